@@ -0,0 +1 @@
+"""Micro-benchmarks for vision stack hot paths."""
@@ -0,0 +1,127 @@
+"""
+Benchmark: YOLO result postprocessing.
+
+Compares the old per-box loop (three .cpu().numpy() syncs per box) against
+the single-transfer batched conversion used by YoloDetector.detect.
+
+Torch is not required: a fake tensor stands in for the device tensor and
+charges a fixed cost per device-to-host sync.
+
+Run with: python -m benchmarks.bench_detector_postprocess
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.common.types import BoundingBox, Detection
+from src.perception.detector import YoloDetector, build_label_lut, detections_from_array
+
+
+class FakeTensor:
+    """Minimal device tensor stand-in that counts host transfers."""
+
+    sync_cost_s = 0.0
+    syncs = 0
+
+    def __init__(self, array: np.ndarray):
+        self._array = array
+
+    def __getitem__(self, idx):
+        return FakeTensor(self._array[idx])
+
+    def __len__(self):
+        return len(self._array)
+
+    def cpu(self) -> "FakeTensor":
+        FakeTensor.syncs += 1
+        if FakeTensor.sync_cost_s > 0:
+            end = time.perf_counter() + FakeTensor.sync_cost_s
+            while time.perf_counter() < end:
+                pass
+        return self
+
+    def numpy(self) -> np.ndarray:
+        return self._array
+
+
+class FakeBoxes:
+    """Mimics ultralytics Boxes (data/xyxy/conf/cls views)."""
+
+    def __init__(self, data: np.ndarray):
+        self.data = FakeTensor(data)
+        self.xyxy = FakeTensor(data[:, :4])
+        self.conf = FakeTensor(data[:, 4])
+        self.cls = FakeTensor(data[:, 5])
+
+    def __len__(self):
+        return len(self.data)
+
+
+def make_boxes(n: int, rng: np.random.Generator) -> FakeBoxes:
+    """Create n random detections in a 1280x720 frame."""
+    xy = rng.uniform(0, 1200, size=(n, 2))
+    wh = rng.uniform(10, 80, size=(n, 2))
+    conf = rng.uniform(0.5, 1.0, size=(n, 1))
+    cls = rng.integers(0, 80, size=(n, 1)).astype(np.float32)
+    data = np.hstack([xy, xy + wh, conf, cls]).astype(np.float32)
+    return FakeBoxes(data)
+
+
+def postprocess_per_box(boxes: FakeBoxes, names: dict) -> list:
+    """Original implementation: three syncs per box."""
+    detections = []
+    for i in range(len(boxes)):
+        xyxy = boxes.xyxy[i].cpu().numpy()
+        conf = float(boxes.conf[i].cpu().numpy())
+        cls = int(boxes.cls[i].cpu().numpy())
+        bbox = BoundingBox(
+            x1=float(xyxy[0]), y1=float(xyxy[1]),
+            x2=float(xyxy[2]), y2=float(xyxy[3])
+        )
+        label = names.get(cls, f"class_{cls}")
+        detections.append(Detection(bbox=bbox, class_id=cls, label=label, confidence=conf))
+    return detections
+
+
+def postprocess_batched(boxes: FakeBoxes, lut: np.ndarray) -> list:
+    """Current implementation: one sync per result."""
+    return detections_from_array(boxes.data.cpu().numpy(), lut)
+
+
+def run(n: int, iters: int, sync_us: float) -> None:
+    rng = np.random.default_rng(0)
+    boxes = make_boxes(n, rng)
+    names = YoloDetector.COCO_CLASSES
+    lut = build_label_lut({}, names)
+    FakeTensor.sync_cost_s = sync_us * 1e-6
+
+    for name, fn, arg in (
+        ("per-box", postprocess_per_box, names),
+        ("batched", postprocess_batched, lut),
+    ):
+        fn(boxes, arg)  # warm-up
+        FakeTensor.syncs = 0
+        start = time.perf_counter()
+        for _ in range(iters):
+            fn(boxes, arg)
+        elapsed = (time.perf_counter() - start) / iters
+        print(f"  {name:8s} n={n:3d}: {elapsed * 1e3:7.3f} ms/frame, "
+              f"{FakeTensor.syncs // iters:3d} syncs/frame")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detector postprocess benchmark")
+    parser.add_argument("--iters", type=int, default=200)
+    parser.add_argument("--sync-us", type=float, default=20.0,
+                        help="Simulated cost of one device-to-host sync (us)")
+    args = parser.parse_args()
+
+    print(f"Detector postprocess (simulated sync cost {args.sync_us:.0f} us)")
+    for n in (1, 10, 50, 100):
+        run(n, args.iters, args.sync_us)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: camera ego-motion estimation cost.
+
+Times EgoMotionEstimator.estimate on a panning 1080p textured scene at
+several flow-frame widths (budget: < 2 ms per frame) and reports the
+translation error against the known pan.
+
+Run with: python -m benchmarks.bench_ego_motion
+"""
+
+import argparse
+
+import cv2
+import numpy as np
+
+from src.perception.ego_motion import EgoMotionEstimator
+
+
+def make_frames(count: int, step: float, rng: np.random.Generator):
+    """Frames of a textured scene panning step px per frame."""
+    small = rng.integers(0, 255, (1080 // 16, 1920 // 16 + count * int(step) // 16 + 2), dtype=np.uint8)
+    scene = cv2.resize(small, (small.shape[1] * 16, 1080), interpolation=cv2.INTER_NEAREST)
+    scene = cv2.cvtColor(cv2.GaussianBlur(scene, (5, 5), 0), cv2.COLOR_GRAY2BGR)
+    # Camera pans right, so image content moves left by step each frame
+    return [scene[:, int(i * step):int(i * step) + 1920].copy() for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ego-motion estimation benchmark")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--step", type=float, default=16.0)
+    parser.add_argument("--widths", type=int, nargs="+", default=[120, 160, 240, 320])
+    args = parser.parse_args()
+
+    frames = make_frames(args.frames, args.step, np.random.default_rng(0))
+
+    print(f"1920x1080, pan {args.step:.0f} px/frame")
+    print(f"{'width':>8}{'median ms':>12}{'p95 ms':>10}{'dx err px':>12}{'valid':>8}")
+    for width in args.widths:
+        estimator = EgoMotionEstimator(width=width)
+        durations, errors = [], []
+        for frame in frames:
+            warp = estimator.estimate(frame)
+            durations.append(estimator.last_duration_ms)
+            if warp is not None:
+                errors.append(abs(warp[0, 2] + args.step))
+        durations = np.array(durations[1:])
+        err = float(np.median(errors)) if errors else float("nan")
+        print(f"{width:>8}{np.median(durations):>12.3f}{np.percentile(durations, 95):>10.3f}"
+              f"{err:>12.2f}{len(errors):>8}")
+
+
+if __name__ == "__main__":
+    main()
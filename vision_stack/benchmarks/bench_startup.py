@@ -0,0 +1,104 @@
+"""
+Benchmark: perception cold start / time-to-first-track.
+
+Each run starts a fresh interpreter (so imports, CUDA init and model
+load are really cold), builds the perception node from a config
+directory, starts it and waits for the first published track. The
+child reports its StartupTimeline; the parent prints per-milestone
+medians across runs.
+
+Without a camera or model (stub mode) no tracks are produced, so the
+run ends at the timeout and time-to-first-track is reported as not
+reached; the earlier milestones are still measured.
+
+Run with: python -m benchmarks.bench_startup --config-dir configs --runs 3
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+MILESTONES = [
+    "package_import",
+    "backend_import",
+    "model_load",
+    "warmup",
+    "camera_boot",
+    "ready",
+    "first_frame",
+    "first_track",
+]
+
+
+def run_child(config_dir: str, timeout_s: float) -> None:
+    """Start a perception node, wait for first track, print timeline JSON."""
+    import logging
+    import os
+
+    from src.common.timeline import StartupTimeline
+    timeline = StartupTimeline("PERCEPTION")
+
+    from src.perception import PerceptionNode, load_perception_config
+    timeline.mark("package_import")
+
+    logging.basicConfig(level=logging.WARNING)
+    config = load_perception_config(
+        os.path.join(config_dir, "camera.yaml"),
+        os.path.join(config_dir, "perception.yaml"),
+        os.path.join(config_dir, "tracker.yaml"),
+    )
+    node = PerceptionNode(config, timeline=timeline)
+    thread = threading.Thread(target=node.start, daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline and not timeline.has("first_track"):
+        time.sleep(0.01)
+
+    node._running = False
+    thread.join(timeout=2.0)
+    print(json.dumps(timeline.as_dict()))
+
+
+def run_once(config_dir: str, timeout_s: float) -> dict:
+    """Run one cold start in a subprocess and parse its timeline."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child",
+         "--config-dir", config_dir, "--timeout", str(timeout_s)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perception cold start benchmark")
+    parser.add_argument("--config-dir", default="configs")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Max seconds to wait for the first track per run")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.config_dir, args.timeout)
+        return
+
+    results = [run_once(args.config_dir, args.timeout) for _ in range(args.runs)]
+
+    print(f"Perception cold start ({args.runs} runs, ms from timeline start, before package import)")
+    print(f"{'milestone':<16}{'median':>10}{'min':>10}{'max':>10}")
+    for milestone in MILESTONES:
+        values = [r[milestone] * 1000 for r in results if milestone in r]
+        if not values:
+            print(f"{milestone:<16}{'not reached':>30}")
+            continue
+        print(f"{milestone:<16}{statistics.median(values):>10.0f}"
+              f"{min(values):>10.0f}{max(values):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: SimpleIOUTracker association cost.
+
+Compares the original per-pair Python IOU loop with repeated argmax
+greedy matching against the vectorized IOU matrix with gated
+Hungarian (and greedy) assignment, then times a full tracker update at
+10/50/100 detections × tracks.
+
+Run with: python -m benchmarks.bench_tracker_association
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.common.types import BoundingBox, Detection
+from src.perception.tracker import SimpleIOUTracker, TrackerConfig, associate, iou_matrix
+
+
+def legacy_iou(box1: np.ndarray, box2: np.ndarray) -> float:
+    """Original scalar IOU."""
+    x1 = max(box1[0], box2[0])
+    y1 = max(box1[1], box2[1])
+    x2 = min(box1[2], box2[2])
+    y2 = min(box1[3], box2[3])
+    if x2 <= x1 or y2 <= y1:
+        return 0.0
+    intersection = (x2 - x1) * (y2 - y1)
+    area1 = (box1[2] - box1[0]) * (box1[3] - box1[1])
+    area2 = (box2[2] - box2[0]) * (box2[3] - box2[1])
+    union = area1 + area2 - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def legacy_associate(det_boxes: np.ndarray, track_boxes: np.ndarray, threshold: float) -> int:
+    """Original double-loop IOU matrix + repeated-argmax greedy matching."""
+    matrix = np.zeros((len(det_boxes), len(track_boxes)))
+    for i in range(len(det_boxes)):
+        for j in range(len(track_boxes)):
+            matrix[i, j] = legacy_iou(det_boxes[i], track_boxes[j])
+    matches = 0
+    while matrix.size and np.max(matrix) >= threshold:
+        d, t = np.unravel_index(np.argmax(matrix), matrix.shape)
+        matrix[d, :] = 0
+        matrix[:, t] = 0
+        matches += 1
+    return matches
+
+
+def make_scene(n: int, rng: np.random.Generator):
+    """n tracks and n jittered detections of the same objects."""
+    xy = rng.uniform(0, 1800, size=(n, 2))
+    wh = rng.uniform(20, 120, size=(n, 2))
+    tracks = np.hstack([xy, xy + wh])
+    dets = tracks + rng.normal(0, 3, size=tracks.shape)
+    return dets, tracks
+
+
+def time_call(fn, repeats: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples) * 1000)
+
+
+def bench_update(n: int, matching: str, rng: np.random.Generator, repeats: int) -> float:
+    """Per-frame SimpleIOUTracker.update cost with n objects in steady state."""
+    dets, _ = make_scene(n, rng)
+    tracker = SimpleIOUTracker(TrackerConfig(matching=matching))
+    frames = []
+    for _ in range(repeats + 5):
+        boxes = dets + rng.normal(0, 2, size=dets.shape)
+        frames.append([
+            Detection(bbox=BoundingBox(*b), class_id=0, label="person", confidence=0.9)
+            for b in boxes.tolist()
+        ])
+    for detections in frames[:5]:
+        tracker.update(detections, None)
+    it = iter(frames[5:])
+    return time_call(lambda: tracker.update(next(it), None), repeats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracker association benchmark")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    threshold = 0.3
+
+    print("Association only (ms, median)")
+    print(f"{'N×N':>8}{'legacy':>12}{'greedy':>12}{'hungarian':>12}")
+    for n in args.sizes:
+        dets, tracks = make_scene(n, rng)
+        legacy = time_call(lambda: legacy_associate(dets, tracks, threshold), args.repeats)
+        greedy = time_call(
+            lambda: associate(iou_matrix(dets, tracks), threshold, "greedy"), args.repeats)
+        hungarian = time_call(
+            lambda: associate(iou_matrix(dets, tracks), threshold, "hungarian"), args.repeats)
+        print(f"{n:>8}{legacy:>12.3f}{greedy:>12.3f}{hungarian:>12.3f}")
+
+    print("\nFull SimpleIOUTracker.update per frame (ms, median)")
+    print(f"{'N×N':>8}{'greedy':>12}{'hungarian':>12}")
+    for n in args.sizes:
+        greedy = bench_update(n, "greedy", rng, args.repeats)
+        hungarian = bench_update(n, "hungarian", rng, args.repeats)
+        print(f"{n:>8}{greedy:>12.3f}{hungarian:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,24 @@ from .types import (
     Detection,
     Track,
     TrackList,
+    TrackArrays,
+    LockedTarget,
     LockStatus,
     LockState,
     Errors,
+    TrackErrors,
+    TargetState,
     Setpoint,
     BatteryStatus,
     BatteryState,
     CommandType,
     UserCommand,
     CameraIntrinsics,
+    Attitude,
     Telemetry,
+    FcStatus,
 )
+from .attitude import AttitudeBuffer
 from .filters import (
     EMAFilter,
     SlewRateLimiter,
@@ -24,6 +31,8 @@ from .filters import (
     clamp,
     deadband,
 )
+from .angle_lut import AngleLUT
+from .scheduler import RateScheduler, JitterStats, scheduler_stats
 from .math3d import (
     Quaternion,
     euler_to_quaternion,
@@ -41,16 +50,23 @@ __all__ = [
     "Detection",
     "Track",
     "TrackList",
+    "TrackArrays",
+    "LockedTarget",
     "LockStatus",
     "LockState",
     "Errors",
+    "TrackErrors",
+    "TargetState",
     "Setpoint",
     "BatteryStatus",
     "BatteryState",
     "CommandType",
     "UserCommand",
     "CameraIntrinsics",
+    "Attitude",
     "Telemetry",
+    "FcStatus",
+    "AttitudeBuffer",
     # Filters
     "EMAFilter",
     "SlewRateLimiter",
@@ -58,7 +74,12 @@ __all__ = [
     "LowPassFilter",
     "clamp",
     "deadband",
+    # Scheduling
+    "RateScheduler",
+    "JitterStats",
+    "scheduler_stats",
     # Math
+    "AngleLUT",
     "Quaternion",
     "euler_to_quaternion",
     "quaternion_to_euler",
@@ -0,0 +1,175 @@
+"""
+Lens-distortion-aware pixel → angle lookup table.
+
+math3d.pixel_to_angles assumes an ideal pinhole camera; near the frame
+edges the OAK-D Lite RGB lens distortion makes that off by degrees. The
+table undistorts a coarse pixel grid once (cv2.undistortPoints) into
+yaw/pitch angles and answers queries by bilinear interpolation, so each
+lookup is O(1) and vectorizes over arrays. Tables are cached on disk per
+camera serial, resolution and calibration.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .types import CameraIntrinsics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "drone_vision", "angle_lut")
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def lut_cache_key(
+    intrinsics: CameraIntrinsics,
+    distortion: Sequence[float],
+    step: int,
+    serial: Optional[str] = None
+) -> str:
+    """Cache file stem: serial, resolution and a digest of the calibration."""
+    params = np.array(
+        [intrinsics.fx, intrinsics.fy, intrinsics.cx, intrinsics.cy, step, *distortion],
+        dtype=np.float64
+    )
+    digest = hashlib.sha256(params.tobytes()).hexdigest()[:12]
+    return f"{serial or 'config'}_{intrinsics.width}x{intrinsics.height}_{digest}"
+
+
+class AngleLUT:
+    """
+    Yaw/pitch of every pixel from a grid sampled every `step` pixels.
+
+    Angles follow pixel_to_angles: yaw positive = right of the optical
+    axis, pitch positive = above it.
+    """
+
+    def __init__(self, yaw: np.ndarray, pitch: np.ndarray, step: int):
+        """
+        Initialize from precomputed grids.
+
+        Args:
+            yaw, pitch: (rows, cols) angle grids in radians at pixels
+                (col * step, row * step)
+            step: Grid spacing in pixels
+        """
+        self.yaw = yaw
+        self.pitch = pitch
+        self.step = step
+
+    @classmethod
+    def build(
+        cls,
+        intrinsics: CameraIntrinsics,
+        distortion: Optional[Sequence[float]] = None,
+        step: int = 8
+    ) -> "AngleLUT":
+        """
+        Undistort a pixel grid into angles.
+
+        Args:
+            intrinsics: Camera matrix and frame size
+            distortion: OpenCV distortion coefficients (k1, k2, p1, p2, k3, ...)
+            step: Grid spacing in pixels
+
+        Returns:
+            AngleLUT covering the whole frame
+        """
+        cols = int(np.ceil((intrinsics.width - 1) / step)) + 1
+        rows = int(np.ceil((intrinsics.height - 1) / step)) + 1
+        u, v = np.meshgrid(np.arange(cols) * step, np.arange(rows) * step)
+        points = np.stack([u, v], axis=-1).reshape(-1, 1, 2).astype(np.float64)
+
+        camera_matrix = np.array([
+            [intrinsics.fx, 0.0, intrinsics.cx],
+            [0.0, intrinsics.fy, intrinsics.cy],
+            [0.0, 0.0, 1.0],
+        ])
+        coeffs = np.asarray(distortion if distortion is not None else [], dtype=np.float64)
+        normalized = cv2.undistortPoints(points, camera_matrix, coeffs).reshape(rows, cols, 2)
+
+        # Normalized image coordinates are tan(angle) from the optical axis
+        yaw = np.arctan(normalized[..., 0])
+        pitch = -np.arctan(normalized[..., 1])
+        return cls(yaw, pitch, step)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        intrinsics: CameraIntrinsics,
+        distortion: Optional[Sequence[float]] = None,
+        step: int = 8,
+        serial: Optional[str] = None,
+        cache_dir: Optional[str] = None
+    ) -> "AngleLUT":
+        """
+        Load the table from the on-disk cache, building and caching it if missing.
+
+        Args:
+            intrinsics: Camera matrix and frame size
+            distortion: OpenCV distortion coefficients
+            step: Grid spacing in pixels
+            serial: Camera serial (device MxId) for the cache key
+            cache_dir: Cache directory (default ~/.cache/drone_vision/angle_lut)
+
+        Returns:
+            AngleLUT
+        """
+        distortion = list(distortion or [])
+        cache_root = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        path = os.path.join(cache_root, lut_cache_key(intrinsics, distortion, step, serial) + ".npz")
+
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    lut = cls(data["yaw"], data["pitch"], int(data["step"]))
+                logger.info(f"Loaded angle LUT: {path}")
+                return lut
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable angle LUT cache {path}: {e}")
+
+        lut = cls.build(intrinsics, distortion, step)
+        try:
+            os.makedirs(cache_root, exist_ok=True)
+            tmp_path = path + ".tmp.npz"
+            np.savez(tmp_path, yaw=lut.yaw, pitch=lut.pitch, step=step)
+            os.replace(tmp_path, path)
+            logger.info(f"Built angle LUT {lut.yaw.shape[1]}x{lut.yaw.shape[0]}, cached to {path}")
+        except OSError as e:
+            logger.warning(f"Could not cache angle LUT: {e}")
+        return lut
+
+    def angles(self, u: ArrayLike, v: ArrayLike) -> Tuple[ArrayLike, ArrayLike]:
+        """
+        Yaw and pitch of pixel(s) by bilinear interpolation.
+
+        Points outside the frame are linearly extrapolated from the edge cells.
+
+        Args:
+            u, v: Pixel coordinates (scalars or arrays of the same shape)
+
+        Returns:
+            (yaw, pitch) in radians, scalars or arrays matching the input
+        """
+        gx = np.asarray(u, dtype=np.float64) / self.step
+        gy = np.asarray(v, dtype=np.float64) / self.step
+        rows, cols = self.yaw.shape
+        x0 = np.clip(np.floor(gx).astype(np.int64), 0, cols - 2)
+        y0 = np.clip(np.floor(gy).astype(np.int64), 0, rows - 2)
+        fx = gx - x0
+        fy = gy - y0
+
+        def interpolate(grid: np.ndarray) -> np.ndarray:
+            top = grid[y0, x0] * (1 - fx) + grid[y0, x0 + 1] * fx
+            bottom = grid[y0 + 1, x0] * (1 - fx) + grid[y0 + 1, x0 + 1] * fx
+            return top * (1 - fy) + bottom * fy
+
+        yaw, pitch = interpolate(self.yaw), interpolate(self.pitch)
+        if np.ndim(u) == 0 and np.ndim(v) == 0:
+            return float(yaw), float(pitch)
+        return yaw, pitch
@@ -0,0 +1,103 @@
+"""
+Time-indexed attitude history.
+
+Flight-controller attitude arrives at a higher rate than camera frames and
+is needed at the frame's capture time, not at the time the frame is
+processed. AttitudeBuffer keeps the most recent samples in a fixed-size
+ring and interpolates the attitude at any timestamp it covers.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .types import Attitude
+
+
+class AttitudeBuffer:
+    """
+    Ring buffer of (timestamp, roll, pitch, yaw) samples.
+
+    Samples must be added in timestamp order (older samples are dropped).
+    Thread-safe.
+    """
+
+    def __init__(self, capacity: int = 256, max_gap_s: float = 0.1):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Number of samples kept
+            max_gap_s: Max distance from a query time to the nearest sample;
+                past either end the nearest sample is held this long
+        """
+        self.capacity = capacity
+        self.max_gap_s = max_gap_s
+        self._data = np.zeros((capacity, 4))  # timestamp, roll, pitch, yaw
+        self._count = 0
+        self._head = 0  # Next write index
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, attitude: Attitude) -> None:
+        """Append a sample (ignored if not newer than the last one)."""
+        with self._lock:
+            if self._count and attitude.timestamp <= self._data[(self._head - 1) % self.capacity, 0]:
+                return
+            self._data[self._head] = (attitude.timestamp, attitude.roll, attitude.pitch, attitude.yaw)
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def latest(self) -> Optional[Attitude]:
+        """Newest sample, or None if empty."""
+        with self._lock:
+            if not self._count:
+                return None
+            t, roll, pitch, yaw = self._data[(self._head - 1) % self.capacity]
+        return Attitude(roll=roll, pitch=pitch, yaw=yaw, timestamp=t)
+
+    def at(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
+        """
+        Attitude at a timestamp, linearly interpolated between samples.
+
+        Args:
+            timestamp: Query time (same clock as the samples)
+
+        Returns:
+            (roll, pitch, yaw) in radians, or None if no sample lies within
+            max_gap_s of the query time
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            # Chronological view of the ring
+            start = (self._head - self._count) % self.capacity
+            samples = np.roll(self._data, -start, axis=0)[:self._count]
+
+        times = samples[:, 0]
+        i = int(np.searchsorted(times, timestamp))
+        if i == 0 or i == len(times):
+            nearest = samples[0] if i == 0 else samples[-1]
+            if abs(timestamp - nearest[0]) > self.max_gap_s:
+                return None
+            return float(nearest[1]), float(nearest[2]), float(nearest[3])
+
+        before, after = samples[i - 1], samples[i]
+        if min(timestamp - before[0], after[0] - timestamp) > self.max_gap_s:
+            return None
+        w = (timestamp - before[0]) / (after[0] - before[0])
+        # Yaw is interpolated along the short way around
+        d_yaw = (after[3] - before[3] + np.pi) % (2 * np.pi) - np.pi
+        roll = before[1] + w * (after[1] - before[1])
+        pitch = before[2] + w * (after[2] - before[2])
+        yaw = (before[3] + w * d_yaw + np.pi) % (2 * np.pi) - np.pi
+        return float(roll), float(pitch), float(yaw)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        with self._lock:
+            self._count = 0
+            self._head = 0
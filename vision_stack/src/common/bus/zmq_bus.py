@@ -8,6 +8,7 @@ import json
 import logging
 import time
 from dataclasses import asdict, is_dataclass
+from enum import Enum
 from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
 
 import zmq
@@ -30,7 +31,14 @@ class ZmqSerializer:
             data = obj
         else:
             data = {"value": obj}
-        return json.dumps(data).encode("utf-8")
+        return json.dumps(data, default=ZmqSerializer._encode_default).encode("utf-8")
+
+    @staticmethod
+    def _encode_default(obj: Any) -> Any:
+        """Encode values json does not handle natively (enums by name)."""
+        if isinstance(obj, Enum):
+            return obj.name
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
     @staticmethod
     def deserialize(data: bytes, type_registry: Optional[Dict[str, Type]] = None) -> Any:
@@ -0,0 +1,56 @@
+"""
+Mode overrides for component configuration files.
+
+Component YAML files (perception.yaml, targeting.yaml, ...) hold the
+shipped defaults. A mode file (configs/modes/<mode>.yaml) may carry a
+section named after the component whose keys are merged over them, so
+features can be switched on for one mode (e.g. bench) without changing
+flight behavior.
+"""
+
+from typing import Any, Dict, Optional
+
+import yaml
+
+
+def merge_config(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recursively merge override into a copy of base.
+
+    Args:
+        base: Base configuration
+        override: Values replacing those in base; nested dicts are merged
+
+    Returns:
+        Merged configuration (inputs are not modified)
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def apply_mode_overrides(
+    config: Dict[str, Any],
+    mode_yaml: Optional[str],
+    section: str
+) -> Dict[str, Any]:
+    """
+    Merge a mode file's `section` over a component configuration.
+
+    Args:
+        config: Component configuration loaded from its own YAML file
+        mode_yaml: Mode file path, or None for no overrides
+        section: Mode file section holding this component's overrides
+
+    Returns:
+        Configuration with the mode overrides applied
+    """
+    if mode_yaml is None:
+        return config
+    with open(mode_yaml, 'r') as f:
+        mode_cfg = yaml.safe_load(f) or {}
+    return merge_config(config or {}, mode_cfg.get(section) or {})
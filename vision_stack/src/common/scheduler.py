@@ -0,0 +1,217 @@
+"""
+Drift-free periodic loop scheduling.
+
+Loops that sleep "period - elapsed" measured with time.time() drift
+(the sleep overshoot accumulates every iteration) and jump with NTP
+corrections. RateScheduler keeps absolute deadlines on a fixed grid of
+the monotonic perf_counter_ns clock, so overshoot on one tick is not
+carried into the next, detects overruns, and records how late each tick
+started (jitter) in a rolling window.
+
+Usage:
+    scheduler = RateScheduler(30.0, name="control")
+    while running:
+        scheduler.wait()
+        do_work()
+"""
+
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CATCH_UP_SKIP = "skip"  # Drop missed ticks and stay on the grid
+CATCH_UP_BURST = "burst"  # Run missed ticks back-to-back (up to max_burst), then skip
+
+# Jitter histogram bin edges (microseconds); the last bin is open-ended
+JITTER_BINS_US = (0, 100, 250, 500, 1000, 2000, 5000, 10000)
+
+_registry: "weakref.WeakValueDictionary[str, RateScheduler]" = weakref.WeakValueDictionary()
+
+
+@dataclass
+class JitterStats:
+    """Tick-start lateness over the rolling window."""
+    name: str
+    rate_hz: float
+    ticks: int  # Total ticks since start/reset
+    overruns: int  # Ticks that started a full period or more late
+    skipped: int  # Ticks dropped by the catch-up policy
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    max_us: float
+    histogram: List[int]  # Counts per JITTER_BINS_US bin (last bin: >= last edge)
+
+    def format(self) -> str:
+        """One-line summary for logs."""
+        return (f"{self.name} @{self.rate_hz:.0f}Hz: jitter p50 {self.p50_us:.0f}us "
+                f"p99 {self.p99_us:.0f}us max {self.max_us:.0f}us, "
+                f"{self.overruns} overruns, {self.skipped} skipped / {self.ticks} ticks")
+
+
+class RateScheduler:
+    """
+    Fixed-rate tick source with absolute monotonic deadlines.
+
+    wait() blocks until the next deadline. The first call returns at once
+    and anchors the grid. A tick that starts a full period or more late is
+    an overrun; the catch-up policy then either skips the missed ticks
+    (default) or bursts through them.
+    """
+
+    def __init__(
+        self,
+        rate_hz: float,
+        name: str = "loop",
+        catch_up: str = CATCH_UP_SKIP,
+        max_burst: int = 3,
+        spin_us: float = 0.0,
+        window: int = 1000,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            rate_hz: Tick rate
+            name: Loop name for stats and logs
+            catch_up: CATCH_UP_SKIP or CATCH_UP_BURST
+            max_burst: Max consecutive catch-up ticks in burst mode
+            spin_us: Busy-wait this long before each deadline instead of
+                sleeping (trades CPU for sub-sleep-granularity jitter)
+            window: Ticks kept for the jitter statistics
+            clock: Monotonic nanosecond clock (injectable for tests)
+            sleep: Sleep function taking seconds (injectable for tests)
+        """
+        if catch_up not in (CATCH_UP_SKIP, CATCH_UP_BURST):
+            raise ValueError(f"Unknown catch-up policy: {catch_up}")
+        self.name = name
+        self.catch_up = catch_up
+        self.max_burst = max_burst
+        self.spin_ns = int(spin_us * 1000)
+        self._clock = clock
+        self._sleep = sleep
+        self._period_ns = 0
+        self.set_rate(rate_hz)
+        self._lateness_ns: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.reset()
+        _registry[name] = self
+
+    @property
+    def period(self) -> float:
+        """Tick period in seconds."""
+        return self._period_ns / 1e9
+
+    @property
+    def rate_hz(self) -> float:
+        """Tick rate."""
+        return 1e9 / self._period_ns
+
+    def set_rate(self, rate_hz: float) -> None:
+        """Change the rate; takes effect from the next tick."""
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self._period_ns = int(round(1e9 / rate_hz))
+
+    def reset(self) -> None:
+        """Re-anchor the grid at the next wait() and clear statistics."""
+        self._deadline_ns: Optional[int] = None
+        self._burst = 0
+        with self._lock:
+            self._ticks = 0
+            self._overruns = 0
+            self._skipped = 0
+            self._lateness_ns.clear()
+
+    def wait(self) -> int:
+        """
+        Block until the next tick.
+
+        Returns:
+            Number of ticks skipped to get back on the grid (0 normally)
+        """
+        now = self._clock()
+        if self._deadline_ns is None:
+            self._deadline_ns = now
+        if now < self._deadline_ns:
+            self._sleep_until(self._deadline_ns)
+            now = self._clock()
+
+        period = self._period_ns
+        late = now - self._deadline_ns
+        skipped = 0
+        overrun = late >= period
+        if overrun:
+            # This call runs one missed tick; `late // period` more have passed since
+            if self.catch_up == CATCH_UP_BURST and self._burst < self.max_burst:
+                # Run them back-to-back: the next wait() returns at once
+                self._burst += 1
+            else:
+                skipped = late // period
+                self._deadline_ns += skipped * period
+                late -= skipped * period
+                self._burst = 0
+        else:
+            self._burst = 0
+        self._deadline_ns += period
+
+        with self._lock:
+            self._ticks += 1
+            self._overruns += overrun
+            self._skipped += skipped
+            self._lateness_ns.append(late)
+        return skipped
+
+    def time_to_next(self) -> float:
+        """Seconds until the next deadline (negative if already late)."""
+        if self._deadline_ns is None:
+            return 0.0
+        return (self._deadline_ns - self._clock()) / 1e9
+
+    def stats(self) -> JitterStats:
+        """Jitter statistics over the rolling window."""
+        with self._lock:
+            lateness = np.array(self._lateness_ns, dtype=np.float64) / 1000.0
+            ticks, overruns, skipped = self._ticks, self._overruns, self._skipped
+        if len(lateness):
+            p50, p99 = np.percentile(lateness, [50, 99])
+            mean, peak = lateness.mean(), lateness.max()
+        else:
+            p50 = p99 = mean = peak = 0.0
+        edges = list(JITTER_BINS_US) + [np.inf]
+        histogram = np.histogram(lateness, bins=edges)[0].tolist()
+        return JitterStats(
+            name=self.name,
+            rate_hz=self.rate_hz,
+            ticks=ticks,
+            overruns=overruns,
+            skipped=skipped,
+            mean_us=float(mean),
+            p50_us=float(p50),
+            p99_us=float(p99),
+            max_us=float(peak),
+            histogram=histogram
+        )
+
+    def _sleep_until(self, deadline_ns: int) -> None:
+        remaining = deadline_ns - self._clock() - self.spin_ns
+        if remaining > 0:
+            self._sleep(remaining / 1e9)
+        # Spin for the rest; sleep(0) yields the GIL to other threads
+        while self._clock() < deadline_ns:
+            self._sleep(0)
+
+
+def scheduler_stats() -> Dict[str, JitterStats]:
+    """Statistics of every live RateScheduler in this process, by name."""
+    return {name: scheduler.stats() for name, scheduler in list(_registry.items())}
@@ -0,0 +1,85 @@
+"""
+Startup timeline.
+
+Records named milestones (imports, model load, camera boot, first frame,
+...) relative to a common start time and logs each one as it happens, so
+cold-start cost can be attributed to a phase.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """Monotonic milestone log for node startup."""
+
+    def __init__(self, name: str, start: Optional[float] = None):
+        """
+        Initialize timeline.
+
+        Args:
+            name: Node name used in log lines
+            start: time.monotonic() reference (defaults to now)
+        """
+        self.name = name
+        self.start = start if start is not None else time.monotonic()
+        self._marks: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def mark(self, milestone: str) -> float:
+        """
+        Record a milestone once; repeated marks are ignored.
+
+        Args:
+            milestone: Milestone name
+
+        Returns:
+            Seconds since start for the (first) mark
+        """
+        now = time.monotonic()
+        with self._lock:
+            for name, t in self._marks:
+                if name == milestone:
+                    return t - self.start
+            previous = self._marks[-1][1] if self._marks else self.start
+            self._marks.append((milestone, now))
+
+        logger.info(
+            f"[{self.name}] startup: {milestone} at {(now - self.start) * 1000:.0f}ms "
+            f"(+{(now - previous) * 1000:.0f}ms)"
+        )
+        return now - self.start
+
+    def has(self, milestone: str) -> bool:
+        """Whether a milestone has been recorded."""
+        with self._lock:
+            return any(name == milestone for name, _ in self._marks)
+
+    def elapsed(self, milestone: str) -> Optional[float]:
+        """Seconds from start to a milestone, or None if not reached."""
+        with self._lock:
+            for name, t in self._marks:
+                if name == milestone:
+                    return t - self.start
+        return None
+
+    def as_dict(self) -> Dict[str, float]:
+        """Milestone -> seconds since start, in order recorded."""
+        with self._lock:
+            return {name: t - self.start for name, t in self._marks}
+
+    def summary(self) -> str:
+        """One-line summary of all milestones with per-phase durations."""
+        parts = []
+        previous = self.start
+        with self._lock:
+            marks = list(self._marks)
+        for name, t in marks:
+            parts.append(f"{name} +{(t - previous) * 1000:.0f}ms")
+            previous = t
+        total = (marks[-1][1] - self.start) * 1000 if marks else 0.0
+        return f"{' | '.join(parts)} = {total:.0f}ms"
@@ -9,6 +9,8 @@ from enum import Enum, auto
 from typing import List, Optional, Tuple
 import time
 
+import numpy as np
+
 
 @dataclass
 class BoundingBox:
@@ -56,6 +58,69 @@ class Track:
     confidence: float
     timestamp: float = field(default_factory=time.time)
     velocity: Optional[Tuple[float, float]] = None  # pixels/sec
+    # Row-major 4x4 covariance of (cx, cy, vx, vy) in px and px/s
+    covariance: Optional[List[float]] = None
+    # Normalized hue/saturation histogram of the bbox (lock reacquisition)
+    appearance: Optional[List[float]] = None
+
+    def predicted_bbox(self, dt: float) -> BoundingBox:
+        """Bbox extrapolated dt seconds ahead with the track velocity."""
+        if self.velocity is None:
+            return self.bbox
+        dx, dy = self.velocity[0] * dt, self.velocity[1] * dt
+        return BoundingBox(self.bbox.x1 + dx, self.bbox.y1 + dy,
+                           self.bbox.x2 + dx, self.bbox.y2 + dy)
+
+
+@dataclass
+class TrackArrays:
+    """Struct-of-arrays snapshot of tracks (row i describes one track)."""
+    ids: np.ndarray  # (N,) int64
+    bboxes: np.ndarray  # (N, 4) xyxy
+    class_ids: np.ndarray  # (N,) int64
+    labels: np.ndarray  # (N,) object (str)
+    confidences: np.ndarray  # (N,)
+    timestamps: np.ndarray  # (N,)
+    velocities: np.ndarray  # (N, 2) center velocity, px/s
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_tracks(self) -> List[Track]:
+        """Convert to Track messages."""
+        return [
+            Track(
+                track_id=tid,
+                bbox=BoundingBox(*box),
+                class_id=cls,
+                label=label,
+                confidence=conf,
+                timestamp=ts,
+                velocity=tuple(vel)
+            )
+            for tid, box, cls, label, conf, ts, vel in zip(
+                self.ids.tolist(), self.bboxes.tolist(), self.class_ids.tolist(),
+                self.labels.tolist(), self.confidences.tolist(),
+                self.timestamps.tolist(), self.velocities.tolist()
+            )
+        ]
+
+    @classmethod
+    def from_tracks(cls, tracks: List["Track"]) -> "TrackArrays":
+        """Pack Track messages (missing velocities become NaN)."""
+        labels = np.empty(len(tracks), dtype=object)
+        labels[:] = [t.label for t in tracks]
+        return cls(
+            ids=np.array([t.track_id for t in tracks], dtype=np.int64),
+            bboxes=np.array([[t.bbox.x1, t.bbox.y1, t.bbox.x2, t.bbox.y2] for t in tracks],
+                            dtype=np.float64).reshape(-1, 4),
+            class_ids=np.array([t.class_id for t in tracks], dtype=np.int64),
+            labels=labels,
+            confidences=np.array([t.confidence for t in tracks], dtype=np.float64),
+            timestamps=np.array([t.timestamp for t in tracks], dtype=np.float64),
+            velocities=np.array([t.velocity if t.velocity is not None else (np.nan, np.nan)
+                                 for t in tracks], dtype=np.float64).reshape(-1, 2)
+        )
 
 
 @dataclass
@@ -66,6 +131,16 @@ class TrackList:
     timestamp: float = field(default_factory=time.time)
 
 
+@dataclass
+class LockedTarget:
+    """Camera-rate position of the locked target from the correlation tracker."""
+    track_id: int
+    bbox: BoundingBox
+    score: float  # Correlation peak-to-sidelobe ratio (higher = more confident)
+    timestamp: float = field(default_factory=time.time)  # Frame capture time
+    reseeded: bool = False  # True when the box comes from a confirming detection
+
+
 class LockStatus(Enum):
     """Target lock status."""
     UNLOCKED = auto()
@@ -81,6 +156,7 @@ class LockState:
     locked_track_id: Optional[int] = None
     lock_timestamp: Optional[float] = None
     frames_since_lock: int = 0
+    bbox: Optional[BoundingBox] = None  # Last known bbox of locked target
     
     @property
     def is_valid(self) -> bool:
@@ -99,6 +175,9 @@ class Errors:
     depth_valid: bool = False
     lock_valid: bool = False
     
+    # Seconds the target position was extrapolated ahead (predictive mode)
+    lead_time_s: float = 0.0
+    
     timestamp: float = field(default_factory=time.time)
 
     @property
@@ -106,6 +185,35 @@ class Errors:
         return self.track_valid and self.depth_valid and self.lock_valid
 
 
+@dataclass
+class TrackErrors:
+    """Errors for every track of one frame, column-wise (row i = track_ids[i])."""
+    frame_id: int
+    track_ids: List[int]
+    yaw_error: List[float]  # radians
+    pitch_error: List[float]  # radians
+    range_error: List[Optional[float]]  # meters, None without depth
+    depth_valid: List[bool]
+    priority: Optional[List[float]] = None  # Auto-selection score (0-1), if enabled
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class TargetState:
+    """Filtered 3D state of the locked target relative to the aircraft."""
+    track_id: int
+    frame: str  # "ned" (attitude available) or "body" (FRD)
+    position: List[float]  # meters, target relative to the camera
+    velocity: List[float]  # m/s, relative
+    position_std: List[float]  # meters, per axis
+    range_m: float
+    range_rate: float  # m/s, positive = opening
+    los_rate_yaw: float  # rad/s, azimuth rate of the line of sight
+    los_rate_pitch: float  # rad/s, elevation rate of the line of sight
+    range_observed: bool  # False until depth was fused (range is the prior)
+    timestamp: float = field(default_factory=time.time)
+
+
 @dataclass
 class Setpoint:
     """Control setpoint for the flight controller."""
@@ -191,6 +299,19 @@ class CameraIntrinsics:
     cy: float  # principal point y
     width: int
     height: int
+    distortion: Optional[List[float]] = None  # OpenCV coefficients (k1, k2, p1, p2, k3, ...)
+
+
+@dataclass
+class Attitude:
+    """Aircraft attitude from the flight controller (MAVLink ATTITUDE)."""
+    roll: float  # radians, positive = right wing down
+    pitch: float  # radians, positive = nose up
+    yaw: float  # radians, heading from north
+    rollspeed: float = 0.0  # rad/s
+    pitchspeed: float = 0.0  # rad/s
+    yawspeed: float = 0.0  # rad/s
+    timestamp: float = field(default_factory=time.time)  # Local receive time
 
 
 @dataclass 
@@ -202,3 +323,17 @@ class Telemetry:
     battery_remaining: int = 0
     gps_fix: int = 0
     timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class FcStatus:
+    """Compact FC link summary published by the MAVLink bridge on `telemetry`."""
+    connected: bool = False  # FC heartbeat within the heartbeat timeout
+    heartbeat_age_ms: Optional[float] = None  # None before the first FC heartbeat
+    armed: bool = False
+    mode: str = "UNKNOWN"
+    roll: Optional[float] = None  # radians, None before the first ATTITUDE
+    pitch: Optional[float] = None
+    yaw: Optional[float] = None
+    attitude_age_ms: Optional[float] = None
+    timestamp: float = field(default_factory=time.time)  # Publish time
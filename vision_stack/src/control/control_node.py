@@ -1,8 +1,8 @@
 """
 Control node - orchestrates control mapping and safety.
 
-Subscribes to errors from targeting, applies control and safety,
-publishes setpoints to MAVLink bridge.
+Subscribes to errors from targeting and FC telemetry from the MAVLink
+bridge, applies control and safety, publishes setpoints to MAVLink bridge.
 """
 
 import logging
@@ -12,8 +12,9 @@ from typing import Optional
 
 import yaml
 
-from ..common.types import Errors, Setpoint
+from ..common.types import Errors, FcStatus, Setpoint
 from ..common.bus import ZmqPublisher, ZmqSubscriber, BusPorts
+from ..common.scheduler import RateScheduler
 from .control_mapper import ControlMapper, ControlConfig, ControlGains, ControlLimits
 from .safety_manager import SafetyManager, SafetyConfig
 
@@ -82,6 +83,7 @@ class ControlNode:
     
     Subscribes to:
     - errors from targeting
+    - telemetry (FC link summary) from MAVLink bridge
     
     Publishes:
     - setpoints to MAVLink bridge
@@ -104,11 +106,16 @@ class ControlNode:
         self._publisher = ZmqPublisher(BusPorts.pub_endpoint(BusPorts.CONTROL))
         self._error_sub = ZmqSubscriber(BusPorts.sub_endpoint(BusPorts.TARGETING))
         self._error_sub.subscribe("errors")
+        self._telemetry_sub = ZmqSubscriber(BusPorts.sub_endpoint(BusPorts.MAVLINK))
+        self._telemetry_sub.subscribe("telemetry")
         
         # State
         self._running = False
         self._last_errors: Optional[Errors] = None
+        self._fc_status: Optional[FcStatus] = None
+        self._fc_status_received = 0.0  # time.monotonic() of the last telemetry message
         self._frame_count = 0
+        self._scheduler = RateScheduler(config.update_rate_hz, name="control")
         
         logger.info(f"ControlNode initialized (bench={config.safety.bench_mode})")
 
@@ -134,28 +141,25 @@ class ControlNode:
         
         self._publisher.close()
         self._error_sub.close()
+        self._telemetry_sub.close()
         logger.info("Control node stopped")
 
     def _run_loop(self) -> None:
         """Main processing loop."""
-        target_period = 1.0 / self.config.update_rate_hz
+        self._scheduler.reset()
         
         while self._running:
-            loop_start = time.time()
+            self._scheduler.wait()
             
-            # Get latest errors
+            # Get latest errors and FC telemetry
             self._receive_errors()
+            self._receive_telemetry()
             
             # Compute and publish setpoint
             setpoint = self._compute_setpoint()
             self._publisher.publish("setpoints", setpoint)
             
             self._frame_count += 1
-            
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < target_period:
-                time.sleep(target_period - elapsed)
 
             # Periodic logging
             if self._frame_count % 100 == 0:
@@ -180,8 +184,52 @@ class ControlNode:
                     track_valid=msg.get('track_valid', False),
                     depth_valid=msg.get('depth_valid', False),
                     lock_valid=msg.get('lock_valid', False),
+                    lead_time_s=msg.get('lead_time_s', 0.0),
                 )
 
+    def _receive_telemetry(self) -> None:
+        """Keep only the latest FC telemetry message."""
+        while True:
+            result = self._telemetry_sub.receive(timeout_ms=0)
+            if result is None:
+                break
+            
+            topic, msg = result
+            if isinstance(msg, dict):
+                msg = FcStatus(
+                    connected=msg.get('connected', False),
+                    heartbeat_age_ms=msg.get('heartbeat_age_ms'),
+                    armed=msg.get('armed', False),
+                    mode=msg.get('mode', "UNKNOWN"),
+                    roll=msg.get('roll'),
+                    pitch=msg.get('pitch'),
+                    yaw=msg.get('yaw'),
+                    attitude_age_ms=msg.get('attitude_age_ms'),
+                    timestamp=msg.get('timestamp', 0.0),
+                )
+            if isinstance(msg, FcStatus):
+                self._fc_status = msg
+                self._fc_status_received = time.monotonic()
+
+    def _telemetry_fresh(self) -> bool:
+        """
+        Whether FC telemetry is fresh.
+
+        The FC heartbeat age reported by the bridge plus the time since the
+        report arrived must be within safety.telemetry_timeout_ms, so a dead
+        FC link and a dead bridge both count as lost telemetry.
+        """
+        status = self._fc_status
+        if status is None or not status.connected or status.heartbeat_age_ms is None:
+            return False
+        age_ms = status.heartbeat_age_ms + (time.monotonic() - self._fc_status_received) * 1000
+        return age_ms <= self.config.safety.telemetry_timeout_ms
+
+    @property
+    def fc_status(self) -> Optional[FcStatus]:
+        """Latest FC telemetry (armed, mode, attitude), if any was received."""
+        return self._fc_status
+
     def _compute_setpoint(self) -> Setpoint:
         """Compute safe setpoint from errors."""
         if self._last_errors is None:
@@ -195,7 +243,7 @@ class ControlNode:
             setpoint=raw_setpoint,
             lock_valid=self._last_errors.lock_valid,
             track_fresh=self._last_errors.track_valid,
-            telemetry_fresh=True  # TODO: Get from MAVLink
+            telemetry_fresh=self._telemetry_fresh()
         )
         
         return safe_setpoint
@@ -210,6 +258,8 @@ class ControlNode:
                 f"→ roll={setpoint.roll_deg:.1f}° pitch={setpoint.pitch_deg:.1f}° "
                 f"thrust={setpoint.thrust:.2f}"
             )
+        if self._frame_count % 1000 == 0:
+            logger.debug(f"Loop timing: {self._scheduler.stats().format()}")
 
 
 def main():
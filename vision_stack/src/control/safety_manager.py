@@ -74,7 +74,6 @@ class SafetyManager:
         
         # Last valid setpoint time
         self._last_valid_time: Optional[float] = None
-        self._last_telemetry_time: Optional[float] = None
         
         # Failsafe state
         self._failsafe_active = False
@@ -95,17 +94,14 @@ class SafetyManager:
             setpoint: Raw setpoint from control mapper
             lock_valid: Whether target lock is valid
             track_fresh: Whether tracking data is fresh
-            telemetry_fresh: Whether FC telemetry is fresh
+            telemetry_fresh: Whether FC telemetry is fresh (the caller applies
+                telemetry_timeout_ms; stale telemetry gates immediately)
             
         Returns:
             Safe setpoint with all constraints applied
         """
         current_time = time.time()
         
-        # Update telemetry timestamp
-        if telemetry_fresh:
-            self._last_telemetry_time = current_time
-        
         # Check validity gates
         if not self._check_gates(lock_valid, track_fresh, telemetry_fresh, current_time):
             return self._get_failsafe_setpoint()
@@ -168,13 +164,11 @@ class SafetyManager:
                     logger.warning(f"Track timeout ({time_since_valid:.0f}ms) - failsafe")
                 return False
         
-        # Check telemetry timeout
-        if not telemetry_fresh and self._last_telemetry_time is not None:
-            time_since_telemetry = (current_time - self._last_telemetry_time) * 1000
-            if time_since_telemetry > self.config.telemetry_timeout_ms:
-                if not self._failsafe_active:
-                    logger.warning(f"Telemetry timeout ({time_since_telemetry:.0f}ms) - failsafe")
-                return False
+        # FC telemetry must be fresh
+        if not telemetry_fresh:
+            if not self._failsafe_active:
+                logger.warning("Telemetry stale - entering failsafe")
+            return False
         
         return True
 
@@ -200,7 +194,6 @@ class SafetyManager:
         self._roll_slew.reset()
         self._pitch_slew.reset()
         self._last_valid_time = None
-        self._last_telemetry_time = None
         self._failsafe_active = False
         logger.info("SafetyManager reset")
 
@@ -13,6 +13,7 @@ import yaml
 
 from ..common.types import BatteryState
 from ..common.bus import ZmqPublisher, BusPorts
+from ..common.scheduler import RateScheduler
 from .gpio_reader import GpioReader, GpioConfig
 
 logger = logging.getLogger(__name__)
@@ -95,11 +96,11 @@ class Esp32GpioBridge:
 
     def _run_loop(self) -> None:
         """Main processing loop."""
-        read_period = 1.0 / self.config.read_rate_hz
+        scheduler = RateScheduler(self.config.read_rate_hz, name="esp32_gpio")
         publish_period = 1.0 / self.config.publish_rate_hz
         
         while self._running:
-            loop_start = time.time()
+            scheduler.wait()
             
             # Read GPIO
             state = self._gpio.read()
@@ -123,11 +124,6 @@ class Esp32GpioBridge:
                 self._last_publish_time = time.time()
             
             self._last_state = state
-            
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < read_period:
-                time.sleep(read_period - elapsed)
 
     def read_state(self) -> BatteryState:
         """Read current battery state (for testing)."""
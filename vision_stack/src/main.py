@@ -78,13 +78,17 @@ Examples:
     
     try:
         if args.component == "perception":
+            from .common.timeline import StartupTimeline
+            timeline = StartupTimeline("PERCEPTION")
             from .perception import PerceptionNode, load_perception_config
+            timeline.mark("package_import")
             config = load_perception_config(
                 os.path.join(args.config_dir, "camera.yaml"),
                 os.path.join(args.config_dir, "perception.yaml"),
                 os.path.join(args.config_dir, "tracker.yaml"),
+                os.path.join(args.config_dir, "modes", f"{args.mode}.yaml"),
             )
-            node = PerceptionNode(config)
+            node = PerceptionNode(config, timeline=timeline)
             node.start()
             
         elif args.component == "targeting":
@@ -92,6 +96,7 @@ Examples:
             config = load_targeting_config(
                 os.path.join(args.config_dir, "targeting.yaml"),
                 os.path.join(args.config_dir, "camera.yaml"),
+                os.path.join(args.config_dir, "modes", f"{args.mode}.yaml"),
             )
             node = TargetingNode(config)
             node.start()
@@ -166,10 +171,12 @@ def run_all_components(args):
         os.path.join(config_dir, "camera.yaml"),
         os.path.join(config_dir, "perception.yaml"),
         os.path.join(config_dir, "tracker.yaml"),
+        os.path.join(config_dir, "modes", f"{mode}.yaml"),
     )
     targeting_config = load_targeting_config(
         os.path.join(config_dir, "targeting.yaml"),
         os.path.join(config_dir, "camera.yaml"),
+        os.path.join(config_dir, "modes", f"{mode}.yaml"),
     )
     control_config = load_control_config(
         os.path.join(config_dir, "control.yaml"),
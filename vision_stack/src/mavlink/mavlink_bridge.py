@@ -18,6 +18,7 @@ import yaml
 
 from ..common.types import Setpoint, BatteryState, UserCommand
 from ..common.bus import ZmqPublisher, ZmqSubscriber, BusPorts
+from ..common.scheduler import RateScheduler
 from .offboard_session import OffboardSession, OffboardConfig
 from .user_commands import UserCommandParser
 from .custom_telemetry import CustomTelemetrySender
@@ -54,6 +55,8 @@ class MavlinkConfig:
     # Rates
     receive_rate_hz: float = 100.0  # MAVLink receive rate
     command_publish_rate_hz: float = 30.0
+    attitude_rate_hz: float = 50.0  # Requested FC ATTITUDE stream rate (0 = leave as is)
+    telemetry_publish_rate_hz: float = 10.0  # `telemetry` (FcStatus) bus rate
 
     def __post_init__(self):
         if self.offboard is None:
@@ -78,12 +81,17 @@ def load_mavlink_config(mavlink_yaml: str, mode_yaml: str) -> MavlinkConfig:
     return MavlinkConfig(
         udp_host=conn.get('host', '127.0.0.1'),
         udp_port=conn.get('port', 14551),
+        attitude_rate_hz=mav_cfg.get('streams', {}).get('attitude_rate_hz', 50.0),
+        telemetry_publish_rate_hz=mav_cfg.get('streams', {}).get('telemetry_publish_rate_hz', 10.0),
         offboard=OffboardConfig(
             setpoint_rate_hz=offboard_cfg.get('setpoint_rate_hz', 30.0),
             heartbeat_rate_hz=offboard_cfg.get('heartbeat_rate_hz', 1.0),
+            setpoint_spin_us=offboard_cfg.get('setpoint_spin_us', 0.0),
+            setpoint_catch_up=offboard_cfg.get('setpoint_catch_up', 'skip'),
         ),
         telemetry=TelemetryConfig(
             timeout_ms=safety_cfg.get('telemetry_timeout_ms', 1000.0),
+            clock_sync_window_s=mav_cfg.get('streams', {}).get('clock_sync_window_s', 10.0),
         ),
         failsafe=FailsafeConfig(
             track_lost_failsafe_ms=safety_cfg.get('track_timeout_ms', 500.0),
@@ -133,6 +141,7 @@ class MavlinkBridge:
         self._tracking_active = False
         self._current_setpoint = Setpoint.neutral()
         self._current_battery: Optional[BatteryState] = None
+        self._last_status_publish = -float("inf")
         
         logger.info("MavlinkBridge initialized")
 
@@ -161,6 +170,7 @@ class MavlinkBridge:
             # Initialize components that need connection
             self._offboard = OffboardSession(self._connection, self.config.offboard)
             self._telemetry_sender = CustomTelemetrySender(self._connection)
+            self._request_attitude_stream()
             
             return True
             
@@ -168,6 +178,21 @@ class MavlinkBridge:
             logger.error(f"Failed to connect: {e}")
             return False
 
+    def _request_attitude_stream(self) -> None:
+        """Ask the FC to stream ATTITUDE at attitude_rate_hz."""
+        if self.config.attitude_rate_hz <= 0:
+            return
+        self._connection.mav.command_long_send(
+            self._connection.target_system,
+            self._connection.target_component,
+            mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL,
+            0,  # confirmation
+            mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE,  # param1: message ID
+            1e6 / self.config.attitude_rate_hz,  # param2: interval (us)
+            0, 0, 0, 0, 0  # params 3-7 unused
+        )
+        logger.info(f"Requested ATTITUDE at {self.config.attitude_rate_hz:.0f} Hz")
+
     def start(self) -> None:
         """Start MAVLink bridge."""
         if not self.connect():
@@ -200,10 +225,10 @@ class MavlinkBridge:
 
     def _run_loop(self) -> None:
         """Main processing loop."""
-        receive_period = 1.0 / self.config.receive_rate_hz
+        scheduler = RateScheduler(self.config.receive_rate_hz, name="mavlink_bridge")
         
         while self._running:
-            loop_start = time.time()
+            scheduler.wait()
             
             # Receive MAVLink messages
             self._receive_mavlink()
@@ -217,17 +242,15 @@ class MavlinkBridge:
             # Send custom telemetry
             self._send_telemetry()
             
+            # FC link summary for control
+            self._publish_status()
+            
             # Update offboard setpoint
             if self._offboard and self._offboard.is_active:
                 if self._failsafe.should_command_neutral:
                     self._offboard.update_setpoint(Setpoint.neutral())
                 else:
                     self._offboard.update_setpoint(self._current_setpoint)
-            
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < receive_period:
-                time.sleep(receive_period - elapsed)
 
     def _receive_mavlink(self) -> None:
         """Receive and process MAVLink messages."""
@@ -246,6 +269,9 @@ class MavlinkBridge:
             
             # Process telemetry
             self._telemetry_receiver.process_message(msg)
+            if msg.get_type() == 'ATTITUDE':
+                # Every sample: targeting matches attitude to frame capture times
+                self._publisher.publish("attitude", self._telemetry_receiver.attitude)
             
             # Process user commands
             cmd = self._cmd_parser.parse(msg)
@@ -309,6 +335,14 @@ class MavlinkBridge:
             lock_valid=self._tracking_active
         )
 
+    def _publish_status(self) -> None:
+        """Publish the FC link summary on `telemetry`, rate-limited."""
+        now = time.monotonic()
+        if now - self._last_status_publish < 1.0 / self.config.telemetry_publish_rate_hz:
+            return
+        self._last_status_publish = now
+        self._publisher.publish("telemetry", self._telemetry_receiver.status())
+
     def _send_telemetry(self) -> None:
         """Send custom telemetry to QGC."""
         if not self._telemetry_sender:
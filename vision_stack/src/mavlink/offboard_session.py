@@ -11,6 +11,7 @@ from dataclasses import dataclass
 from typing import Optional, Callable
 
 from ..common.types import Setpoint
+from ..common.scheduler import RateScheduler, JitterStats
 from .setpoints_attitude import send_attitude_target
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,9 @@ class OffboardConfig:
     """Offboard session configuration."""
     setpoint_rate_hz: float = 30.0
     heartbeat_rate_hz: float = 1.0
+    # Busy-wait the last part of each setpoint period for sub-ms jitter (0 = off, costs CPU)
+    setpoint_spin_us: float = 0.0
+    setpoint_catch_up: str = "skip"  # "skip" or "burst" after an overrun
     arm_timeout_s: float = 5.0
     mode_timeout_s: float = 5.0
     system_id: int = 255  # Companion computer ID
@@ -74,6 +78,7 @@ class OffboardSession:
         self._stream_thread: Optional[threading.Thread] = None
         self._current_setpoint = Setpoint.neutral()
         self._setpoint_lock = threading.Lock()
+        self._scheduler: Optional[RateScheduler] = None
         
         logger.info("OffboardSession initialized")
 
@@ -164,12 +169,18 @@ class OffboardSession:
 
     def _streaming_loop(self) -> None:
         """Background thread for continuous setpoint streaming."""
-        setpoint_period = 1.0 / self.config.setpoint_rate_hz
+        scheduler = RateScheduler(
+            self.config.setpoint_rate_hz,
+            name="offboard_setpoints",
+            catch_up=self.config.setpoint_catch_up,
+            spin_us=self.config.setpoint_spin_us
+        )
+        self._scheduler = scheduler
         heartbeat_period = 1.0 / self.config.heartbeat_rate_hz
-        last_heartbeat = 0.0
+        last_heartbeat = -float("inf")
         
         while self._streaming:
-            loop_start = time.time()
+            scheduler.wait()
             
             # Get current setpoint
             with self._setpoint_lock:
@@ -188,14 +199,17 @@ class OffboardSession:
                     logger.error(f"Failed to send setpoint: {e}")
             
             # Send heartbeat periodically
-            if time.time() - last_heartbeat >= heartbeat_period:
+            if time.monotonic() - last_heartbeat >= heartbeat_period:
                 self._send_heartbeat()
-                last_heartbeat = time.time()
-            
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < setpoint_period:
-                time.sleep(setpoint_period - elapsed)
+                last_heartbeat = time.monotonic()
+        
+        logger.info(f"Setpoint stream {scheduler.stats().format()}")
+
+    @property
+    def stream_stats(self) -> Optional[JitterStats]:
+        """Setpoint stream timing statistics (None before streaming starts)."""
+        scheduler = self._scheduler
+        return scheduler.stats() if scheduler is not None else None
 
     def _send_heartbeat(self) -> None:
         """Send heartbeat as companion computer."""
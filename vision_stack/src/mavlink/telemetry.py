@@ -6,10 +6,11 @@ Receives and processes telemetry from the flight controller.
 
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Callable
+from typing import Deque, Optional, Callable, Tuple
 
-from ..common.types import Telemetry
+from ..common.types import Attitude, FcStatus, Telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,60 @@ class TelemetryConfig:
     """Telemetry receiver configuration."""
     timeout_ms: float = 1000.0  # Telemetry timeout
     heartbeat_timeout_ms: float = 3000.0  # FC heartbeat timeout
+    clock_sync_window_s: float = 10.0  # FC boot clock -> host offset estimation window
+
+
+class BootClockOffset:
+    """
+    Maps FC time_boot_ms to host time.
+
+    Each message gives offset = receive_time - time_boot_ms / 1000, which
+    overestimates the true offset by the link/scheduling delay. The
+    minimum over a sliding window is the least-delayed sample; the window
+    lets the estimate follow clock drift between FC and host. An FC reboot
+    (time_boot_ms going backwards) restarts the estimate.
+    """
+
+    def __init__(self, window_s: float = 10.0):
+        """
+        Initialize estimator.
+
+        Args:
+            window_s: Sliding window for the minimum (seconds of host time)
+        """
+        self.window_s = window_s
+        # (receive_time, offset) with increasing offsets: the front is the minimum
+        self._samples: Deque[Tuple[float, float]] = deque()
+        self._last_boot_ms: Optional[int] = None
+
+    def update(self, time_boot_ms: int, receive_time: float) -> float:
+        """
+        Add a sample and convert its FC time to host time.
+
+        Args:
+            time_boot_ms: FC time since boot from the message
+            receive_time: Host time.time() at receipt
+
+        Returns:
+            Host time corresponding to time_boot_ms
+        """
+        if self._last_boot_ms is not None and time_boot_ms < self._last_boot_ms:
+            logger.warning("FC time_boot_ms went backwards (reboot?); clock offset reset")
+            self._samples.clear()
+        self._last_boot_ms = time_boot_ms
+
+        offset = receive_time - time_boot_ms / 1000.0
+        while self._samples and self._samples[-1][1] >= offset:
+            self._samples.pop()
+        self._samples.append((receive_time, offset))
+        while self._samples[0][0] < receive_time - self.window_s:
+            self._samples.popleft()
+        return time_boot_ms / 1000.0 + self._samples[0][1]
+
+    @property
+    def offset(self) -> Optional[float]:
+        """Current host - FC boot time offset (s), None before the first sample."""
+        return self._samples[0][1] if self._samples else None
 
 
 class TelemetryReceiver:
@@ -52,7 +107,9 @@ class TelemetryReceiver:
         # State
         self._last_heartbeat_time: Optional[float] = None
         self._telemetry = Telemetry()
+        self._attitude: Optional[Attitude] = None
         self._connected = False
+        self._boot_clock = BootClockOffset(config.clock_sync_window_s)
         
         logger.info("TelemetryReceiver initialized")
 
@@ -79,6 +136,8 @@ class TelemetryReceiver:
             self._process_gps(msg)
         elif msg_type == 'EXTENDED_SYS_STATE':
             self._process_extended_state(msg)
+        elif msg_type == 'ATTITUDE':
+            self._process_attitude(msg, current_time)
 
     def _process_heartbeat(self, msg, current_time: float) -> None:
         """Process HEARTBEAT message."""
@@ -137,6 +196,18 @@ class TelemetryReceiver:
         """Process GPS_RAW_INT message."""
         self._telemetry.gps_fix = msg.fix_type
 
+    def _process_attitude(self, msg, current_time: float) -> None:
+        """Process ATTITUDE message (stamped with its FC time in host time)."""
+        self._attitude = Attitude(
+            roll=msg.roll,
+            pitch=msg.pitch,
+            yaw=msg.yaw,
+            rollspeed=msg.rollspeed,
+            pitchspeed=msg.pitchspeed,
+            yawspeed=msg.yawspeed,
+            timestamp=self._boot_clock.update(msg.time_boot_ms, current_time)
+        )
+
     def _process_extended_state(self, msg) -> None:
         """Process EXTENDED_SYS_STATE message."""
         # Additional state info if needed
@@ -159,6 +230,27 @@ class TelemetryReceiver:
         """Get current telemetry state."""
         return self._telemetry
 
+    def status(self) -> FcStatus:
+        """Compact link/attitude summary for the bus."""
+        now = time.time()
+        attitude = self._attitude
+        return FcStatus(
+            connected=self.is_connected,
+            heartbeat_age_ms=self.time_since_heartbeat_ms,
+            armed=self._telemetry.armed,
+            mode=self._telemetry.mode,
+            roll=attitude.roll if attitude else None,
+            pitch=attitude.pitch if attitude else None,
+            yaw=attitude.yaw if attitude else None,
+            attitude_age_ms=(now - attitude.timestamp) * 1000 if attitude else None,
+            timestamp=now
+        )
+
+    @property
+    def attitude(self) -> Optional[Attitude]:
+        """Latest FC attitude, if any was received."""
+        return self._attitude
+
     @property
     def is_connected(self) -> bool:
         """Check if connected to FC."""
@@ -1,12 +1,34 @@
 """OAK-D camera module."""
 
-from .oak_bridge import OakBridge, OakConfig
-from .depth_query import query_depth_point, query_depth_roi_median, is_depth_in_range
+from .oak_bridge import OakBridge, OakConfig, RgbFrame
+from .calibration import (
+    RgbCalibration,
+    read_device_calibration,
+    save_calibration,
+    load_calibration,
+)
+from .depth_query import (
+    query_depth_point,
+    query_depth_roi_median,
+    query_depth_roi_percentile,
+    query_depth_rois_percentile,
+    is_depth_in_range,
+)
+from .depth_shm import SharedDepthReader, SharedDepthWriter
 
 __all__ = [
     "OakBridge",
     "OakConfig",
+    "RgbFrame",
+    "RgbCalibration",
+    "read_device_calibration",
+    "save_calibration",
+    "load_calibration",
     "query_depth_point",
     "query_depth_roi_median",
+    "query_depth_roi_percentile",
+    "query_depth_rois_percentile",
+    "SharedDepthReader",
+    "SharedDepthWriter",
     "is_depth_in_range",
 ]
@@ -0,0 +1,88 @@
+"""
+RGB camera calibration from the OAK device EEPROM.
+
+The camera owner reads the factory calibration when the device opens and
+writes it to a small JSON file, so processes without the device (targeting)
+use the same intrinsics and distortion coefficients.
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CALIBRATION_FILE = os.path.join("~", ".cache", "drone_vision", "rgb_calibration.json")
+
+
+@dataclass
+class RgbCalibration:
+    """RGB intrinsics and distortion for one output resolution."""
+    serial: str
+    width: int
+    height: int
+    fx: float
+    fy: float
+    cx: float
+    cy: float
+    distortion: List[float] = field(default_factory=list)  # OpenCV order (k1, k2, p1, p2, k3, ...)
+
+
+def read_device_calibration(device, width: int, height: int) -> RgbCalibration:
+    """
+    Read RGB calibration scaled to an output resolution.
+
+    Args:
+        device: Open dai.Device
+        width, height: RGB output size the intrinsics refer to
+
+    Returns:
+        RgbCalibration
+    """
+    import depthai as dai
+
+    calib = device.readCalibration()
+    matrix = calib.getCameraIntrinsics(dai.CameraBoardSocket.RGB, width, height)
+    distortion = calib.getDistortionCoefficients(dai.CameraBoardSocket.RGB)
+    return RgbCalibration(
+        serial=device.getMxId(),
+        width=width,
+        height=height,
+        fx=float(matrix[0][0]),
+        fy=float(matrix[1][1]),
+        cx=float(matrix[0][2]),
+        cy=float(matrix[1][2]),
+        # Trailing zeros (unused higher-order terms) do not change the model
+        distortion=[float(c) for c in distortion[:8]]
+    )
+
+
+def save_calibration(calibration: RgbCalibration, path: str = DEFAULT_CALIBRATION_FILE) -> None:
+    """Write calibration to a JSON file (atomically)."""
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(asdict(calibration), f, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved RGB calibration for {calibration.serial} to {path}")
+
+
+def load_calibration(path: str = DEFAULT_CALIBRATION_FILE) -> Optional[RgbCalibration]:
+    """
+    Read a calibration file written by save_calibration.
+
+    Returns:
+        RgbCalibration, or None if the file is missing or unreadable
+    """
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return RgbCalibration(**json.load(f))
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable calibration file {path}: {e}")
+        return None
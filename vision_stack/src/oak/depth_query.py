@@ -67,6 +67,34 @@ def query_depth_roi_median(
     Returns:
         Median depth in meters, or None if invalid
     """
+    return query_depth_roi_percentile(depth_frame, x1, y1, x2, y2, rgb_size, depth_size, 50.0)
+
+
+def query_depth_roi_percentile(
+    depth_frame: np.ndarray,
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+    rgb_size: Tuple[int, int],
+    depth_size: Tuple[int, int],
+    percentile: float = 50.0,
+    copy: bool = False
+) -> Optional[float]:
+    """
+    Query a depth percentile over a region of interest.
+    
+    Args:
+        depth_frame: Depth image (uint16, mm)
+        x1, y1, x2, y2: ROI in RGB coordinates
+        rgb_size: (width, height) of RGB frame
+        depth_size: (width, height) of depth frame
+        percentile: Percentile of valid depths (50 = median)
+        copy: Copy the ROI before reducing (frame may change concurrently)
+        
+    Returns:
+        Depth in meters, or None if invalid
+    """
     if depth_frame is None:
         return None
 
@@ -83,12 +111,80 @@ def query_depth_roi_median(
         return None
 
     roi = depth_frame[d_y1:d_y2, d_x1:d_x2]
+    if copy:
+        roi = roi.copy()
     valid_depths = roi[roi > 0]
     
     if len(valid_depths) == 0:
         return None
 
-    return float(np.median(valid_depths)) / 1000.0
+    return float(np.percentile(valid_depths, percentile)) / 1000.0
+
+
+def query_depth_rois_percentile(
+    depth_frame: np.ndarray,
+    bboxes: np.ndarray,
+    rgb_size: Tuple[int, int],
+    depth_size: Tuple[int, int],
+    percentile: float = 50.0
+) -> np.ndarray:
+    """
+    Query a depth percentile over many regions of interest at once.
+
+    The valid pixels of all ROIs are gathered into one array and every
+    percentile is taken from a single sort (same linear interpolation as
+    np.percentile), instead of one reduction per ROI.
+
+    Args:
+        depth_frame: Depth image (uint16, mm)
+        bboxes: (N, 4) ROIs [x1, y1, x2, y2] in RGB coordinates
+        rgb_size: (width, height) of RGB frame
+        depth_size: (width, height) of depth frame
+        percentile: Percentile of valid depths (50 = median)
+
+    Returns:
+        (N,) depths in meters, NaN where an ROI has no valid pixels
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    depths = np.full(len(bboxes), np.nan)
+    if depth_frame is None or len(bboxes) == 0:
+        return depths
+
+    # Scale all ROIs to depth coordinates
+    scale = np.array([depth_size[0] / rgb_size[0], depth_size[1] / rgb_size[1]] * 2)
+    rois = (bboxes * scale).astype(int)
+    rois[:, 0::2] = np.clip(rois[:, 0::2], 0, depth_size[0])
+    rois[:, 1::2] = np.clip(rois[:, 1::2], 0, depth_size[1])
+
+    values = []
+    labels = []
+    for i, (x1, y1, x2, y2) in enumerate(rois.tolist()):
+        if x2 <= x1 or y2 <= y1:
+            continue
+        roi = depth_frame[y1:y2, x1:x2]
+        valid = roi[roi > 0]
+        values.append(valid)
+        labels.append(np.full(len(valid), i))
+    if not values:
+        return depths
+    values = np.concatenate(values)
+    labels = np.concatenate(labels)
+    if len(values) == 0:
+        return depths
+
+    # Sort by (ROI, depth): each ROI's valid depths become a sorted run
+    order = np.lexsort((values, labels))
+    values = values[order].astype(np.float64)
+    counts = np.bincount(labels, minlength=len(bboxes))
+    has = counts > 0
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has]
+    position = (counts[has] - 1) * (percentile / 100.0)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, counts[has] - 1)
+    frac = position - lower
+    low = values[starts + lower]
+    depths[has] = (low + (values[starts + upper] - low) * frac) / 1000.0
+    return depths
 
 
 def is_depth_in_range(
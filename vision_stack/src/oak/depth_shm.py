@@ -0,0 +1,222 @@
+"""
+Shared-memory depth frame for processes that do not own the camera.
+
+The camera owner (OakBridge) writes every depth frame into a named
+shared-memory block; targeting attaches to it and computes the ROI
+percentile depth of the locked bbox locally. Only the ROI is copied and
+nothing crosses a socket, so a query costs well under a millisecond.
+
+Layout: a 32-byte header [seq: int64, timestamp: float64, height: int32,
+width: int32, pad] followed by the uint16 depth frame (mm). The writer
+makes seq odd while it writes (seqlock); readers retry if seq was odd or
+changed during their copy.
+"""
+
+import logging
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from .depth_query import query_depth_roi_percentile, query_depth_rois_percentile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHM_NAME = "drone_vision_depth"
+HEADER_SIZE = 32
+
+# Seqlock read attempts, and the pause before each retry (a depth frame
+# copy takes well under a millisecond, so the writer is done by then)
+READ_ATTEMPTS = 4
+RETRY_BACKOFF_S = (0.0001, 0.0002, 0.0005)
+
+# Blocks created by a writer in this process. The resource tracker
+# registration belongs to the writer, so a reader here must not drop it.
+_created_names = set()
+
+T = TypeVar("T")
+
+
+def _header(buf) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    seq = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=0)
+    timestamp = np.ndarray((1,), dtype=np.float64, buffer=buf, offset=8)
+    shape = np.ndarray((2,), dtype=np.int32, buffer=buf, offset=16)
+    return seq, timestamp, shape
+
+
+class SharedDepthWriter:
+    """Publishes depth frames into shared memory (camera owner side)."""
+
+    def __init__(self, width: int, height: int, name: str = DEFAULT_SHM_NAME):
+        """
+        Create (or replace) the shared-memory block.
+
+        Args:
+            width, height: Maximum depth frame size
+            name: Shared-memory block name
+        """
+        size = HEADER_SIZE + width * height * 2
+        try:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created_names.add(self._shm._name)
+        self._seq, self._timestamp, self._shape = _header(self._shm.buf)
+        self._seq[0] = 0
+        self._capacity = width * height
+        self.name = name
+        logger.info(f"Shared depth frame '{name}' created ({width}x{height})")
+
+    def write(self, depth_frame: np.ndarray, timestamp: Optional[float] = None) -> None:
+        """
+        Publish a depth frame.
+
+        Args:
+            depth_frame: (H, W) uint16 depth in mm
+            timestamp: Frame time (default: time.time())
+        """
+        height, width = depth_frame.shape[:2]
+        if height * width > self._capacity:
+            logger.warning(f"Depth frame {width}x{height} exceeds shared block, dropped")
+            return
+        pixels = np.ndarray((height, width), dtype=np.uint16,
+                            buffer=self._shm.buf, offset=HEADER_SIZE)
+        self._seq[0] += 1  # odd: write in progress
+        pixels[:] = depth_frame
+        self._shape[:] = (height, width)
+        self._timestamp[0] = time.time() if timestamp is None else timestamp
+        self._seq[0] += 1  # even: consistent
+
+    def close(self) -> None:
+        """Release and remove the shared-memory block."""
+        del self._seq, self._timestamp, self._shape
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _created_names.discard(self._shm._name)
+
+
+class SharedDepthReader:
+    """
+    ROI depth queries against the shared depth frame (targeting side).
+
+    Offers the same query_depth_roi() / query_depth_rois() as OakBridge, so TargetingNode can
+    use either. Attaches lazily, so it may be created before the camera
+    owner is running.
+    """
+
+    def __init__(
+        self,
+        rgb_size: Tuple[int, int],
+        name: str = DEFAULT_SHM_NAME,
+        max_age_s: float = 0.2,
+        retry_interval_s: float = 1.0
+    ):
+        """
+        Initialize reader.
+
+        Args:
+            rgb_size: (width, height) of the RGB frame ROIs refer to
+            name: Shared-memory block name
+            max_age_s: Treat older depth frames as unavailable
+            retry_interval_s: Min seconds between attach attempts
+        """
+        self.rgb_size = rgb_size
+        self.name = name
+        self.max_age_s = max_age_s
+        self.retry_interval_s = retry_interval_s
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._last_attach = -float("inf")
+
+    def query_depth_roi(
+        self,
+        x1: int,
+        y1: int,
+        x2: int,
+        y2: int,
+        percentile: float = 50.0
+    ) -> Optional[float]:
+        """
+        Percentile depth over an ROI of the latest depth frame.
+
+        Args:
+            x1, y1, x2, y2: ROI in RGB frame coordinates
+            percentile: Percentile of valid depths (50 = median)
+
+        Returns:
+            Depth in meters, or None if no fresh frame / no valid pixels
+        """
+        return self._read(lambda frame, depth_size: query_depth_roi_percentile(
+            frame, x1, y1, x2, y2, self.rgb_size, depth_size, percentile, copy=True
+        ))
+
+    def query_depth_rois(self, bboxes: np.ndarray, percentile: float = 50.0) -> np.ndarray:
+        """
+        Percentile depth over many ROIs of the same depth frame.
+
+        Args:
+            bboxes: (N, 4) ROIs [x1, y1, x2, y2] in RGB frame coordinates
+            percentile: Percentile of valid depths (50 = median)
+
+        Returns:
+            (N,) depths in meters, NaN where invalid or without a fresh frame
+        """
+        depths = self._read(lambda frame, depth_size: query_depth_rois_percentile(
+            frame, bboxes, self.rgb_size, depth_size, percentile
+        ))
+        return np.full(len(bboxes), np.nan) if depths is None else depths
+
+    def _read(self, query: Callable[[np.ndarray, Tuple[int, int]], T]) -> Optional[T]:
+        """Run query(frame, (width, height)) on a consistent, fresh depth frame."""
+        if not self._attach():
+            return None
+
+        seq, timestamp, shape = _header(self._shm.buf)
+        for attempt in range(READ_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_BACKOFF_S[min(attempt, len(RETRY_BACKOFF_S)) - 1])
+            start_seq = int(seq[0])
+            if start_seq % 2:
+                continue
+            if time.time() - float(timestamp[0]) > self.max_age_s or start_seq == 0:
+                return None
+            height, width = (int(v) for v in shape)
+            frame = np.ndarray((height, width), dtype=np.uint16,
+                               buffer=self._shm.buf, offset=HEADER_SIZE)
+            result = query(frame, (width, height))
+            if int(seq[0]) == start_seq:
+                return result
+        return None
+
+    def close(self) -> None:
+        """Detach from the shared-memory block."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def _attach(self) -> bool:
+        if self._shm is not None:
+            return True
+        now = time.monotonic()
+        if now - self._last_attach < self.retry_interval_s:
+            return False
+        self._last_attach = now
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        # Readers must not unlink the owner's block when they exit. A writer
+        # in this same process owns the (shared) tracker entry: leave it.
+        if self._shm._name not in _created_names:
+            try:
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            except Exception:
+                pass
+        logger.info(f"Attached to shared depth frame '{self.name}'")
+        return True
@@ -7,12 +7,16 @@ Provides RGB frames to perception and depth queries to targeting.
 import logging
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import threading
 from queue import Queue
 
 import numpy as np
 
+from .calibration import RgbCalibration, read_device_calibration, save_calibration
+from .depth_query import query_depth_rois_percentile
+from .depth_shm import SharedDepthWriter
+
 logger = logging.getLogger(__name__)
 
 # Try to import DepthAI, but allow running without it for testing
@@ -33,11 +37,26 @@ class OakConfig:
     depth_width: int = 640
     depth_height: int = 400
     depth_enabled: bool = False  # Disable depth by default - uses too much bandwidth
+    # Publish depth frames to this shared-memory block for other processes
+    depth_shared_memory: Optional[str] = None
     # Camera intrinsics (calibrate for actual camera)
     fx: float = 1000.0
     fy: float = 1000.0
     cx: float = 640.0  # Updated for 1280 width
     cy: float = 360.0  # Updated for 720 height
+    distortion: Optional[List[float]] = None  # OpenCV coefficients (k1, k2, p1, p2, k3)
+    # Use the device's factory RGB calibration instead of the values above,
+    # and write it here for processes without the device (None = don't write)
+    use_device_calibration: bool = True
+    calibration_file: Optional[str] = None
+
+
+@dataclass
+class RgbFrame:
+    """An RGB frame with its sequence number and capture time."""
+    image: np.ndarray  # BGR
+    sequence: int  # Increments with every new frame from the camera
+    timestamp: float  # Capture time on the host wall clock (time.time())
 
 
 class OakBridge:
@@ -48,6 +67,7 @@ class OakBridge:
     - RGB frames at configured FPS
     - Depth queries at arbitrary pixel locations
     - ROI depth median for more robust measurements
+    - Depth frames in shared memory for targeting in another process
     """
 
     def __init__(self, config: OakConfig):
@@ -60,11 +80,15 @@ class OakBridge:
         self.config = config
         self._running = False
         self._rgb_frame: Optional[np.ndarray] = None
+        self._rgb_sequence = 0
+        self._rgb_timestamp = 0.0
         self._depth_frame: Optional[np.ndarray] = None
         self._frame_lock = threading.Lock()
         self._frame_queue: Queue = Queue(maxsize=2)
         self._pipeline: Optional["dai.Pipeline"] = None
         self._device: Optional["dai.Device"] = None
+        self._depth_writer: Optional[SharedDepthWriter] = None
+        self._calibration: Optional[RgbCalibration] = None
         
         logger.info(f"OakBridge initialized: {config.rgb_width}x{config.rgb_height}@{config.rgb_fps}fps")
 
@@ -117,9 +141,17 @@ class OakBridge:
         if self._running:
             return
 
+        if self.config.depth_enabled and self.config.depth_shared_memory:
+            self._depth_writer = SharedDepthWriter(
+                self.config.depth_width, self.config.depth_height,
+                self.config.depth_shared_memory
+            )
+
         if DEPTHAI_AVAILABLE:
             self._pipeline = self._create_pipeline()
             self._device = dai.Device(self._pipeline)
+            if self.config.use_device_calibration:
+                self._load_device_calibration()
             self._running = True
             
             # Start capture thread
@@ -136,8 +168,33 @@ class OakBridge:
         if self._device:
             self._device.close()
             self._device = None
+        if self._depth_writer:
+            self._depth_writer.close()
+            self._depth_writer = None
         logger.info("OAK-D pipeline stopped")
 
+    def _load_device_calibration(self) -> None:
+        """Replace configured intrinsics with the device EEPROM calibration."""
+        try:
+            calib = read_device_calibration(
+                self._device, self.config.rgb_width, self.config.rgb_height
+            )
+        except Exception as e:
+            logger.warning(f"Could not read device calibration, using configured intrinsics: {e}")
+            return
+
+        self._calibration = calib
+        self.config.fx, self.config.fy = calib.fx, calib.fy
+        self.config.cx, self.config.cy = calib.cx, calib.cy
+        self.config.distortion = calib.distortion
+        logger.info(f"Using device calibration ({calib.serial}): "
+                    f"fx={calib.fx:.1f} fy={calib.fy:.1f} cx={calib.cx:.1f} cy={calib.cy:.1f}")
+        if self.config.calibration_file:
+            try:
+                save_calibration(calib, self.config.calibration_file)
+            except OSError as e:
+                logger.warning(f"Could not write calibration file: {e}")
+
     def _capture_loop(self) -> None:
         """Continuously capture frames from OAK-D."""
         if not self._device:
@@ -153,15 +210,22 @@ class OakBridge:
                 # Get RGB frame
                 rgb_data = rgb_queue.tryGet()
                 if rgb_data:
+                    frame = rgb_data.getCvFrame()
+                    timestamp = self._capture_time(rgb_data)
                     with self._frame_lock:
-                        self._rgb_frame = rgb_data.getCvFrame()
+                        self._rgb_frame = frame
+                        self._rgb_sequence += 1
+                        self._rgb_timestamp = timestamp
 
                 # Get depth frame
                 if depth_queue:
                     depth_data = depth_queue.tryGet()
                     if depth_data:
+                        depth_frame = depth_data.getFrame()
                         with self._frame_lock:
-                            self._depth_frame = depth_data.getFrame()
+                            self._depth_frame = depth_frame
+                        if self._depth_writer:
+                            self._depth_writer.write(depth_frame)
 
                 time.sleep(0.001)  # Small sleep to prevent busy-waiting
             except Exception as e:
@@ -185,6 +249,45 @@ class OakBridge:
         
         return None
 
+    def get_rgb_frame(self) -> Optional[RgbFrame]:
+        """
+        Get the latest RGB frame with its sequence number and capture time.
+        
+        Compare `sequence` with the previous call to skip frames already
+        processed.
+        
+        Returns:
+            RgbFrame or None if no frame available
+        """
+        with self._frame_lock:
+            if self._rgb_frame is not None:
+                return RgbFrame(self._rgb_frame.copy(), self._rgb_sequence, self._rgb_timestamp)
+            
+            # Stub mode: a new black frame on every call
+            if not DEPTHAI_AVAILABLE and self._running:
+                self._rgb_sequence += 1
+                return RgbFrame(
+                    np.zeros((self.config.rgb_height, self.config.rgb_width, 3), dtype=np.uint8),
+                    self._rgb_sequence,
+                    time.time()
+                )
+        
+        return None
+
+    @staticmethod
+    def _capture_time(img_frame) -> float:
+        """
+        Host wall-clock capture time of a DepthAI frame.
+        
+        Device timestamps are synced to the host monotonic clock
+        (dai.Clock); the frame's age on that clock is subtracted from now.
+        """
+        try:
+            age = (dai.Clock.now() - img_frame.getTimestamp()).total_seconds()
+        except Exception:
+            return time.time()
+        return time.time() - max(age, 0.0)
+
     def get_depth_frame(self) -> Optional[np.ndarray]:
         """
         Get the latest depth frame.
@@ -283,11 +386,38 @@ class OakBridge:
         depth_mm = np.percentile(valid_depths, percentile)
         return depth_mm / 1000.0
 
+    def query_depth_rois(self, bboxes: np.ndarray, percentile: float = 50.0) -> np.ndarray:
+        """
+        Query depth over many ROIs of the same depth frame.
+
+        The frame is read once under the frame lock (no full-frame copy;
+        only the valid ROI pixels are gathered).
+
+        Args:
+            bboxes: (N, 4) ROIs [x1, y1, x2, y2] in RGB frame coordinates
+            percentile: Percentile to use (50 = median)
+
+        Returns:
+            (N,) depths in meters, NaN where invalid
+        """
+        with self._frame_lock:
+            return query_depth_rois_percentile(
+                self._depth_frame, bboxes,
+                (self.config.rgb_width, self.config.rgb_height),
+                (self.config.depth_width, self.config.depth_height),
+                percentile
+            )
+
     @property
     def intrinsics(self) -> Tuple[float, float, float, float]:
         """Return camera intrinsics (fx, fy, cx, cy)."""
         return (self.config.fx, self.config.fy, self.config.cx, self.config.cy)
 
+    @property
+    def calibration(self) -> Optional[RgbCalibration]:
+        """Device RGB calibration, if it was read at start."""
+        return self._calibration
+
     @property
     def is_running(self) -> bool:
         return self._running
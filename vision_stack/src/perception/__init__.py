@@ -1,7 +1,7 @@
 """Perception module - detection and tracking."""
 
-from .detector import Detector, YoloDetector, DetectorConfig, StubDetector
-from .tracker import Tracker, SimpleIOUTracker, ByteTrackTracker, TrackerConfig
+from .detector import Detector, YoloDetector, DetectorConfig, StubDetector, create_detector
+from .tracker import Tracker, SimpleIOUTracker, ByteTrackTracker, TrackerConfig, TrackArrays
 from .perception_node import PerceptionNode, PerceptionConfig, load_perception_config
 
 __all__ = [
@@ -9,11 +9,30 @@ __all__ = [
     "YoloDetector",
     "DetectorConfig",
     "StubDetector",
+    "OnnxDetector",
+    "QuantizedOnnxDetector",
+    "create_detector",
     "Tracker",
     "SimpleIOUTracker",
     "ByteTrackTracker",
     "TrackerConfig",
+    "TrackArrays",
     "PerceptionNode",
     "PerceptionConfig",
     "load_perception_config",
 ]
+
+# ONNX detectors import onnxruntime; resolve them on first access so that
+# importing the package does not pay for backends that are not configured.
+_LAZY_EXPORTS = {
+    "OnnxDetector": ".onnx_detector",
+    "QuantizedOnnxDetector": ".quantization",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
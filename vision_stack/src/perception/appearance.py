@@ -0,0 +1,68 @@
+"""
+Track appearance signatures.
+
+A coarse hue/saturation histogram of each track's bbox, attached to the
+published tracks so targeting can recognize the locked target again
+after the tracker reassigns its ID (occlusion, missed detections).
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+import cv2
+import numpy as np
+
+from ..common.types import Track
+
+
+@dataclass
+class AppearanceConfig:
+    """Appearance signature configuration."""
+    enabled: bool = False
+    hue_bins: int = 8
+    sat_bins: int = 4
+    max_side: int = 32  # Crops are downscaled to at most this side first
+
+
+def color_histogram(
+    frame: np.ndarray,
+    bbox,
+    hue_bins: int = 8,
+    sat_bins: int = 4,
+    max_side: int = 32
+) -> List[float]:
+    """
+    Normalized hue/saturation histogram of a bbox crop.
+
+    Args:
+        frame: BGR frame
+        bbox: BoundingBox in frame pixels
+        hue_bins, sat_bins: Histogram resolution
+        max_side: Downscale the crop to at most this side before binning
+
+    Returns:
+        hue_bins * sat_bins values summing to 1 (empty list for empty crops)
+    """
+    height, width = frame.shape[:2]
+    x1, y1 = max(0, int(bbox.x1)), max(0, int(bbox.y1))
+    x2, y2 = min(width, int(bbox.x2)), min(height, int(bbox.y2))
+    if x2 <= x1 or y2 <= y1:
+        return []
+
+    crop = frame[y1:y2, x1:x2]
+    scale = max_side / max(crop.shape[:2])
+    if scale < 1.0:
+        size = (max(1, round(crop.shape[1] * scale)), max(1, round(crop.shape[0] * scale)))
+        crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
+    hist = cv2.calcHist([hsv], [0, 1], None, [hue_bins, sat_bins], [0, 180, 0, 256]).ravel()
+    total = hist.sum()
+    return np.round(hist / total, 4).tolist() if total > 0 else []
+
+
+def attach_appearance(tracks: List[Track], frame: np.ndarray, config: AppearanceConfig) -> None:
+    """Set Track.appearance on each track from its bbox in frame (in place)."""
+    for track in tracks:
+        track.appearance = color_histogram(
+            frame, track.bbox, config.hue_bins, config.sat_bins, config.max_side
+        ) or None
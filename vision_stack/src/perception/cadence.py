@@ -0,0 +1,152 @@
+"""
+Adaptive detection cadence.
+
+Runs the detector every N frames and lets the tracker's motion model
+carry tracks in between. Detection is forced early when the scene
+changes (frame difference) or the tracker's predictions grow uncertain,
+and N is raised automatically when inference is too slow to sustain
+target_fps.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class CadenceConfig:
+    """Detection cadence configuration."""
+    enabled: bool = False
+    min_interval: int = 1  # Detect at least every N frames (floor for auto-adjust)
+    max_interval: int = 10  # Never predict more than N-1 frames in a row
+    frame_diff_threshold: float = 12.0  # Mean abs gray-level change forcing detection
+    uncertainty_threshold: float = 0.5  # Tracker uncertainty forcing detection
+    diff_width: int = 80  # Width of the downscaled frame used for differencing
+    timing_alpha: float = 0.2  # EMA weight for inference/prediction timing
+
+
+class DetectionCadence:
+    """
+    Decides per frame whether to run the detector or predict tracks.
+
+    Usage:
+        if cadence.should_detect(frame, tracker.uncertainty):
+            ... detect + tracker.update ...
+            cadence.record_detection(elapsed_s, frame)
+        else:
+            ... tracker.predict ...
+            cadence.record_prediction(elapsed_s)
+    """
+
+    def __init__(self, config: CadenceConfig, target_fps: float):
+        """
+        Initialize cadence controller.
+
+        Args:
+            config: Cadence configuration
+            target_fps: Published track rate to sustain
+        """
+        self.config = config
+        self.target_period = 1.0 / target_fps
+        self._interval = max(1, config.min_interval)
+        self._frames_since_detect: Optional[int] = None
+        self._reference: Optional[np.ndarray] = None
+        self._detect_time: Optional[float] = None
+        self._predict_time: Optional[float] = None
+
+    def should_detect(self, frame: np.ndarray, uncertainty: float = 0.0) -> bool:
+        """
+        Decide whether to run the detector on this frame.
+
+        Args:
+            frame: Current BGR frame
+            uncertainty: Tracker prediction uncertainty (see Tracker.uncertainty)
+
+        Returns:
+            True to detect, False to propagate tracks with the motion model
+        """
+        if not self.config.enabled or self._frames_since_detect is None:
+            return True
+        if self._frames_since_detect + 1 >= self._interval:
+            return True
+        if uncertainty > self.config.uncertainty_threshold:
+            return True
+        return self.frame_difference(frame) > self.config.frame_diff_threshold
+
+    def record_detection(self, elapsed_s: float, frame: Optional[np.ndarray] = None) -> None:
+        """
+        Record a detection step.
+
+        Args:
+            elapsed_s: Wall time of detection + tracker update
+            frame: Frame detected on (reference for frame differencing)
+        """
+        self._frames_since_detect = 0
+        self._detect_time = self._ema(self._detect_time, elapsed_s)
+        if self.config.enabled and frame is not None:
+            self._reference = self._downscale(frame)
+        self._interval = self._compute_interval()
+
+    def record_prediction(self, elapsed_s: float) -> None:
+        """
+        Record a prediction-only step.
+
+        Args:
+            elapsed_s: Wall time of tracker prediction
+        """
+        if self._frames_since_detect is not None:
+            self._frames_since_detect += 1
+        self._predict_time = self._ema(self._predict_time, elapsed_s)
+
+    def frame_difference(self, frame: np.ndarray) -> float:
+        """Mean absolute gray-level change since the last detection frame."""
+        if self._reference is None:
+            return math.inf
+        current = self._downscale(frame)
+        if current.shape != self._reference.shape:
+            return math.inf
+        return float(cv2.absdiff(current, self._reference).mean())
+
+    @property
+    def interval(self) -> int:
+        """Current detection interval N."""
+        return self._interval
+
+    def _compute_interval(self) -> int:
+        """
+        Smallest N that sustains target_fps.
+
+        One detection plus N-1 predictions must fit in N frame periods:
+        t_det + (N - 1) * t_pred <= N * period.
+        """
+        floor = max(1, self.config.min_interval)
+        ceiling = max(floor, self.config.max_interval)
+        if not self.config.enabled or self._detect_time is None:
+            return floor
+
+        t_det = self._detect_time
+        t_pred = self._predict_time or 0.0
+        period = self.target_period
+        if t_det <= period:
+            return floor
+        if t_pred >= period:
+            return ceiling
+
+        required = math.ceil((t_det - t_pred) / (period - t_pred))
+        return int(min(max(required, floor), ceiling))
+
+    def _ema(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        a = self.config.timing_alpha
+        return a * sample + (1 - a) * current
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Small grayscale copy of a frame for cheap differencing."""
+        height, width = frame.shape[:2]
+        size = (self.config.diff_width, max(1, round(height * self.config.diff_width / width)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
@@ -0,0 +1,286 @@
+"""
+Correlation tracker for the locked target.
+
+A MOSSE filter (Bolme et al., 2010) learned in the Fourier domain on a
+small grayscale window around the locked bbox. Updating it costs two
+FFTs on a template_size² patch, so it can follow the one target that
+matters on every camera frame, including the frames the detector skips.
+Whenever detection confirms the locked track, the filter is re-seeded
+from the detection so correlation drift never accumulates.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..common.types import BoundingBox, LockedTarget, LockStatus, Track
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CorrelationConfig:
+    """Locked-target correlation tracker configuration."""
+    enabled: bool = False
+    padding: float = 2.0  # Search window side = padding * bbox side
+    template_size: int = 64  # Filter side in pixels (window is resized to this)
+    learning_rate: float = 0.125  # Filter running-average weight per frame
+    sigma: float = 2.0  # Desired response Gaussian width (template pixels)
+    psr_threshold: float = 7.0  # Below this peak-to-sidelobe ratio the target is lost
+    init_samples: int = 8  # Randomly perturbed samples used to train a new filter
+
+
+class MosseTracker:
+    """
+    Single-target MOSSE correlation filter.
+
+    The bbox size is fixed between re-seeds; only the center moves.
+
+    Usage:
+        tracker.init(frame, bbox)
+        bbox = tracker.update(next_frame)  # None when the target is lost
+    """
+
+    def __init__(self, config: CorrelationConfig, seed: int = 0):
+        """
+        Initialize tracker.
+
+        Args:
+            config: Correlation configuration
+            seed: RNG seed for the training perturbations
+        """
+        self.config = config
+        self.psr = 0.0
+        self._rng = np.random.default_rng(seed)
+        size = config.template_size
+        self._window = np.outer(np.hanning(size), np.hanning(size))
+        self._target = np.fft.fft2(self._gaussian(size, config.sigma))
+        self._num: Optional[np.ndarray] = None
+        self._den: Optional[np.ndarray] = None
+        self._center = np.zeros(2)
+        self._box_size = np.zeros(2)
+
+    @property
+    def initialized(self) -> bool:
+        """Whether a filter has been trained."""
+        return self._num is not None
+
+    @property
+    def bbox(self) -> Optional[BoundingBox]:
+        """Current target bbox, or None before init."""
+        if not self.initialized:
+            return None
+        x1, y1 = self._center - self._box_size / 2
+        x2, y2 = self._center + self._box_size / 2
+        return BoundingBox(float(x1), float(y1), float(x2), float(y2))
+
+    def init(self, frame: np.ndarray, bbox: BoundingBox) -> None:
+        """
+        Train a new filter on the target at bbox.
+
+        Args:
+            frame: BGR or grayscale frame
+            bbox: Target bbox in frame pixels
+        """
+        self._center = np.array(bbox.center, dtype=np.float64)
+        self._box_size = np.array([max(bbox.width, 2.0), max(bbox.height, 2.0)])
+        patch = self._crop(frame, self._center)
+
+        size = self.config.template_size
+        num = np.zeros((size, size), dtype=np.complex128)
+        den = np.zeros((size, size), dtype=np.complex128)
+        samples = [patch] + [self._perturb(patch) for _ in range(self.config.init_samples)]
+        for sample in samples:
+            f = np.fft.fft2(self._preprocess(sample))
+            num += self._target * np.conj(f)
+            den += f * np.conj(f)
+        self._num = num
+        self._den = den
+        self.psr = float("inf")
+
+    def update(self, frame: np.ndarray) -> Optional[BoundingBox]:
+        """
+        Locate the target in a new frame and adapt the filter.
+
+        Args:
+            frame: BGR or grayscale frame
+
+        Returns:
+            New bbox, or None if not initialized or the response is too
+            weak (the filter is then left unchanged)
+        """
+        if not self.initialized:
+            return None
+
+        f = np.fft.fft2(self._preprocess(self._crop(frame, self._center)))
+        response = np.real(np.fft.ifft2(self._num / (self._den + 1e-5) * f))
+        peak_y, peak_x = np.unravel_index(int(np.argmax(response)), response.shape)
+        self.psr = self._peak_to_sidelobe(response, peak_y, peak_x)
+        if self.psr < self.config.psr_threshold:
+            return None
+
+        # Response is centered at the window middle when the target has not moved
+        size = self.config.template_size
+        shift = np.array([peak_x, peak_y], dtype=np.float64) - size // 2
+        self._center = self._center + shift * self._window_size() / size
+
+        rate = self.config.learning_rate
+        f = np.fft.fft2(self._preprocess(self._crop(frame, self._center)))
+        self._num = (1 - rate) * self._num + rate * self._target * np.conj(f)
+        self._den = (1 - rate) * self._den + rate * f * np.conj(f)
+        return self.bbox
+
+    def reset(self) -> None:
+        """Forget the target."""
+        self._num = None
+        self._den = None
+        self.psr = 0.0
+
+    def _window_size(self) -> np.ndarray:
+        return self._box_size * self.config.padding
+
+    def _crop(self, frame: np.ndarray, center: np.ndarray) -> np.ndarray:
+        """Grayscale template_size² resample of the search window."""
+        width, height = np.maximum(self._window_size(), 4.0)
+        patch = cv2.getRectSubPix(frame, (int(round(width)), int(round(height))),
+                                  (float(center[0]), float(center[1])))
+        size = self.config.template_size
+        patch = cv2.resize(patch, (size, size), interpolation=cv2.INTER_LINEAR)
+        # Convert only the small patch, not the full frame
+        return cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY) if patch.ndim == 3 else patch
+
+    def _preprocess(self, patch: np.ndarray) -> np.ndarray:
+        """Log transform, normalize and taper (MOSSE preprocessing)."""
+        patch = np.log1p(patch.astype(np.float64))
+        patch = (patch - patch.mean()) / (patch.std() + 1e-5)
+        return patch * self._window
+
+    def _perturb(self, patch: np.ndarray) -> np.ndarray:
+        """Small random rotation/scale of a training patch."""
+        size = self.config.template_size
+        angle = self._rng.uniform(-10, 10)
+        scale = self._rng.uniform(0.9, 1.1)
+        matrix = cv2.getRotationMatrix2D((size / 2, size / 2), angle, scale)
+        return cv2.warpAffine(patch, matrix, (size, size), borderMode=cv2.BORDER_REFLECT)
+
+    @staticmethod
+    def _peak_to_sidelobe(response: np.ndarray, peak_y: int, peak_x: int) -> float:
+        """(peak - sidelobe mean) / sidelobe std, excluding an 11x11 peak area."""
+        mask = np.ones(response.shape, dtype=bool)
+        mask[max(0, peak_y - 5):peak_y + 6, max(0, peak_x - 5):peak_x + 6] = False
+        sidelobe = response[mask]
+        return float((response[peak_y, peak_x] - sidelobe.mean()) / (sidelobe.std() + 1e-5))
+
+    @staticmethod
+    def _gaussian(size: int, sigma: float) -> np.ndarray:
+        coords = np.arange(size) - size // 2
+        return np.exp(-(coords[None, :] ** 2 + coords[:, None] ** 2) / (2 * sigma ** 2))
+
+
+class LockedTargetTracker:
+    """
+    Follows the track targeting has locked with a MosseTracker.
+
+    Thread-safe: lock updates and re-seeds come from the perception
+    stages, step() runs on its own camera-rate thread.
+    """
+
+    def __init__(self, config: CorrelationConfig):
+        """
+        Initialize locked-target tracker.
+
+        Args:
+            config: Correlation configuration
+        """
+        self.config = config
+        self._mosse = MosseTracker(config)
+        self._lock = threading.Lock()
+        self._track_id: Optional[int] = None
+        self._pending_seed: Optional[Tuple[np.ndarray, Track]] = None
+
+    @property
+    def track_id(self) -> Optional[int]:
+        """Locked track ID being followed, if any."""
+        return self._track_id
+
+    def set_lock(self, status: Optional[LockStatus], track_id: Optional[int]) -> None:
+        """
+        Follow a new lock (or stop following).
+
+        Args:
+            status: Lock status from targeting
+            track_id: Locked track ID
+        """
+        if status in (None, LockStatus.UNLOCKED) or track_id is None:
+            track_id = None
+        with self._lock:
+            if track_id != self._track_id:
+                logger.info(f"Correlation tracker following track {track_id}")
+                self._track_id = track_id
+                self._mosse.reset()
+                self._pending_seed = None
+
+    def reseed(self, tracks: List[Track], frame: np.ndarray) -> bool:
+        """
+        Re-seed from the tracker output of a detection frame.
+
+        Tracks returned by a tracker update were matched to a detection on
+        this frame, so the locked track's box is a confirmed position.
+
+        Args:
+            tracks: Tracks from Tracker.update
+            frame: Frame the detections came from
+
+        Returns:
+            True if the locked track was present
+        """
+        with self._lock:
+            if self._track_id is None:
+                return False
+            for track in tracks:
+                if track.track_id == self._track_id:
+                    self._pending_seed = (frame, track)
+                    return True
+        return False
+
+    def step(self, frame: np.ndarray, timestamp: float) -> Optional[LockedTarget]:
+        """
+        Advance the filter to a new camera frame.
+
+        Args:
+            frame: Latest camera frame
+            timestamp: Frame capture time
+
+        Returns:
+            LockedTarget, or None when nothing is locked or the target is lost
+        """
+        with self._lock:
+            track_id = self._track_id
+            seed, self._pending_seed = self._pending_seed, None
+            if track_id is None:
+                return None
+
+            reseeded = False
+            if seed is not None:
+                seed_frame, track = seed
+                # Train on the detection frame, then catch up to this one
+                self._mosse.init(seed_frame, track.bbox)
+                reseeded = True
+            bbox = self._mosse.update(frame)
+            if bbox is None:
+                if reseeded:
+                    bbox = self._mosse.bbox
+                else:
+                    return None
+
+            return LockedTarget(
+                track_id=track_id,
+                bbox=bbox,
+                score=self._mosse.psr,
+                timestamp=timestamp,
+                reseeded=reseeded
+            )
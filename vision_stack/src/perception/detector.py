@@ -4,10 +4,12 @@ YOLO detector interface and implementation.
 Provides object detection using YOLO models.
 """
 
+import importlib.util
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional, Protocol
+from typing import Dict, List, Optional, Protocol
 
 import numpy as np
 
@@ -16,13 +18,43 @@ from ..common.types import Detection, BoundingBox
 logger = logging.getLogger(__name__)
 
 
-# Try to import ultralytics
-try:
-    from ultralytics import YOLO
-    ULTRALYTICS_AVAILABLE = True
-except ImportError:
-    ULTRALYTICS_AVAILABLE = False
-    logger.warning("Ultralytics not available - using stub detector")
+# ultralytics pulls in torch/CUDA and takes seconds to import, so only
+# check that it is installed here; load_backend() imports it on demand
+# (and warns when it is missing, only if that backend is selected).
+ULTRALYTICS_AVAILABLE = importlib.util.find_spec("ultralytics") is not None
+
+_YOLO = None
+
+
+def _yolo_class():
+    """Import and return ultralytics.YOLO (cached after the first call)."""
+    global _YOLO
+    if _YOLO is None:
+        from ultralytics import YOLO
+        _YOLO = YOLO
+    return _YOLO
+
+
+# COCO class names for reference
+COCO_CLASSES = {
+    0: "person", 1: "bicycle", 2: "car", 3: "motorcycle", 4: "airplane",
+    5: "bus", 6: "train", 7: "truck", 8: "boat", 9: "traffic light",
+    10: "fire hydrant", 11: "stop sign", 12: "parking meter", 13: "bench",
+    14: "bird", 15: "cat", 16: "dog", 17: "horse", 18: "sheep", 19: "cow",
+    20: "elephant", 21: "bear", 22: "zebra", 23: "giraffe", 24: "backpack",
+    25: "umbrella", 26: "handbag", 27: "tie", 28: "suitcase", 29: "frisbee",
+    30: "skis", 31: "snowboard", 32: "sports ball", 33: "kite", 34: "baseball bat",
+    35: "baseball glove", 36: "skateboard", 37: "surfboard", 38: "tennis racket",
+    39: "bottle", 40: "wine glass", 41: "cup", 42: "fork", 43: "knife",
+    44: "spoon", 45: "bowl", 46: "banana", 47: "apple", 48: "sandwich",
+    49: "orange", 50: "broccoli", 51: "carrot", 52: "hot dog", 53: "pizza",
+    54: "donut", 55: "cake", 56: "chair", 57: "couch", 58: "potted plant",
+    59: "bed", 60: "dining table", 61: "toilet", 62: "tv", 63: "laptop",
+    64: "mouse", 65: "remote", 66: "keyboard", 67: "cell phone", 68: "microwave",
+    69: "oven", 70: "toaster", 71: "sink", 72: "refrigerator", 73: "book",
+    74: "clock", 75: "vase", 76: "scissors", 77: "teddy bear", 78: "hair drier",
+    79: "toothbrush"
+}
 
 
 @dataclass
@@ -36,6 +68,11 @@ class DetectorConfig:
     classes: Optional[List[int]] = None  # Filter specific classes (legacy)
     filter_classes: Optional[List] = None  # New: filter by name or ID
     class_names: Optional[dict] = None  # Name to ID mapping
+    backend: str = "ultralytics"  # "ultralytics", "onnx" or "onnx_int8"
+    input_size: int = 640  # Square network input size (ONNX backend)
+    cache_dir: Optional[str] = None  # Optimized session cache (ONNX backend)
+    num_threads: int = 0  # CPU inference threads, 0 = runtime default (ONNX backend)
+    warmup_iterations: int = 3  # Dummy inferences per input shape before ready
 
 
 class Detector(Protocol):
@@ -54,6 +91,129 @@ class Detector(Protocol):
         ...
 
 
+def resolve_class_filter(
+    config: DetectorConfig,
+    model_names: Optional[Dict[int, str]] = None
+) -> Optional[List[int]]:
+    """
+    Resolve filter_classes to list of class IDs.
+    
+    Supports:
+    - None or "all": no filter
+    - List of ints: direct class IDs
+    - List of strings: resolve via class_names, model names or COCO
+    """
+    filter_classes = config.filter_classes
+    
+    # Handle legacy 'classes' parameter
+    if filter_classes is None and config.classes:
+        return config.classes
+    
+    if filter_classes is None or filter_classes == "all":
+        return None
+    
+    if not isinstance(filter_classes, list):
+        return None
+    
+    # Build name-to-ID mapping
+    name_to_id = {}
+    
+    # Add from config class_names
+    if config.class_names:
+        for class_id, name in config.class_names.items():
+            name_to_id[name.lower()] = int(class_id)
+    
+    # Add from model names if available
+    if model_names:
+        for class_id, name in model_names.items():
+            name_to_id[name.lower()] = int(class_id)
+    
+    # Add COCO classes as fallback
+    for class_id, name in COCO_CLASSES.items():
+        if name.lower() not in name_to_id:
+            name_to_id[name.lower()] = class_id
+    
+    # Resolve each item in filter_classes
+    resolved = []
+    for item in filter_classes:
+        if isinstance(item, int):
+            resolved.append(item)
+        elif isinstance(item, str):
+            item_lower = item.lower()
+            if item_lower in name_to_id:
+                resolved.append(name_to_id[item_lower])
+            else:
+                logger.warning(f"Unknown class name: {item}")
+    
+    return resolved if resolved else None
+
+
+def build_label_lut(names: Dict[int, str], fallback: Dict[int, str]) -> np.ndarray:
+    """
+    Build a class-ID -> label lookup table.
+    
+    Args:
+        names: Preferred class names (e.g. from the model)
+        fallback: Names used for IDs missing from `names`
+        
+    Returns:
+        Object array indexed by class ID; unknown IDs map to "class_<id>"
+    """
+    ids = [int(k) for k in list(names.keys()) + list(fallback.keys())]
+    size = max(ids) + 1 if ids else 0
+    lut = np.array([f"class_{i}" for i in range(size)], dtype=object)
+    for class_id, name in fallback.items():
+        lut[int(class_id)] = name
+    for class_id, name in names.items():
+        lut[int(class_id)] = name
+    return lut
+
+
+def detections_from_array(
+    data: np.ndarray,
+    label_lut: np.ndarray,
+    timestamp: Optional[float] = None
+) -> List[Detection]:
+    """
+    Convert a raw detection array to Detection objects.
+    
+    Args:
+        data: (N, 6+) array of [x1, y1, x2, y2, ..., conf, cls] rows
+        label_lut: Class-ID lookup table from build_label_lut()
+        timestamp: Timestamp for all detections (defaults to now)
+        
+    Returns:
+        List of Detection objects
+    """
+    if data.size == 0:
+        return []
+
+    if timestamp is None:
+        timestamp = time.time()
+
+    xyxy = data[:, :4].astype(np.float64).tolist()
+    confs = data[:, -2].astype(np.float64).tolist()
+    cls_ids = data[:, -1].astype(np.int64)
+
+    # Vectorized label lookup, out-of-table IDs resolved individually
+    in_table = (cls_ids >= 0) & (cls_ids < len(label_lut))
+    labels = np.empty(len(cls_ids), dtype=object)
+    labels[in_table] = label_lut[cls_ids[in_table]]
+    for i in np.flatnonzero(~in_table):
+        labels[i] = f"class_{cls_ids[i]}"
+
+    return [
+        Detection(
+            bbox=BoundingBox(x1=box[0], y1=box[1], x2=box[2], y2=box[3]),
+            class_id=cls,
+            label=label,
+            confidence=conf,
+            timestamp=timestamp
+        )
+        for box, conf, cls, label in zip(xyxy, confs, cls_ids.tolist(), labels.tolist())
+    ]
+
+
 class YoloDetector:
     """
     YOLO detector using ultralytics.
@@ -62,25 +222,7 @@ class YoloDetector:
     """
 
     # COCO class names for reference
-    COCO_CLASSES = {
-        0: "person", 1: "bicycle", 2: "car", 3: "motorcycle", 4: "airplane",
-        5: "bus", 6: "train", 7: "truck", 8: "boat", 9: "traffic light",
-        10: "fire hydrant", 11: "stop sign", 12: "parking meter", 13: "bench",
-        14: "bird", 15: "cat", 16: "dog", 17: "horse", 18: "sheep", 19: "cow",
-        20: "elephant", 21: "bear", 22: "zebra", 23: "giraffe", 24: "backpack",
-        25: "umbrella", 26: "handbag", 27: "tie", 28: "suitcase", 29: "frisbee",
-        30: "skis", 31: "snowboard", 32: "sports ball", 33: "kite", 34: "baseball bat",
-        35: "baseball glove", 36: "skateboard", 37: "surfboard", 38: "tennis racket",
-        39: "bottle", 40: "wine glass", 41: "cup", 42: "fork", 43: "knife",
-        44: "spoon", 45: "bowl", 46: "banana", 47: "apple", 48: "sandwich",
-        49: "orange", 50: "broccoli", 51: "carrot", 52: "hot dog", 53: "pizza",
-        54: "donut", 55: "cake", 56: "chair", 57: "couch", 58: "potted plant",
-        59: "bed", 60: "dining table", 61: "toilet", 62: "tv", 63: "laptop",
-        64: "mouse", 65: "remote", 66: "keyboard", 67: "cell phone", 68: "microwave",
-        69: "oven", 70: "toaster", 71: "sink", 72: "refrigerator", 73: "book",
-        74: "clock", 75: "vase", 76: "scissors", 77: "teddy bear", 78: "hair drier",
-        79: "toothbrush"
-    }
+    COCO_CLASSES = COCO_CLASSES
 
     def __init__(self, config: DetectorConfig):
         """
@@ -90,73 +232,28 @@ class YoloDetector:
             config: Detector configuration
         """
         self.config = config
-        self._model: Optional[YOLO] = None
+        self._model = None
         self._class_filter: Optional[List[int]] = None
+        self._label_lut = build_label_lut({}, self.COCO_CLASSES)
         
         if ULTRALYTICS_AVAILABLE:
-            self._model = YOLO(config.model_path)
+            self._model = _yolo_class()(config.model_path)
             logger.info(f"Loaded YOLO model: {config.model_path}")
             
+            # Precompute class-name lookup (model names, COCO fallback)
+            self._label_lut = build_label_lut(
+                getattr(self._model, 'names', None) or {}, self.COCO_CLASSES
+            )
+            
             # Resolve class filter
-            self._class_filter = self._resolve_class_filter(config)
+            self._class_filter = resolve_class_filter(
+                config, getattr(self._model, 'names', None)
+            )
             if self._class_filter:
                 logger.info(f"Class filter: {self._class_filter}")
         else:
             logger.warning("Running in stub mode - no real detections")
 
-    def _resolve_class_filter(self, config: DetectorConfig) -> Optional[List[int]]:
-        """
-        Resolve filter_classes to list of class IDs.
-        
-        Supports:
-        - None or "all": no filter
-        - List of ints: direct class IDs
-        - List of strings: resolve via class_names or COCO
-        """
-        filter_classes = config.filter_classes
-        
-        # Handle legacy 'classes' parameter
-        if filter_classes is None and config.classes:
-            return config.classes
-        
-        if filter_classes is None or filter_classes == "all":
-            return None
-        
-        if not isinstance(filter_classes, list):
-            return None
-        
-        # Build name-to-ID mapping
-        name_to_id = {}
-        
-        # Add from config class_names
-        if config.class_names:
-            for class_id, name in config.class_names.items():
-                name_to_id[name.lower()] = int(class_id)
-        
-        # Add from model names if available
-        if self._model and hasattr(self._model, 'names'):
-            for class_id, name in self._model.names.items():
-                name_to_id[name.lower()] = int(class_id)
-        
-        # Add COCO classes as fallback
-        for class_id, name in self.COCO_CLASSES.items():
-            if name.lower() not in name_to_id:
-                name_to_id[name.lower()] = class_id
-        
-        # Resolve each item in filter_classes
-        resolved = []
-        for item in filter_classes:
-            if isinstance(item, int):
-                resolved.append(item)
-            elif isinstance(item, str):
-                item_lower = item.lower()
-                if item_lower in name_to_id:
-                    resolved.append(name_to_id[item_lower])
-                else:
-                    logger.warning(f"Unknown class name: {item}")
-        
-        return resolved if resolved else None
-
     def detect(self, frame: np.ndarray) -> List[Detection]:
         """
         Detect objects in a frame.
@@ -184,33 +281,12 @@ class YoloDetector:
             detections = []
             for result in results:
                 boxes = result.boxes
-                if boxes is None:
+                if boxes is None or len(boxes) == 0:
                     continue
 
-                for i in range(len(boxes)):
-                    xyxy = boxes.xyxy[i].cpu().numpy()
-                    conf = float(boxes.conf[i].cpu().numpy())
-                    cls = int(boxes.cls[i].cpu().numpy())
-                    
-                    bbox = BoundingBox(
-                        x1=float(xyxy[0]),
-                        y1=float(xyxy[1]),
-                        x2=float(xyxy[2]),
-                        y2=float(xyxy[3])
-                    )
-                    
-                    # Use model's class names if available, fallback to COCO
-                    if hasattr(result, 'names') and cls in result.names:
-                        label = result.names[cls]
-                    else:
-                        label = self.COCO_CLASSES.get(cls, f"class_{cls}")
-                    
-                    detections.append(Detection(
-                        bbox=bbox,
-                        class_id=cls,
-                        label=label,
-                        confidence=conf
-                    ))
+                # Single device-to-host transfer: rows are [x1, y1, x2, y2, conf, cls]
+                data = boxes.data.cpu().numpy()
+                detections.extend(detections_from_array(data, self._label_lut))
 
             return detections
 
@@ -225,3 +301,75 @@ class StubDetector:
     def detect(self, frame: np.ndarray) -> List[Detection]:
         """Return empty detections."""
         return []
+
+
+def load_backend(backend: str) -> bool:
+    """
+    Import the heavy inference library for a detector backend.
+    
+    Detector modules defer these imports so that importing the perception
+    package stays fast; calling this up front lets startup time the
+    import separately from model loading.
+    
+    Args:
+        backend: DetectorConfig.backend value
+        
+    Returns:
+        True if the backend library is available
+    """
+    if backend in ("onnx", "onnx_int8"):
+        from .onnx_detector import ONNXRUNTIME_AVAILABLE
+        return ONNXRUNTIME_AVAILABLE
+    if not ULTRALYTICS_AVAILABLE:
+        logger.warning("Ultralytics not available - using stub detector")
+        return False
+    _yolo_class()
+    return True
+
+
+def warmup_detector(
+    detector: Detector,
+    shapes: List[tuple],
+    iterations: int = 3
+) -> List[float]:
+    """
+    Run dummy inferences so CUDA/cuDNN init and autotuning happen before
+    the first real frame.
+    
+    Args:
+        detector: Detector to warm up
+        shapes: Frame shapes (H, W) to warm up, e.g. full frame and ROI crop
+        iterations: Inferences per shape
+        
+    Returns:
+        Per-inference latencies in seconds (first entries include init cost)
+    """
+    latencies = []
+    for height, width in shapes:
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            detector.detect(frame)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def create_detector(config: DetectorConfig) -> Detector:
+    """
+    Create a detector for the configured backend.
+    
+    Args:
+        config: Detector configuration
+        
+    Returns:
+        Detector instance (YoloDetector, OnnxDetector or QuantizedOnnxDetector)
+    """
+    if config.backend == "onnx":
+        from .onnx_detector import OnnxDetector
+        return OnnxDetector(config)
+    if config.backend == "onnx_int8":
+        from .quantization import QuantizedOnnxDetector
+        return QuantizedOnnxDetector(config)
+    if config.backend != "ultralytics":
+        logger.warning(f"Unknown detector backend '{config.backend}', using ultralytics")
+    return YoloDetector(config)
@@ -0,0 +1,111 @@
+"""
+Camera ego-motion estimation.
+
+Estimates the global image motion between consecutive frames with sparse
+Lucas-Kanade optical flow on a small grayscale copy of the frame and a
+RANSAC similarity fit. Trackers warp their predicted boxes with the
+result before association, so a banking airframe does not shift every
+box out of IOU range.
+"""
+
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def warp_points(warp: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Apply a 2x3 affine warp to (N, 2) points."""
+    return points @ warp[:, :2].T + warp[:, 2]
+
+
+def warp_scale(warp: np.ndarray) -> float:
+    """Isotropic scale factor of a 2x3 similarity warp."""
+    return float(np.sqrt(abs(np.linalg.det(warp[:, :2]))))
+
+
+class EgoMotionEstimator:
+    """
+    Frame-to-frame global motion from sparse optical flow.
+
+    Usage:
+        warp = estimator.estimate(frame)  # 2x3, previous -> current frame
+    """
+
+    def __init__(
+        self,
+        width: int = 160,
+        max_features: int = 100,
+        min_features: int = 12,
+        ransac_threshold: float = 1.0
+    ):
+        """
+        Initialize estimator.
+
+        Args:
+            width: Width of the downscaled frame used for flow
+            max_features: Max corners tracked between frames
+            min_features: Min inlier-capable flow pairs for a valid estimate
+            ransac_threshold: RANSAC reprojection threshold (downscaled px)
+        """
+        self.width = width
+        self.max_features = max_features
+        self.min_features = min_features
+        self.ransac_threshold = ransac_threshold
+        self.last_duration_ms = 0.0
+        self._prev_gray: Optional[np.ndarray] = None
+        self._prev_points: Optional[np.ndarray] = None
+        self._ratio = 1.0
+
+    def estimate(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Estimate motion from the previous frame to this one.
+
+        Args:
+            frame: Current BGR or grayscale frame
+
+        Returns:
+            2x3 similarity warp in full-resolution pixels mapping previous
+            frame coordinates to current ones, or None if unavailable
+        """
+        start = time.perf_counter()
+        gray = self._downscale(frame)
+        warp = None
+
+        if (self._prev_gray is not None and self._prev_points is not None
+                and gray.shape == self._prev_gray.shape):
+            points, status, _ = cv2.calcOpticalFlowPyrLK(
+                self._prev_gray, gray, self._prev_points, None,
+                winSize=(15, 15), maxLevel=2
+            )
+            ok = status.reshape(-1).astype(bool)
+            if ok.sum() >= self.min_features:
+                small, _ = cv2.estimateAffinePartial2D(
+                    self._prev_points[ok], points[ok],
+                    method=cv2.RANSAC, ransacReprojThreshold=self.ransac_threshold
+                )
+                if small is not None:
+                    warp = small.copy()
+                    warp[:, 2] *= self._ratio
+
+        self._prev_gray = gray
+        self._prev_points = cv2.goodFeaturesToTrack(
+            gray, maxCorners=self.max_features, qualityLevel=0.01, minDistance=5
+        )
+        self.last_duration_ms = (time.perf_counter() - start) * 1000
+        return warp
+
+    def reset(self) -> None:
+        """Forget the previous frame."""
+        self._prev_gray = None
+        self._prev_points = None
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        self._ratio = width / self.width
+        size = (self.width, max(1, round(height / self._ratio)))
+        # INTER_AREA costs ~3 ms on 1080p; bilinear is ~40x cheaper and the
+        # LK pyramid smooths the aliasing well enough for a global fit
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
@@ -0,0 +1,456 @@
+"""
+ONNX Runtime detector backend.
+
+Runs YOLOv8-style ONNX exports without ultralytics: NumPy letterbox
+preprocessing into a preallocated input tensor, vectorized decoding and
+NMS, and an on-disk cache of optimized sessions / TensorRT engines keyed
+by model hash and execution provider.
+"""
+
+import ast
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from ..common.types import Detection
+from .detector import (
+    COCO_CLASSES,
+    DetectorConfig,
+    build_label_lut,
+    detections_from_array,
+    resolve_class_filter,
+)
+
+logger = logging.getLogger(__name__)
+
+# Try to import onnxruntime
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    logger.warning("onnxruntime not available - ONNX detector disabled")
+
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "drone_vision", "onnx")
+
+# Providers in order of preference for GPU devices
+GPU_PROVIDERS = ["TensorrtExecutionProvider", "CUDAExecutionProvider"]
+
+# Padding value used by YOLO letterboxing
+LETTERBOX_FILL = 114
+
+# Max candidates passed to NMS after confidence filtering
+MAX_NMS_CANDIDATES = 3000
+
+
+def device_index(device: str) -> int:
+    """
+    CUDA device index of a device setting.
+
+    Accepts the forms the ultralytics backend takes: "0", "cuda:1", "cuda"
+    or "cpu" (and the first index of a list such as "0,1").
+
+    Args:
+        device: Device setting
+
+    Returns:
+        Device index, 0 when the setting names none
+    """
+    match = re.search(r"\d+", str(device))
+    return int(match.group()) if match else 0
+
+
+def select_providers(device: str, available: List[str]) -> List[str]:
+    """
+    Choose execution providers for a device setting.
+
+    Args:
+        device: "cpu" or a CUDA device (e.g. "0" or "cuda:0")
+        available: Providers reported by onnxruntime
+
+    Returns:
+        Provider names in priority order, always ending with CPU
+    """
+    providers = []
+    if str(device).lower() != "cpu":
+        providers = [p for p in GPU_PROVIDERS if p in available]
+    providers.append("CPUExecutionProvider")
+    return providers
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Compute SHA-256 of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def session_cache_key(model_hash: str, provider: str) -> str:
+    """Cache key for an optimized session: model hash plus provider."""
+    short_provider = provider.replace("ExecutionProvider", "").lower()
+    return f"{model_hash[:16]}_{short_provider}"
+
+
+def letterbox_geometry(
+    height: int,
+    width: int,
+    size: int
+) -> Tuple[float, int, int, int, int]:
+    """
+    Compute letterbox resize and padding for a frame.
+
+    Args:
+        height, width: Frame size
+        size: Square network input size
+
+    Returns:
+        Tuple of (scale, new_width, new_height, pad_x, pad_y)
+    """
+    scale = min(size / height, size / width)
+    new_w = int(round(width * scale))
+    new_h = int(round(height * scale))
+    pad_x = (size - new_w) // 2
+    pad_y = (size - new_h) // 2
+    return scale, new_w, new_h, pad_x, pad_y
+
+
+def letterbox_into(
+    frame: np.ndarray,
+    geometry: Tuple[float, int, int, int, int],
+    canvas: np.ndarray,
+    out: np.ndarray
+) -> None:
+    """
+    Letterbox a BGR frame into a CHW RGB float32 tensor.
+
+    Args:
+        frame: BGR image (H, W, 3)
+        geometry: Result of letterbox_geometry() for this frame size
+        canvas: (size, size, 3) uint8 scratch buffer, padding already filled
+        out: (3, size, size) float32 destination, values in [0, 1]
+    """
+    _, new_w, new_h, pad_x, pad_y = geometry
+    if (new_w, new_h) == (frame.shape[1], frame.shape[0]):
+        resized = frame
+    else:
+        resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+
+    # HWC BGR uint8 -> CHW RGB float32
+    np.multiply(
+        canvas.transpose(2, 0, 1)[::-1],
+        np.float32(1.0 / 255.0),
+        out=out,
+        casting="unsafe",
+    )
+
+
+def preprocess_frame(frame: np.ndarray, size: int) -> np.ndarray:
+    """
+    Letterbox a single frame into a new (1, 3, size, size) input tensor.
+
+    Allocating convenience wrapper for offline use (calibration, evaluation).
+    """
+    canvas = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+    tensor = np.empty((1, 3, size, size), dtype=np.float32)
+    geometry = letterbox_geometry(frame.shape[0], frame.shape[1], size)
+    letterbox_into(frame, geometry, canvas, tensor[0])
+    return tensor
+
+
+def nms(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    iou_threshold: float,
+    max_det: int
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression.
+
+    Each iteration compares the best remaining box against all others in
+    one vectorized step.
+
+    Args:
+        boxes: (N, 4) xyxy boxes
+        scores: (N,) confidence scores
+        iou_threshold: Suppress boxes overlapping a kept box above this IoU
+        max_det: Max boxes to keep
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+
+    while order.size > 0 and len(keep) < max_det:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        w = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        h = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = w * h
+        union = areas[i] + areas[rest] - inter
+        iou = np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+        order = rest[iou <= iou_threshold]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+def decode_yolo_output(
+    pred: np.ndarray,
+    conf_threshold: float,
+    iou_threshold: float,
+    max_det: int,
+    class_filter: Optional[List[int]] = None
+) -> np.ndarray:
+    """
+    Decode a raw YOLOv8 head output.
+
+    Args:
+        pred: (4 + nc, A) array of [cx, cy, w, h, class scores] per anchor
+        conf_threshold: Minimum class score
+        iou_threshold: NMS IoU threshold (applied per class)
+        max_det: Max detections to return
+        class_filter: Optional list of class IDs to keep
+
+    Returns:
+        (N, 6) float32 array of [x1, y1, x2, y2, conf, cls] in network pixels
+    """
+    pred = pred.T
+
+    scores = pred[:, 4:]
+    conf = scores.max(axis=1)
+    mask = conf >= conf_threshold
+    if not mask.any():
+        return np.zeros((0, 6), dtype=np.float32)
+
+    candidates = pred[mask]
+    conf = conf[mask]
+    cls = candidates[:, 4:].argmax(axis=1)
+
+    if class_filter:
+        keep_cls = np.isin(cls, class_filter)
+        candidates, conf, cls = candidates[keep_cls], conf[keep_cls], cls[keep_cls]
+
+    if len(conf) > MAX_NMS_CANDIDATES:
+        top = np.argpartition(-conf, MAX_NMS_CANDIDATES)[:MAX_NMS_CANDIDATES]
+        candidates, conf, cls = candidates[top], conf[top], cls[top]
+
+    half_wh = candidates[:, 2:4] / 2
+    boxes = np.concatenate(
+        [candidates[:, 0:2] - half_wh, candidates[:, 0:2] + half_wh], axis=1
+    )
+
+    # Class-aware NMS: shift boxes of each class into a disjoint region
+    offsets = cls[:, None] * (boxes.max() + 1.0)
+    keep = nms(boxes + offsets, conf, iou_threshold, max_det)
+
+    return np.column_stack(
+        [boxes[keep], conf[keep], cls[keep].astype(np.float32)]
+    ).astype(np.float32)
+
+
+def parse_model_names(metadata: Dict[str, str]) -> Dict[int, str]:
+    """Parse class names from ultralytics ONNX export metadata."""
+    names = metadata.get("names")
+    if not names:
+        return {}
+    try:
+        parsed = ast.literal_eval(names)
+        return {int(k): str(v) for k, v in parsed.items()}
+    except (ValueError, SyntaxError, AttributeError):
+        logger.warning("Could not parse class names from model metadata")
+        return {}
+
+
+class OnnxDetector:
+    """
+    YOLO detector running on ONNX Runtime.
+
+    Uses TensorRT or CUDA execution providers when available and falls
+    back to CPU. Optimized sessions are cached under config.cache_dir so
+    subsequent starts skip graph optimization / engine building.
+    """
+
+    def __init__(self, config: DetectorConfig):
+        """
+        Initialize ONNX detector.
+
+        Args:
+            config: Detector configuration (model_path must be an .onnx file)
+        """
+        self.config = config
+        self._session: Optional["ort.InferenceSession"] = None
+        self._class_filter: Optional[List[int]] = None
+        self._label_lut = build_label_lut({}, COCO_CLASSES)
+        self.provider: Optional[str] = None
+
+        # Preallocated buffers (filled per frame, never reallocated)
+        size = config.input_size
+        self._canvas = np.full((size, size, 3), LETTERBOX_FILL, dtype=np.uint8)
+        self._input = np.zeros((1, 3, size, size), dtype=np.float32)
+        self._frame_shape: Optional[Tuple[int, int]] = None
+        self._geometry: Tuple[float, int, int, int, int] = (1.0, size, size, 0, 0)
+
+        if not ONNXRUNTIME_AVAILABLE:
+            logger.warning("Running in stub mode - no real detections")
+            return
+
+        self._session = self._create_session(config.model_path)
+        self._input_name = self._session.get_inputs()[0].name
+        self._output_name = self._session.get_outputs()[0].name
+
+        model_names = parse_model_names(
+            self._session.get_modelmeta().custom_metadata_map
+        )
+        names = dict(model_names)
+        if config.class_names:
+            names.update({int(k): v for k, v in config.class_names.items()})
+        self._label_lut = build_label_lut(names, COCO_CLASSES)
+
+        self._class_filter = resolve_class_filter(config, model_names)
+        if self._class_filter:
+            logger.info(f"Class filter: {self._class_filter}")
+
+    def _session_options(self) -> "ort.SessionOptions":
+        """Base session options for this backend."""
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.config.num_threads > 0:
+            options.intra_op_num_threads = self.config.num_threads
+        return options
+
+    def _providers(self) -> List[str]:
+        """Execution providers for this backend, in priority order."""
+        return select_providers(self.config.device, ort.get_available_providers())
+
+    def _create_session(self, model_path: str) -> "ort.InferenceSession":
+        """Create an inference session, reusing the on-disk cache when possible."""
+        providers = self._providers()
+        self.provider = providers[0]
+
+        cache_root = os.path.expanduser(self.config.cache_dir or DEFAULT_CACHE_DIR)
+        key = session_cache_key(file_sha256(model_path), self.provider)
+        cache_path = os.path.join(cache_root, key)
+        os.makedirs(cache_path, exist_ok=True)
+
+        provider_options = self._provider_options(providers, cache_path)
+
+        # TensorRT caches compiled engines itself; other providers cache the
+        # optimized graph (compiled TRT nodes cannot be serialized to ONNX)
+        if self.provider == "TensorrtExecutionProvider":
+            return ort.InferenceSession(
+                model_path,
+                sess_options=self._session_options(),
+                providers=providers,
+                provider_options=provider_options,
+            )
+
+        optimized_path = os.path.join(cache_path, "model.opt.onnx")
+        if os.path.exists(optimized_path):
+            options = self._session_options()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            try:
+                session = ort.InferenceSession(
+                    optimized_path,
+                    sess_options=options,
+                    providers=providers,
+                    provider_options=provider_options,
+                )
+                logger.info(f"Loaded cached ONNX session: {optimized_path}")
+                return session
+            except Exception as e:
+                logger.warning(f"Cached session unusable ({e}), rebuilding")
+
+        options = self._session_options()
+        options.optimized_model_filepath = optimized_path
+        session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=providers,
+            provider_options=provider_options,
+        )
+        logger.info(f"Built ONNX session ({self.provider}), cached to {optimized_path}")
+        return session
+
+    def _provider_options(self, providers: List[str], cache_path: str) -> List[dict]:
+        """Per-provider options (device ID, TensorRT engine cache)."""
+        device_id = device_index(self.config.device)
+        options = []
+        for provider in providers:
+            if provider == "TensorrtExecutionProvider":
+                options.append({
+                    "device_id": device_id,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": cache_path,
+                    "trt_fp16_enable": True,
+                })
+            elif provider == "CUDAExecutionProvider":
+                options.append({"device_id": device_id})
+            else:
+                options.append({})
+        return options
+
+    def _preprocess(self, frame: np.ndarray) -> None:
+        """Letterbox a BGR frame into the preallocated input tensor."""
+        shape = frame.shape[:2]
+        if shape != self._frame_shape:
+            # Geometry changed: recompute and reset padding
+            self._frame_shape = shape
+            self._geometry = letterbox_geometry(shape[0], shape[1], self.config.input_size)
+            self._canvas.fill(LETTERBOX_FILL)
+
+        letterbox_into(frame, self._geometry, self._canvas, self._input[0])
+
+    def _postprocess(self, output: np.ndarray) -> np.ndarray:
+        """Decode raw output and map boxes back to frame coordinates."""
+        data = decode_yolo_output(
+            output[0],
+            conf_threshold=self.config.confidence_threshold,
+            iou_threshold=self.config.iou_threshold,
+            max_det=self.config.max_detections,
+            class_filter=self._class_filter,
+        )
+        if len(data) == 0:
+            return data
+
+        scale, _, _, pad_x, pad_y = self._geometry
+        data[:, [0, 2]] = (data[:, [0, 2]] - pad_x) / scale
+        data[:, [1, 3]] = (data[:, [1, 3]] - pad_y) / scale
+        height, width = self._frame_shape
+        data[:, [0, 2]] = data[:, [0, 2]].clip(0, width)
+        data[:, [1, 3]] = data[:, [1, 3]].clip(0, height)
+        return data
+
+    def detect(self, frame: np.ndarray) -> List[Detection]:
+        """
+        Detect objects in a frame.
+
+        Args:
+            frame: BGR image (H, W, 3)
+
+        Returns:
+            List of Detection objects
+        """
+        if self._session is None:
+            return []
+
+        try:
+            self._preprocess(frame)
+            output = self._session.run([self._output_name], {self._input_name: self._input})[0]
+            return detections_from_array(self._postprocess(output), self._label_lut)
+        except Exception as e:
+            logger.error(f"Detection error: {e}")
+            return []
@@ -6,17 +6,27 @@ tracks objects, and publishes track list to ZMQ bus.
 """
 
 import logging
+import threading
 import time
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional
 
+import numpy as np
 import yaml
 
-from ..common.types import TrackList
-from ..common.bus import ZmqPublisher, BusPorts
+from ..common.types import BoundingBox, Detection, LockStatus, TrackList
+from ..common.bus import ZmqPublisher, ZmqSubscriber, BusPorts
+from ..common.timeline import StartupTimeline
+from ..common.config import apply_mode_overrides
+from ..common.scheduler import RateScheduler
 from ..oak import OakBridge, OakConfig
-from .detector import YoloDetector, DetectorConfig
+from .detector import DetectorConfig, create_detector, load_backend, warmup_detector
 from .tracker import ByteTrackTracker, TrackerConfig
+from .roi import RoiConfig, RoiScheduler, merge_detections, offset_detections
+from .cadence import CadenceConfig, DetectionCadence
+from .pipeline import PipelineConfig, PipelineStage, StagePipeline
+from .correlation import CorrelationConfig, LockedTargetTracker
+from .appearance import AppearanceConfig, attach_appearance
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +40,64 @@ class PerceptionConfig:
     detector: DetectorConfig
     # Tracking
     tracker: TrackerConfig
+    # Lock-focused ROI inference
+    roi: RoiConfig = None
+    # Detect-every-N-frames cadence
+    cadence: CadenceConfig = None
+    # Threaded stage pipeline
+    pipeline: PipelineConfig = None
+    # Camera-rate correlation tracking of the locked target
+    correlation: CorrelationConfig = None
+    # Per-track color signatures for lock reacquisition
+    appearance: AppearanceConfig = None
     # Node settings
     target_fps: float = 30.0
     publish_rate_hz: float = 30.0
 
+    def __post_init__(self):
+        if self.roi is None:
+            self.roi = RoiConfig()
+        if self.cadence is None:
+            self.cadence = CadenceConfig()
+        if self.pipeline is None:
+            self.pipeline = PipelineConfig()
+        if self.correlation is None:
+            self.correlation = CorrelationConfig()
+        if self.appearance is None:
+            self.appearance = AppearanceConfig()
+
+
+@dataclass
+class FramePacket:
+    """A frame moving through the perception stages."""
+    frame_id: int
+    frame: np.ndarray
+    capture_time: float
+    detect: bool = True
+    roi_rect: Optional[tuple] = None
+    run_full: bool = True
+    detections: List[Detection] = field(default_factory=list)
+    detect_s: float = 0.0
+
+
+class TrackerSnapshot(NamedTuple):
+    """Tracker figures published by the tracking stage for the inference stage."""
+    uncertainty: float = 0.0  # Tracker.uncertainty after the last step
+    update_s: float = 0.0  # Wall time of the last tracker update
+    predict_s: float = 0.0  # Wall time of the last tracker prediction
+
 
 def load_perception_config(
     camera_yaml: str,
     perception_yaml: str,
-    tracker_yaml: str
+    tracker_yaml: str,
+    mode_yaml: Optional[str] = None
 ) -> PerceptionConfig:
-    """Load configuration from YAML files."""
+    """Load configuration from YAML files (mode `perception:` section overrides)."""
     with open(camera_yaml, 'r') as f:
         camera_cfg = yaml.safe_load(f)
     with open(perception_yaml, 'r') as f:
-        perception_cfg = yaml.safe_load(f)
+        perception_cfg = apply_mode_overrides(yaml.safe_load(f), mode_yaml, 'perception')
     with open(tracker_yaml, 'r') as f:
         tracker_cfg = yaml.safe_load(f)
 
@@ -56,10 +109,14 @@ def load_perception_config(
             depth_width=camera_cfg.get('camera', {}).get('depth', {}).get('width', 640),
             depth_height=camera_cfg.get('camera', {}).get('depth', {}).get('height', 400),
             depth_enabled=camera_cfg.get('camera', {}).get('depth', {}).get('enabled', True),
+            depth_shared_memory=camera_cfg.get('camera', {}).get('depth', {}).get('shared_memory'),
             fx=camera_cfg.get('camera', {}).get('intrinsics', {}).get('fx', 1000.0),
             fy=camera_cfg.get('camera', {}).get('intrinsics', {}).get('fy', 1000.0),
             cx=camera_cfg.get('camera', {}).get('intrinsics', {}).get('cx', 960.0),
             cy=camera_cfg.get('camera', {}).get('intrinsics', {}).get('cy', 540.0),
+            distortion=camera_cfg.get('camera', {}).get('intrinsics', {}).get('distortion'),
+            use_device_calibration=camera_cfg.get('camera', {}).get('calibration', {}).get('use_device', True),
+            calibration_file=camera_cfg.get('camera', {}).get('calibration', {}).get('file'),
         ),
         detector=DetectorConfig(
             model_path=perception_cfg.get('detector', {}).get('model_path', 'yolov8n.pt'),
@@ -69,11 +126,63 @@ def load_perception_config(
             device=perception_cfg.get('detector', {}).get('device', '0'),
             filter_classes=perception_cfg.get('detector', {}).get('filter_classes'),
             class_names=perception_cfg.get('detector', {}).get('class_names'),
+            backend=perception_cfg.get('detector', {}).get('backend', 'ultralytics'),
+            input_size=perception_cfg.get('detector', {}).get('input_size', 640),
+            cache_dir=perception_cfg.get('detector', {}).get('cache_dir'),
+            num_threads=perception_cfg.get('detector', {}).get('num_threads', 0),
+            warmup_iterations=perception_cfg.get('detector', {}).get('warmup_iterations', 3),
         ),
         tracker=TrackerConfig(
             max_age=tracker_cfg.get('tracker', {}).get('max_age', 30),
             min_hits=tracker_cfg.get('tracker', {}).get('min_hits', 3),
             iou_threshold=tracker_cfg.get('tracker', {}).get('iou_threshold', 0.3),
+            track_buffer=tracker_cfg.get('tracker', {}).get('track_buffer', 30),
+            max_tracks=tracker_cfg.get('tracker', {}).get('max_tracks', 64),
+            velocity_alpha=tracker_cfg.get('tracker', {}).get('velocity_alpha', 0.5),
+            template_refine=tracker_cfg.get('tracker', {}).get('template_refine', False),
+            template_search_margin=tracker_cfg.get('tracker', {}).get('template_search_margin', 0.5),
+            template_min_score=tracker_cfg.get('tracker', {}).get('template_min_score', 0.6),
+            matching=tracker_cfg.get('tracker', {}).get('matching', 'hungarian'),
+            track_high_thresh=tracker_cfg.get('tracker', {}).get('track_high_thresh', 0.5),
+            track_low_thresh=tracker_cfg.get('tracker', {}).get('track_low_thresh', 0.1),
+            new_track_thresh=tracker_cfg.get('tracker', {}).get('new_track_thresh', 0.6),
+            low_iou_threshold=tracker_cfg.get('tracker', {}).get('low_iou_threshold', 0.5),
+            frame_rate=camera_cfg.get('camera', {}).get('rgb', {}).get('fps', 30),
+            ego_motion=tracker_cfg.get('tracker', {}).get('ego_motion', False),
+            ego_motion_width=tracker_cfg.get('tracker', {}).get('ego_motion_width', 160),
+            ego_motion_max_features=tracker_cfg.get('tracker', {}).get('ego_motion_max_features', 100),
+        ),
+        roi=RoiConfig(
+            enabled=perception_cfg.get('roi', {}).get('enabled', False),
+            padding=perception_cfg.get('roi', {}).get('padding', 3.0),
+            min_size=perception_cfg.get('roi', {}).get('min_size', 640),
+            full_frame_interval=perception_cfg.get('roi', {}).get('full_frame_interval', 5),
+            lock_timeout_ms=perception_cfg.get('roi', {}).get('lock_timeout_ms', 500.0),
+        ),
+        cadence=CadenceConfig(
+            enabled=perception_cfg.get('cadence', {}).get('enabled', False),
+            min_interval=perception_cfg.get('cadence', {}).get('min_interval', 1),
+            max_interval=perception_cfg.get('cadence', {}).get('max_interval', 10),
+            frame_diff_threshold=perception_cfg.get('cadence', {}).get('frame_diff_threshold', 12.0),
+            uncertainty_threshold=perception_cfg.get('cadence', {}).get('uncertainty_threshold', 0.5),
+        ),
+        pipeline=PipelineConfig(
+            enabled=perception_cfg.get('pipeline', {}).get('enabled', False),
+            stats_interval_s=perception_cfg.get('pipeline', {}).get('stats_interval_s', 5.0),
+        ),
+        correlation=CorrelationConfig(
+            enabled=perception_cfg.get('correlation', {}).get('enabled', False),
+            padding=perception_cfg.get('correlation', {}).get('padding', 2.0),
+            template_size=perception_cfg.get('correlation', {}).get('template_size', 64),
+            learning_rate=perception_cfg.get('correlation', {}).get('learning_rate', 0.125),
+            sigma=perception_cfg.get('correlation', {}).get('sigma', 2.0),
+            psr_threshold=perception_cfg.get('correlation', {}).get('psr_threshold', 7.0),
+        ),
+        appearance=AppearanceConfig(
+            enabled=perception_cfg.get('appearance', {}).get('enabled', False),
+            hue_bins=perception_cfg.get('appearance', {}).get('hue_bins', 8),
+            sat_bins=perception_cfg.get('appearance', {}).get('sat_bins', 4),
+            max_side=perception_cfg.get('appearance', {}).get('max_side', 32),
         ),
         target_fps=perception_cfg.get('target_fps', 30.0),
     )
@@ -84,36 +193,95 @@ class PerceptionNode:
     Main perception node.
     
     Pipeline: OAK → RGB frame → YOLO → Detections → Tracker → Tracks → ZMQ
+    
+    With ROI mode enabled, lock_state from targeting focuses detection on
+    a native-resolution crop around the locked target.
+    
+    With cadence enabled, detection runs every N frames and the tracker's
+    motion model propagates tracks in between.
+    
+    With the pipeline enabled, capture → inference → tracking run as
+    overlapped threads joined by single-slot drop-oldest queues; otherwise
+    the same stage functions run serially in one loop. Detect/predict and
+    ROI decisions are made in the inference stage, which owns the cadence
+    and ROI state; it sees the tracker only through an immutable
+    TrackerSnapshot that the tracking stage replaces after every step.
+    
+    With correlation enabled, a MOSSE filter follows the locked track on
+    every camera frame in its own thread and publishes `locked_target`;
+    it is re-seeded whenever detection confirms the locked track.
+    
+    Startup milestones (backend import, model load, warm-up, camera boot,
+    first frame, first track) are logged on a StartupTimeline; `ready` is
+    set once the detector is warm and the camera is running.
     """
 
-    def __init__(self, config: PerceptionConfig):
+    def __init__(self, config: PerceptionConfig, timeline: Optional[StartupTimeline] = None):
         """
         Initialize perception node.
         
         Args:
             config: Perception configuration
+            timeline: Startup timeline to record into (default: starts now)
         """
         self.config = config
+        self.timeline = timeline or StartupTimeline("PERCEPTION")
+        self.ready = threading.Event()
         
         # Initialize components
         self._oak = OakBridge(config.camera)
-        self._detector = YoloDetector(config.detector)
+        load_backend(config.detector.backend)
+        self.timeline.mark("backend_import")
+        self._detector = create_detector(config.detector)
+        self.timeline.mark("model_load")
         self._tracker = ByteTrackTracker(config.tracker)
+        self._roi = RoiScheduler(config.roi)
+        self._cadence = DetectionCadence(config.cadence, config.target_fps)
+        
+        self._locked_target: Optional[LockedTargetTracker] = None
+        self._locked_target_stage: Optional[PipelineStage] = None
+        if config.correlation.enabled:
+            self._locked_target = LockedTargetTracker(config.correlation)
         
-        # ZMQ publisher
+        # ZMQ publisher (shared by the tracking and locked-target threads)
         self._publisher = ZmqPublisher(BusPorts.pub_endpoint(BusPorts.PERCEPTION))
+        self._publish_lock = threading.Lock()
+        
+        # Lock feedback from targeting (ROI and correlation modes)
+        self._lock_sub: Optional[ZmqSubscriber] = None
+        if config.roi.enabled or config.correlation.enabled:
+            self._lock_sub = ZmqSubscriber(BusPorts.sub_endpoint(BusPorts.TARGETING))
+            self._lock_sub.subscribe("lock_state")
         
         # State
         self._running = False
         self._frame_count = 0
+        self._last_detection_log = 0.0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._latency_count = 0
+        self._tracker_snapshot = TrackerSnapshot()
+        self._locked_target_sequence: Optional[int] = None
+        self._capture_sequence: Optional[int] = None
         
         logger.info("PerceptionNode initialized")
 
     def start(self) -> None:
-        """Start perception pipeline."""
+        """Start perception pipeline (returns when stopped)."""
         logger.info("Starting perception node...")
+        self.warmup()
         self._oak.start()
+        self.timeline.mark("camera_boot")
         self._running = True
+        if self._locked_target is not None:
+            self._locked_target_stage = PipelineStage(
+                "locked_target", lambda _: self._locked_target_step(),
+                # Poll at twice the camera rate; repeated frames are skipped
+                period=0.5 / self.config.camera.rgb_fps
+            )
+            self._locked_target_stage.start()
+        self.ready.set()
+        self.timeline.mark("ready")
         
         try:
             self._run_loop()
@@ -122,59 +290,242 @@ class PerceptionNode:
         finally:
             self.stop()
 
+    def warmup(self) -> None:
+        """Run dummy inferences at every input shape the loop will use."""
+        iterations = self.config.detector.warmup_iterations
+        if iterations <= 0:
+            return
+        
+        shapes = [(self.config.camera.rgb_height, self.config.camera.rgb_width)]
+        size = self.config.detector.input_size
+        shapes.append((size, size))
+        if self.config.roi.enabled:
+            side = min(self.config.roi.min_size, self.config.camera.rgb_width,
+                       self.config.camera.rgb_height)
+            shapes.append((side, side))
+        shapes = list(dict.fromkeys(shapes))
+        
+        latencies = warmup_detector(self._detector, shapes, iterations)
+        self.timeline.mark("warmup")
+        if latencies:
+            logger.info(
+                f"Detector warm-up: {len(latencies)} inferences over {len(shapes)} shapes, "
+                f"first {latencies[0] * 1000:.0f}ms, last {latencies[-1] * 1000:.1f}ms"
+            )
+
     def stop(self) -> None:
         """Stop perception pipeline."""
         self._running = False
+        self.ready.clear()
+        if self._locked_target_stage:
+            self._locked_target_stage.stop()
         self._oak.stop()
         self._publisher.close()
+        if self._lock_sub:
+            self._lock_sub.close()
         logger.info("Perception node stopped")
 
     def _run_loop(self) -> None:
         """Main processing loop."""
-        target_period = 1.0 / self.config.target_fps
-        last_detection_log = time.time()
+        if self.config.pipeline.enabled:
+            self._run_pipeline()
+            return
+        
+        scheduler = RateScheduler(self.config.target_fps, name="perception")
         
         while self._running:
-            loop_start = time.time()
+            scheduler.wait()
             
-            # Get frame from OAK
-            frame = self._oak.get_frame()
-            if frame is None:
-                time.sleep(0.001)
+            packet = self._capture_stage()
+            if packet is None:
                 continue
+            self._track_stage(self._infer_stage(packet))
 
-            # Run detection
-            detections = self._detector.detect(frame)
+    def _run_pipeline(self) -> None:
+        """Run stages in overlapped threads until stopped."""
+        pipeline = StagePipeline([
+            ("capture", lambda _: self._capture_stage()),
+            # A predicted packet must not overwrite a detected one awaiting tracking
+            ("inference", self._infer_stage, lambda pending: pending.detect),
+            ("tracking", self._track_stage),
+        ], source_period=1.0 / self.config.target_fps)
+        pipeline.start()
+        logger.info("Perception pipeline started")
+        
+        interval = self.config.pipeline.stats_interval_s
+        try:
+            while self._running:
+                time.sleep(interval if interval > 0 else 0.1)
+                if interval > 0:
+                    logger.info(
+                        f"[PERCEPTION] {StagePipeline.format_stats(pipeline.stats())} | "
+                        f"latency {self._take_latency_stats()}"
+                    )
+        finally:
+            pipeline.stop()
+
+    def _capture_stage(self) -> Optional[FramePacket]:
+        """Grab the latest camera frame, stamped with its device capture time."""
+        latest = self._oak.get_rgb_frame()
+        if latest is None or latest.sequence == self._capture_sequence:
+            time.sleep(0.001)
+            return None
+        self._capture_sequence = latest.sequence
+        
+        if self._frame_count == 0:
+            self.timeline.mark("first_frame")
+        packet = FramePacket(
+            frame_id=self._frame_count,
+            frame=latest.image,
+            capture_time=latest.timestamp
+        )
+        self._frame_count += 1
+        return packet
+
+    def _infer_stage(self, packet: FramePacket) -> FramePacket:
+        """Decide detect vs predict, plan ROI crops and run the detector."""
+        self._receive_lock_state()
+        snapshot = self._tracker_snapshot
+        packet.detect = self._cadence.should_detect(packet.frame, snapshot.uncertainty)
+        if not packet.detect:
+            self._cadence.record_prediction(snapshot.predict_s)
+            return packet
+        
+        height, width = packet.frame.shape[:2]
+        packet.roi_rect, packet.run_full = self._roi.plan(width, height)
+        start = time.time()
+        packet.detections = self._detect(packet.frame, packet.roi_rect, packet.run_full)
+        packet.detect_s = time.time() - start
+        self._cadence.record_detection(packet.detect_s + snapshot.update_s, packet.frame)
+        # Stamp with capture time so the tracker's frame period
+        # estimate is not skewed by inference jitter
+        for det in packet.detections:
+            det.timestamp = packet.capture_time
+        return packet
+
+    def _track_stage(self, packet: FramePacket) -> None:
+        """Update or propagate tracks and publish the track list."""
+        start = time.time()
+        snapshot = self._tracker_snapshot
+        if packet.detect:
+            # ROI-only frames: tracks outside the crop were not looked for
+            region = None if packet.run_full else packet.roi_rect
+            tracks = self._tracker.update(packet.detections, packet.frame, region)
+            snapshot = snapshot._replace(update_s=time.time() - start)
+            if self._locked_target is not None:
+                self._locked_target.reseed(tracks, packet.frame)
             
             # Debug: log detection count every 2 seconds
-            if time.time() - last_detection_log > 2.0:
-                logger.info(f"[PERCEPTION] Frame {self._frame_count}: {len(detections)} detections")
-                last_detection_log = time.time()
-            
-            # Run tracking
-            tracks = self._tracker.update(detections, frame)
-            
-            # Create track list message
-            track_list = TrackList(
-                tracks=tracks,
-                frame_id=self._frame_count,
-                timestamp=time.time()
-            )
-            
-            # Publish to ZMQ
-            self._publisher.publish("tracks", track_list)
-            
-            self._frame_count += 1
-            
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < target_period:
-                time.sleep(target_period - elapsed)
+            if time.time() - self._last_detection_log > 2.0:
+                logger.info(
+                    f"[PERCEPTION] Frame {packet.frame_id}: {len(packet.detections)} detections "
+                    f"(detect every {self._cadence.interval} frames)"
+                )
+                self._last_detection_log = time.time()
+        else:
+            # Propagate tracks with the motion model
+            tracks = self._tracker.predict(packet.frame)
+            snapshot = snapshot._replace(predict_s=time.time() - start)
+        if self.config.cadence.enabled:
+            snapshot = snapshot._replace(uncertainty=self._tracker.uncertainty)
+        self._tracker_snapshot = snapshot
+        
+        # Published boxes describe this frame, detected or predicted
+        for track in tracks:
+            track.timestamp = packet.capture_time
+        if self.config.appearance.enabled:
+            attach_appearance(tracks, packet.frame, self.config.appearance)
+        
+        # Create track list message
+        track_list = TrackList(
+            tracks=tracks,
+            frame_id=packet.frame_id,
+            timestamp=time.time()
+        )
+        
+        # Publish to ZMQ
+        self._publish("tracks", track_list)
+        if tracks and not self.timeline.has("first_track"):
+            self.timeline.mark("first_track")
+            logger.info(f"[PERCEPTION] Startup timeline: {self.timeline.summary()}")
+        
+        latency = track_list.timestamp - packet.capture_time
+        self._latency_sum += latency
+        self._latency_max = max(self._latency_max, latency)
+        self._latency_count += 1
+        
+        # Periodic logging
+        if (packet.frame_id + 1) % 100 == 0:
+            logger.debug(f"Frame {packet.frame_id}: {len(tracks)} tracks, latency {latency * 1000:.1f}ms")
+
+    def _locked_target_step(self) -> None:
+        """Follow the locked target on each new camera frame."""
+        latest = self._oak.get_rgb_frame()
+        if latest is None or latest.sequence == self._locked_target_sequence:
+            return
+        self._locked_target_sequence = latest.sequence
+        target = self._locked_target.step(latest.image, latest.timestamp)
+        if target is not None:
+            self._publish("locked_target", target)
+
+    def _publish(self, topic: str, message) -> None:
+        """Publish from any stage thread (ZMQ sockets are not thread-safe)."""
+        with self._publish_lock:
+            self._publisher.publish(topic, message)
 
-            # Periodic logging
-            if self._frame_count % 100 == 0:
-                fps = 1.0 / max(elapsed, 0.001)
-                logger.debug(f"Frame {self._frame_count}: {len(tracks)} tracks, {fps:.1f} FPS")
+    def _take_latency_stats(self) -> str:
+        """Capture-to-publish latency summary since the last call."""
+        if self._latency_count == 0:
+            return "n/a"
+        summary = (
+            f"{self._latency_sum / self._latency_count * 1000:.1f}ms mean / "
+            f"{self._latency_max * 1000:.1f}ms max"
+        )
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._latency_count = 0
+        return summary
+
+    def _detect(
+        self,
+        frame: np.ndarray,
+        rect: Optional[tuple],
+        run_full: bool
+    ) -> List[Detection]:
+        """Run full-frame and/or lock-focused ROI detection on a frame."""
+        detections = self._detector.detect(frame) if run_full else []
+        if rect is None:
+            return detections
+        
+        x1, y1, x2, y2 = rect
+        roi_detections = offset_detections(self._detector.detect(frame[y1:y2, x1:x2]), x1, y1)
+        return merge_detections(detections, roi_detections, rect)
+
+    def _receive_lock_state(self) -> None:
+        """Drain lock_state messages and keep the latest for ROI/correlation."""
+        if self._lock_sub is None:
+            return
+        
+        latest = None
+        while True:
+            result = self._lock_sub.receive(timeout_ms=0)
+            if result is None:
+                break
+            topic, msg = result
+            if isinstance(msg, dict):
+                latest = msg
+        
+        if latest is None:
+            return
+        
+        status = LockStatus.__members__.get(latest.get('status'))
+        bbox = latest.get('bbox')
+        if self._locked_target is not None:
+            self._locked_target.set_lock(status, latest.get('locked_track_id'))
+        self._roi.update_lock(
+            status,
+            BoundingBox(bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2']) if bbox else None
+        )
 
 
 def main():
@@ -184,6 +535,7 @@ def main():
 
     parser = argparse.ArgumentParser(description="Perception Node")
     parser.add_argument("--config-dir", default="configs", help="Config directory")
+    parser.add_argument("--mode", default="bench_px4_v1_16", help="Mode config name")
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO)
@@ -192,6 +544,7 @@ def main():
         os.path.join(args.config_dir, "camera.yaml"),
         os.path.join(args.config_dir, "perception.yaml"),
         os.path.join(args.config_dir, "tracker.yaml"),
+        os.path.join(args.config_dir, "modes", f"{args.mode}.yaml"),
     )
 
     node = PerceptionNode(config)
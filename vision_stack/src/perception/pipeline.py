@@ -0,0 +1,243 @@
+"""
+Threaded stage pipeline for perception.
+
+Stages are connected by single-slot queues with a drop-oldest policy:
+a producer never blocks, it overwrites whatever the consumer has not
+picked up yet. Each stage therefore always works on the freshest item,
+so end-to-end latency stays bounded by the slowest stage instead of
+growing with a backlog, while stages overlap (frame N+1 is captured and
+prepared while frame N is in inference).
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ..common.scheduler import RateScheduler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineConfig:
+    """Perception pipeline configuration."""
+    enabled: bool = False  # Run stages in threads (False = serial loop)
+    stats_interval_s: float = 5.0  # Log per-stage stats this often (0 = never)
+
+
+class LatestSlot:
+    """
+    Thread-safe single-slot queue with drop-oldest semantics.
+
+    put() never blocks and replaces an unconsumed item; get() waits for
+    a new item or times out. With a `keep` predicate, a pending item for
+    which keep() is true is only replaced by another such item (the
+    incoming one is dropped instead).
+    """
+
+    def __init__(self, keep: Optional[Callable[[Any], bool]] = None):
+        self._keep = keep
+        self._cond = threading.Condition()
+        self._item: Any = None
+        self._has_item = False
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        """Store an item, dropping the previous one if not yet consumed."""
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+                if self._keep is not None and self._keep(self._item) and not self._keep(item):
+                    return
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Take the pending item.
+
+        Args:
+            timeout: Max seconds to wait (None = wait until item or close)
+
+        Returns:
+            The item, or None on timeout/close
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._has_item or self._closed, timeout):
+                return None
+            if not self._has_item:
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            return item
+
+    def close(self) -> None:
+        """Wake any waiting consumer; subsequent gets return pending item or None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class StageStats:
+    """Per-stage throughput and occupancy counters."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.busy_s = 0.0
+        self.max_busy_s = 0.0
+        self._window_start = time.monotonic()
+        self._dropped_at_window = 0
+
+    def record(self, busy_s: float) -> None:
+        """Record one processed item."""
+        self.processed += 1
+        self.busy_s += busy_s
+        self.max_busy_s = max(self.max_busy_s, busy_s)
+
+    def snapshot(self, dropped_total: int = 0) -> Dict[str, float]:
+        """
+        Stats since the last snapshot, then reset the window.
+
+        Args:
+            dropped_total: Cumulative inbox drop count for this stage
+
+        Returns:
+            Dict with fps, occupancy (busy fraction), mean/max ms and drops
+        """
+        now = time.monotonic()
+        window = max(now - self._window_start, 1e-6)
+        result = {
+            "fps": self.processed / window,
+            "occupancy": self.busy_s / window,
+            "mean_ms": self.busy_s / self.processed * 1000 if self.processed else 0.0,
+            "max_ms": self.max_busy_s * 1000,
+            "dropped": dropped_total - self._dropped_at_window,
+        }
+        self.processed = 0
+        self.busy_s = 0.0
+        self.max_busy_s = 0.0
+        self._window_start = now
+        self._dropped_at_window = dropped_total
+        return result
+
+
+class PipelineStage:
+    """
+    Worker thread applying a function from an input slot to an output slot.
+
+    The function returns the item to forward, or None to drop it. A stage
+    without an input slot is a source and is called repeatedly, at most
+    once per `period` seconds if given (pacing is not counted as busy).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Optional[Any]],
+        inbox: Optional[LatestSlot] = None,
+        outbox: Optional[LatestSlot] = None,
+        period: Optional[float] = None
+    ):
+        self.name = name
+        self.stats = StageStats(name)
+        self._fn = fn
+        self._inbox = inbox
+        self._outbox = outbox
+        self._scheduler = (RateScheduler(1.0 / period, name=f"perception-{name}")
+                           if period else None)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=f"perception-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the worker thread."""
+        self._running = False
+        if self._inbox:
+            self._inbox.close()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    @property
+    def dropped(self) -> int:
+        """Items overwritten in this stage's inbox before it consumed them."""
+        return self._inbox.dropped if self._inbox else 0
+
+    def _loop(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.reset()
+        while self._running:
+            if self._inbox is not None:
+                item = self._inbox.get(timeout=0.1)
+                if item is None:
+                    continue
+            else:
+                item = None
+                if self._scheduler is not None:
+                    self._scheduler.wait()
+
+            start = time.monotonic()
+            try:
+                result = self._fn(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage '{self.name}' error: {e}")
+                result = None
+            self.stats.record(time.monotonic() - start)
+
+            if result is not None and self._outbox is not None:
+                self._outbox.put(result)
+
+
+class StagePipeline:
+    """Chain of stages connected by single-slot drop-oldest queues."""
+
+    def __init__(self, stages: List[tuple], source_period: Optional[float] = None):
+        """
+        Build a linear pipeline.
+
+        Args:
+            stages: (name, fn) or (name, fn, keep) tuples in order; the
+                first is the source. `keep` is the LatestSlot predicate
+                for the stage's output slot
+            source_period: Minimum seconds between source calls
+        """
+        self.stages: List[PipelineStage] = []
+        inbox = None
+        for i, (name, fn, *keep) in enumerate(stages):
+            outbox = LatestSlot(*keep) if i < len(stages) - 1 else None
+            period = source_period if i == 0 else None
+            self.stages.append(PipelineStage(name, fn, inbox, outbox, period))
+            inbox = outbox
+
+    def start(self) -> None:
+        """Start all stages, sinks first."""
+        for stage in reversed(self.stages):
+            stage.start()
+
+    def stop(self) -> None:
+        """Stop all stages, source first."""
+        for stage in self.stages:
+            stage.stop()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage stats since the previous call."""
+        return {s.name: s.stats.snapshot(s.dropped) for s in self.stages}
+
+    @staticmethod
+    def format_stats(stats: Dict[str, Dict[str, float]]) -> str:
+        """One-line human readable summary of stats()."""
+        return " | ".join(
+            f"{name}: {s['fps']:.1f}fps {s['occupancy'] * 100:.0f}% "
+            f"{s['mean_ms']:.1f}/{s['max_ms']:.1f}ms drop={s['dropped']}"
+            for name, s in stats.items()
+        )
@@ -0,0 +1,492 @@
+"""
+INT8 quantization workflow for the ONNX detector.
+
+Calibrates a static INT8 model from recorded frames, provides a CPU
+detector backend for it, and reports accuracy (mAP@0.5 against the FP32
+model on the same clips) and latency so each deployment can choose.
+
+Usage:
+    python -m src.perception.quantization calibrate \\
+        --model models/best.onnx --output models/best.int8.onnx recordings/
+    python -m src.perception.quantization report \\
+        --model models/best.onnx --int8 models/best.int8.onnx recordings/
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..common.types import Detection
+from .detector import DetectorConfig
+from .onnx_detector import ONNXRUNTIME_AVAILABLE, OnnxDetector, preprocess_frame
+
+logger = logging.getLogger(__name__)
+
+# Try to import quantization tooling (ships with onnxruntime)
+try:
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+    QUANTIZATION_AVAILABLE = True
+except ImportError:
+    CalibrationDataReader = object
+    QUANTIZATION_AVAILABLE = False
+
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".h264")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Calibration folds activation ranges every N frames instead of keeping
+# every frame's intermediate outputs until the end
+CALIBRATION_FLUSH_FRAMES = 16
+
+# Frames in memory, or a factory returning a fresh frame iterator (streamed)
+FrameSource = Union[Sequence[np.ndarray], Callable[[], Iterable[np.ndarray]]]
+
+
+def iter_recording_frames(
+    paths: Sequence[str],
+    stride: int = 1,
+    max_frames: Optional[int] = None
+) -> Iterator[np.ndarray]:
+    """
+    Iterate BGR frames from recordings.
+
+    Args:
+        paths: Video files, image files or directories containing either
+        stride: Keep every Nth frame of each video
+        max_frames: Stop after this many frames (None = all)
+
+    Yields:
+        BGR frames (H, W, 3)
+    """
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith(VIDEO_EXTENSIONS + IMAGE_EXTENSIONS)
+            )
+        else:
+            files.append(path)
+
+    count = 0
+    for path in files:
+        if path.lower().endswith(IMAGE_EXTENSIONS):
+            frames: Iterator[np.ndarray] = iter([cv2.imread(path)])
+        else:
+            frames = _iter_video(path, stride)
+
+        for frame in frames:
+            if frame is None:
+                continue
+            yield frame
+            count += 1
+            if max_frames is not None and count >= max_frames:
+                return
+
+
+def _iter_video(path: str, stride: int) -> Iterator[np.ndarray]:
+    """Iterate every `stride`-th frame of a video file."""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        logger.warning(f"Cannot open recording: {path}")
+        return
+    try:
+        index = 0
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            if index % stride == 0:
+                yield frame
+            index += 1
+    finally:
+        capture.release()
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """
+    Feeds letterboxed recording frames to the ORT calibrator.
+
+    Frames are streamed: each one is read and preprocessed in get_next(),
+    so only the current frame and tensor are held in memory.
+    """
+
+    def __init__(self, frames: FrameSource, input_name: str, input_size: int):
+        """
+        Initialize reader.
+
+        Args:
+            frames: Calibration frames (BGR), or a factory returning a new
+                iterator over them (called again on rewind)
+            input_name: Model input tensor name
+            input_size: Square network input size
+        """
+        self._open = frames if callable(frames) else lambda: iter(frames)
+        self._input_name = input_name
+        self._input_size = input_size
+        self.count = 0  # Frames returned since the last rewind
+        self.rewind()
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        """Return the next calibration batch, or None when exhausted."""
+        frame = self._next
+        if frame is None:
+            return None
+        self._next = next(self._frames, None)
+        self.count += 1
+        return {self._input_name: preprocess_frame(frame, self._input_size)}
+
+    def rewind(self) -> None:
+        """Restart from the first frame (re-opens the source)."""
+        self._frames = iter(self._open())
+        self._next = next(self._frames, None)
+        self.count = 0
+
+    @property
+    def empty(self) -> bool:
+        """No frames left to return."""
+        return self._next is None
+
+
+def quantize_model(
+    model_path: str,
+    output_path: str,
+    frames: FrameSource,
+    input_size: int = 640,
+    per_channel: bool = True,
+    nodes_to_exclude: Optional[List[str]] = None
+) -> str:
+    """
+    Produce a statically quantized INT8 model.
+
+    Args:
+        model_path: FP32 ONNX model
+        output_path: Destination for the INT8 model
+        frames: Calibration frames (BGR), representative of deployment, or
+            a factory returning a new iterator over them (streamed)
+        input_size: Square network input size
+        per_channel: Per-channel weight quantization (better accuracy)
+        nodes_to_exclude: Node names kept in FP32 (e.g. the detection head)
+
+    Returns:
+        Path to the quantized model
+    """
+    if not QUANTIZATION_AVAILABLE:
+        raise RuntimeError("onnxruntime quantization tooling not available")
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(
+        model_path, providers=["CPUExecutionProvider"]
+    ).get_inputs()[0].name
+
+    reader = FrameCalibrationReader(frames, input_name, input_size)
+    if reader.empty:
+        raise ValueError("No calibration frames")
+    logger.info("Calibrating...")
+
+    quantize_static(
+        model_path,
+        output_path,
+        calibration_data_reader=reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=per_channel,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        nodes_to_exclude=nodes_to_exclude,
+        calibrate_method=CalibrationMethod.MinMax,
+        extra_options={"CalibMaxIntermediateOutputs": CALIBRATION_FLUSH_FRAMES},
+    )
+    logger.info(f"Calibrated on {reader.count} frames")
+
+    # Carry class-name metadata over to the quantized model
+    _copy_metadata(model_path, output_path)
+
+    logger.info(f"Wrote INT8 model: {output_path}")
+    return output_path
+
+
+def _copy_metadata(src_path: str, dst_path: str) -> None:
+    """Copy custom metadata (class names etc.) between ONNX files."""
+    try:
+        import onnx
+    except ImportError:
+        return
+    src = onnx.load(src_path, load_external_data=False)
+    dst = onnx.load(dst_path)
+    existing = {p.key for p in dst.metadata_props}
+    for prop in src.metadata_props:
+        if prop.key not in existing:
+            dst.metadata_props.add(key=prop.key, value=prop.value)
+    onnx.save(dst, dst_path)
+
+
+class QuantizedOnnxDetector(OnnxDetector):
+    """
+    INT8 ONNX detector for CPU-only hosts and GPU-saturated fallback.
+
+    Always runs on the CPU execution provider, regardless of config.device.
+    """
+
+    def _providers(self) -> List[str]:
+        """INT8 QDQ models run on the CPU provider."""
+        return ["CPUExecutionProvider"]
+
+
+def detections_to_array(detections: List[Detection]) -> np.ndarray:
+    """Convert detections to an (N, 6) [x1, y1, x2, y2, conf, cls] array."""
+    if not detections:
+        return np.zeros((0, 6), dtype=np.float32)
+    return np.array([
+        [d.bbox.x1, d.bbox.y1, d.bbox.x2, d.bbox.y2, d.confidence, d.class_id]
+        for d in detections
+    ], dtype=np.float32)
+
+
+def _iou_one_to_many(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """IoU of one xyxy box against (N, 4) boxes."""
+    w = (np.minimum(box[2], boxes[:, 2]) - np.maximum(box[0], boxes[:, 0])).clip(0)
+    h = (np.minimum(box[3], boxes[:, 3]) - np.maximum(box[1], boxes[:, 1])).clip(0)
+    inter = w * h
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    union = area + areas - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """All-point interpolated AP (area under the precision envelope)."""
+    mrec = np.concatenate([[0.0], recall, [1.0]])
+    mpre = np.concatenate([[1.0], precision, [0.0]])
+    mpre = np.maximum.accumulate(mpre[::-1])[::-1]
+    steps = np.flatnonzero(mrec[1:] != mrec[:-1])
+    return float(np.sum((mrec[steps + 1] - mrec[steps]) * mpre[steps + 1]))
+
+
+def mean_average_precision(
+    predictions: Sequence[np.ndarray],
+    references: Sequence[np.ndarray],
+    iou_threshold: float = 0.5
+) -> float:
+    """
+    mAP of predictions against reference detections.
+
+    Args:
+        predictions: Per-frame (N, 6) [x1, y1, x2, y2, conf, cls] arrays
+        references: Per-frame (M, 6) arrays used as ground truth
+        iou_threshold: IoU for a true positive
+
+    Returns:
+        mAP over classes present in the references (1.0 if there are none
+        and no predictions either)
+    """
+    ref_classes = set()
+    for ref in references:
+        ref_classes.update(ref[:, 5].astype(int).tolist())
+    if not ref_classes:
+        return 1.0 if all(len(p) == 0 for p in predictions) else 0.0
+
+    aps = []
+    for cls in sorted(ref_classes):
+        scored = []
+        refs_by_frame = []
+        n_refs = 0
+        for frame_idx, (pred, ref) in enumerate(zip(predictions, references)):
+            ref_c = ref[ref[:, 5].astype(int) == cls, :4]
+            refs_by_frame.append(ref_c)
+            n_refs += len(ref_c)
+            for row in pred[pred[:, 5].astype(int) == cls]:
+                scored.append((float(row[4]), frame_idx, row[:4]))
+
+        scored.sort(key=lambda item: -item[0])
+        matched = [np.zeros(len(r), dtype=bool) for r in refs_by_frame]
+        tp = np.zeros(len(scored))
+        for i, (_, frame_idx, box) in enumerate(scored):
+            ref_c = refs_by_frame[frame_idx]
+            if len(ref_c) == 0:
+                continue
+            ious = _iou_one_to_many(box, ref_c)
+            ious[matched[frame_idx]] = -1.0
+            best = int(np.argmax(ious))
+            if ious[best] >= iou_threshold:
+                matched[frame_idx][best] = True
+                tp[i] = 1.0
+
+        cum_tp = np.cumsum(tp)
+        cum_fp = np.cumsum(1.0 - tp)
+        recall = cum_tp / max(n_refs, 1)
+        precision = cum_tp / np.maximum(cum_tp + cum_fp, 1e-9)
+        aps.append(average_precision(recall, precision))
+
+    return float(np.mean(aps))
+
+
+@dataclass
+class LatencyStats:
+    """Per-frame detect() latency in milliseconds."""
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+
+    @staticmethod
+    def from_samples(samples_s: Sequence[float]) -> "LatencyStats":
+        ms = np.asarray(samples_s) * 1000.0
+        return LatencyStats(
+            mean_ms=float(ms.mean()),
+            p50_ms=float(np.percentile(ms, 50)),
+            p95_ms=float(np.percentile(ms, 95)),
+        )
+
+
+@dataclass
+class QuantizationReport:
+    """Accuracy and latency of an INT8 model against its FP32 source."""
+    frames: int
+    map50: float  # INT8 mAP@0.5 with FP32 detections as reference
+    fp32_latency: LatencyStats
+    int8_latency: LatencyStats
+    fp32_provider: str
+    int8_provider: str
+
+    @property
+    def speedup(self) -> float:
+        return self.fp32_latency.mean_ms / max(self.int8_latency.mean_ms, 1e-9)
+
+    def summary(self) -> str:
+        """Human-readable report."""
+        return (
+            f"Frames evaluated:   {self.frames}\n"
+            f"mAP@0.5 vs FP32:    {self.map50:.3f}\n"
+            f"FP32 ({self.fp32_provider}): mean {self.fp32_latency.mean_ms:.1f} ms, "
+            f"p50 {self.fp32_latency.p50_ms:.1f} ms, p95 {self.fp32_latency.p95_ms:.1f} ms\n"
+            f"INT8 ({self.int8_provider}): mean {self.int8_latency.mean_ms:.1f} ms, "
+            f"p50 {self.int8_latency.p50_ms:.1f} ms, p95 {self.int8_latency.p95_ms:.1f} ms\n"
+            f"Speedup:            {self.speedup:.2f}x"
+        )
+
+
+def _detect_timed(detector: OnnxDetector, frame: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Run a detector on one frame, returning (detection array, latency)."""
+    start = time.perf_counter()
+    detections = detector.detect(frame)
+    return detections_to_array(detections), time.perf_counter() - start
+
+
+def evaluate_quantized(
+    fp32_config: DetectorConfig,
+    int8_model_path: str,
+    frames: Iterable[np.ndarray]
+) -> QuantizationReport:
+    """
+    Compare an INT8 model against its FP32 source on the same frames.
+
+    Frames are streamed: both models run on each frame as it is read, and
+    only the (small) detection arrays are kept.
+
+    Args:
+        fp32_config: Detector configuration of the FP32 model
+        int8_model_path: Quantized model
+        frames: Evaluation frames (BGR), e.g. iter_recording_frames()
+
+    Returns:
+        QuantizationReport
+    """
+    fp32 = OnnxDetector(fp32_config)
+    int8 = QuantizedOnnxDetector(replace(fp32_config, model_path=int8_model_path))
+
+    reference, predictions = [], []
+    fp32_times, int8_times = [], []
+    for frame in frames:
+        if not reference:
+            fp32.detect(frame)  # Warm-up, not timed
+            int8.detect(frame)
+        detections, latency = _detect_timed(fp32, frame)
+        reference.append(detections)
+        fp32_times.append(latency)
+        detections, latency = _detect_timed(int8, frame)
+        predictions.append(detections)
+        int8_times.append(latency)
+    if not reference:
+        raise ValueError("No evaluation frames")
+
+    return QuantizationReport(
+        frames=len(reference),
+        map50=mean_average_precision(predictions, reference, iou_threshold=0.5),
+        fp32_latency=LatencyStats.from_samples(fp32_times),
+        int8_latency=LatencyStats.from_samples(int8_times),
+        fp32_provider=fp32.provider or "none",
+        int8_provider=int8.provider or "none",
+    )
+
+
+def main():
+    """Quantization CLI."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="INT8 detector quantization")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cal = sub.add_parser("calibrate", help="Build an INT8 model from recordings")
+    cal.add_argument("recordings", nargs="+", help="Videos, images or directories")
+    cal.add_argument("--model", required=True, help="FP32 ONNX model")
+    cal.add_argument("--output", required=True, help="INT8 ONNX output path")
+    cal.add_argument("--input-size", type=int, default=640)
+    cal.add_argument("--stride", type=int, default=15, help="Use every Nth video frame")
+    cal.add_argument("--max-frames", type=int, default=300)
+    cal.add_argument("--exclude-nodes", nargs="*", default=None,
+                     help="Node names to keep in FP32")
+
+    rep = sub.add_parser("report", help="Compare INT8 against FP32 on recordings")
+    rep.add_argument("recordings", nargs="+", help="Videos, images or directories")
+    rep.add_argument("--model", required=True, help="FP32 ONNX model")
+    rep.add_argument("--int8", required=True, help="INT8 ONNX model")
+    rep.add_argument("--input-size", type=int, default=640)
+    rep.add_argument("--device", default="cpu", help="FP32 device (cpu or CUDA index)")
+    rep.add_argument("--conf", type=float, default=0.25)
+    rep.add_argument("--stride", type=int, default=5)
+    rep.add_argument("--max-frames", type=int, default=500)
+    rep.add_argument("--json", default=None, help="Also write the report as JSON")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if not ONNXRUNTIME_AVAILABLE:
+        parser.error("onnxruntime is required")
+
+    # Streamed from disk (re-opened for every calibration pass)
+    def frames():
+        return iter_recording_frames(args.recordings, args.stride, args.max_frames)
+
+    if args.command == "calibrate":
+        quantize_model(
+            args.model, args.output, frames,
+            input_size=args.input_size,
+            nodes_to_exclude=args.exclude_nodes,
+        )
+    else:
+        config = DetectorConfig(
+            model_path=args.model,
+            confidence_threshold=args.conf,
+            device=args.device,
+            input_size=args.input_size,
+        )
+        report = evaluate_quantized(config, args.int8, frames())
+        print(report.summary())
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(asdict(report), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Lock-focused ROI inference.
+
+While targeting holds a lock, the detector runs every frame on a padded
+native-resolution crop around the locked bbox, and full-frame detection
+drops to a lower cadence. Crop detections are mapped back into frame
+coordinates and merged with the occasional full-frame pass.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..common.types import BoundingBox, Detection, LockStatus
+
+# Crop rectangle in frame pixels: (x1, y1, x2, y2), x2/y2 exclusive
+Rect = Tuple[int, int, int, int]
+
+
+@dataclass
+class RoiConfig:
+    """ROI inference configuration."""
+    enabled: bool = False
+    padding: float = 3.0  # Crop side = padding * max(bbox width, height)
+    min_size: int = 640  # Minimum crop side (detector input size = native pixels)
+    full_frame_interval: int = 5  # Full-frame detection every N frames while locked
+    lock_timeout_ms: float = 500.0  # Ignore lock updates older than this
+
+
+def compute_roi(
+    bbox: BoundingBox,
+    frame_width: int,
+    frame_height: int,
+    padding: float,
+    min_size: int
+) -> Rect:
+    """
+    Compute a square crop around a bbox, shifted to stay inside the frame.
+
+    Args:
+        bbox: Target bbox in frame pixels
+        frame_width, frame_height: Frame size
+        padding: Crop side as a multiple of the larger bbox side
+        min_size: Minimum crop side
+
+    Returns:
+        (x1, y1, x2, y2) crop rectangle
+    """
+    side = max(bbox.width, bbox.height) * padding
+    side = int(min(max(side, min_size), max(frame_width, frame_height)))
+    width = min(side, frame_width)
+    height = min(side, frame_height)
+
+    cx, cy = bbox.center
+    x1 = int(round(cx - width / 2))
+    y1 = int(round(cy - height / 2))
+    x1 = max(0, min(x1, frame_width - width))
+    y1 = max(0, min(y1, frame_height - height))
+    return x1, y1, x1 + width, y1 + height
+
+
+def offset_detections(detections: List[Detection], dx: float, dy: float) -> List[Detection]:
+    """Shift crop-relative detections into frame coordinates (in place)."""
+    for det in detections:
+        det.bbox = BoundingBox(
+            x1=det.bbox.x1 + dx,
+            y1=det.bbox.y1 + dy,
+            x2=det.bbox.x2 + dx,
+            y2=det.bbox.y2 + dy
+        )
+    return detections
+
+
+def merge_detections(
+    full_frame: List[Detection],
+    roi: List[Detection],
+    rect: Rect
+) -> List[Detection]:
+    """
+    Merge full-frame and ROI detections.
+
+    Inside the crop the native-resolution ROI detections are authoritative,
+    so full-frame detections centered in the crop are dropped. On ROI-only
+    frames the tracker is given the crop as its update region, so tracks
+    outside it are carried forward instead of being marked lost.
+    """
+    x1, y1, x2, y2 = rect
+    merged = []
+    for det in full_frame:
+        cx, cy = det.bbox.center
+        if not (x1 <= cx < x2 and y1 <= cy < y2):
+            merged.append(det)
+    merged.extend(roi)
+    return merged
+
+
+class RoiScheduler:
+    """
+    Decides per frame whether to run ROI and/or full-frame detection.
+
+    Fed with lock updates from targeting; falls back to full-frame only
+    when there is no recent lock.
+    """
+
+    def __init__(self, config: RoiConfig):
+        """
+        Initialize ROI scheduler.
+
+        Args:
+            config: ROI configuration
+        """
+        self.config = config
+        self._lock_bbox: Optional[BoundingBox] = None
+        self._lock_time: Optional[float] = None
+        self._frames_since_full = 0
+
+    def update_lock(
+        self,
+        status: Optional[LockStatus],
+        bbox: Optional[BoundingBox],
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Update with the latest lock state from targeting.
+
+        Args:
+            status: Lock status (None/UNLOCKED clears the ROI)
+            bbox: Locked target bbox in frame pixels
+            timestamp: Time of the update (defaults to now)
+        """
+        if status in (LockStatus.LOCKED, LockStatus.LOCKING) and bbox is not None:
+            self._lock_bbox = bbox
+            self._lock_time = timestamp if timestamp is not None else time.time()
+        else:
+            self._lock_bbox = None
+            self._lock_time = None
+
+    def plan(self, frame_width: int, frame_height: int) -> Tuple[Optional[Rect], bool]:
+        """
+        Plan detection for the next frame.
+
+        Args:
+            frame_width, frame_height: Frame size
+
+        Returns:
+            Tuple of (ROI rectangle or None, whether to run full-frame detection)
+        """
+        bbox = self.active_bbox
+        if bbox is None:
+            self._frames_since_full = 0
+            return None, True
+
+        rect = compute_roi(
+            bbox, frame_width, frame_height, self.config.padding, self.config.min_size
+        )
+
+        run_full = self._frames_since_full + 1 >= self.config.full_frame_interval
+        self._frames_since_full = 0 if run_full else self._frames_since_full + 1
+        return rect, run_full
+
+    @property
+    def active_bbox(self) -> Optional[BoundingBox]:
+        """Locked bbox if ROI mode is enabled and the lock is fresh."""
+        if not self.config.enabled or self._lock_bbox is None or self._lock_time is None:
+            return None
+        age_ms = (time.time() - self._lock_time) * 1000
+        if age_ms > self.config.lock_timeout_ms:
+            return None
+        return self._lock_bbox
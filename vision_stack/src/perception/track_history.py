@@ -0,0 +1,163 @@
+"""
+Per-track history ring buffer.
+
+Keeps the last K (timestamp, x1, y1, x2, y2) samples of every track in
+one preallocated array. Each sample is written twice (at i and i + K) so
+the newest n samples are always a contiguous, chronological slice:
+trajectories are returned as NumPy views without copying or per-frame
+allocation.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Sample layout: [timestamp, x1, y1, x2, y2]
+SAMPLE_SIZE = 5
+
+
+class TrackHistory:
+    """Fixed-length trajectory store for many tracks."""
+
+    def __init__(self, length: int, max_tracks: int = 64):
+        """
+        Initialize history.
+
+        Args:
+            length: Samples kept per track (TrackerConfig.track_buffer)
+            max_tracks: Initial number of track slots (doubles when full)
+        """
+        self.length = max(2, length)
+        self._data = np.zeros((max_tracks, 2 * self.length, SAMPLE_SIZE))
+        self._head = np.full(max_tracks, -1, dtype=np.int64)  # last written index (< length)
+        self._count = np.zeros(max_tracks, dtype=np.int64)
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = list(range(max_tracks - 1, -1, -1))
+
+    @property
+    def max_tracks(self) -> int:
+        """Current slot capacity."""
+        return len(self._data)
+
+    def append(
+        self,
+        track_ids: Iterable[int],
+        timestamps: np.ndarray,
+        bboxes: np.ndarray
+    ) -> None:
+        """
+        Append one sample to each of several tracks.
+
+        Args:
+            track_ids: Track IDs (new IDs get a slot)
+            timestamps: (N,) sample times
+            bboxes: (N, 4) xyxy boxes
+        """
+        slots = np.array([self._slot(tid) for tid in track_ids], dtype=np.int64)
+        if len(slots) == 0:
+            return
+        head = (self._head[slots] + 1) % self.length
+        samples = np.column_stack([timestamps, bboxes])
+        self._data[slots, head] = samples
+        self._data[slots, head + self.length] = samples
+        self._head[slots] = head
+        self._count[slots] = np.minimum(self._count[slots] + 1, self.length)
+
+    def remove(self, track_ids: Iterable[int]) -> None:
+        """Forget tracks and free their slots."""
+        for tid in track_ids:
+            slot = self._slots.pop(tid, None)
+            if slot is not None:
+                self._head[slot] = -1
+                self._count[slot] = 0
+                self._free.append(slot)
+
+    def clear(self) -> None:
+        """Forget all tracks."""
+        self.remove(list(self._slots))
+
+    def __contains__(self, track_id: int) -> bool:
+        return track_id in self._slots
+
+    def trajectory(self, track_id: int, n: Optional[int] = None) -> np.ndarray:
+        """
+        Newest samples of a track, oldest first.
+
+        Args:
+            track_id: Track ID
+            n: Max samples (default: all stored)
+
+        Returns:
+            (M, 5) view of [timestamp, x1, y1, x2, y2] rows (M = 0 if unknown)
+        """
+        slot = self._slots.get(track_id)
+        if slot is None:
+            return self._data[0, :0]
+        count = int(self._count[slot])
+        if n is not None:
+            count = min(count, n)
+        end = int(self._head[slot]) + self.length + 1
+        return self._data[slot, end - count:end]
+
+    def centers(self, track_id: int, n: Optional[int] = None) -> np.ndarray:
+        """(M, 3) [timestamp, cx, cy] of the newest samples, oldest first."""
+        traj = self.trajectory(track_id, n)
+        return np.column_stack([
+            traj[:, 0], (traj[:, 1] + traj[:, 3]) / 2, (traj[:, 2] + traj[:, 4]) / 2
+        ])
+
+    def velocity(self, track_id: int, span: int = 5) -> Optional[np.ndarray]:
+        """
+        Center velocity over the newest span samples (endpoint difference).
+
+        Returns:
+            (vx, vy) in px/s, or None with fewer than 2 samples
+        """
+        traj = self.trajectory(track_id, span)
+        if len(traj) < 2:
+            return None
+        return self._rate(traj[0], traj[-1])
+
+    def acceleration(self, track_id: int, span: int = 6) -> Optional[np.ndarray]:
+        """
+        Center acceleration from the velocities of the older and newer
+        halves of the newest span samples.
+
+        Returns:
+            (ax, ay) in px/s², or None with fewer than 3 samples
+        """
+        traj = self.trajectory(track_id, span)
+        if len(traj) < 3:
+            return None
+        mid = len(traj) // 2
+        v_old = self._rate(traj[0], traj[mid])
+        v_new = self._rate(traj[mid], traj[-1])
+        if v_old is None or v_new is None:
+            return None
+        dt = (traj[-1, 0] - traj[0, 0]) / 2
+        return (v_new - v_old) / dt if dt > 0 else None
+
+    @staticmethod
+    def _rate(a: np.ndarray, b: np.ndarray) -> Optional[np.ndarray]:
+        dt = b[0] - a[0]
+        if dt <= 0:
+            return None
+        ca = np.array([(a[1] + a[3]) / 2, (a[2] + a[4]) / 2])
+        cb = np.array([(b[1] + b[3]) / 2, (b[2] + b[4]) / 2])
+        return (cb - ca) / dt
+
+    def _slot(self, track_id: int) -> int:
+        slot = self._slots.get(track_id)
+        if slot is None:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slots[track_id] = slot
+        return slot
+
+    def _grow(self) -> None:
+        old = self.max_tracks
+        self._data = np.concatenate([self._data, np.zeros_like(self._data)])
+        self._head = np.concatenate([self._head, np.full(old, -1, dtype=np.int64)])
+        self._count = np.concatenate([self._count, np.zeros(old, dtype=np.int64)])
+        self._free = list(range(2 * old - 1, old - 1, -1)) + self._free
@@ -1,7 +1,8 @@
 """
 Multi-object tracker implementation.
 
-Uses ByteTrack or OCSORT for stable track IDs across frames.
+ByteTrack (NumPy, batched Kalman filter) for stable track IDs across
+frames, plus a minimal IOU tracker for reference.
 """
 
 import logging
@@ -9,9 +10,13 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import List, Optional, Protocol, Tuple
 
+import cv2
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
-from ..common.types import Detection, Track, BoundingBox
+from ..common.types import Detection, Track, TrackArrays, BoundingBox
+from .ego_motion import EgoMotionEstimator, warp_points, warp_scale
+from .track_history import TrackHistory
 
 logger = logging.getLogger(__name__)
 
@@ -22,273 +27,994 @@ class TrackerConfig:
     max_age: int = 30  # Max frames to keep lost tracks
     min_hits: int = 3  # Min hits before track is confirmed
     iou_threshold: float = 0.3  # IOU threshold for association
-    track_buffer: int = 30  # Buffer size for track history
+    track_buffer: int = 30  # Samples kept per track in the history ring buffer
+    max_tracks: int = 64  # Initial track slot capacity (grows when exceeded)
+    velocity_alpha: float = 0.5  # EMA weight of newest bbox velocity measurement
+    template_refine: bool = False  # Refine predicted boxes by template matching
+    template_search_margin: float = 0.5  # Search margin as fraction of bbox size
+    template_min_score: float = 0.6  # Min normalized correlation to accept a match
+    matching: str = "hungarian"  # "hungarian" (optimal) or "greedy"
+    track_high_thresh: float = 0.5  # ByteTrack: first-stage detection score
+    track_low_thresh: float = 0.1  # ByteTrack: min score for second-stage matching
+    new_track_thresh: float = 0.6  # ByteTrack: min score to start a track
+    low_iou_threshold: float = 0.5  # ByteTrack: IOU threshold for low-score matching
+    frame_rate: float = 30.0  # Initial frame rate for px/s velocities (refined from timestamps)
+    ego_motion: bool = False  # Warp predicted boxes by estimated camera motion
+    ego_motion_width: int = 160  # Width of the downscaled frame used for flow
+    ego_motion_max_features: int = 100  # Max corners tracked for flow
+
+
+def iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
+    """
+    Pairwise IOU between two sets of xyxy boxes.
+    
+    Args:
+        boxes1: (N, 4) boxes
+        boxes2: (M, 4) boxes
+        
+    Returns:
+        (N, M) IOU matrix
+    """
+    boxes1 = np.asarray(boxes1, dtype=np.float64).reshape(-1, 4)
+    boxes2 = np.asarray(boxes2, dtype=np.float64).reshape(-1, 4)
+    
+    ix1 = np.maximum(boxes1[:, None, 0], boxes2[None, :, 0])
+    iy1 = np.maximum(boxes1[:, None, 1], boxes2[None, :, 1])
+    ix2 = np.minimum(boxes1[:, None, 2], boxes2[None, :, 2])
+    iy2 = np.minimum(boxes1[:, None, 3], boxes2[None, :, 3])
+    intersection = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    
+    area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+    union = area1[:, None] + area2[None, :] - intersection
+    
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def centers_in_region(boxes: np.ndarray, region: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+    """
+    Which xyxy boxes have their center inside a region.
+
+    Args:
+        boxes: (N, 4) boxes
+        region: (x1, y1, x2, y2) with x2/y2 exclusive, or None for the whole frame
+
+    Returns:
+        (N,) bool mask
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if region is None:
+        return np.ones(len(boxes), dtype=bool)
+    x1, y1, x2, y2 = region
+    cx = (boxes[:, 0] + boxes[:, 2]) / 2
+    cy = (boxes[:, 1] + boxes[:, 3]) / 2
+    return (cx >= x1) & (cx < x2) & (cy >= y1) & (cy < y2)
+
+
+def associate(
+    scores: np.ndarray,
+    threshold: float,
+    method: str = "hungarian"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Match rows to columns of a similarity matrix (e.g. detections × tracks).
+    
+    Pairs scoring below threshold are gated out before assignment, and
+    rows/columns with no feasible pair are dropped from the problem.
+    
+    Args:
+        scores: (N, M) similarity, higher is better (e.g. IOU)
+        threshold: Minimum score for a valid match
+        method: "hungarian" (scipy linear_sum_assignment) or "greedy"
+        
+    Returns:
+        Tuple of (matches (K, 2) row/col indices, unmatched rows, unmatched cols)
+    """
+    n_rows, n_cols = scores.shape
+    feasible = scores >= threshold
+    rows = np.flatnonzero(feasible.any(axis=1))
+    cols = np.flatnonzero(feasible.any(axis=0))
+    
+    if len(rows) == 0:
+        matches = np.empty((0, 2), dtype=np.intp)
+    elif method == "greedy":
+        sub_rows, sub_cols = np.nonzero(feasible)
+        order = np.argsort(-scores[sub_rows, sub_cols], kind="stable")
+        used_rows = np.zeros(n_rows, dtype=bool)
+        used_cols = np.zeros(n_cols, dtype=bool)
+        pairs = []
+        for r, c in zip(sub_rows[order].tolist(), sub_cols[order].tolist()):
+            if not used_rows[r] and not used_cols[c]:
+                used_rows[r] = used_cols[c] = True
+                pairs.append((r, c))
+        matches = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+    else:
+        sub = scores[np.ix_(rows, cols)]
+        # Gated pairs cost more than any feasible one and are filtered below
+        cost = np.where(sub >= threshold, 1.0 - sub, 1e6)
+        r_idx, c_idx = linear_sum_assignment(cost)
+        keep = sub[r_idx, c_idx] >= threshold
+        matches = np.stack([rows[r_idx[keep]], cols[c_idx[keep]]], axis=1)
+    
+    unmatched_rows = np.setdiff1d(np.arange(n_rows), matches[:, 0], assume_unique=True)
+    unmatched_cols = np.setdiff1d(np.arange(n_cols), matches[:, 1], assume_unique=True)
+    return matches, unmatched_rows, unmatched_cols
 
 
 class Tracker(Protocol):
     """Protocol for multi-object trackers."""
 
-    def update(self, detections: List[Detection], frame: np.ndarray) -> List[Track]:
+    def update(
+        self,
+        detections: List[Detection],
+        frame: np.ndarray,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[Track]:
         """
         Update tracker with new detections.
         
         Args:
             detections: List of detections from current frame
             frame: Current frame (may be used for appearance features)
+            region: Area the detector covered (x1, y1, x2, y2), None = whole
+                frame. Tracks predicted outside it were not looked for: they
+                are propagated with their motion model, not aged toward lost.
             
         Returns:
             List of confirmed tracks
         """
         ...
 
+    def predict(self, frame: np.ndarray) -> List[Track]:
+        """
+        Propagate tracks one frame without running detection.
+        
+        Args:
+            frame: Current frame (may be used to refine predictions)
+            
+        Returns:
+            List of confirmed tracks at their predicted positions
+        """
+        ...
+
+    def predict_ahead(self, dt: float) -> List[Track]:
+        """
+        Confirmed tracks extrapolated dt seconds ahead, without changing state.
+        
+        Args:
+            dt: Seconds ahead of the latest tracker frame
+            
+        Returns:
+            Tracks with predicted bboxes and timestamps advanced by dt
+        """
+        ...
+
+    def trajectory(self, track_id: int, n: Optional[int] = None) -> np.ndarray:
+        """
+        Recent history of a track.
+        
+        Args:
+            track_id: Track ID
+            n: Max samples (default: TrackerConfig.track_buffer)
+            
+        Returns:
+            (M, 5) view of [timestamp, x1, y1, x2, y2] rows, oldest first
+        """
+        ...
+
     def reset(self) -> None:
         """Reset tracker state."""
         ...
 
+    @property
+    def uncertainty(self) -> float:
+        """Prediction uncertainty since the last detection (0 = just detected)."""
+        ...
+
+
+def create_ego_motion(config: TrackerConfig) -> Optional[EgoMotionEstimator]:
+    """Ego-motion estimator for a tracker, or None if disabled."""
+    if not config.ego_motion:
+        return None
+    return EgoMotionEstimator(
+        width=config.ego_motion_width,
+        max_features=config.ego_motion_max_features
+    )
+
+
+class FramePeriodEstimator:
+    """
+    Estimates the tracker frame period from detection timestamps.
+    
+    Trackers step once per frame; this converts per-frame motion into
+    per-second velocities without assuming the nominal camera rate.
+    """
+
+    def __init__(self, frame_rate: float, alpha: float = 0.1):
+        self.period = 1.0 / frame_rate
+        self._alpha = alpha
+        self._last: Optional[Tuple[int, float]] = None
+
+    def update(self, frame_index: int, timestamp: Optional[float]) -> None:
+        """Record the timestamp of a tracker frame."""
+        if timestamp is None:
+            return
+        if self._last is not None:
+            frames = frame_index - self._last[0]
+            elapsed = timestamp - self._last[1]
+            if frames > 0 and elapsed > 0:
+                self.period += self._alpha * (elapsed / frames - self.period)
+        self._last = (frame_index, timestamp)
+
+    def reset(self) -> None:
+        self._last = None
+
 
 class SimpleIOUTracker:
     """
     Simple IOU-based tracker implementation.
     
-    For production, use ByteTrack via the ByteTrackTracker wrapper.
+    For production, use ByteTrackTracker.
     This is a minimal reference implementation.
+    
+    Track state lives in preallocated arrays indexed by slot; freed slots
+    go on a free-list for reuse and capacity doubles when it runs out, so
+    steady-state frames allocate no per-track objects until output.
     """
 
-    def __init__(self, config: TrackerConfig):
+    def __init__(self, config: TrackerConfig, capacity: Optional[int] = None):
         self.config = config
-        self._tracks: dict = {}  # track_id -> track_data
+        self._frame_period = FramePeriodEstimator(config.frame_rate)
+        self.history = TrackHistory(config.track_buffer, config.max_tracks)
+        self._ego_motion = create_ego_motion(config)
+        self._allocate(capacity or config.max_tracks)
         self._next_id = 1
         self._frame_count = 0
 
-    def update(self, detections: List[Detection], frame: np.ndarray) -> List[Track]:
-        """Update tracker with new detections."""
+    def _allocate(self, capacity: int) -> None:
+        """(Re)create empty storage with the given capacity."""
+        self._capacity = capacity
+        self._bbox = np.zeros((capacity, 4))
+        self._velocity = np.zeros((capacity, 4))  # bbox change per frame
+        self._det_bbox = np.zeros((capacity, 4))  # bbox at last detection
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._class_ids = np.zeros(capacity, dtype=np.int64)
+        self._labels = np.empty(capacity, dtype=object)
+        self._confidence = np.zeros(capacity)
+        self._timestamps = np.zeros(capacity)
+        self._hits = np.zeros(capacity, dtype=np.int64)
+        self._age = np.zeros(capacity, dtype=np.int64)
+        self._frames_since_det = np.zeros(capacity, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._templates: List[Optional[np.ndarray]] = [None] * capacity
+        # Pop from the end: lowest slots are reused first
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def _grow(self) -> None:
+        """Double capacity, keeping existing slots in place."""
+        old = self._capacity
+        new = old * 2
+        for name in ("_bbox", "_velocity", "_det_bbox", "_ids", "_class_ids", "_labels",
+                     "_confidence", "_timestamps", "_hits", "_age", "_frames_since_det",
+                     "_active"):
+            array = getattr(self, name)
+            grown = np.zeros((new,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self._templates.extend([None] * old)
+        self._free = list(range(new - 1, old - 1, -1)) + self._free
+        self._capacity = new
+
+    @property
+    def _slots(self) -> np.ndarray:
+        """Indices of live tracks, in creation (ID) order."""
+        slots = np.flatnonzero(self._active)
+        return slots[np.argsort(self._ids[slots], kind="stable")]
+
+    def update(
+        self,
+        detections: List[Detection],
+        frame: np.ndarray,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[Track]:
+        """Update tracker with new detections (see Tracker.update for region)."""
         self._frame_count += 1
+        if detections:
+            self._frame_period.update(self._frame_count, max(d.timestamp for d in detections))
+        self._compensate_camera_motion(frame)
         
+        slots = self._slots
+        if region is not None:
+            # Not covered by the detector: propagate without aging
+            inside = centers_in_region(self._bbox[slots], region)
+            outside = slots[~inside]
+            self._bbox[outside] += self._velocity[outside]
+            self._frames_since_det[outside] += 1
+            slots = slots[inside]
         if not detections:
             # Age out tracks
-            self._age_tracks()
+            self._age_tracks(slots)
+            self._remove_old_tracks()
             return self._get_confirmed_tracks()
 
         # Convert detections to matrix format for matching
-        det_boxes = np.array([[d.bbox.x1, d.bbox.y1, d.bbox.x2, d.bbox.y2] 
+        det_boxes = np.array([[d.bbox.x1, d.bbox.y1, d.bbox.x2, d.bbox.y2]
                               for d in detections])
         
-        # Get existing track boxes
-        track_ids = list(self._tracks.keys())
-        if track_ids:
-            track_boxes = np.array([self._tracks[tid]["bbox"] for tid in track_ids])
-            
-            # Compute IOU matrix
-            iou_matrix = self._compute_iou_matrix(det_boxes, track_boxes)
-            
-            # Greedy matching
-            matched_dets = set()
-            matched_tracks = set()
-            
-            while True:
-                if iou_matrix.size == 0:
-                    break
-                max_iou = np.max(iou_matrix)
-                if max_iou < self.config.iou_threshold:
-                    break
-                
-                det_idx, track_idx = np.unravel_index(np.argmax(iou_matrix), iou_matrix.shape)
-                
-                # Update matched track
-                tid = track_ids[track_idx]
-                det = detections[det_idx]
-                self._update_track(tid, det)
-                
-                matched_dets.add(det_idx)
-                matched_tracks.add(track_idx)
-                
-                # Remove matched from consideration
-                iou_matrix[det_idx, :] = 0
-                iou_matrix[:, track_idx] = 0
-            
-            # Start new tracks for unmatched detections
-            for i, det in enumerate(detections):
-                if i not in matched_dets:
-                    self._create_track(det)
-            
-            # Age unmatched tracks
-            for i, tid in enumerate(track_ids):
-                if i not in matched_tracks:
-                    self._tracks[tid]["age"] += 1
+        if len(slots):
+            # Gated IOU assignment
+            matches, unmatched_dets, unmatched_tracks = associate(
+                iou_matrix(det_boxes, self._bbox[slots]),
+                self.config.iou_threshold,
+                self.config.matching
+            )
+            self._update_tracks(slots[matches[:, 1]], det_boxes[matches[:, 0]],
+                                [detections[i] for i in matches[:, 0].tolist()])
+            self._age_tracks(slots[unmatched_tracks])
         else:
-            # No existing tracks, create from all detections
-            for det in detections:
-                self._create_track(det)
+            unmatched_dets = np.arange(len(detections))
+        
+        # Start new tracks for unmatched detections
+        for i in unmatched_dets.tolist():
+            self._create_track(detections[i])
+        
+        # Record detected boxes in the history
+        detected = np.flatnonzero(self._active & (self._frames_since_det == 0))
+        self.history.append(
+            self._ids[detected].tolist(), self._timestamps[detected], self._bbox[detected]
+        )
 
         # Remove old tracks
         self._remove_old_tracks()
         
+        # Capture appearance templates for predicted frames
+        if self.config.template_refine and frame is not None:
+            self._capture_templates(frame)
+        
         return self._get_confirmed_tracks()
 
-    def _compute_iou_matrix(self, boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
-        """Compute IOU between two sets of boxes."""
-        n1, n2 = len(boxes1), len(boxes2)
-        iou_matrix = np.zeros((n1, n2))
+    def predict(self, frame: np.ndarray) -> List[Track]:
+        """
+        Propagate tracks one frame with their constant-velocity motion model.
         
-        for i in range(n1):
-            for j in range(n2):
-                iou_matrix[i, j] = self._compute_iou(boxes1[i], boxes2[j])
+        Optionally refines each predicted box by matching the track's
+        template in a small search window around the prediction.
+        """
+        self._frame_count += 1
+        self._compensate_camera_motion(frame)
         
-        return iou_matrix
-
-    def _compute_iou(self, box1: np.ndarray, box2: np.ndarray) -> float:
-        """Compute IOU between two boxes."""
-        x1 = max(box1[0], box2[0])
-        y1 = max(box1[1], box2[1])
-        x2 = min(box1[2], box2[2])
-        y2 = min(box1[3], box2[3])
+        live = self._active
+        self._bbox[live] += self._velocity[live]
+        self._age[live] += 1
+        self._frames_since_det[live] += 1
+        
+        if self.config.template_refine and frame is not None:
+            self._refine_with_templates(frame)
         
-        if x2 <= x1 or y2 <= y1:
+        self._remove_old_tracks()
+        return self._get_confirmed_tracks()
+
+    @property
+    def uncertainty(self) -> float:
+        """
+        Largest predicted center displacement since the last detection,
+        in units of bbox size, over confirmed tracks.
+        """
+        mask = (self._active & (self._hits >= self.config.min_hits)
+                & (self._frames_since_det > 0))
+        if not mask.any():
             return 0.0
+        v = self._velocity[mask]
+        speed = np.hypot((v[:, 0] + v[:, 2]) / 2, (v[:, 1] + v[:, 3]) / 2)
+        b = self._bbox[mask]
+        size = np.maximum(np.maximum(b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]), 1.0)
+        return float(np.max(self._frames_since_det[mask] * speed / size))
+
+    def _compensate_camera_motion(self, frame: Optional[np.ndarray]) -> None:
+        """Move track boxes (and velocity references) with the camera."""
+        if self._ego_motion is None or frame is None:
+            return
+        warp = self._ego_motion.estimate(frame)
+        live = np.flatnonzero(self._active)
+        if warp is None or len(live) == 0:
+            return
         
-        intersection = (x2 - x1) * (y2 - y1)
-        area1 = (box1[2] - box1[0]) * (box1[3] - box1[1])
-        area2 = (box2[2] - box2[0]) * (box2[3] - box2[1])
-        union = area1 + area2 - intersection
+        scale = warp_scale(warp)
+        for boxes in (self._bbox, self._det_bbox):
+            b = boxes[live]
+            centers = warp_points(warp, (b[:, :2] + b[:, 2:]) / 2)
+            half = (b[:, 2:] - b[:, :2]) / 2 * scale
+            boxes[live] = np.hstack([centers - half, centers + half])
+        # Rotate/scale per-frame velocities into the new camera frame
+        linear = warp[:, :2]
+        v = self._velocity[live]
+        self._velocity[live] = np.hstack([v[:, :2] @ linear.T, v[:, 2:] @ linear.T])
+
+    @staticmethod
+    def _to_gray(frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame to grayscale (no-op for gray input)."""
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+    def _capture_templates(self, frame: np.ndarray) -> None:
+        """Store grayscale patches of tracks detected this frame."""
+        gray = self._to_gray(frame)
+        height, width = gray.shape[:2]
+        for slot in np.flatnonzero(self._active & (self._frames_since_det == 0)).tolist():
+            x1, y1, x2, y2 = (int(round(c)) for c in self._bbox[slot])
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(width, x2), min(height, y2)
+            self._templates[slot] = (
+                gray[y1:y2, x1:x2].copy() if x2 - x1 >= 4 and y2 - y1 >= 4 else None
+            )
+
+    def _refine_with_templates(self, frame: np.ndarray) -> None:
+        """Snap predicted boxes to the best template match near the prediction."""
+        gray = self._to_gray(frame)
+        height, width = gray.shape[:2]
+        margin_frac = self.config.template_search_margin
         
-        return intersection / union if union > 0 else 0.0
+        candidates = self._active & (self._hits >= self.config.min_hits)
+        for slot in np.flatnonzero(candidates).tolist():
+            template = self._templates[slot]
+            if template is None:
+                continue
+            th, tw = template.shape[:2]
+            bx1, by1 = self._bbox[slot, 0], self._bbox[slot, 1]
+            mx, my = int(tw * margin_frac) + 1, int(th * margin_frac) + 1
+            sx1, sy1 = max(0, int(bx1) - mx), max(0, int(by1) - my)
+            sx2, sy2 = min(width, int(bx1) + tw + mx), min(height, int(by1) + th + my)
+            if sx2 - sx1 < tw or sy2 - sy1 < th:
+                continue
+            
+            scores = cv2.matchTemplate(gray[sy1:sy2, sx1:sx2], template, cv2.TM_CCOEFF_NORMED)
+            _, best, _, (ox, oy) = cv2.minMaxLoc(scores)
+            if best < self.config.template_min_score:
+                continue
+            
+            dx, dy = sx1 + ox - bx1, sy1 + oy - by1
+            self._bbox[slot] += (dx, dy, dx, dy)
 
     def _create_track(self, det: Detection) -> None:
         """Create a new track from detection."""
-        self._tracks[self._next_id] = {
-            "bbox": [det.bbox.x1, det.bbox.y1, det.bbox.x2, det.bbox.y2],
-            "class_id": det.class_id,
-            "label": det.label,
-            "confidence": det.confidence,
-            "hits": 1,
-            "age": 0,
-            "timestamp": det.timestamp
-        }
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        bbox = (det.bbox.x1, det.bbox.y1, det.bbox.x2, det.bbox.y2)
+        self._bbox[slot] = bbox
+        self._det_bbox[slot] = bbox
+        self._velocity[slot] = 0.0
+        self._ids[slot] = self._next_id
+        self._class_ids[slot] = det.class_id
+        self._labels[slot] = det.label
+        self._confidence[slot] = det.confidence
+        self._timestamps[slot] = det.timestamp
+        self._hits[slot] = 1
+        self._age[slot] = 0
+        self._frames_since_det[slot] = 0
+        self._templates[slot] = None
+        self._active[slot] = True
         self._next_id += 1
 
-    def _update_track(self, track_id: int, det: Detection) -> None:
-        """Update existing track with new detection."""
-        track = self._tracks[track_id]
-        track["bbox"] = [det.bbox.x1, det.bbox.y1, det.bbox.x2, det.bbox.y2]
-        track["confidence"] = det.confidence
-        track["hits"] += 1
-        track["age"] = 0
-        track["timestamp"] = det.timestamp
+    def _update_tracks(
+        self,
+        slots: np.ndarray,
+        boxes: np.ndarray,
+        detections: List[Detection]
+    ) -> None:
+        """Update matched tracks with their detections (vectorized)."""
+        if len(slots) == 0:
+            return
+        
+        # Constant-velocity model: per-frame bbox change since last detection
+        frames = (self._frames_since_det[slots] + 1)[:, None]
+        measured = (boxes - self._det_bbox[slots]) / frames
+        a = self.config.velocity_alpha
+        first = (self._hits[slots] == 1)[:, None]
+        self._velocity[slots] = np.where(
+            first, measured, a * measured + (1 - a) * self._velocity[slots]
+        )
+        self._det_bbox[slots] = boxes
+        self._frames_since_det[slots] = 0
+        
+        self._bbox[slots] = boxes
+        self._confidence[slots] = [d.confidence for d in detections]
+        self._timestamps[slots] = [d.timestamp for d in detections]
+        self._hits[slots] += 1
+        self._age[slots] = 0
 
-    def _age_tracks(self) -> None:
-        """Increment age of all tracks."""
-        for tid in self._tracks:
-            self._tracks[tid]["age"] += 1
+    def _age_tracks(self, slots: np.ndarray) -> None:
+        """Increment age of the given tracks."""
+        self._age[slots] += 1
+        self._frames_since_det[slots] += 1
 
     def _remove_old_tracks(self) -> None:
-        """Remove tracks that exceeded max age."""
-        to_remove = [tid for tid, t in self._tracks.items() 
-                     if t["age"] > self.config.max_age]
-        for tid in to_remove:
-            del self._tracks[tid]
-
-    def _get_confirmed_tracks(self) -> List[Track]:
-        """Get tracks that meet minimum hit requirement."""
-        tracks = []
-        for tid, t in self._tracks.items():
-            if t["hits"] >= self.config.min_hits and t["age"] <= self.config.max_age:
-                tracks.append(Track(
-                    track_id=tid,
-                    bbox=BoundingBox(t["bbox"][0], t["bbox"][1], t["bbox"][2], t["bbox"][3]),
-                    class_id=t["class_id"],
-                    label=t["label"],
-                    confidence=t["confidence"],
-                    timestamp=t["timestamp"]
-                ))
-        return tracks
+        """Remove tracks that exceeded max age and return their slots."""
+        expired = np.flatnonzero(self._active & (self._age > self.config.max_age))
+        if len(expired) == 0:
+            return
+        self._active[expired] = False
+        for slot in expired.tolist():
+            self._templates[slot] = None
+        self._free.extend(expired[::-1].tolist())
+        self.history.remove(self._ids[expired].tolist())
+
+    def track_arrays(self, dt: float = 0.0) -> TrackArrays:
+        """
+        Confirmed tracks as a struct of arrays.
+        
+        Args:
+            dt: Seconds to extrapolate bboxes/timestamps ahead
+            
+        Returns:
+            TrackArrays in track ID order
+        """
+        slots = self._slots
+        slots = slots[(self._hits[slots] >= self.config.min_hits)
+                      & (self._age[slots] <= self.config.max_age)]
+        
+        fps = 1.0 / self._frame_period.period
+        v = self._velocity[slots]
+        velocities = np.stack([(v[:, 0] + v[:, 2]) / 2, (v[:, 1] + v[:, 3]) / 2], axis=1) * fps
+        bboxes = self._bbox[slots]
+        if dt:
+            bboxes = bboxes + np.tile(velocities * dt, 2)
+        
+        return TrackArrays(
+            ids=self._ids[slots],
+            bboxes=bboxes,
+            class_ids=self._class_ids[slots],
+            labels=self._labels[slots],
+            confidences=self._confidence[slots],
+            timestamps=self._timestamps[slots] + dt,
+            velocities=velocities
+        )
+
+    def _get_confirmed_tracks(self, dt: float = 0.0) -> List[Track]:
+        """Get tracks that meet minimum hit requirement, dt seconds ahead."""
+        return self.track_arrays(dt).to_tracks()
+
+    def predict_ahead(self, dt: float) -> List[Track]:
+        """
+        Confirmed tracks extrapolated dt seconds ahead (state unchanged).
+        
+        Args:
+            dt: Seconds ahead of the latest tracker frame
+            
+        Returns:
+            Tracks with predicted bboxes and timestamps advanced by dt
+        """
+        return self._get_confirmed_tracks(dt)
+
+    def trajectory(self, track_id: int, n: Optional[int] = None) -> np.ndarray:
+        """Recent detected boxes of a track as a (M, 5) view, oldest first."""
+        return self.history.trajectory(track_id, n)
 
     def reset(self) -> None:
         """Reset tracker state."""
-        self._tracks.clear()
+        self.history.clear()
+        if self._ego_motion is not None:
+            self._ego_motion.reset()
+        self._allocate(self._capacity)
         self._next_id = 1
         self._frame_count = 0
+        self._frame_period.reset()
+
+
+class BatchKalmanFilter:
+    """
+    Constant-velocity Kalman filter over many tracks at once.
+    
+    State per track is [cx, cy, a, h, vcx, vcy, va, vh] (center, aspect
+    ratio w/h, height and their per-frame rates), stored as (N, 8) means
+    and (N, 8, 8) covariances. Noise scales with box height as in
+    ByteTrack/DeepSORT.
+    """
+
+    std_weight_position = 1.0 / 20
+    std_weight_velocity = 1.0 / 160
+
+    def __init__(self):
+        self._update_mat = np.eye(4, 8)
+
+    @staticmethod
+    def _transition(dt: float) -> np.ndarray:
+        motion = np.eye(8)
+        motion[:4, 4:] = np.eye(4) * dt
+        return motion
+
+    @staticmethod
+    def _diag(std: np.ndarray) -> np.ndarray:
+        """(N, k) standard deviations -> (N, k, k) diagonal covariances."""
+        n, k = std.shape
+        out = np.zeros((n, k, k))
+        idx = np.arange(k)
+        out[:, idx, idx] = std ** 2
+        return out
+
+    def initiate(self, measurements: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Create tracks from unassociated (N, 4) xyah measurements.
+        
+        Returns:
+            Tuple of (mean (N, 8), covariance (N, 8, 8))
+        """
+        n = len(measurements)
+        mean = np.hstack([measurements, np.zeros((n, 4))])
+        h = measurements[:, 3]
+        wp, wv = self.std_weight_position, self.std_weight_velocity
+        std = np.stack([
+            2 * wp * h, 2 * wp * h, np.full(n, 1e-2), 2 * wp * h,
+            10 * wv * h, 10 * wv * h, np.full(n, 1e-5), 10 * wv * h
+        ], axis=1)
+        return mean, self._diag(std)
+
+    def predict(
+        self,
+        mean: np.ndarray,
+        covariance: np.ndarray,
+        dt: float = 1.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Propagate all tracks dt frames ahead.
+        
+        Returns:
+            Tuple of (mean (N, 8), covariance (N, 8, 8))
+        """
+        if len(mean) == 0:
+            return mean, covariance
+        h = mean[:, 3]
+        n = len(mean)
+        wp, wv = self.std_weight_position, self.std_weight_velocity
+        std = np.stack([
+            wp * h, wp * h, np.full(n, 1e-2), wp * h,
+            wv * h, wv * h, np.full(n, 1e-5), wv * h
+        ], axis=1)
+        motion = self._transition(dt)
+        mean = mean @ motion.T
+        covariance = motion @ covariance @ motion.T + self._diag(std) * abs(dt)
+        return mean, covariance
+
+    def project(self, mean: np.ndarray, covariance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Project states into (N, 4) measurement space with noise."""
+        h = mean[:, 3]
+        wp = self.std_weight_position
+        std = np.stack([wp * h, wp * h, np.full(len(mean), 1e-1), wp * h], axis=1)
+        H = self._update_mat
+        return mean @ H.T, H @ covariance @ H.T + self._diag(std)
+
+    def update(
+        self,
+        mean: np.ndarray,
+        covariance: np.ndarray,
+        measurements: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Correct all tracks with their (N, 4) xyah measurements.
+        
+        Returns:
+            Tuple of (mean (N, 8), covariance (N, 8, 8))
+        """
+        if len(mean) == 0:
+            return mean, covariance
+        projected_mean, projected_cov = self.project(mean, covariance)
+        # K = P H^T S^-1, solved as S K^T = H P
+        cross = covariance @ self._update_mat.T  # (N, 8, 4)
+        gain = np.linalg.solve(projected_cov, cross.transpose(0, 2, 1)).transpose(0, 2, 1)
+        innovation = measurements - projected_mean
+        mean = mean + np.einsum('nij,nj->ni', gain, innovation)
+        covariance = covariance - gain @ projected_cov @ gain.transpose(0, 2, 1)
+        return mean, covariance
+
+
+def xyxy_to_xyah(boxes: np.ndarray) -> np.ndarray:
+    """(N, 4) corner boxes -> (N, 4) [cx, cy, w/h, h]."""
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([
+        boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w / np.maximum(h, 1e-6), h
+    ], axis=1)
+
+
+def xyah_to_xyxy(states: np.ndarray) -> np.ndarray:
+    """(N, >=4) [cx, cy, w/h, h, ...] -> (N, 4) corner boxes."""
+    h = states[:, 3]
+    w = states[:, 2] * h
+    return np.stack([
+        states[:, 0] - w / 2, states[:, 1] - h / 2,
+        states[:, 0] + w / 2, states[:, 1] + h / 2
+    ], axis=1)
 
 
 class ByteTrackTracker:
     """
-    ByteTrack wrapper for high-performance multi-object tracking.
+    Self-contained ByteTrack multi-object tracker.
+    
+    Tracks live in struct-of-arrays form and are predicted/corrected with
+    one BatchKalmanFilter call per frame. Association runs in stages:
+    
+    1. confirmed (active + lost) tracks vs high-score detections
+    2. remaining active tracks vs low-score detections (recovers
+       occluded/blurred targets the detector is unsure about)
+    3. unconfirmed tracks vs the leftover high-score detections
     
-    Requires: pip install supervision bytetrack
-    Falls back to SimpleIOUTracker if not available.
+    Each track keeps the class and label of its own detections. Lost
+    tracks are kept for max_age frames; unconfirmed tracks (fewer than
+    min_hits matches) are dropped on their first miss. On frames where the
+    detector only covered a region (ROI inference), tracks predicted
+    outside it skip association and keep their Kalman prediction.
     """
 
     def __init__(self, config: TrackerConfig):
         self.config = config
-        self._tracker = None
-        
+        self._kf = BatchKalmanFilter()
+        self._frame_period = FramePeriodEstimator(config.frame_rate)
+        self.history = TrackHistory(config.track_buffer, config.max_tracks)
+        self._ego_motion = create_ego_motion(config)
+        self._last_tracks: List[Track] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset tracker state."""
+        self.history.clear()
+        if self._ego_motion is not None:
+            self._ego_motion.reset()
+        self._mean = np.zeros((0, 8))
+        self._cov = np.zeros((0, 8, 8))
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._class_ids = np.zeros(0, dtype=np.int64)
+        self._labels = np.zeros(0, dtype=object)
+        self._scores = np.zeros(0)
+        self._timestamps = np.zeros(0)
+        self._hits = np.zeros(0, dtype=np.int64)
+        self._lost = np.zeros(0, dtype=bool)
+        self._last_update = np.zeros(0, dtype=np.int64)
+        self._next_id = 1
+        self._frame_count = 0
+        self._frame_period.reset()
+        self._last_tracks = []
+
+    def update(
+        self,
+        detections: List[Detection],
+        frame: np.ndarray,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[Track]:
+        """Update tracker with new detections (see Tracker.update for region)."""
         try:
-            # Try to import ByteTrack via supervision
-            from supervision import ByteTrack
-            self._tracker = ByteTrack(
-                track_activation_threshold=0.25,
-                lost_track_buffer=config.max_age,
-                minimum_matching_threshold=config.iou_threshold,
-                frame_rate=30
-            )
-            logger.info("Using ByteTrack tracker")
-        except ImportError:
-            logger.warning("ByteTrack not available, using SimpleIOUTracker")
-            self._fallback = SimpleIOUTracker(config)
+            self._last_tracks = self._update(detections, frame, region)
+        except Exception as e:
+            # Keep publishing the last tracks so a transient error does not
+            # drop the lock; the next update resynchronizes.
+            logger.exception(f"ByteTrack error: {e}")
+        return self._last_tracks
 
-    def update(self, detections: List[Detection], frame: np.ndarray) -> List[Track]:
-        """Update tracker with new detections."""
-        if self._tracker is None:
-            return self._fallback.update(detections, frame)
+    def predict(self, frame: np.ndarray) -> List[Track]:
+        """Propagate tracks one frame with the Kalman motion model."""
+        self._frame_count += 1
+        self._predict_all(frame)
+        self._remove_expired()
+        self._last_tracks = self._output()
+        return self._last_tracks
 
-        try:
-            import supervision as sv
-            
-            if not detections:
-                # Create empty detections
-                sv_detections = sv.Detections.empty()
-            else:
-                # Convert to supervision format
-                xyxy = np.array([[d.bbox.x1, d.bbox.y1, d.bbox.x2, d.bbox.y2] 
-                                 for d in detections])
-                confidence = np.array([d.confidence for d in detections])
-                class_id = np.array([d.class_id for d in detections])
-                
-                sv_detections = sv.Detections(
-                    xyxy=xyxy,
-                    confidence=confidence,
-                    class_id=class_id
-                )
-
-            # Run ByteTrack
-            tracked = self._tracker.update_with_detections(sv_detections)
-            
-            # Convert back to Track objects
-            tracks = []
-            if tracked.tracker_id is not None:
-                for i in range(len(tracked)):
-                    bbox = tracked.xyxy[i]
-                    tracks.append(Track(
-                        track_id=int(tracked.tracker_id[i]),
-                        bbox=BoundingBox(
-                            x1=float(bbox[0]),
-                            y1=float(bbox[1]),
-                            x2=float(bbox[2]),
-                            y2=float(bbox[3])
-                        ),
-                        class_id=int(tracked.class_id[i]) if tracked.class_id is not None else 0,
-                        label=detections[0].label if detections else "unknown",
-                        confidence=float(tracked.confidence[i]) if tracked.confidence is not None else 0.0
-                    ))
+    def predict_ahead(self, dt: float) -> List[Track]:
+        """
+        Confirmed tracks propagated dt seconds ahead (state unchanged).
+        
+        Used to compensate perception latency: boxes, velocities and
+        covariances are those the filter expects at timestamp + dt.
+        
+        Args:
+            dt: Seconds ahead of the latest tracker frame
             
-            return tracks
-
-        except Exception as e:
-            logger.error(f"ByteTrack error: {e}")
-            return []
+        Returns:
+            Tracks with predicted bboxes and timestamps advanced by dt
+        """
+        idx = np.flatnonzero(self._confirmed & ~self._lost)
+        mean, cov = self._kf.predict(
+            self._mean[idx], self._cov[idx], dt / self._frame_period.period
+        )
+        return self._output(idx, mean, cov, dt)
+
+    def trajectory(self, track_id: int, n: Optional[int] = None) -> np.ndarray:
+        """Recent filtered boxes of a track as a (M, 5) view, oldest first."""
+        return self.history.trajectory(track_id, n)
+
+    @property
+    def uncertainty(self) -> float:
+        """
+        Largest predicted center displacement since the last detection,
+        in units of bbox height, over confirmed active tracks.
+        """
+        active = self._confirmed & ~self._lost
+        if not active.any():
+            return 0.0
+        frames = (self._frame_count - self._last_update)[active]
+        speed = np.hypot(self._mean[active, 4], self._mean[active, 5])
+        height = np.maximum(self._mean[active, 3], 1.0)
+        return float(np.max(frames * speed / height))
+
+    @property
+    def _confirmed(self) -> np.ndarray:
+        return self._hits >= self.config.min_hits
+
+    def _predict_all(self, frame: Optional[np.ndarray] = None) -> None:
+        # Lost tracks do not keep growing/shrinking
+        self._mean[self._lost, 7] = 0.0
+        self._mean, self._cov = self._kf.predict(self._mean, self._cov)
+        self._compensate_camera_motion(frame)
+
+    def _compensate_camera_motion(self, frame: Optional[np.ndarray]) -> None:
+        """Warp predicted states into the current camera frame."""
+        if self._ego_motion is None or frame is None:
+            return
+        warp = self._ego_motion.estimate(frame)
+        if warp is None or len(self._mean) == 0:
+            return
+        
+        scale = warp_scale(warp)
+        rotation = warp[:, :2]
+        # State transform: rotate/scale (cx, cy) and (vcx, vcy), scale h and vh
+        transform = np.eye(8)
+        transform[0:2, 0:2] = rotation
+        transform[4:6, 4:6] = rotation
+        transform[3, 3] = transform[7, 7] = scale
+        self._mean = self._mean @ transform.T
+        self._mean[:, :2] += warp[:, 2]
+        self._cov = transform @ self._cov @ transform.T
+
+    def _update(
+        self,
+        detections: List[Detection],
+        frame: Optional[np.ndarray] = None,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> List[Track]:
+        self._frame_count += 1
+        cfg = self.config
 
-    def reset(self) -> None:
-        """Reset tracker state."""
-        if self._tracker:
-            self._tracker.reset()
-        elif hasattr(self, '_fallback'):
-            self._fallback.reset()
+        if detections:
+            self._frame_period.update(self._frame_count, max(d.timestamp for d in detections))
+            det_boxes = np.array([[d.bbox.x1, d.bbox.y1, d.bbox.x2, d.bbox.y2]
+                                  for d in detections], dtype=np.float64)
+            det_scores = np.array([d.confidence for d in detections])
+        else:
+            det_boxes = np.zeros((0, 4))
+            det_scores = np.zeros(0)
+
+        high = np.flatnonzero(det_scores >= cfg.track_high_thresh)
+        low = np.flatnonzero((det_scores >= cfg.track_low_thresh) &
+                             (det_scores < cfg.track_high_thresh))
+
+        self._predict_all(frame)
+        track_boxes = xyah_to_xyxy(self._mean)
+        matched_tracks: List[int] = []
+        matched_dets: List[int] = []
+
+        def match(track_idx: np.ndarray, det_idx: np.ndarray, threshold: float):
+            if len(track_idx) == 0 or len(det_idx) == 0:
+                return det_idx, track_idx
+            pairs, rest_dets, rest_tracks = associate(
+                iou_matrix(det_boxes[det_idx], track_boxes[track_idx]), threshold, cfg.matching
+            )
+            matched_dets.extend(det_idx[pairs[:, 0]].tolist())
+            matched_tracks.extend(track_idx[pairs[:, 1]].tolist())
+            return det_idx[rest_dets], track_idx[rest_tracks]
+
+        confirmed = self._confirmed
+        # Tracks outside the detected region keep their prediction and state
+        covered = centers_in_region(track_boxes, region)
+        # Stage 1: confirmed tracks (active and lost) vs high-score detections
+        high, pool = match(np.flatnonzero(confirmed & covered), high, cfg.iou_threshold)
+        # Stage 2: still-active tracks vs low-score detections
+        _, unmatched_active = match(pool[~self._lost[pool]], low, cfg.low_iou_threshold)
+        # Stage 3: unconfirmed tracks vs leftover high-score detections
+        high, unmatched_new = match(np.flatnonzero(~confirmed & covered), high, cfg.iou_threshold)
+
+        # Correct matched tracks
+        if matched_tracks:
+            t = np.array(matched_tracks)
+            d = np.array(matched_dets)
+            self._mean[t], self._cov[t] = self._kf.update(
+                self._mean[t], self._cov[t], xyxy_to_xyah(det_boxes[d])
+            )
+            self._hits[t] += 1
+            self._lost[t] = False
+            self._last_update[t] = self._frame_count
+            self._scores[t] = det_scores[d]
+            for ti, di in zip(t.tolist(), d.tolist()):
+                self._class_ids[ti] = detections[di].class_id
+                self._labels[ti] = detections[di].label
+                self._timestamps[ti] = detections[di].timestamp
+
+        self._lost[unmatched_active] = True
+        keep = np.ones(len(self._ids), dtype=bool)
+        keep[unmatched_new] = False
+        self._select(keep)
+
+        # Start tracks from confident unmatched detections
+        new = high[det_scores[high] >= cfg.new_track_thresh]
+        if len(new):
+            self._create(det_boxes[new], [detections[i] for i in new.tolist()])
+
+        # Record filtered boxes of tracks updated this frame
+        updated = np.flatnonzero(self._last_update == self._frame_count)
+        self.history.append(
+            self._ids[updated].tolist(), self._timestamps[updated],
+            xyah_to_xyxy(self._mean[updated])
+        )
+
+        self._remove_expired()
+        return self._output()
+
+    def _create(self, boxes: np.ndarray, detections: List[Detection]) -> None:
+        n = len(detections)
+        mean, cov = self._kf.initiate(xyxy_to_xyah(boxes))
+        self._mean = np.concatenate([self._mean, mean])
+        self._cov = np.concatenate([self._cov, cov])
+        self._ids = np.concatenate([self._ids, np.arange(self._next_id, self._next_id + n)])
+        self._next_id += n
+        self._class_ids = np.concatenate([self._class_ids, [d.class_id for d in detections]])
+        labels = np.empty(n, dtype=object)
+        labels[:] = [d.label for d in detections]
+        self._labels = np.concatenate([self._labels, labels])
+        self._scores = np.concatenate([self._scores, [d.confidence for d in detections]])
+        self._timestamps = np.concatenate([self._timestamps, [d.timestamp for d in detections]])
+        self._hits = np.concatenate([self._hits, np.ones(n, dtype=np.int64)])
+        self._lost = np.concatenate([self._lost, np.zeros(n, dtype=bool)])
+        self._last_update = np.concatenate([self._last_update, np.full(n, self._frame_count)])
+
+    def _select(self, keep: np.ndarray) -> None:
+        """Keep only the tracks where keep is True."""
+        if keep.all():
+            return
+        self.history.remove(self._ids[~keep].tolist())
+        self._mean = self._mean[keep]
+        self._cov = self._cov[keep]
+        self._ids = self._ids[keep]
+        self._class_ids = self._class_ids[keep]
+        self._labels = self._labels[keep]
+        self._scores = self._scores[keep]
+        self._timestamps = self._timestamps[keep]
+        self._hits = self._hits[keep]
+        self._lost = self._lost[keep]
+        self._last_update = self._last_update[keep]
+
+    def _remove_expired(self) -> None:
+        """Drop lost tracks that have not been matched for max_age frames."""
+        expired = self._lost & (self._frame_count - self._last_update > self.config.max_age)
+        self._select(~expired)
+
+    def _output(
+        self,
+        idx: Optional[np.ndarray] = None,
+        mean: Optional[np.ndarray] = None,
+        cov: Optional[np.ndarray] = None,
+        dt: float = 0.0
+    ) -> List[Track]:
+        """Confirmed, currently tracked targets (optionally with given states)."""
+        if idx is None:
+            idx = np.flatnonzero(self._confirmed & ~self._lost)
+            mean, cov = self._mean[idx], self._cov[idx]
+        
+        # Per-frame -> per-second units for (cx, cy, vcx, vcy)
+        fps = 1.0 / self._frame_period.period
+        scale = np.array([1.0, 1.0, fps, fps])
+        sel = [0, 1, 4, 5]
+        velocities = (mean[:, 4:6] * fps).tolist()
+        covariances = (cov[:, sel][:, :, sel] * scale[:, None] * scale[None, :]).reshape(-1, 16)
+        boxes = xyah_to_xyxy(mean).tolist()
+        
+        return [
+            Track(
+                track_id=int(self._ids[i]),
+                bbox=BoundingBox(*box),
+                class_id=int(self._class_ids[i]),
+                label=self._labels[i],
+                confidence=float(self._scores[i]),
+                timestamp=float(self._timestamps[i]) + dt,
+                velocity=tuple(velocity),
+                covariance=covariance
+            )
+            for i, box, velocity, covariance in zip(
+                idx.tolist(), boxes, velocities, covariances.tolist()
+            )
+        ]
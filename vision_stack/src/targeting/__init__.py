@@ -2,6 +2,7 @@
 
 from .lock_manager import LockManager, LockConfig
 from .errors import ErrorComputer, ErrorConfig
+from .prioritizer import TargetPrioritizer, PriorityConfig
 from .targeting_node import TargetingNode, TargetingConfig, load_targeting_config
 
 __all__ = [
@@ -9,6 +10,8 @@ __all__ = [
     "LockConfig",
     "ErrorComputer",
     "ErrorConfig",
+    "TargetPrioritizer",
+    "PriorityConfig",
     "TargetingNode",
     "TargetingConfig",
     "load_targeting_config",
@@ -5,12 +5,15 @@ Computes yaw, pitch, and range errors from target position
 relative to camera optical axis.
 """
 
-import math
+import time
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
-from ..common.types import Track, Errors, CameraIntrinsics, BoundingBox
-from ..common.math3d import pixel_to_angles
+import numpy as np
+
+from ..common.types import Track, TrackArrays, Errors, CameraIntrinsics, BoundingBox
+from ..common.math3d import pixel_to_angles, rotation_matrix_from_euler
+from ..common.angle_lut import AngleLUT
 
 
 @dataclass
@@ -20,6 +23,30 @@ class ErrorConfig:
     min_range_m: float = 3.0  # Minimum valid range
     max_range_m: float = 50.0  # Maximum valid range
     depth_percentile: float = 50.0  # Which percentile to use for depth ROI
+    # Latency compensation: aim at where the target will be at actuation
+    predictive: bool = False
+    actuation_latency_s: float = 0.03  # Publish -> setpoint applied by the FC
+    max_lead_s: float = 0.3  # Cap on the extrapolation horizon
+    # Lens-distortion-aware pixel -> angle mapping via a cached lookup table
+    angle_lut: bool = False
+    lut_step: int = 8  # LUT grid spacing in pixels
+    # Rotate the line of sight out of the body-fixed camera frame using the
+    # aircraft attitude at capture time: "none", "level" (remove roll) or
+    # "earth" (remove roll and pitch)
+    derotation: str = "none"
+
+
+@dataclass
+class ErrorArrays:
+    """Errors for N tracks (row i = track i of the input TrackArrays)."""
+    yaw_error: np.ndarray  # (N,) radians
+    pitch_error: np.ndarray  # (N,) radians
+    range_error: np.ndarray  # (N,) meters, NaN without depth
+    depth_valid: np.ndarray  # (N,) bool, depth within [min_range_m, max_range_m]
+    lead_time_s: np.ndarray  # (N,) seconds extrapolated (predictive mode)
+
+    def __len__(self) -> int:
+        return len(self.yaw_error)
 
 
 class ErrorComputer:
@@ -30,24 +57,52 @@ class ErrorComputer:
     - yaw_error: Horizontal angular offset from optical axis (positive = target right)
     - pitch_error: Vertical angular offset from optical axis (positive = target above)
     - range_error: Distance error from desired range (positive = target too far)
+    
+    In predictive mode the target center is extrapolated with the track
+    velocity over the frame age (capture → now) plus the expected
+    actuation latency, and the applied lead is reported in
+    Errors.lead_time_s.
+    
+    compute_all() evaluates every track in one NumPy pass; compute() runs
+    the same kernel on a single row.
+    
+    With an AngleLUT, pixel positions are mapped to angles through the
+    lens-distortion-corrected table instead of the pinhole model.
+    
+    With derotation enabled and an attitude given, the line of sight is
+    rotated from the (rolled) camera frame into a level or earth frame
+    before the angles are taken, so a bank does not couple yaw and pitch
+    errors.
     """
 
-    def __init__(self, intrinsics: CameraIntrinsics, config: ErrorConfig):
+    def __init__(
+        self,
+        intrinsics: CameraIntrinsics,
+        config: ErrorConfig,
+        lut: Optional[AngleLUT] = None
+    ):
         """
         Initialize error computer.
         
         Args:
             intrinsics: Camera intrinsic parameters
             config: Error computation configuration
+            lut: Pixel -> angle table; when None and config.angle_lut is
+                set, one is built from intrinsics.distortion (uncached)
         """
         self.intrinsics = intrinsics
         self.config = config
+        if lut is None and config.angle_lut:
+            lut = AngleLUT.build(intrinsics, intrinsics.distortion, config.lut_step)
+        self.lut = lut
 
     def compute(
         self,
         track: Optional[Track],
         depth_m: Optional[float],
-        lock_valid: bool
+        lock_valid: bool,
+        now: Optional[float] = None,
+        attitude: Optional[Tuple[float, float, float]] = None
     ) -> Errors:
         """
         Compute tracking errors.
@@ -56,6 +111,8 @@ class ErrorComputer:
             track: Locked target track (may be None)
             depth_m: Depth to target in meters (may be None)
             lock_valid: Whether lock is currently valid
+            now: Current time for the frame age (default: time.time())
+            attitude: (roll, pitch, yaw) at the track's capture time, for derotation
             
         Returns:
             Errors object with computed errors and validity flags
@@ -76,38 +133,132 @@ class ErrorComputer:
         # Track is valid
         errors.track_valid = True
 
-        # Compute target center in pixels
-        cx, cy = track.bbox.center
-
-        # Compute angular errors using camera intrinsics
-        yaw_error, pitch_error = pixel_to_angles(
-            u=cx,
-            v=cy,
-            fx=self.intrinsics.fx,
-            fy=self.intrinsics.fy,
-            cx=self.intrinsics.cx,
-            cy=self.intrinsics.cy
+        result = self.compute_all(
+            TrackArrays.from_tracks([track]),
+            np.array([np.nan if depth_m is None else depth_m]),
+            now,
+            attitude
         )
+        errors.yaw_error = float(result.yaw_error[0])
+        errors.pitch_error = float(result.pitch_error[0])
+        errors.lead_time_s = float(result.lead_time_s[0])
 
-        errors.yaw_error = yaw_error
-        errors.pitch_error = pitch_error
-
-        # Compute range error if depth is valid
+        # Range error is reported even when depth is out of the valid range
         if depth_m is not None:
-            if self.config.min_range_m <= depth_m <= self.config.max_range_m:
-                errors.depth_valid = True
-                errors.range_error = depth_m - self.config.desired_range_m
-            else:
-                # Depth out of valid range
-                errors.depth_valid = False
-                # Still provide error estimate for out-of-range cases
-                if depth_m < self.config.min_range_m:
-                    errors.range_error = depth_m - self.config.desired_range_m
-                else:
-                    errors.range_error = depth_m - self.config.desired_range_m
+            errors.depth_valid = bool(result.depth_valid[0])
+            errors.range_error = float(result.range_error[0])
 
         return errors
 
+    def compute_all(
+        self,
+        track_array: TrackArrays,
+        depth_array: Optional[np.ndarray] = None,
+        now: Optional[float] = None,
+        attitude: Optional[Tuple[float, float, float]] = None
+    ) -> ErrorArrays:
+        """
+        Compute errors for all tracks at once.
+        
+        Args:
+            track_array: Tracks as arrays (bboxes, velocities, timestamps)
+            depth_array: (N,) depth per track in meters, NaN if unknown
+            now: Current time for the frame age (default: time.time())
+            attitude: (roll, pitch, yaw) at the frame's capture time, for
+                derotation (errors stay in the camera frame without it)
+            
+        Returns:
+            ErrorArrays with one row per track
+        """
+        n = len(track_array)
+        boxes = track_array.bboxes
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+
+        lead = np.zeros(n)
+        if self.config.predictive and n:
+            now = time.time() if now is None else now
+            lead = np.clip(now - track_array.timestamps + self.config.actuation_latency_s,
+                           0.0, self.config.max_lead_s)
+            velocities = track_array.velocities
+            lead[~np.isfinite(velocities).all(axis=1)] = 0.0
+            centers = centers + np.nan_to_num(velocities) * lead[:, None]
+
+        yaw, pitch = self._angles(centers[:, 0], centers[:, 1])
+        if attitude is not None and self.config.derotation != "none":
+            yaw, pitch = self.derotate(yaw, pitch, attitude)
+
+        depth = np.full(n, np.nan) if depth_array is None else np.asarray(depth_array, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            depth_valid = (depth >= self.config.min_range_m) & (depth <= self.config.max_range_m)
+
+        return ErrorArrays(
+            yaw_error=yaw,
+            pitch_error=pitch,
+            range_error=depth - self.config.desired_range_m,
+            depth_valid=depth_valid,
+            lead_time_s=lead
+        )
+
+    def _angles(self, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Yaw/pitch of pixel arrays (LUT if available, else pinhole)."""
+        if self.lut is not None:
+            return self.lut.angles(u, v)
+        # Pinhole model; pitch is negated because image y increases downward
+        intr = self.intrinsics
+        return np.arctan2(u - intr.cx, intr.fx), -np.arctan2(v - intr.cy, intr.fy)
+
+    def derotate(
+        self,
+        yaw: np.ndarray,
+        pitch: np.ndarray,
+        attitude: Tuple[float, float, float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rotate camera-frame angles into the configured reference frame.
+        
+        The camera is assumed body-fixed and looking along the body x axis.
+        
+        Args:
+            yaw, pitch: Camera-frame angles (pixel_to_angles convention)
+            attitude: Aircraft (roll, pitch, yaw) in radians
+            
+        Returns:
+            (yaw, pitch) in the level frame (roll removed) or earth frame
+            (roll and pitch removed); heading is never removed
+        """
+        roll_rad, pitch_rad, _ = attitude
+        if self.config.derotation == "level":
+            pitch_rad = 0.0
+        los = self._body_line_of_sight(yaw, pitch) @ rotation_matrix_from_euler(roll_rad, pitch_rad, 0.0).T
+        return np.arctan2(los[..., 1], los[..., 0]), -np.arctan2(los[..., 2], los[..., 0])
+
+    def line_of_sight(
+        self,
+        u: np.ndarray,
+        v: np.ndarray,
+        attitude: Optional[Tuple[float, float, float]] = None
+    ) -> np.ndarray:
+        """
+        Unit line-of-sight vectors of pixels.
+        
+        Args:
+            u, v: Pixel coordinates (arrays of the same shape)
+            attitude: Aircraft (roll, pitch, yaw); rotates into NED when given
+            
+        Returns:
+            (..., 3) unit vectors in NED, or body FRD without attitude
+        """
+        yaw, pitch = self._angles(np.asarray(u, dtype=np.float64), np.asarray(v, dtype=np.float64))
+        los = self._body_line_of_sight(yaw, pitch)
+        if attitude is not None:
+            los = los @ rotation_matrix_from_euler(*attitude).T
+        return los / np.linalg.norm(los, axis=-1, keepdims=True)
+
+    @staticmethod
+    def _body_line_of_sight(yaw: np.ndarray, pitch: np.ndarray) -> np.ndarray:
+        """Line of sight in body FRD axes: forward, right (tan yaw), down (-tan pitch)."""
+        return np.stack([np.ones_like(yaw), np.tan(yaw), -np.tan(pitch)], axis=-1)
+
     def compute_from_pixel(
         self,
         pixel: Tuple[float, float],
@@ -125,14 +276,17 @@ class ErrorComputer:
         """
         u, v = pixel
 
-        yaw_error, pitch_error = pixel_to_angles(
-            u=u,
-            v=v,
-            fx=self.intrinsics.fx,
-            fy=self.intrinsics.fy,
-            cx=self.intrinsics.cx,
-            cy=self.intrinsics.cy
-        )
+        if self.lut is not None:
+            yaw_error, pitch_error = self.lut.angles(u, v)
+        else:
+            yaw_error, pitch_error = pixel_to_angles(
+                u=u,
+                v=v,
+                fx=self.intrinsics.fx,
+                fy=self.intrinsics.fy,
+                cx=self.intrinsics.cx,
+                cy=self.intrinsics.cy
+            )
 
         range_error = 0.0
         if depth_m is not None:
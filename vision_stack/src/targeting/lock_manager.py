@@ -8,7 +8,9 @@ and loss-of-track detection.
 import logging
 import time
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from ..common.types import Track, LockState, LockStatus, BoundingBox
 
@@ -22,6 +24,28 @@ class LockConfig:
     reacquire_timeout_ms: float = 2000.0  # Time to try reacquiring before giving up
     iou_threshold: float = 0.3  # IOU threshold for track matching
     max_pixel_distance: float = 100.0  # Max pixel distance for pixel selection
+    # Reacquisition after track ID switches
+    appearance_weight: float = 1.0  # Weight of appearance similarity vs IOU
+    appearance_threshold: float = 0.8  # Min histogram similarity (0-1) without IOU
+    reacquire_radius: float = 3.0  # Max center distance in bbox heights without IOU
+
+
+def box_ious(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """IOU of one xyxy box against (N, 4) boxes."""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    union = area + areas - intersection
+    return np.divide(intersection, union, out=np.zeros_like(union), where=union > 0)
+
+
+def histogram_similarity(signature: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+    """Bhattacharyya coefficient (1 = identical) of one histogram vs (N, D)."""
+    return np.sqrt(signatures * signature).sum(axis=1)
 
 
 class LockManager:
@@ -32,6 +56,9 @@ class LockManager:
     - Selection by track_id
     - Selection by pixel click (finds nearest track)
     - Maintaining lock across frames via track_id
+    - Re-binding to a new track_id after an ID switch, scored by IOU with
+      the motion-predicted last bbox plus appearance similarity; tracks
+      seen alongside the locked target are other objects and are excluded
     - Timeout on loss-of-track
     """
 
@@ -49,6 +76,10 @@ class LockManager:
         self._lock_timestamp: Optional[float] = None
         self._last_seen_timestamp: Optional[float] = None
         self._lock_bbox: Optional[BoundingBox] = None
+        self._last_track: Optional[Track] = None
+        self._appearance: Optional[np.ndarray] = None  # Cached once per lock
+        # Track ID -> last time it was seen in a frame with the locked target
+        self._coexisting: Dict[int, float] = {}
         self._status = LockStatus.UNLOCKED
         self._frames_locked = 0
         
@@ -68,6 +99,7 @@ class LockManager:
         for track in tracks:
             if track.track_id == track_id:
                 self._lock_to_track(track)
+                self._note_coexisting(tracks, self._lock_timestamp)
                 logger.info(f"Locked to track ID {track_id}")
                 return True
         
@@ -91,28 +123,24 @@ class LockManager:
             logger.warning("No tracks available for pixel selection")
             return False
 
-        # Find track with bbox containing or nearest to click point
-        best_track = None
-        best_distance = float('inf')
-        
-        for track in tracks:
-            bbox = track.bbox
-            cx, cy = bbox.center
-            
-            # Check if click is inside bbox
-            if bbox.x1 <= u <= bbox.x2 and bbox.y1 <= v <= bbox.y2:
-                best_track = track
-                best_distance = 0
-                break
-            
-            # Otherwise compute distance to center
-            distance = ((u - cx) ** 2 + (v - cy) ** 2) ** 0.5
-            if distance < best_distance:
-                best_distance = distance
-                best_track = track
+        # Track with bbox containing the click point (first one), else nearest center
+        boxes = np.array([[t.bbox.x1, t.bbox.y1, t.bbox.x2, t.bbox.y2] for t in tracks],
+                         dtype=np.float64)
+        inside = ((boxes[:, 0] <= u) & (u <= boxes[:, 2]) &
+                  (boxes[:, 1] <= v) & (v <= boxes[:, 3]))
+        if inside.any():
+            best_track = tracks[int(np.argmax(inside))]
+            best_distance = 0.0
+        else:
+            centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+            distances = np.hypot(centers[:, 0] - u, centers[:, 1] - v)
+            best = int(np.argmin(distances))
+            best_track = tracks[best]
+            best_distance = float(distances[best])
 
         if best_track and best_distance <= self.config.max_pixel_distance:
             self._lock_to_track(best_track)
+            self._note_coexisting(tracks, self._lock_timestamp)
             logger.info(f"Locked to track ID {best_track.track_id} via pixel ({u}, {v})")
             return True
         
@@ -125,9 +153,21 @@ class LockManager:
         self._lock_timestamp = time.time()
         self._last_seen_timestamp = time.time()
         self._lock_bbox = track.bbox
+        self._last_track = track
+        self._appearance = np.asarray(track.appearance) if track.appearance else None
+        self._coexisting = {}
         self._status = LockStatus.LOCKED
         self._frames_locked = 0
 
+    def _note_coexisting(self, tracks: List[Track], current_time: float) -> None:
+        """Remember the other tracks in a frame where the locked target is visible."""
+        for track in tracks:
+            if track.track_id != self._locked_track_id:
+                self._coexisting[track.track_id] = current_time
+        # Only the reacquisition window matters
+        horizon = current_time - self.config.reacquire_timeout_ms / 1000.0
+        self._coexisting = {k: t for k, t in self._coexisting.items() if t >= horizon}
+
     def update(self, tracks: List[Track]) -> LockState:
         """
         Update lock state with new tracks.
@@ -150,12 +190,19 @@ class LockManager:
                 found_track = track
                 break
 
+        if found_track is None:
+            found_track = self._reacquire(tracks, current_time)
+
         if found_track:
             # Track still visible
             self._last_seen_timestamp = current_time
             self._lock_bbox = found_track.bbox
+            self._last_track = found_track
+            if self._appearance is None and found_track.appearance:
+                self._appearance = np.asarray(found_track.appearance)
             self._status = LockStatus.LOCKED
             self._frames_locked += 1
+            self._note_coexisting(tracks, current_time)
         else:
             # Track not in current frame
             time_since_seen = (current_time - self._last_seen_timestamp) * 1000  # ms
@@ -176,9 +223,65 @@ class LockManager:
             status=self._status,
             locked_track_id=self._locked_track_id,
             lock_timestamp=self._lock_timestamp,
-            frames_since_lock=self._frames_locked
+            frames_since_lock=self._frames_locked,
+            bbox=self._lock_bbox
         )
 
+    def _reacquire(self, tracks: List[Track], current_time: float) -> Optional[Track]:
+        """
+        Find the locked target under a new track ID.
+
+        Candidates are scored by IOU with the last bbox propagated by the
+        last known velocity, plus appearance_weight times the histogram
+        similarity to the signature cached at lock time. A candidate needs
+        either IOU >= iou_threshold, or appearance similarity >=
+        appearance_threshold within reacquire_radius bbox heights. Tracks
+        that were alive alongside the locked target (e.g. a crossing
+        target) are never candidates.
+
+        Returns:
+            The re-bound track, or None
+        """
+        last = self._last_track
+        tracks = [t for t in tracks if t.track_id not in self._coexisting]
+        if last is None or not tracks:
+            return None
+
+        cfg = self.config
+        predicted = last.predicted_bbox(current_time - self._last_seen_timestamp)
+        pred_box = np.array([predicted.x1, predicted.y1, predicted.x2, predicted.y2], dtype=np.float64)
+        boxes = np.array([[t.bbox.x1, t.bbox.y1, t.bbox.x2, t.bbox.y2] for t in tracks],
+                         dtype=np.float64)
+        ious = box_ious(pred_box, boxes)
+        gate = ious >= cfg.iou_threshold
+        score = ious.copy()
+
+        signatures = [t.appearance for t in tracks]
+        if self._appearance is not None:
+            has_sig = np.array([s is not None and len(s) == len(self._appearance)
+                                for s in signatures])
+            similarity = np.zeros(len(tracks))
+            if has_sig.any():
+                similarity[has_sig] = histogram_similarity(
+                    self._appearance, np.array([s for s, ok in zip(signatures, has_sig) if ok])
+                )
+            centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+            distance = np.hypot(*(centers - np.array(predicted.center)).T)
+            near = distance <= cfg.reacquire_radius * max(predicted.height, 1.0)
+            gate |= (similarity >= cfg.appearance_threshold) & near
+            score += cfg.appearance_weight * similarity
+
+        if not gate.any():
+            return None
+        best = int(np.argmax(np.where(gate, score, -np.inf)))
+        track = tracks[best]
+        logger.info(
+            f"Lock re-bound from track {self._locked_track_id} to {track.track_id} "
+            f"(IOU {ious[best]:.2f}, score {score[best]:.2f})"
+        )
+        self._locked_track_id = track.track_id
+        return track
+
     def clear_lock(self) -> None:
         """Clear current lock."""
         if self._locked_track_id is not None:
@@ -188,6 +291,9 @@ class LockManager:
         self._lock_timestamp = None
         self._last_seen_timestamp = None
         self._lock_bbox = None
+        self._last_track = None
+        self._appearance = None
+        self._coexisting = {}
         self._status = LockStatus.UNLOCKED
         self._frames_locked = 0
 
@@ -221,7 +327,8 @@ class LockManager:
             status=self._status,
             locked_track_id=self._locked_track_id,
             lock_timestamp=self._lock_timestamp,
-            frames_since_lock=self._frames_locked
+            frames_since_lock=self._frames_locked,
+            bbox=self._lock_bbox
         )
 
     @property
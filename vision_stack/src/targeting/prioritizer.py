@@ -0,0 +1,282 @@
+"""
+Automatic target prioritization.
+
+Scores every track of each frame from class priority, detection
+confidence, proximity to the optical axis, range, track age and the
+predicted time until the track leaves the frame, and decides when to
+auto-lock the best candidate or hand an existing lock off to a clearly
+better one - without a round trip to the GCS.
+
+Scores are kept in a max-heap with lazy invalidation: a track's entry is
+only re-pushed when its score moves by more than rescore_epsilon, stale
+entries are skipped when the top is read, so the best candidate is an
+amortized O(log N) lookup.
+"""
+
+import heapq
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..common.types import LockStatus, TrackArrays
+from .errors import ErrorArrays
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriorityConfig:
+    """Target prioritization and auto-selection configuration."""
+    enabled: bool = False
+    # Label -> priority (0-1); labels not listed get default_class_priority
+    class_priority: Dict[str, float] = field(default_factory=dict)
+    default_class_priority: float = 0.5
+    # Term weights (the score is the weighted mean of terms in [0, 1])
+    class_weight: float = 1.0
+    confidence_weight: float = 1.0
+    center_weight: float = 1.0
+    range_weight: float = 0.5
+    age_weight: float = 0.5
+    time_to_lose_weight: float = 0.5
+    center_falloff_rad: float = 0.6  # Angle off-axis at which the center term reaches 0
+    range_tolerance_m: float = 20.0  # Range error at which the range term reaches 0
+    age_saturation_s: float = 2.0  # Track age at which the age term reaches 1
+    time_to_lose_horizon_s: float = 2.0  # Time-to-exit at which that term reaches 1
+    rescore_epsilon: float = 0.01  # Score changes below this do not touch the heap
+    # Policies
+    auto_lock: bool = False  # Lock the best candidate when unlocked
+    auto_handoff: bool = False  # Move the lock to a clearly better candidate
+    min_score: float = 0.5  # Candidates below this are never auto-selected
+    min_age_s: float = 0.5  # ... nor tracks younger than this
+    handoff_margin: float = 0.15  # Required score advantage over the locked track
+    handoff_frames: int = 10  # Consecutive frames the advantage must hold
+    override_operator: bool = False  # Also hand off locks selected from the GCS
+
+
+class TargetPrioritizer:
+    """
+    Ranks tracks and implements the auto-lock / auto-handoff policies.
+
+    Usage:
+        scores = prioritizer.update(track_array, errors, now)
+        track_id = prioritizer.choose(lock_state.status, lock_state.locked_track_id)
+    """
+
+    def __init__(self, config: PriorityConfig, frame_size: Tuple[int, int]):
+        """
+        Initialize prioritizer.
+
+        Args:
+            config: Priority configuration
+            frame_size: (width, height) of the frames track boxes refer to
+        """
+        self.config = config
+        self.frame_size = frame_size
+        self._scores: Dict[int, float] = {}  # Live tracks -> score in the heap
+        self._first_seen: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []  # (-score, track_id), lazily invalidated
+        self._now = 0.0
+        self._challenger: Optional[int] = None
+        self._challenger_frames = 0
+
+        weights = np.array([config.class_weight, config.confidence_weight, config.center_weight,
+                            config.range_weight, config.age_weight, config.time_to_lose_weight])
+        self._weights = weights / max(weights.sum(), 1e-9)
+
+    def score(
+        self,
+        track_array: TrackArrays,
+        errors: ErrorArrays,
+        ages: np.ndarray
+    ) -> np.ndarray:
+        """
+        Priority of every track.
+
+        Args:
+            track_array: Tracks of one frame
+            errors: ErrorComputer.compute_all result for track_array
+            ages: (N,) seconds since each track was first seen
+
+        Returns:
+            (N,) scores in [0, 1]
+        """
+        cfg = self.config
+        n = len(track_array)
+        if n == 0:
+            return np.zeros(0)
+
+        class_term = np.array([cfg.class_priority.get(label, cfg.default_class_priority)
+                               for label in track_array.labels], dtype=np.float64)
+        confidence_term = np.clip(track_array.confidences, 0.0, 1.0)
+        off_axis = np.hypot(errors.yaw_error, errors.pitch_error)
+        center_term = np.clip(1.0 - off_axis / cfg.center_falloff_rad, 0.0, 1.0)
+
+        # Unknown depth is neutral; depth outside the valid range is worst
+        range_term = np.clip(1.0 - np.abs(errors.range_error) / cfg.range_tolerance_m, 0.0, 1.0)
+        range_term = np.where(np.isnan(errors.range_error), 0.5,
+                              np.where(errors.depth_valid, range_term, 0.0))
+
+        age_term = np.clip(ages / cfg.age_saturation_s, 0.0, 1.0)
+        ttl_term = np.clip(self.time_to_lose(track_array) / cfg.time_to_lose_horizon_s, 0.0, 1.0)
+
+        terms = np.stack([class_term, confidence_term, center_term,
+                          range_term, age_term, ttl_term], axis=1)
+        return terms @ self._weights
+
+    def time_to_lose(self, track_array: TrackArrays) -> np.ndarray:
+        """
+        Predicted seconds until each track center leaves the frame.
+
+        Returns:
+            (N,) seconds; inf for stationary tracks or without velocity
+        """
+        width, height = self.frame_size
+        boxes = track_array.bboxes
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        velocity = np.nan_to_num(track_array.velocities)
+        limits = np.array([width, height], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exit_time = np.where(velocity > 0, (limits - centers) / velocity,
+                                 np.where(velocity < 0, -centers / velocity, np.inf))
+        return np.clip(exit_time, 0.0, None).min(axis=1)
+
+    def update(
+        self,
+        track_array: TrackArrays,
+        errors: ErrorArrays,
+        now: float
+    ) -> np.ndarray:
+        """
+        Rescore a new frame and refresh the priority heap.
+
+        Args:
+            track_array: Tracks of the frame
+            errors: ErrorComputer.compute_all result for track_array
+            now: Current time (track ages)
+
+        Returns:
+            (N,) scores, row i = track i
+        """
+        self._now = now
+        ids = track_array.ids.tolist()
+        for track_id in ids:
+            self._first_seen.setdefault(track_id, now)
+        ages = np.array([now - self._first_seen[track_id] for track_id in ids], dtype=np.float64)
+        scores = self.score(track_array, errors, ages)
+
+        live = set(ids)
+        for track_id in [t for t in self._scores if t not in live]:
+            del self._scores[track_id]
+        for track_id in [t for t in self._first_seen if t not in live]:
+            del self._first_seen[track_id]
+
+        eps = self.config.rescore_epsilon
+        for track_id, score in zip(ids, scores.tolist()):
+            previous = self._scores.get(track_id)
+            if previous is None or abs(score - previous) > eps:
+                self._scores[track_id] = score
+                heapq.heappush(self._heap, (-score, track_id))
+
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 4 * max(len(self._scores), 8):
+            self._heap = [(-s, t) for t, s in self._scores.items()]
+            heapq.heapify(self._heap)
+        return scores
+
+    def best(self) -> Optional[Tuple[int, float]]:
+        """
+        Highest-priority live track.
+
+        Returns:
+            (track_id, score), or None without tracks
+        """
+        heap = self._heap
+        while heap:
+            neg_score, track_id = heap[0]
+            if self._scores.get(track_id) == -neg_score:
+                return track_id, -neg_score
+            heapq.heappop(heap)
+        return None
+
+    def ranked(self, count: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Live tracks as (track_id, score), best first."""
+        ranking = sorted(self._scores.items(), key=lambda item: -item[1])
+        return ranking if count is None else ranking[:count]
+
+    def score_of(self, track_id: Optional[int]) -> Optional[float]:
+        """Current score of a track, or None if it is not in the last frame."""
+        return self._scores.get(track_id)
+
+    def choose(
+        self,
+        status: LockStatus,
+        locked_track_id: Optional[int],
+        operator_selected: bool = False
+    ) -> Optional[int]:
+        """
+        Apply the auto-lock / auto-handoff policies to the last update.
+
+        Args:
+            status: Current lock status
+            locked_track_id: Currently locked track, if any
+            operator_selected: The lock was chosen from the GCS
+
+        Returns:
+            Track ID to lock onto, or None to leave the lock as it is
+        """
+        cfg = self.config
+        best = self.best()
+        if best is None:
+            self._reset_challenger()
+            return None
+        best_id, best_score = best
+        if best_score < cfg.min_score or self._now - self._first_seen[best_id] < cfg.min_age_s:
+            self._reset_challenger()
+            return None
+
+        if status == LockStatus.UNLOCKED or locked_track_id is None:
+            self._reset_challenger()
+            if cfg.auto_lock:
+                logger.info(f"Auto-lock on track {best_id} (score {best_score:.2f})")
+                return best_id
+            return None
+
+        if not cfg.auto_handoff or (operator_selected and not cfg.override_operator):
+            self._reset_challenger()
+            return None
+
+        locked_score = self.score_of(locked_track_id)
+        if locked_score is None:
+            # Locked target not in this frame: hand off once the lock is lost
+            if status == LockStatus.LOST and best_id != locked_track_id:
+                self._reset_challenger()
+                logger.info(f"Auto-handoff from lost track {locked_track_id} to {best_id}")
+                return best_id
+            return None
+        if best_id == locked_track_id or best_score < locked_score + cfg.handoff_margin:
+            self._reset_challenger()
+            return None
+
+        # Hysteresis: the same challenger must stay ahead for handoff_frames
+        if best_id != self._challenger:
+            self._challenger, self._challenger_frames = best_id, 0
+        self._challenger_frames += 1
+        if self._challenger_frames < cfg.handoff_frames:
+            return None
+        self._reset_challenger()
+        logger.info(f"Auto-handoff from track {locked_track_id} ({locked_score:.2f}) "
+                    f"to {best_id} ({best_score:.2f})")
+        return best_id
+
+    def reset(self) -> None:
+        """Forget all tracks (e.g. when tracking is stopped)."""
+        self._scores.clear()
+        self._first_seen.clear()
+        self._heap.clear()
+        self._reset_challenger()
+
+    def _reset_challenger(self) -> None:
+        self._challenger = None
+        self._challenger_frames = 0
@@ -0,0 +1,254 @@
+"""
+3D state estimator for the locked target.
+
+Per-frame yaw/pitch/range errors are noisy, especially at range. The
+estimator fuses each line-of-sight measurement (bbox center through the
+camera model, rotated by the FC attitude at capture time) and the ROI
+depth into a constant-velocity extended Kalman filter over the target's
+position and velocity relative to the aircraft.
+
+The frame is NED (heading included) when attitude is available, else the
+body FRD frame. Measurements are azimuth, elevation and (when depth is
+valid) slant range. Stereo ROI depth is measured along the optical axis
+(camera Z), so it is converted to slant range with the line of sight
+before fusing: range = depth / cos(angle between line of sight and
+optical axis), with its std scaled the same way. The filter also reports
+the smoothed line-of-sight rates and closing speed, which control can
+use instead of raw per-frame errors.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..common.types import TargetState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EstimatorConfig:
+    """Target state estimator configuration."""
+    enabled: bool = False
+    accel_noise: float = 3.0  # Target acceleration spectral density (m/s^2 / sqrt(Hz))
+    angle_noise_rad: float = 0.005  # Azimuth/elevation measurement std
+    range_noise_m: float = 0.2  # Depth (camera Z) std at 0 m ...
+    range_noise_per_m2: float = 0.004  # ... plus this times depth^2 (stereo error grows with z^2)
+    initial_range_m: float = 10.0  # Range prior until depth is fused
+    initial_range_std_m: float = 10.0
+    initial_velocity_std: float = 5.0  # m/s
+    reset_after_s: float = 1.0  # Restart the filter after this long without measurements
+
+
+def _wrap(angle: float) -> float:
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+class TargetEstimator:
+    """
+    Constant-velocity EKF on [x, y, z, vx, vy, vz] (meters, m/s).
+
+    Usage:
+        estimator.update(track_id, los, depth_m, frame, timestamp, optical_cos)
+        state = estimator.state()
+    """
+
+    def __init__(self, config: EstimatorConfig):
+        """
+        Initialize estimator.
+
+        Args:
+            config: Estimator configuration
+        """
+        self.config = config
+        self._x: Optional[np.ndarray] = None  # (6,) state
+        self._P: Optional[np.ndarray] = None  # (6, 6) covariance
+        self._track_id: Optional[int] = None
+        self._frame: Optional[str] = None
+        self._timestamp = 0.0
+        self._range_observed = False
+
+    @property
+    def initialized(self) -> bool:
+        """Whether the filter holds a target state."""
+        return self._x is not None
+
+    def reset(self) -> None:
+        """Forget the target."""
+        self._x = None
+        self._P = None
+        self._track_id = None
+        self._frame = None
+        self._range_observed = False
+
+    def update(
+        self,
+        track_id: int,
+        los: np.ndarray,
+        depth_m: Optional[float],
+        frame: str,
+        timestamp: float,
+        optical_cos: float = 1.0
+    ) -> bool:
+        """
+        Fuse one observation of the locked target.
+
+        Args:
+            track_id: Locked track ID (a different ID restarts the filter)
+            los: (3,) line-of-sight unit vector in `frame`
+            depth_m: Valid ROI depth in meters (along the optical axis), or None
+            frame: "ned" or "body"
+            timestamp: Capture time of the observation
+            optical_cos: Cosine of the angle between the line of sight and
+                the optical axis (the camera-frame Z of the unit line of sight)
+
+        Returns:
+            True if the measurement was fused (older observations are dropped)
+        """
+        cfg = self.config
+        range_m = range_var = None
+        if depth_m is not None:
+            # Camera-Z depth -> slant range along the line of sight
+            scale = 1.0 / max(optical_cos, 1e-3)
+            range_m = depth_m * scale
+            range_var = self._range_variance(depth_m) * scale ** 2
+        if (self._x is None or track_id != self._track_id or frame != self._frame
+                or timestamp - self._timestamp > cfg.reset_after_s):
+            self._initialize(track_id, los, range_m, range_var, frame, timestamp)
+            return True
+
+        dt = timestamp - self._timestamp
+        if dt < 0:
+            return False
+        self._predict(dt)
+        self._timestamp = timestamp
+
+        azimuth = math.atan2(los[1], los[0])
+        elevation = math.atan2(-los[2], math.hypot(los[0], los[1]))
+        z = [azimuth, elevation]
+        noise = [cfg.angle_noise_rad ** 2] * 2
+        if range_m is not None:
+            z.append(range_m)
+            noise.append(range_var)
+            self._range_observed = True
+
+        h, H = self._measure(self._x, with_range=range_m is not None)
+        innovation = np.asarray(z) - h
+        innovation[0] = _wrap(innovation[0])
+        S = H @ self._P @ H.T + np.diag(noise)
+        K = self._P @ H.T @ np.linalg.inv(S)
+        self._x = self._x + K @ innovation
+        # Joseph form keeps P symmetric positive definite
+        I_KH = np.eye(6) - K @ H
+        self._P = I_KH @ self._P @ I_KH.T + K @ np.diag(noise) @ K.T
+        return True
+
+    def state(self, timestamp: Optional[float] = None) -> Optional[TargetState]:
+        """
+        Current estimate, optionally propagated to a later time.
+
+        Args:
+            timestamp: Predict ahead to this time (default: last update)
+
+        Returns:
+            TargetState, or None when not initialized
+        """
+        if self._x is None:
+            return None
+        x = self._x
+        P = self._P
+        t = self._timestamp
+        if timestamp is not None and timestamp > t:
+            F, Q = self._transition(timestamp - t)
+            x, P = F @ x, F @ P @ F.T + Q
+            t = timestamp
+
+        p, v = x[:3], x[3:]
+        horizontal_sq = max(p[0] ** 2 + p[1] ** 2, 1e-9)
+        range_sq = max(horizontal_sq + p[2] ** 2, 1e-9)
+        horizontal = math.sqrt(horizontal_sq)
+        horizontal_rate = (p[0] * v[0] + p[1] * v[1]) / horizontal
+        return TargetState(
+            track_id=self._track_id,
+            frame=self._frame,
+            position=p.tolist(),
+            velocity=v.tolist(),
+            position_std=np.sqrt(np.diag(P)[:3]).tolist(),
+            range_m=math.sqrt(range_sq),
+            range_rate=float(p @ v) / math.sqrt(range_sq),
+            los_rate_yaw=(p[0] * v[1] - p[1] * v[0]) / horizontal_sq,
+            los_rate_pitch=(-v[2] * horizontal + p[2] * horizontal_rate) / range_sq,
+            range_observed=self._range_observed,
+            timestamp=t
+        )
+
+    def _initialize(
+        self,
+        track_id: int,
+        los: np.ndarray,
+        range_m: Optional[float],
+        range_var: Optional[float],
+        frame: str,
+        timestamp: float
+    ) -> None:
+        cfg = self.config
+        los = np.asarray(los, dtype=np.float64)
+        los = los / np.linalg.norm(los)
+        distance = range_m if range_m is not None else cfg.initial_range_m
+        if range_var is None:
+            range_var = cfg.initial_range_std_m ** 2
+
+        # Position covariance: range_var along the line of sight, angle noise across it
+        cross_var = (distance * cfg.angle_noise_rad) ** 2
+        P_pos = cross_var * np.eye(3) + (range_var - cross_var) * np.outer(los, los)
+        self._x = np.concatenate([los * distance, np.zeros(3)])
+        self._P = np.zeros((6, 6))
+        self._P[:3, :3] = P_pos
+        self._P[3:, 3:] = cfg.initial_velocity_std ** 2 * np.eye(3)
+        self._track_id = track_id
+        self._frame = frame
+        self._timestamp = timestamp
+        self._range_observed = range_m is not None
+        logger.debug(f"Target estimator (re)started on track {track_id} in {frame} frame")
+
+    def _range_variance(self, depth_m: float) -> float:
+        cfg = self.config
+        return (cfg.range_noise_m + cfg.range_noise_per_m2 * depth_m ** 2) ** 2
+
+    def _transition(self, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Constant-velocity transition and white-noise-acceleration process noise."""
+        F = np.eye(6)
+        F[:3, 3:] = dt * np.eye(3)
+        q = self.config.accel_noise ** 2
+        Q = np.zeros((6, 6))
+        Q[:3, :3] = q * dt ** 3 / 3 * np.eye(3)
+        Q[:3, 3:] = Q[3:, :3] = q * dt ** 2 / 2 * np.eye(3)
+        Q[3:, 3:] = q * dt * np.eye(3)
+        return F, Q
+
+    def _predict(self, dt: float) -> None:
+        F, Q = self._transition(dt)
+        self._x = F @ self._x
+        self._P = F @ self._P @ F.T + Q
+
+    @staticmethod
+    def _measure(x: np.ndarray, with_range: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Predicted [azimuth, elevation(, range)] and its Jacobian."""
+        px, py, pz = x[:3]
+        horizontal_sq = max(px ** 2 + py ** 2, 1e-9)
+        horizontal = math.sqrt(horizontal_sq)
+        range_sq = horizontal_sq + pz ** 2
+        rng = math.sqrt(range_sq)
+
+        h = [math.atan2(py, px), math.atan2(-pz, horizontal)]
+        H = np.zeros((3 if with_range else 2, 6))
+        H[0, :3] = [-py / horizontal_sq, px / horizontal_sq, 0.0]
+        H[1, :3] = [pz * px / (horizontal * range_sq), pz * py / (horizontal * range_sq),
+                    -horizontal / range_sq]
+        if with_range:
+            h.append(rng)
+            H[2, :3] = [px / rng, py / rng, pz / rng]
+        return np.asarray(h), H
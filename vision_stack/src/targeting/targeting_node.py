@@ -7,19 +7,25 @@ and publishes lock state and errors to control.
 
 import logging
 import time
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
 
+import numpy as np
 import yaml
 
 from ..common.types import (
-    TrackList, LockState, Errors, UserCommand, CommandType,
-    CameraIntrinsics
+    TrackList, LockState, LockStatus, Errors, UserCommand, CommandType,
+    CameraIntrinsics, LockedTarget, Track, BoundingBox, TrackArrays, TrackErrors, Attitude
 )
+from ..common.attitude import AttitudeBuffer
 from ..common.bus import ZmqPublisher, ZmqSubscriber, BusPorts
-from ..oak import OakBridge
+from ..common.angle_lut import AngleLUT
+from ..common.config import apply_mode_overrides
+from ..oak import OakBridge, SharedDepthReader, load_calibration
 from .lock_manager import LockManager, LockConfig
-from .errors import ErrorComputer, ErrorConfig
+from .errors import ErrorArrays, ErrorComputer, ErrorConfig
+from .prioritizer import PriorityConfig, TargetPrioritizer
+from .target_estimator import EstimatorConfig, TargetEstimator
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +36,39 @@ class TargetingConfig:
     lock: LockConfig
     error: ErrorConfig
     intrinsics: CameraIntrinsics
-    update_rate_hz: float = 30.0
+    update_rate_hz: float = 30.0  # Max wait between command checks (1 / rate)
+    keepalive_hz: float = 5.0  # Republish the last result this often when idle (0 = never)
+    track_errors: bool = False  # Publish errors for every track of each frame
+    # Shared-memory depth from the camera owner (used when no OakBridge is given)
+    depth_shared_memory: Optional[str] = None
+    depth_max_age_ms: float = 200.0
+    # Device calibration written by the camera owner (overrides intrinsics
+    # when the resolution matches)
+    calibration_file: Optional[str] = None
+    lut_cache_dir: Optional[str] = None  # Angle LUT cache (None = default)
+    priority: PriorityConfig = field(default_factory=PriorityConfig)
+    estimator: EstimatorConfig = field(default_factory=EstimatorConfig)
+    # FC attitude history for error derotation and the target estimator
+    attitude_buffer_size: int = 256
+    attitude_max_gap_ms: float = 100.0
 
 
 def load_targeting_config(
     targeting_yaml: str,
-    camera_yaml: str
+    camera_yaml: str,
+    mode_yaml: Optional[str] = None
 ) -> TargetingConfig:
-    """Load configuration from YAML files."""
+    """Load configuration from YAML files (mode `targeting:` section overrides)."""
     with open(targeting_yaml, 'r') as f:
-        targeting_cfg = yaml.safe_load(f)
+        targeting_cfg = apply_mode_overrides(yaml.safe_load(f), mode_yaml, 'targeting')
     with open(camera_yaml, 'r') as f:
         camera_cfg = yaml.safe_load(f)
 
     cam = camera_cfg.get('camera', {})
     intrinsics = cam.get('intrinsics', {})
+    priority = targeting_cfg.get('priority', {})
+    weights = priority.get('weights', {})
+    estimator = targeting_cfg.get('estimator', {})
 
     return TargetingConfig(
         lock=LockConfig(
@@ -52,11 +76,21 @@ def load_targeting_config(
             reacquire_timeout_ms=targeting_cfg.get('lock', {}).get('reacquire_timeout_ms', 2000.0),
             iou_threshold=targeting_cfg.get('lock', {}).get('iou_threshold', 0.3),
             max_pixel_distance=targeting_cfg.get('lock', {}).get('max_pixel_distance', 100.0),
+            appearance_weight=targeting_cfg.get('lock', {}).get('appearance_weight', 1.0),
+            appearance_threshold=targeting_cfg.get('lock', {}).get('appearance_threshold', 0.8),
+            reacquire_radius=targeting_cfg.get('lock', {}).get('reacquire_radius', 3.0),
         ),
         error=ErrorConfig(
             desired_range_m=targeting_cfg.get('error', {}).get('desired_range_m', 10.0),
             min_range_m=targeting_cfg.get('error', {}).get('min_range_m', 3.0),
             max_range_m=targeting_cfg.get('error', {}).get('max_range_m', 50.0),
+            depth_percentile=targeting_cfg.get('error', {}).get('depth_percentile', 50.0),
+            predictive=targeting_cfg.get('error', {}).get('predictive', False),
+            actuation_latency_s=targeting_cfg.get('error', {}).get('actuation_latency_s', 0.03),
+            max_lead_s=targeting_cfg.get('error', {}).get('max_lead_s', 0.3),
+            angle_lut=targeting_cfg.get('error', {}).get('angle_lut', False),
+            lut_step=targeting_cfg.get('error', {}).get('lut_step', 8),
+            derotation=targeting_cfg.get('error', {}).get('derotation', 'none'),
         ),
         intrinsics=CameraIntrinsics(
             fx=intrinsics.get('fx', 1000.0),
@@ -65,8 +99,53 @@ def load_targeting_config(
             cy=intrinsics.get('cy', 540.0),
             width=cam.get('rgb', {}).get('width', 1920),
             height=cam.get('rgb', {}).get('height', 1080),
+            distortion=intrinsics.get('distortion'),
         ),
         update_rate_hz=targeting_cfg.get('update_rate_hz', 30.0),
+        keepalive_hz=targeting_cfg.get('keepalive_hz', 5.0),
+        track_errors=targeting_cfg.get('track_errors', False),
+        depth_shared_memory=targeting_cfg.get('depth', {}).get(
+            'shared_memory', cam.get('depth', {}).get('shared_memory')),
+        depth_max_age_ms=targeting_cfg.get('depth', {}).get('max_age_ms', 200.0),
+        calibration_file=(cam.get('calibration', {}).get('file')
+                          if cam.get('calibration', {}).get('use_device', True) else None),
+        lut_cache_dir=targeting_cfg.get('error', {}).get('lut_cache_dir'),
+        estimator=EstimatorConfig(
+            enabled=estimator.get('enabled', False),
+            accel_noise=estimator.get('accel_noise', 3.0),
+            angle_noise_rad=estimator.get('angle_noise_rad', 0.005),
+            range_noise_m=estimator.get('range_noise_m', 0.2),
+            range_noise_per_m2=estimator.get('range_noise_per_m2', 0.004),
+            initial_range_m=estimator.get('initial_range_m', 10.0),
+            initial_range_std_m=estimator.get('initial_range_std_m', 10.0),
+            initial_velocity_std=estimator.get('initial_velocity_std', 5.0),
+            reset_after_s=estimator.get('reset_after_s', 1.0),
+        ),
+        attitude_buffer_size=targeting_cfg.get('attitude', {}).get('buffer_size', 256),
+        attitude_max_gap_ms=targeting_cfg.get('attitude', {}).get('max_gap_ms', 100.0),
+        priority=PriorityConfig(
+            enabled=priority.get('enabled', False),
+            class_priority=priority.get('class_priority') or {},
+            default_class_priority=priority.get('default_class_priority', 0.5),
+            class_weight=weights.get('class', 1.0),
+            confidence_weight=weights.get('confidence', 1.0),
+            center_weight=weights.get('center', 1.0),
+            range_weight=weights.get('range', 0.5),
+            age_weight=weights.get('age', 0.5),
+            time_to_lose_weight=weights.get('time_to_lose', 0.5),
+            center_falloff_rad=priority.get('center_falloff_rad', 0.6),
+            range_tolerance_m=priority.get('range_tolerance_m', 20.0),
+            age_saturation_s=priority.get('age_saturation_s', 2.0),
+            time_to_lose_horizon_s=priority.get('time_to_lose_horizon_s', 2.0),
+            rescore_epsilon=priority.get('rescore_epsilon', 0.01),
+            auto_lock=priority.get('auto_lock', False),
+            auto_handoff=priority.get('auto_handoff', False),
+            min_score=priority.get('min_score', 0.5),
+            min_age_s=priority.get('min_age_s', 0.5),
+            handoff_margin=priority.get('handoff_margin', 0.15),
+            handoff_frames=priority.get('handoff_frames', 10),
+            override_operator=priority.get('override_operator', False),
+        ),
     )
 
 
@@ -76,11 +155,19 @@ class TargetingNode:
     
     Subscribes to:
     - tracks from perception
+    - locked_target from perception (camera-rate position of the lock)
     - qgc_cmds from mavlink bridge
+    - attitude from mavlink bridge (when error derotation is enabled)
     
     Publishes:
     - lock_state
     - errors
+    - track_errors (errors and priority for every track, once per track
+      frame, when track_errors or priority is enabled)
+    - target_state (filtered 3D state of the locked target, per observation)
+    
+    With priority.enabled, every frame is ranked by TargetPrioritizer and
+    the lock follows its auto-lock / auto-handoff policies.
     """
 
     def __init__(self, config: TargetingConfig, oak_bridge: Optional[OakBridge] = None):
@@ -89,14 +176,31 @@ class TargetingNode:
         
         Args:
             config: Targeting configuration
-            oak_bridge: Optional OAK bridge for depth queries (can be shared)
+            oak_bridge: Optional OAK bridge for depth queries (can be shared);
+                without one, depth comes from the shared-memory depth frame
         """
         self.config = config
         
         # Components
         self._lock_manager = LockManager(config.lock)
-        self._error_computer = ErrorComputer(config.intrinsics, config.error)
-        self._oak = oak_bridge  # May be None if depth comes from another source
+        intrinsics, serial = self._resolve_intrinsics(config, oak_bridge)
+        lut = None
+        if config.error.angle_lut:
+            lut = AngleLUT.load_or_build(
+                intrinsics, intrinsics.distortion, config.error.lut_step,
+                serial=serial, cache_dir=config.lut_cache_dir
+            )
+        self._error_computer = ErrorComputer(intrinsics, config.error, lut)
+        self._prioritizer = (TargetPrioritizer(config.priority, (intrinsics.width, intrinsics.height))
+                             if config.priority.enabled else None)
+        # Depth source: OakBridge in-process, else the camera owner's shared depth frame
+        self._depth = oak_bridge
+        if self._depth is None and config.depth_shared_memory:
+            self._depth = SharedDepthReader(
+                (config.intrinsics.width, config.intrinsics.height),
+                config.depth_shared_memory,
+                max_age_s=config.depth_max_age_ms / 1000.0
+            )
         
         # ZMQ
         self._publisher = ZmqPublisher(BusPorts.pub_endpoint(BusPorts.TARGETING))
@@ -104,17 +208,59 @@ class TargetingNode:
         self._cmd_sub = ZmqSubscriber(BusPorts.sub_endpoint(BusPorts.MAVLINK))
         
         self._track_sub.subscribe("tracks")
+        self._track_sub.subscribe("locked_target")
         self._cmd_sub.subscribe("qgc_cmds")
+        self._estimator = TargetEstimator(config.estimator) if config.estimator.enabled else None
+        self._attitude: Optional[AttitudeBuffer] = None
+        if config.error.derotation != "none" or self._estimator is not None:
+            self._attitude = AttitudeBuffer(config.attitude_buffer_size,
+                                            config.attitude_max_gap_ms / 1000.0)
+            self._cmd_sub.subscribe("attitude")
         
         # State
         self._running = False
         self._tracking_enabled = False
         self._current_tracks: Optional[TrackList] = None
+        self._locked_target: Optional[LockedTarget] = None
+        self._last_frame_id: Optional[int] = None
+        self._last_lock_state: Optional[LockState] = None
+        self._last_errors: Optional[Errors] = None
+        self._last_publish_time = 0.0
         self._min_depth = config.error.min_range_m
         self._max_depth = config.error.max_range_m
+        self._operator_selected = False  # Current lock was chosen from the GCS
         
         logger.info("TargetingNode initialized")
 
+    @staticmethod
+    def _resolve_intrinsics(
+        config: TargetingConfig,
+        oak_bridge: Optional[OakBridge]
+    ) -> Tuple[CameraIntrinsics, Optional[str]]:
+        """
+        Device calibration if available for this resolution, else configured intrinsics.
+
+        Returns:
+            (intrinsics, camera serial or None)
+        """
+        configured = config.intrinsics
+        calib = oak_bridge.calibration if oak_bridge is not None else None
+        if calib is None and config.calibration_file:
+            calib = load_calibration(config.calibration_file)
+        if calib is None:
+            return configured, None
+        if (calib.width, calib.height) != (configured.width, configured.height):
+            logger.warning(f"Device calibration is for {calib.width}x{calib.height}, "
+                           f"frames are {configured.width}x{configured.height}; "
+                           f"using configured intrinsics")
+            return configured, None
+        logger.info(f"Using device calibration ({calib.serial})")
+        return CameraIntrinsics(
+            fx=calib.fx, fy=calib.fy, cx=calib.cx, cy=calib.cy,
+            width=calib.width, height=calib.height,
+            distortion=calib.distortion
+        ), calib.serial
+
     def start(self) -> None:
         """Start targeting node."""
         logger.info("Starting targeting node...")
@@ -133,39 +279,52 @@ class TargetingNode:
         self._publisher.close()
         self._track_sub.close()
         self._cmd_sub.close()
+        if isinstance(self._depth, SharedDepthReader):
+            self._depth.close()
         logger.info("Targeting node stopped")
 
     def _run_loop(self) -> None:
-        """Main processing loop."""
-        target_period = 1.0 / self.config.update_rate_hz
+        """
+        Main processing loop.
+        
+        Waits on the perception socket and computes once per new track
+        frame (or new locked_target position) as soon as it arrives. The
+        last result is republished as a keepalive when nothing new arrives.
+        """
+        poll_ms = max(1, int(1000 / self.config.update_rate_hz))
+        keepalive_period = (1.0 / self.config.keepalive_hz
+                            if self.config.keepalive_hz > 0 else None)
         
         while self._running:
-            loop_start = time.time()
-            
             # Process incoming commands
             self._process_commands()
             
-            # Process incoming tracks
-            self._process_tracks()
+            # Wait for tracks / locked-target updates
+            new_frame, new_target = self._process_tracks(timeout_ms=poll_ms)
             
-            # If we have tracks and tracking is enabled, compute errors
-            if self._tracking_enabled and self._current_tracks:
-                self._compute_and_publish()
+            if not (self._tracking_enabled and self._current_tracks):
+                continue
             
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < target_period:
-                time.sleep(target_period - elapsed)
+            if new_frame:
+                self._compute_and_publish()
+            elif new_target:
+                # Fresher position of the locked target; lock state unchanged
+                self._compute_and_publish(update_lock=False)
+            elif (keepalive_period is not None and self._last_errors is not None
+                  and time.time() - self._last_publish_time >= keepalive_period):
+                self._publish_keepalive()
 
     def _process_commands(self) -> None:
-        """Process incoming QGC commands."""
+        """Process incoming QGC commands and FC attitude samples."""
         while True:
             result = self._cmd_sub.receive(timeout_ms=0)
             if result is None:
                 break
             
             topic, msg = result
-            if isinstance(msg, dict):
+            if topic == "attitude":
+                self._handle_attitude(msg)
+            elif isinstance(msg, dict):
                 self._handle_command(msg)
             elif isinstance(msg, UserCommand):
                 self._handle_user_command(msg)
@@ -180,26 +339,28 @@ class TargetingNode:
             logger.info("[TARGETING] Tracking ENABLED")
         elif cmd_type == 'STOP_TRACKING':
             self._tracking_enabled = False
-            self._lock_manager.clear_lock()
+            self._clear_lock()
             logger.info("[TARGETING] Tracking DISABLED")
         elif cmd_type == 'SELECT_TARGET_ID':
             track_id = msg.get('track_id')
             logger.info(f"[TARGETING] Select target by ID: {track_id}")
             if track_id and self._current_tracks:
-                self._lock_manager.select_by_id(track_id, self._current_tracks.tracks)
+                self._operator_selected = self._lock_manager.select_by_id(
+                    track_id, self._current_tracks.tracks) or self._operator_selected
                 logger.info(f"[TARGETING] Lock state: {self._lock_manager.get_lock_state()}")
         elif cmd_type == 'SELECT_TARGET_PIXEL':
             u, v = msg.get('pixel_u'), msg.get('pixel_v')
             logger.info(f"[TARGETING] Select target by pixel: ({u}, {v})")
             if u is not None and v is not None and self._current_tracks:
-                self._lock_manager.select_by_pixel(u, v, self._current_tracks.tracks)
+                self._operator_selected = self._lock_manager.select_by_pixel(
+                    u, v, self._current_tracks.tracks) or self._operator_selected
                 logger.info(f"[TARGETING] Lock state: {self._lock_manager.get_lock_state()}")
         elif cmd_type == 'SET_DEPTH_RANGE':
             self._min_depth = msg.get('min_depth', self._min_depth)
             self._max_depth = msg.get('max_depth', self._max_depth)
             logger.info(f"[TARGETING] Depth range set: {self._min_depth} - {self._max_depth} m")
         elif cmd_type == 'CLEAR_LOCK':
-            self._lock_manager.clear_lock()
+            self._clear_lock()
             logger.info("[TARGETING] Lock CLEARED")
 
     def _handle_user_command(self, cmd: UserCommand) -> None:
@@ -208,36 +369,94 @@ class TargetingNode:
             self._tracking_enabled = True
         elif cmd.cmd_type == CommandType.STOP_TRACKING:
             self._tracking_enabled = False
-            self._lock_manager.clear_lock()
+            self._clear_lock()
         elif cmd.cmd_type == CommandType.SELECT_TARGET_ID:
             if cmd.track_id and self._current_tracks:
-                self._lock_manager.select_by_id(cmd.track_id, self._current_tracks.tracks)
+                self._operator_selected = self._lock_manager.select_by_id(
+                    cmd.track_id, self._current_tracks.tracks) or self._operator_selected
         elif cmd.cmd_type == CommandType.SELECT_TARGET_PIXEL:
             if cmd.pixel_u is not None and cmd.pixel_v is not None and self._current_tracks:
-                self._lock_manager.select_by_pixel(
+                self._operator_selected = self._lock_manager.select_by_pixel(
                     cmd.pixel_u, cmd.pixel_v, self._current_tracks.tracks
-                )
+                ) or self._operator_selected
         elif cmd.cmd_type == CommandType.SET_DEPTH_RANGE:
             if cmd.min_depth is not None:
                 self._min_depth = cmd.min_depth
             if cmd.max_depth is not None:
                 self._max_depth = cmd.max_depth
         elif cmd.cmd_type == CommandType.CLEAR_LOCK:
-            self._lock_manager.clear_lock()
+            self._clear_lock()
+
+    def _handle_attitude(self, msg) -> None:
+        """Buffer an FC attitude sample."""
+        if self._attitude is None:
+            return
+        if isinstance(msg, dict):
+            msg = Attitude(
+                roll=msg.get('roll', 0.0),
+                pitch=msg.get('pitch', 0.0),
+                yaw=msg.get('yaw', 0.0),
+                rollspeed=msg.get('rollspeed', 0.0),
+                pitchspeed=msg.get('pitchspeed', 0.0),
+                yawspeed=msg.get('yawspeed', 0.0),
+                timestamp=msg.get('timestamp', time.time())
+            )
+        self._attitude.add(msg)
+
+    def _attitude_at(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
+        """FC attitude at a capture time, or None (errors stay in the camera frame)."""
+        if self._attitude is None:
+            return None
+        attitude = self._attitude.at(timestamp)
+        if attitude is None and len(self._attitude):
+            logger.debug(f"No attitude sample within {self._attitude.max_gap_s * 1000:.0f}ms "
+                         f"of capture time; errors not derotated")
+        return attitude
+
+    def _clear_lock(self) -> None:
+        """Clear the lock (operator command)."""
+        self._lock_manager.clear_lock()
+        self._operator_selected = False
 
-    def _process_tracks(self) -> None:
-        """Process incoming track lists."""
+    def _process_tracks(self, timeout_ms: int = 0) -> Tuple[bool, bool]:
+        """
+        Process incoming track lists and locked-target updates.
+        
+        Args:
+            timeout_ms: Max wait for the first message (0 = just drain)
+            
+        Returns:
+            (new track frame_id received, new locked_target received)
+        """
+        new_frame = False
+        new_target = False
         while True:
-            result = self._track_sub.receive(timeout_ms=0)
+            result = self._track_sub.receive(timeout_ms=timeout_ms)
+            timeout_ms = 0
             if result is None:
                 break
             
             topic, msg = result
-            if isinstance(msg, TrackList):
+            if topic == "locked_target":
+                if isinstance(msg, dict):
+                    bbox = msg.get('bbox', {})
+                    self._locked_target = LockedTarget(
+                        track_id=msg.get('track_id', 0),
+                        bbox=BoundingBox(
+                            x1=bbox.get('x1', 0),
+                            y1=bbox.get('y1', 0),
+                            x2=bbox.get('x2', 0),
+                            y2=bbox.get('y2', 0)
+                        ),
+                        score=msg.get('score', 0.0),
+                        timestamp=msg.get('timestamp', time.time()),
+                        reseeded=msg.get('reseeded', False)
+                    )
+                    new_target = True
+            elif isinstance(msg, TrackList):
                 self._current_tracks = msg
             elif isinstance(msg, dict) and 'tracks' in msg:
                 # Reconstruct from dict
-                from ..common.types import Track, BoundingBox
                 tracks = []
                 for t in msg.get('tracks', []):
                     bbox = t.get('bbox', {})
@@ -252,46 +471,170 @@ class TargetingNode:
                         class_id=t.get('class_id', 0),
                         label=t.get('label', 'unknown'),
                         confidence=t.get('confidence', 0.0),
-                        timestamp=t.get('timestamp', time.time())
+                        timestamp=t.get('timestamp', time.time()),
+                        velocity=tuple(t['velocity']) if t.get('velocity') else None,
+                        covariance=t.get('covariance'),
+                        appearance=t.get('appearance')
                     ))
                 self._current_tracks = TrackList(
                     tracks=tracks,
                     frame_id=msg.get('frame_id', 0),
                     timestamp=msg.get('timestamp', time.time())
                 )
+        
+        if self._current_tracks is not None and self._current_tracks.frame_id != self._last_frame_id:
+            self._last_frame_id = self._current_tracks.frame_id
+            new_frame = True
+        return new_frame, new_target
 
-    def _compute_and_publish(self) -> None:
-        """Compute lock state and errors, then publish."""
+    def _compute_and_publish(self, update_lock: bool = True) -> None:
+        """
+        Compute lock state and errors, then publish.
+        
+        Args:
+            update_lock: Advance the lock manager (only on a new track frame)
+        """
         if not self._current_tracks:
             return
 
         # Update lock state
-        lock_state = self._lock_manager.update(self._current_tracks.tracks)
+        frame_errors = None
+        if update_lock:
+            if self.config.track_errors or self._prioritizer is not None:
+                frame_errors = self._frame_errors()
+            lock_state = self._lock_manager.update(self._current_tracks.tracks)
+            if lock_state.status == LockStatus.UNLOCKED:
+                self._operator_selected = False
+            if self._prioritizer is not None:
+                lock_state = self._auto_select(lock_state)
+        else:
+            lock_state = self._lock_manager.get_lock_state()
         
         # Publish lock state
         self._publisher.publish("lock_state", lock_state)
         
         # Get locked track
-        locked_track = self._lock_manager.get_locked_track(self._current_tracks.tracks)
+        locked_track = self._with_locked_target(
+            self._lock_manager.get_locked_track(self._current_tracks.tracks)
+        )
         
-        # Query depth if we have OAK bridge and a locked track
+        # Query depth if we have a depth source and a locked track
         depth_m = None
-        if self._oak and locked_track:
+        if self._depth and locked_track:
             bbox = locked_track.bbox
-            depth_m = self._oak.query_depth_roi(
+            depth_m = self._depth.query_depth_roi(
                 int(bbox.x1), int(bbox.y1),
-                int(bbox.x2), int(bbox.y2)
+                int(bbox.x2), int(bbox.y2),
+                self.config.error.depth_percentile
             )
         
         # Compute errors
         errors = self._error_computer.compute(
             track=locked_track,
             depth_m=depth_m,
-            lock_valid=lock_state.is_valid
+            lock_valid=lock_state.is_valid,
+            attitude=self._attitude_at(locked_track.timestamp) if locked_track else None
         )
         
         # Publish errors
         self._publisher.publish("errors", errors)
+        self._update_estimator(locked_track, depth_m if errors.depth_valid else None, lock_state)
+        if frame_errors is not None:
+            self._publish_track_errors(*frame_errors)
+        self._last_lock_state = lock_state
+        self._last_errors = errors
+        self._last_publish_time = time.time()
+
+    def _update_estimator(
+        self,
+        track: Optional[Track],
+        depth_m: Optional[float],
+        lock_state: LockState
+    ) -> None:
+        """Fuse the locked target's observation and publish its 3D state."""
+        if self._estimator is None:
+            return
+        if lock_state.status == LockStatus.UNLOCKED:
+            self._estimator.reset()
+            return
+        if track is None:
+            return
+
+        attitude = self._attitude_at(track.timestamp)
+        u, v = np.array(track.bbox.center[0]), np.array(track.bbox.center[1])
+        # Camera is body-fixed and looks forward: the body line of sight's
+        # forward component is the cosine to the optical axis (depth is along it)
+        body_los = self._error_computer.line_of_sight(u, v)
+        los = body_los if attitude is None else self._error_computer.line_of_sight(u, v, attitude)
+        frame = "ned" if attitude is not None else "body"
+        if self._estimator.update(track.track_id, los, depth_m, frame, track.timestamp,
+                                  optical_cos=float(body_los[0])):
+            self._publisher.publish("target_state", self._estimator.state())
+
+    def _frame_errors(self) -> Tuple[TrackArrays, ErrorArrays, Optional[np.ndarray]]:
+        """
+        Errors (and priorities) for all tracks of the current frame.
+
+        Returns:
+            (track arrays, errors, priority scores or None)
+        """
+        tracks = self._current_tracks.tracks
+        track_array = TrackArrays.from_tracks(tracks)
+        if self._depth and tracks:
+            # One depth frame read for all ROIs
+            depths = self._depth.query_depth_rois(track_array.bboxes, self.config.error.depth_percentile)
+        else:
+            depths = np.full(len(tracks), np.nan)
+
+        # Published tracks carry the frame's capture time
+        attitude = self._attitude_at(float(track_array.timestamps.max())) if tracks else None
+        result = self._error_computer.compute_all(track_array, depths, attitude=attitude)
+        scores = None
+        if self._prioritizer is not None:
+            scores = self._prioritizer.update(track_array, result, time.time())
+        return track_array, result, scores
+
+    def _auto_select(self, lock_state: LockState) -> LockState:
+        """Apply the prioritizer's auto-lock / auto-handoff decision."""
+        track_id = self._prioritizer.choose(
+            lock_state.status, lock_state.locked_track_id, self._operator_selected
+        )
+        if track_id is None or not self._lock_manager.select_by_id(track_id, self._current_tracks.tracks):
+            return lock_state
+        self._operator_selected = False
+        return self._lock_manager.get_lock_state()
+
+    def _publish_track_errors(
+        self,
+        track_array: TrackArrays,
+        result: ErrorArrays,
+        scores: Optional[np.ndarray]
+    ) -> None:
+        """Publish errors for all tracks of the current frame in one message."""
+        range_error = np.where(np.isnan(result.range_error), None, result.range_error)
+        self._publisher.publish("track_errors", TrackErrors(
+            frame_id=self._current_tracks.frame_id,
+            track_ids=track_array.ids.tolist(),
+            yaw_error=result.yaw_error.tolist(),
+            pitch_error=result.pitch_error.tolist(),
+            range_error=range_error.tolist(),
+            depth_valid=result.depth_valid.tolist(),
+            priority=None if scores is None else np.round(scores, 3).tolist()
+        ))
+
+    def _publish_keepalive(self) -> None:
+        """Republish the last lock state and errors unchanged (same timestamp)."""
+        self._publisher.publish("lock_state", self._last_lock_state)
+        self._publisher.publish("errors", self._last_errors)
+        self._last_publish_time = time.time()
+
+    def _with_locked_target(self, track: Optional[Track]) -> Optional[Track]:
+        """Use the camera-rate correlation position if newer than the track."""
+        target = self._locked_target
+        if (track is None or target is None or target.track_id != track.track_id
+                or target.timestamp <= track.timestamp):
+            return track
+        return replace(track, bbox=target.bbox, timestamp=target.timestamp)
 
 
 def main():
@@ -301,6 +644,7 @@ def main():
 
     parser = argparse.ArgumentParser(description="Targeting Node")
     parser.add_argument("--config-dir", default="configs", help="Config directory")
+    parser.add_argument("--mode", default="bench_px4_v1_16", help="Mode config name")
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO)
@@ -308,6 +652,7 @@ def main():
     config = load_targeting_config(
         os.path.join(args.config_dir, "targeting.yaml"),
         os.path.join(args.config_dir, "camera.yaml"),
+        os.path.join(args.config_dir, "modes", f"{args.mode}.yaml"),
     )
 
     node = TargetingNode(config)
@@ -12,6 +12,8 @@ from typing import Optional
 import numpy as np
 import yaml
 
+from ..common.scheduler import RateScheduler
+
 logger = logging.getLogger(__name__)
 
 # Try to import GStreamer
@@ -349,12 +351,12 @@ class VideoStreamerNode:
 
     def _run_loop(self) -> None:
         """Main processing loop."""
-        target_period = 1.0 / self.config.fps
+        scheduler = RateScheduler(self.config.fps, name="video_streamer")
         frame_count = 0
         last_track_log = time.time()
         
         while self._running:
-            loop_start = time.time()
+            scheduler.wait()
             
             # Check for new tracks (non-blocking)
             if self._track_sub:
@@ -399,11 +401,6 @@ class VideoStreamerNode:
                 frame = self._draw_tracks(frame)
                 self._streamer.push_frame(frame)
                 frame_count += 1
-            
-            # Rate limiting
-            elapsed = time.time() - loop_start
-            if elapsed < target_period:
-                time.sleep(target_period - elapsed)
 
 
 def main():
@@ -0,0 +1,120 @@
+"""
+Tests for the lens-distortion-aware pixel → angle LUT.
+
+Run with: pytest tests/test_angle_lut.py -v
+"""
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+from src.common.angle_lut import AngleLUT
+from src.common.math3d import pixel_to_angles
+from src.common.types import BoundingBox, CameraIntrinsics, Track
+from src.oak.calibration import RgbCalibration, load_calibration, save_calibration
+from src.targeting.errors import ErrorComputer, ErrorConfig
+
+DISTORTION = [-0.12, 0.05, 0.001, -0.0005, -0.01]
+
+
+@pytest.fixture
+def intrinsics():
+    return CameraIntrinsics(fx=666.67, fy=666.67, cx=640, cy=360, width=1280, height=720,
+                            distortion=DISTORTION)
+
+
+def _undistorted_angles(intrinsics, u, v):
+    camera_matrix = np.array([[intrinsics.fx, 0, intrinsics.cx],
+                              [0, intrinsics.fy, intrinsics.cy],
+                              [0, 0, 1]], dtype=np.float64)
+    points = np.array([[[u, v]]], dtype=np.float64)
+    x, y = cv2.undistortPoints(points, camera_matrix, np.array(DISTORTION)).ravel()
+    return np.arctan(x), -np.arctan(y)
+
+
+class TestAngleLUT:
+    """Test LUT construction, interpolation and caching."""
+
+    def test_zero_distortion_matches_pinhole(self, intrinsics):
+        lut = AngleLUT.build(intrinsics, None, step=8)
+        for u, v in [(640, 360), (0, 0), (1279, 719), (123.4, 567.8), (1000, 100)]:
+            yaw, pitch = lut.angles(u, v)
+            expected = pixel_to_angles(u, v, intrinsics.fx, intrinsics.fy,
+                                       intrinsics.cx, intrinsics.cy)
+            assert yaw == pytest.approx(expected[0], abs=1e-4)
+            assert pitch == pytest.approx(expected[1], abs=1e-4)
+
+    def test_distortion_matches_undistort_points(self, intrinsics):
+        lut = AngleLUT.build(intrinsics, DISTORTION, step=8)
+        for u, v in [(5, 5), (1275, 700), (100, 360), (640, 20), (901.3, 611.7)]:
+            yaw, pitch = lut.angles(u, v)
+            expected = _undistorted_angles(intrinsics, u, v)
+            assert yaw == pytest.approx(expected[0], abs=2e-4)
+            assert pitch == pytest.approx(expected[1], abs=2e-4)
+
+    def test_distortion_corrects_edges(self, intrinsics):
+        lut = AngleLUT.build(intrinsics, DISTORTION, step=8)
+        yaw, _ = lut.angles(1270, 360)
+        pinhole_yaw, _ = pixel_to_angles(1270, 360, intrinsics.fx, intrinsics.fy,
+                                         intrinsics.cx, intrinsics.cy)
+        # Barrel distortion compresses the edges: the true angle is larger
+        assert abs(yaw) > abs(pinhole_yaw) + np.radians(0.5)
+
+    def test_vectorized_matches_scalar(self, intrinsics):
+        lut = AngleLUT.build(intrinsics, DISTORTION, step=8)
+        u = np.array([10.0, 640.0, 1200.5])
+        v = np.array([700.0, 360.0, 33.3])
+        yaw, pitch = lut.angles(u, v)
+        assert yaw.shape == (3,)
+        for i in range(3):
+            assert (yaw[i], pitch[i]) == pytest.approx(lut.angles(u[i], v[i]))
+
+    def test_outside_frame_extrapolates(self, intrinsics):
+        lut = AngleLUT.build(intrinsics, None, step=8)
+        yaw, _ = lut.angles(1300, 360)
+        assert yaw > lut.angles(1279, 360)[0]
+
+    def test_cache_round_trip(self, intrinsics, tmp_path):
+        built = AngleLUT.load_or_build(intrinsics, DISTORTION, 8, serial="18443010", cache_dir=str(tmp_path))
+        files = os.listdir(tmp_path)
+        assert len(files) == 1
+        assert files[0].startswith("18443010_1280x720_")
+
+        loaded = AngleLUT.load_or_build(intrinsics, DISTORTION, 8, serial="18443010", cache_dir=str(tmp_path))
+        np.testing.assert_array_equal(loaded.yaw, built.yaw)
+        np.testing.assert_array_equal(loaded.pitch, built.pitch)
+
+        # A different calibration gets its own table
+        AngleLUT.load_or_build(intrinsics, [0.0] * 5, 8, serial="18443010", cache_dir=str(tmp_path))
+        assert len(os.listdir(tmp_path)) == 2
+
+
+class TestErrorComputerLUT:
+    """Test ErrorComputer with the angle LUT."""
+
+    def test_compute_uses_lut(self, intrinsics):
+        computer = ErrorComputer(intrinsics, ErrorConfig(angle_lut=True))
+        track = Track(track_id=1, bbox=BoundingBox(1180, 600, 1220, 680), class_id=0,
+                      label="person", confidence=0.9)
+        errors = computer.compute(track, 10.0, True)
+        expected = _undistorted_angles(intrinsics, 1200, 640)
+        assert errors.yaw_error == pytest.approx(expected[0], abs=2e-4)
+        assert errors.pitch_error == pytest.approx(expected[1], abs=2e-4)
+
+        yaw, pitch, _ = computer.compute_from_pixel((1200, 640), None)
+        assert (yaw, pitch) == pytest.approx((errors.yaw_error, errors.pitch_error))
+
+
+class TestCalibrationFile:
+    """Test device calibration hand-off between processes."""
+
+    def test_round_trip(self, tmp_path):
+        calib = RgbCalibration(serial="18443010", width=1280, height=720,
+                               fx=1010.5, fy=1011.2, cx=641.3, cy=358.9, distortion=DISTORTION)
+        path = str(tmp_path / "calib.json")
+        save_calibration(calib, path)
+        assert load_calibration(path) == calib
+
+    def test_missing_file(self, tmp_path):
+        assert load_calibration(str(tmp_path / "missing.json")) is None
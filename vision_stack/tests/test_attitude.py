@@ -0,0 +1,166 @@
+"""
+Tests for attitude buffering and attitude-aware error derotation.
+
+Run with: pytest tests/test_attitude.py -v
+"""
+
+import math
+
+import numpy as np
+import pytest
+from src.common.attitude import AttitudeBuffer
+from src.common.types import Attitude, BoundingBox, CameraIntrinsics, Track
+from src.mavlink.telemetry import BootClockOffset, TelemetryConfig, TelemetryReceiver
+from src.targeting.errors import ErrorComputer, ErrorConfig
+
+INTRINSICS = CameraIntrinsics(fx=1000, fy=1000, cx=960, cy=540, width=1920, height=1080)
+
+
+def _track(cx, cy, timestamp=100.0):
+    return Track(track_id=1, bbox=BoundingBox(cx - 20, cy - 40, cx + 20, cy + 40),
+                 class_id=0, label="person", confidence=0.9, timestamp=timestamp)
+
+
+class TestAttitudeBuffer:
+    """Test the time-indexed attitude ring."""
+
+    def test_interpolates_between_samples(self):
+        buffer = AttitudeBuffer(max_gap_s=0.1)
+        buffer.add(Attitude(roll=0.0, pitch=0.1, yaw=0.0, timestamp=10.00))
+        buffer.add(Attitude(roll=0.2, pitch=0.3, yaw=0.4, timestamp=10.02))
+        roll, pitch, yaw = buffer.at(10.005)
+        assert roll == pytest.approx(0.05)
+        assert pitch == pytest.approx(0.15)
+        assert yaw == pytest.approx(0.1)
+
+    def test_yaw_wraps_short_way(self):
+        buffer = AttitudeBuffer()
+        buffer.add(Attitude(roll=0.0, pitch=0.0, yaw=math.pi - 0.1, timestamp=1.0))
+        buffer.add(Attitude(roll=0.0, pitch=0.0, yaw=-math.pi + 0.1, timestamp=1.02))
+        _, _, yaw = buffer.at(1.01)
+        assert abs(yaw) == pytest.approx(math.pi)
+
+    def test_gap_limits(self):
+        buffer = AttitudeBuffer(max_gap_s=0.05)
+        assert buffer.at(1.0) is None
+        buffer.add(Attitude(roll=0.1, pitch=0.0, yaw=0.0, timestamp=1.0))
+        assert buffer.at(1.04) == pytest.approx((0.1, 0.0, 0.0))
+        assert buffer.at(1.06) is None
+        assert buffer.at(0.9) is None
+        buffer.add(Attitude(roll=0.3, pitch=0.0, yaw=0.0, timestamp=2.0))
+        # Between two samples but far from both
+        assert buffer.at(1.5) is None
+
+    def test_ring_keeps_newest(self):
+        buffer = AttitudeBuffer(capacity=8, max_gap_s=0.05)
+        for i in range(20):
+            buffer.add(Attitude(roll=i * 0.01, pitch=0.0, yaw=0.0, timestamp=i * 0.01))
+        assert len(buffer) == 8
+        assert buffer.at(0.05) is None
+        assert buffer.at(0.155)[0] == pytest.approx(0.155)
+        assert buffer.latest().roll == pytest.approx(0.19)
+
+    def test_out_of_order_ignored(self):
+        buffer = AttitudeBuffer()
+        buffer.add(Attitude(roll=0.1, pitch=0.0, yaw=0.0, timestamp=2.0))
+        buffer.add(Attitude(roll=0.9, pitch=0.0, yaw=0.0, timestamp=1.0))
+        assert len(buffer) == 1
+
+
+class FakeAttitudeMsg:
+    def __init__(self, time_boot_ms, roll):
+        self.time_boot_ms = time_boot_ms
+        self.roll, self.pitch, self.yaw = roll, 0.0, 0.0
+        self.rollspeed = self.pitchspeed = self.yawspeed = 0.0
+
+
+class TestBootClockOffset:
+    """Test FC boot time -> host time mapping of ATTITUDE samples."""
+
+    def test_minimum_delay_sample_sets_offset(self):
+        clock = BootClockOffset(window_s=10.0)
+        # FC boot at host 1000.0; link delays 8, 2, 15 ms
+        clock.update(1000, 1001.008)
+        clock.update(1020, 1001.022)
+        assert clock.update(1040, 1001.055) == pytest.approx(1001.042)
+        assert clock.offset == pytest.approx(1000.002)
+
+    def test_window_follows_drift(self):
+        clock = BootClockOffset(window_s=1.0)
+        clock.update(1000, 1001.000)
+        # Host clock runs 50 ms ahead a few seconds later
+        assert clock.update(5000, 1005.051) == pytest.approx(1005.051)
+        assert clock.offset == pytest.approx(1000.051)
+
+    def test_reboot_resets(self):
+        clock = BootClockOffset()
+        clock.update(600_000, 1600.0)
+        assert clock.update(500, 1700.5) == pytest.approx(1700.5)
+        assert clock.offset == pytest.approx(1700.0)
+
+    def test_attitude_matched_to_capture_time(self):
+        receiver = TelemetryReceiver(TelemetryConfig())
+        buffer = AttitudeBuffer(max_gap_s=0.1)
+        # FC rolls 0.01 rad per 20 ms sample; receipt jitters 2-30 ms after
+        for i, delay in enumerate([0.002, 0.030, 0.011, 0.025, 0.004]):
+            receiver._process_attitude(FakeAttitudeMsg(20 * i, 0.01 * i), 1000.0 + 0.02 * i + delay)
+            buffer.add(receiver.attitude)
+        assert receiver.attitude.timestamp == pytest.approx(1000.082)
+        # Frame captured at host 1000.052 = FC 50 ms (+2 ms offset error): roll 0.025
+        roll, _, _ = buffer.at(1000.052)
+        assert roll == pytest.approx(0.025)
+
+
+class TestDerotation:
+    """Test line-of-sight derotation in ErrorComputer."""
+
+    def test_disabled_ignores_attitude(self):
+        computer = ErrorComputer(INTRINSICS, ErrorConfig())
+        plain = computer.compute(_track(1200, 400), 10.0, True)
+        rolled = computer.compute(_track(1200, 400), 10.0, True, attitude=(0.5, 0.1, 0.0))
+        assert rolled.yaw_error == plain.yaw_error
+        assert rolled.pitch_error == plain.pitch_error
+
+    def test_zero_attitude_is_identity(self):
+        computer = ErrorComputer(INTRINSICS, ErrorConfig(derotation="earth"))
+        plain = ErrorComputer(INTRINSICS, ErrorConfig()).compute(_track(1200, 400), 10.0, True)
+        errors = computer.compute(_track(1200, 400), 10.0, True, attitude=(0.0, 0.0, 0.0))
+        assert errors.yaw_error == pytest.approx(plain.yaw_error)
+        assert errors.pitch_error == pytest.approx(plain.pitch_error)
+
+    def test_bank_decoupled(self):
+        # A target level and to the right, seen from an aircraft banked 30 deg right
+        roll = math.radians(30)
+        bearing = math.radians(10)
+        t = math.tan(bearing)
+        # Body-frame line of sight: R_x(roll)^T @ (1, t, 0)
+        right, down = math.cos(roll) * t, -math.sin(roll) * t
+        u = INTRINSICS.cx + INTRINSICS.fx * right
+        v = INTRINSICS.cy + INTRINSICS.fy * down
+
+        camera = ErrorComputer(INTRINSICS, ErrorConfig()).compute(_track(u, v), None, True)
+        assert camera.pitch_error > math.radians(4)  # Coupled into pitch in the image
+
+        level = ErrorComputer(INTRINSICS, ErrorConfig(derotation="level"))
+        errors = level.compute(_track(u, v), None, True, attitude=(roll, 0.0, 0.0))
+        assert errors.yaw_error == pytest.approx(bearing, abs=1e-9)
+        assert errors.pitch_error == pytest.approx(0.0, abs=1e-9)
+
+    def test_level_keeps_pitch_earth_removes_it(self):
+        attitude = (0.0, math.radians(10), 0.0)
+        level = ErrorComputer(INTRINSICS, ErrorConfig(derotation="level"))
+        earth = ErrorComputer(INTRINSICS, ErrorConfig(derotation="earth"))
+        track = _track(960, 540)
+        assert level.compute(track, None, True, attitude=attitude).pitch_error == pytest.approx(0.0)
+        # Camera axis with the nose 10 deg up points 10 deg above the horizon
+        assert earth.compute(track, None, True, attitude=attitude).pitch_error == \
+            pytest.approx(math.radians(10))
+
+    def test_vectorized(self):
+        computer = ErrorComputer(INTRINSICS, ErrorConfig(derotation="level"))
+        yaw = np.array([0.0, 0.1, -0.2])
+        pitch = np.array([0.0, -0.05, 0.1])
+        out_yaw, out_pitch = computer.derotate(yaw, pitch, (0.3, 0.0, 0.0))
+        for i in range(3):
+            single = computer.derotate(yaw[i:i + 1], pitch[i:i + 1], (0.3, 0.0, 0.0))
+            assert (out_yaw[i], out_pitch[i]) == pytest.approx((single[0][0], single[1][0]))
@@ -0,0 +1,212 @@
+"""
+Tests for detect-every-N-frames cadence and tracker prediction.
+
+Run with: pytest tests/test_cadence.py -v
+"""
+
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, Detection
+from src.perception.cadence import CadenceConfig, DetectionCadence
+from src.perception.tracker import SimpleIOUTracker, TrackerConfig
+
+
+def _det(x1, y1, x2, y2):
+    return Detection(bbox=BoundingBox(x1, y1, x2, y2), class_id=0, label="person", confidence=0.9)
+
+
+@pytest.fixture
+def frame():
+    return np.full((360, 640, 3), 100, dtype=np.uint8)
+
+
+class TestDetectionCadence:
+    """Test detection scheduling."""
+
+    def test_disabled_always_detects(self, frame):
+        cadence = DetectionCadence(CadenceConfig(enabled=False), target_fps=30.0)
+        cadence.record_detection(0.1, frame)
+        assert cadence.should_detect(frame)
+        assert cadence.interval == 1
+
+    def test_first_frame_detects(self, frame):
+        cadence = DetectionCadence(CadenceConfig(enabled=True, min_interval=3), target_fps=30.0)
+        assert cadence.should_detect(frame)
+
+    def test_fixed_interval(self, frame):
+        config = CadenceConfig(enabled=True, min_interval=3, max_interval=3)
+        cadence = DetectionCadence(config, target_fps=30.0)
+        decisions = []
+        for _ in range(7):
+            detect = cadence.should_detect(frame)
+            decisions.append(detect)
+            if detect:
+                cadence.record_detection(0.001, frame)
+            else:
+                cadence.record_prediction(0.001)
+        assert decisions == [True, False, False, True, False, False, True]
+
+    def test_interval_adapts_to_slow_inference(self, frame):
+        config = CadenceConfig(enabled=True, min_interval=1, max_interval=10)
+        cadence = DetectionCadence(config, target_fps=30.0)
+        cadence.record_prediction(0.002)
+        cadence.record_detection(0.1, frame)
+        # 0.1 + (N - 1) * 0.002 <= N / 30  ->  N >= 3.05
+        assert cadence.interval == 4
+
+    def test_interval_clamped(self, frame):
+        config = CadenceConfig(enabled=True, min_interval=2, max_interval=5)
+        cadence = DetectionCadence(config, target_fps=30.0)
+        cadence.record_detection(1.0, frame)
+        assert cadence.interval == 5
+        cadence = DetectionCadence(config, target_fps=30.0)
+        cadence.record_detection(0.001, frame)
+        assert cadence.interval == 2
+
+    def test_scene_change_forces_detection(self, frame):
+        config = CadenceConfig(enabled=True, min_interval=10, max_interval=10)
+        cadence = DetectionCadence(config, target_fps=30.0)
+        cadence.record_detection(0.001, frame)
+        assert not cadence.should_detect(frame)
+        changed = np.full_like(frame, 200)
+        assert cadence.frame_difference(changed) == pytest.approx(100.0)
+        assert cadence.should_detect(changed)
+
+    def test_uncertainty_forces_detection(self, frame):
+        config = CadenceConfig(enabled=True, min_interval=10, max_interval=10,
+                               uncertainty_threshold=0.5)
+        cadence = DetectionCadence(config, target_fps=30.0)
+        cadence.record_detection(0.001, frame)
+        assert not cadence.should_detect(frame, uncertainty=0.2)
+        assert cadence.should_detect(frame, uncertainty=0.8)
+
+
+class TestTrackerPrediction:
+    """Test SimpleIOUTracker motion-only propagation."""
+
+    @pytest.fixture
+    def tracker(self):
+        return SimpleIOUTracker(TrackerConfig(min_hits=2, velocity_alpha=1.0))
+
+    def _feed(self, tracker, positions):
+        tracks = []
+        for x in positions:
+            tracks = tracker.update([_det(x, 100, x + 50, 200)], None)
+        return tracks
+
+    def test_predict_extrapolates_velocity(self, tracker):
+        self._feed(tracker, [100, 110, 120])
+        tracks = tracker.predict(None)
+        assert len(tracks) == 1
+        assert tracks[0].bbox.x1 == pytest.approx(130)
+        assert tracks[0].bbox.x2 == pytest.approx(180)
+
+    def test_velocity_spans_predicted_frames(self, tracker):
+        self._feed(tracker, [100, 110])
+        tracker.predict(None)
+        tracker.predict(None)
+        tracks = self._feed(tracker, [140])
+        assert tracks[0].bbox.x1 == pytest.approx(140)
+        assert tracker.predict(None)[0].bbox.x1 == pytest.approx(150)
+
+    def test_uncertainty_grows_between_detections(self, tracker):
+        self._feed(tracker, [100, 110])
+        assert tracker.uncertainty == 0.0
+        tracker.predict(None)
+        first = tracker.uncertainty
+        tracker.predict(None)
+        assert first > 0.0
+        assert tracker.uncertainty == pytest.approx(2 * first, rel=0.05)
+
+    def test_predict_ages_out_tracks(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1, max_age=2))
+        tracker.update([_det(0, 0, 10, 10)], None)
+        for _ in range(3):
+            tracks = tracker.predict(None)
+        assert tracks == []
+
+    def test_template_refine_snaps_to_target(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1, template_refine=True))
+        rng = np.random.default_rng(0)
+        patch = rng.integers(0, 255, (40, 40, 3), dtype=np.uint8)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        frame[100:140, 100:140] = patch
+        tracker.update([_det(100, 100, 140, 140)], frame)
+
+        moved = np.zeros_like(frame)
+        moved[104:144, 108:148] = patch
+        tracks = tracker.predict(moved)
+        assert tracks[0].bbox.x1 == pytest.approx(108)
+        assert tracks[0].bbox.y1 == pytest.approx(104)
+
+
+class TestPerceptionStages:
+    """Test that cadence decisions run in the inference stage on a tracker snapshot."""
+
+    @pytest.fixture
+    def node(self, monkeypatch):
+        from src.oak import OakConfig
+        from src.perception import perception_node
+        from src.perception.detector import DetectorConfig
+
+        class FakeDetector:
+            def detect(self, frame):
+                return [_det(100, 100, 140, 180)]
+
+        class FakePublisher:
+            def __init__(self, endpoint):
+                self.sent = []
+
+            def publish(self, topic, message):
+                self.sent.append((topic, message))
+
+        monkeypatch.setattr(perception_node, "OakBridge", lambda config: None)
+        monkeypatch.setattr(perception_node, "load_backend", lambda backend: None)
+        monkeypatch.setattr(perception_node, "create_detector", lambda config: FakeDetector())
+        monkeypatch.setattr(perception_node, "ZmqPublisher", FakePublisher)
+        config = perception_node.PerceptionConfig(
+            camera=OakConfig(), detector=DetectorConfig(), tracker=TrackerConfig(min_hits=1),
+            cadence=CadenceConfig(enabled=True, min_interval=3, max_interval=3,
+                                  frame_diff_threshold=1000.0, uncertainty_threshold=1000.0))
+        return perception_node.PerceptionNode(config)
+
+    def _packet(self, node, frame, frame_id):
+        from src.perception.perception_node import FramePacket
+        return FramePacket(frame_id=frame_id, frame=frame, capture_time=float(frame_id))
+
+    def test_inference_stage_decides_and_tracking_publishes_snapshot(self, node, frame):
+        decisions = []
+        for i in range(6):
+            packet = node._infer_stage(self._packet(node, frame, i))
+            decisions.append(packet.detect)
+            node._track_stage(packet)
+        assert decisions == [True, False, False, True, False, False]
+        snapshot = node._tracker_snapshot
+        assert snapshot.uncertainty >= 0.0
+        assert snapshot.update_s > 0.0
+        assert len([t for t, _ in node._publisher.sent if t == "tracks"]) == 6
+
+    def test_uncertainty_snapshot_forces_detection(self, node, frame):
+        node._track_stage(node._infer_stage(self._packet(node, frame, 0)))
+        node._tracker_snapshot = node._tracker_snapshot._replace(uncertainty=2000.0)
+        assert node._infer_stage(self._packet(node, frame, 1)).detect
+
+    def test_capture_stage_uses_device_time_once_per_frame(self, node, frame):
+        from src.oak import RgbFrame
+
+        class FakeOak:
+            latest = None
+
+            def get_rgb_frame(self):
+                return self.latest
+
+        node._oak = FakeOak()
+        assert node._capture_stage() is None
+        node._oak.latest = RgbFrame(frame, 5, 42.125)
+        packet = node._capture_stage()
+        assert packet.capture_time == 42.125
+        assert packet.frame is frame
+        # Same camera frame again: nothing new to process
+        assert node._capture_stage() is None
+        node._oak.latest = RgbFrame(frame, 6, 42.158)
+        assert node._capture_stage().frame_id == 1
@@ -0,0 +1,63 @@
+"""
+Tests for mode overrides of component configuration.
+
+Run with: pytest tests/test_config.py -v
+"""
+
+import os
+
+import yaml
+from src.common.config import apply_mode_overrides, merge_config
+from src.perception.perception_node import load_perception_config
+from src.targeting.targeting_node import load_targeting_config
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "..", "configs")
+
+
+class TestModeOverrides:
+    """Test merging mode sections over component files."""
+
+    def test_nested_merge(self):
+        base = {"roi": {"enabled": False, "padding": 3.0}, "target_fps": 30.0}
+        merged = merge_config(base, {"roi": {"enabled": True}})
+        assert merged == {"roi": {"enabled": True, "padding": 3.0}, "target_fps": 30.0}
+        assert base["roi"]["enabled"] is False
+
+    def test_missing_section_is_noop(self, tmp_path):
+        mode = tmp_path / "mode.yaml"
+        mode.write_text(yaml.safe_dump({"mode": "flight"}))
+        config = {"roi": {"enabled": False}}
+        assert apply_mode_overrides(config, str(mode), "perception") == config
+        assert apply_mode_overrides(config, None, "perception") == config
+
+    def test_shipped_perception_config(self):
+        paths = [os.path.join(CONFIG_DIR, name)
+                 for name in ("camera.yaml", "perception.yaml", "tracker.yaml")]
+        base = load_perception_config(*paths)
+        flight = load_perception_config(*paths, os.path.join(CONFIG_DIR, "modes", "flight.yaml"))
+        bench = load_perception_config(
+            *paths, os.path.join(CONFIG_DIR, "modes", "bench_px4_v1_16.yaml"))
+        assert not base.roi.enabled
+        assert not flight.roi.enabled
+        assert bench.roi.enabled
+        assert not base.appearance.enabled
+        assert bench.appearance.enabled
+
+    def test_shipped_targeting_config(self):
+        paths = [os.path.join(CONFIG_DIR, name) for name in ("targeting.yaml", "camera.yaml")]
+        base = load_targeting_config(*paths)
+        flight = load_targeting_config(*paths, os.path.join(CONFIG_DIR, "modes", "flight.yaml"))
+        bench = load_targeting_config(
+            *paths, os.path.join(CONFIG_DIR, "modes", "bench_px4_v1_16.yaml"))
+        assert not base.track_errors
+        assert not flight.track_errors
+        assert bench.track_errors
+        assert not base.error.angle_lut
+        assert not flight.error.angle_lut
+        assert bench.error.angle_lut
+        assert base.error.derotation == "none"
+        assert flight.error.derotation == "none"
+        assert bench.error.derotation == "level"
+        assert not base.estimator.enabled
+        assert not flight.estimator.enabled
+        assert bench.estimator.enabled
@@ -0,0 +1,116 @@
+"""
+Tests for the control node's telemetry freshness gating.
+
+Run with: pytest tests/test_control_node.py -v
+"""
+
+import pytest
+from src.common.types import Errors
+from src.control import control_node
+from src.control.control_mapper import ControlConfig, ControlGains, ControlLimits
+from src.control.control_node import ControlNode, ControlNodeConfig
+from src.control.safety_manager import SafetyConfig
+from src.mavlink.telemetry import TelemetryConfig, TelemetryReceiver
+
+
+class FakePublisher:
+    def __init__(self, endpoint):
+        self.sent = []
+
+    def publish(self, topic, message):
+        self.sent.append((topic, message))
+
+    def close(self):
+        pass
+
+
+class FakeSubscriber:
+    def __init__(self, endpoint):
+        self.queue = []
+
+    def subscribe(self, topic):
+        pass
+
+    def receive(self, timeout_ms=0):
+        return self.queue.pop(0) if self.queue else None
+
+    def close(self):
+        pass
+
+
+def _status_msg(heartbeat_age_ms=20.0, connected=True, mode="OFFBOARD"):
+    return ("telemetry", {
+        "connected": connected, "heartbeat_age_ms": heartbeat_age_ms,
+        "armed": True, "mode": mode, "roll": 0.1, "pitch": -0.05, "yaw": 1.2,
+        "attitude_age_ms": 10.0, "timestamp": 100.0,
+    })
+
+
+@pytest.fixture
+def node(monkeypatch):
+    monkeypatch.setattr(control_node, "ZmqPublisher", FakePublisher)
+    monkeypatch.setattr(control_node, "ZmqSubscriber", FakeSubscriber)
+    config = ControlNodeConfig(control=ControlConfig(ControlGains(), ControlLimits()),
+                               safety=SafetyConfig(telemetry_timeout_ms=1000.0))
+    node = ControlNode(config)
+    node._last_errors = Errors(yaw_error=0.2, pitch_error=0.0, range_error=0.0,
+                               track_valid=True, depth_valid=False, lock_valid=True)
+    return node
+
+
+class TestTelemetryFreshness:
+    """Test that SafetyManager sees real FC telemetry freshness."""
+
+    def test_never_received_is_stale(self, node):
+        node._receive_telemetry()
+        assert node.fc_status is None
+        assert not node._telemetry_fresh()
+        node._compute_setpoint()
+        assert node._safety.is_failsafe_active
+
+    def test_fresh_telemetry_passes(self, node):
+        node._telemetry_sub.queue.append(_status_msg())
+        node._receive_telemetry()
+        assert node._telemetry_fresh()
+        setpoint = node._compute_setpoint()
+        assert not node._safety.is_failsafe_active
+        assert setpoint.roll_deg != 0.0
+        assert node.fc_status.mode == "OFFBOARD"
+        assert node.fc_status.yaw == pytest.approx(1.2)
+
+    def test_latest_value_wins(self, node):
+        node._telemetry_sub.queue.append(_status_msg(mode="POSITION"))
+        node._telemetry_sub.queue.append(_status_msg(mode="OFFBOARD"))
+        node._receive_telemetry()
+        assert node.fc_status.mode == "OFFBOARD"
+
+    def test_stale_heartbeat_gates_immediately(self, node):
+        node._telemetry_sub.queue.append(_status_msg(heartbeat_age_ms=1500.0))
+        node._receive_telemetry()
+        assert not node._telemetry_fresh()
+        node._compute_setpoint()
+        assert node._safety.is_failsafe_active
+
+    def test_disconnected_fc_is_stale(self, node):
+        node._telemetry_sub.queue.append(_status_msg(heartbeat_age_ms=None, connected=False))
+        node._receive_telemetry()
+        assert not node._telemetry_fresh()
+
+    def test_bridge_silence_goes_stale(self, node, monkeypatch):
+        node._telemetry_sub.queue.append(_status_msg(heartbeat_age_ms=100.0))
+        node._receive_telemetry()
+        assert node._telemetry_fresh()
+        # No further telemetry: the last report ages on the control side
+        received = node._fc_status_received
+        monkeypatch.setattr(control_node.time, "monotonic", lambda: received + 0.95)
+        assert not node._telemetry_fresh()
+
+
+class TestFcStatus:
+    """Test the bridge-side telemetry summary."""
+
+    def test_status_before_heartbeat(self):
+        status = TelemetryReceiver(TelemetryConfig()).status()
+        assert not status.connected
+        assert status.heartbeat_age_ms is None
+        assert status.roll is None
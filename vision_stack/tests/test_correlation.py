@@ -0,0 +1,153 @@
+"""
+Tests for the locked-target correlation tracker.
+
+Run with: pytest tests/test_correlation.py -v
+"""
+
+import cv2
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, LockStatus, Track
+from src.perception.correlation import CorrelationConfig, LockedTargetTracker, MosseTracker
+
+
+@pytest.fixture
+def scene():
+    """Textured background and a textured 30x50 target patch."""
+    rng = np.random.default_rng(1)
+    small = rng.integers(0, 255, (45, 80), dtype=np.uint8)
+    background = cv2.GaussianBlur(
+        cv2.resize(small, (1280, 720), interpolation=cv2.INTER_NEAREST), (5, 5), 0)
+    patch = cv2.resize(rng.integers(0, 255, (10, 6), dtype=np.uint8), (30, 50),
+                       interpolation=cv2.INTER_NEAREST)
+
+    def render(x, y):
+        frame = background.copy()
+        frame[y:y + 50, x:x + 30] = patch
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+    return render
+
+
+def _track(track_id, x, y):
+    return Track(track_id=track_id, bbox=BoundingBox(x, y, x + 30, y + 50),
+                 class_id=0, label="person", confidence=0.9)
+
+
+class TestMosseTracker:
+    """Test the MOSSE filter."""
+
+    def test_update_before_init(self, scene):
+        assert MosseTracker(CorrelationConfig()).update(scene(0, 0)) is None
+
+    def test_follows_moving_target(self, scene):
+        tracker = MosseTracker(CorrelationConfig())
+        tracker.init(scene(600, 300), BoundingBox(600, 300, 630, 350))
+        x, y = 600, 300
+        for _ in range(30):
+            x, y = x + 4, y + 1
+            bbox = tracker.update(scene(x, y))
+            assert bbox is not None
+        assert bbox.x1 == pytest.approx(x, abs=2)
+        assert bbox.y1 == pytest.approx(y, abs=2)
+        assert tracker.psr > tracker.config.psr_threshold
+
+    def test_lost_on_unrelated_frame(self, scene):
+        tracker = MosseTracker(CorrelationConfig())
+        tracker.init(scene(600, 300), BoundingBox(600, 300, 630, 350))
+        flat = np.full((720, 1280, 3), 128, dtype=np.uint8)
+        assert tracker.update(flat) is None
+        # Filter is kept, so the target is found again when it reappears
+        assert tracker.update(scene(602, 300)) is not None
+
+
+class TestLockedTargetTracker:
+    """Test lock following and re-seeding."""
+
+    def test_no_lock_no_output(self, scene):
+        follower = LockedTargetTracker(CorrelationConfig())
+        assert follower.step(scene(600, 300), 0.0) is None
+
+    def test_reseed_then_follow(self, scene):
+        follower = LockedTargetTracker(CorrelationConfig())
+        follower.set_lock(LockStatus.LOCKED, 7)
+        # Lock held but no confirming detection yet
+        assert follower.step(scene(600, 300), 0.0) is None
+
+        assert follower.reseed([_track(3, 100, 100), _track(7, 600, 300)], scene(600, 300))
+        target = follower.step(scene(604, 300), 1.0)
+        assert target.track_id == 7 and target.reseeded
+        assert target.bbox.x1 == pytest.approx(604, abs=2)
+
+        target = follower.step(scene(608, 301), 2.0)
+        assert not target.reseeded
+        assert target.timestamp == 2.0
+        assert target.bbox.x1 == pytest.approx(608, abs=2)
+
+    def test_reseed_ignores_other_tracks(self, scene):
+        follower = LockedTargetTracker(CorrelationConfig())
+        follower.set_lock(LockStatus.LOCKED, 7)
+        assert not follower.reseed([_track(3, 100, 100)], scene(100, 100))
+        assert follower.step(scene(100, 100), 0.0) is None
+
+    def test_unlock_stops_following(self, scene):
+        follower = LockedTargetTracker(CorrelationConfig())
+        follower.set_lock(LockStatus.LOCKED, 7)
+        follower.reseed([_track(7, 600, 300)], scene(600, 300))
+        assert follower.step(scene(600, 300), 0.0) is not None
+        follower.set_lock(LockStatus.UNLOCKED, None)
+        assert follower.track_id is None
+        assert follower.step(scene(600, 300), 1.0) is None
+
+
+class TestLockedTargetStep:
+    """Test the perception node's camera-rate locked-target step."""
+
+    def test_steps_once_per_frame_with_capture_time(self, scene, monkeypatch):
+        from src.oak import OakConfig, RgbFrame
+        from src.perception import perception_node
+        from src.perception.detector import DetectorConfig
+        from src.perception.tracker import TrackerConfig
+
+        class FakeOak:
+            latest = None
+
+            def get_rgb_frame(self):
+                return self.latest
+
+        class FakePublisher:
+            def __init__(self, endpoint):
+                self.sent = []
+
+            def publish(self, topic, message):
+                self.sent.append((topic, message))
+
+        class FakeSubscriber:
+            def __init__(self, endpoint):
+                pass
+
+            def subscribe(self, topic):
+                pass
+
+        monkeypatch.setattr(perception_node, "OakBridge", lambda config: FakeOak())
+        monkeypatch.setattr(perception_node, "load_backend", lambda backend: None)
+        monkeypatch.setattr(perception_node, "create_detector", lambda config: None)
+        monkeypatch.setattr(perception_node, "ZmqPublisher", FakePublisher)
+        monkeypatch.setattr(perception_node, "ZmqSubscriber", FakeSubscriber)
+        node = perception_node.PerceptionNode(perception_node.PerceptionConfig(
+            camera=OakConfig(), detector=DetectorConfig(), tracker=TrackerConfig(),
+            correlation=CorrelationConfig(enabled=True)))
+        node._locked_target.set_lock(LockStatus.LOCKED, 7)
+        node._locked_target.reseed([_track(7, 600, 300)], scene(600, 300))
+
+        node._oak.latest = RgbFrame(scene(603, 300), sequence=1, timestamp=50.25)
+        node._locked_target_step()
+        node._locked_target_step()  # Same frame: not stepped again
+        sent = [m for topic, m in node._publisher.sent if topic == "locked_target"]
+        assert len(sent) == 1
+        assert sent[0].timestamp == 50.25
+
+        node._oak.latest = RgbFrame(scene(606, 300), sequence=2, timestamp=50.28)
+        node._locked_target_step()
+        sent = [m for topic, m in node._publisher.sent if topic == "locked_target"]
+        assert [m.timestamp for m in sent] == [50.25, 50.28]
@@ -0,0 +1,150 @@
+"""
+Tests for the shared-memory depth frame.
+
+Run with: pytest tests/test_depth_shm.py -v
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+from src.oak.depth_query import (
+    query_depth_roi_median,
+    query_depth_roi_percentile,
+    query_depth_rois_percentile,
+)
+from src.oak import depth_shm
+from src.oak.depth_shm import SharedDepthReader, SharedDepthWriter
+
+
+@pytest.fixture
+def shm_name():
+    return f"test_depth_{os.getpid()}_{time.monotonic_ns()}"
+
+
+@pytest.fixture
+def depth_frame():
+    frame = np.full((400, 640), 5000, dtype=np.uint16)
+    frame[100:200, 200:300] = 2000  # Target at 2 m
+    frame[100:110, 200:300] = 0  # Invalid pixels
+    return frame
+
+
+class TestDepthQuery:
+    """Test ROI percentile helpers."""
+
+    def test_percentile_matches_median(self, depth_frame):
+        args = (depth_frame, 400, 180, 600, 360, (1280, 720), (640, 400))
+        assert query_depth_roi_percentile(*args) == query_depth_roi_median(*args)
+
+    def test_ignores_invalid_pixels(self, depth_frame):
+        # RGB ROI (400..600, 180..360) -> depth (200..300, 100..200)
+        depth = query_depth_roi_percentile(depth_frame, 400, 180, 600, 360,
+                                           (1280, 720), (640, 400), 10.0)
+        assert depth == pytest.approx(2.0)
+
+    def test_batch_matches_single_queries(self):
+        frame = np.random.default_rng(0).integers(0, 6000, (400, 640)).astype(np.uint16)
+        bboxes = np.array([[0, 0, 100, 100], [400, 180, 600, 360], [10, 10, 10, 50],
+                           [1200, 700, 1400, 800], [-5, -5, 30, 20]])
+        depths = query_depth_rois_percentile(frame, bboxes, (1280, 720), (640, 400), 37.0)
+        for depth, bbox in zip(depths, bboxes):
+            single = query_depth_roi_percentile(frame, *bbox, (1280, 720), (640, 400), 37.0)
+            if single is None:
+                assert np.isnan(depth)
+            else:
+                assert depth == pytest.approx(single)
+
+
+class TestSharedDepth:
+    """Test writer/reader round trips."""
+
+    def test_roi_query(self, shm_name, depth_frame):
+        writer = SharedDepthWriter(640, 400, shm_name)
+        reader = SharedDepthReader((1280, 720), shm_name)
+        try:
+            writer.write(depth_frame)
+            assert reader.query_depth_roi(400, 180, 600, 360) == pytest.approx(2.0)
+            assert reader.query_depth_roi(0, 0, 100, 100) == pytest.approx(5.0)
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_reader_before_writer(self, shm_name, depth_frame):
+        reader = SharedDepthReader((1280, 720), shm_name, retry_interval_s=0.0)
+        assert reader.query_depth_roi(400, 180, 600, 360) is None
+        writer = SharedDepthWriter(640, 400, shm_name)
+        try:
+            assert reader.query_depth_roi(400, 180, 600, 360) is None  # No frame yet
+            writer.write(depth_frame)
+            assert reader.query_depth_roi(400, 180, 600, 360) == pytest.approx(2.0)
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_batch_roi_query(self, shm_name, depth_frame):
+        writer = SharedDepthWriter(640, 400, shm_name)
+        reader = SharedDepthReader((1280, 720), shm_name)
+        try:
+            bboxes = np.array([[400, 180, 600, 360], [0, 0, 100, 100]])
+            assert np.isnan(reader.query_depth_rois(bboxes)).all()  # No frame yet
+            writer.write(depth_frame)
+            np.testing.assert_allclose(reader.query_depth_rois(bboxes), [2.0, 5.0])
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_stale_frame(self, shm_name, depth_frame):
+        writer = SharedDepthWriter(640, 400, shm_name)
+        reader = SharedDepthReader((1280, 720), shm_name, max_age_s=0.1)
+        try:
+            writer.write(depth_frame, timestamp=time.time() - 1.0)
+            assert reader.query_depth_roi(400, 180, 600, 360) is None
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_smaller_frame(self, shm_name):
+        writer = SharedDepthWriter(640, 400, shm_name)
+        reader = SharedDepthReader((1280, 720), shm_name)
+        try:
+            writer.write(np.full((200, 320), 3000, dtype=np.uint16))
+            assert reader.query_depth_roi(0, 0, 1280, 720) == pytest.approx(3.0)
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_retry_backs_off_during_write(self, shm_name, depth_frame, monkeypatch):
+        writer = SharedDepthWriter(640, 400, shm_name)
+        reader = SharedDepthReader((1280, 720), shm_name)
+        pauses = []
+        try:
+            writer.write(depth_frame)
+            writer._seq[0] += 1  # Writer caught mid-frame
+            monkeypatch.setattr(depth_shm.time, "sleep", pauses.append)
+            assert reader.query_depth_roi(400, 180, 600, 360) is None
+            assert len(pauses) == depth_shm.READ_ATTEMPTS - 1
+            assert pauses == sorted(pauses) and all(p > 0 for p in pauses)
+
+            # Writer finishes while the reader backs off
+            monkeypatch.setattr(depth_shm.time, "sleep",
+                                lambda s: writer._seq.__setitem__(0, writer._seq[0] + 1))
+            assert reader.query_depth_roi(400, 180, 600, 360) == pytest.approx(2.0)
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_query_under_a_millisecond(self, shm_name, depth_frame):
+        writer = SharedDepthWriter(640, 400, shm_name)
+        reader = SharedDepthReader((1280, 720), shm_name)
+        try:
+            writer.write(depth_frame)
+            reader.query_depth_roi(400, 180, 600, 360)
+            start = time.perf_counter()
+            for _ in range(100):
+                reader.query_depth_roi(400, 180, 600, 360)
+            assert (time.perf_counter() - start) / 100 < 1e-3
+        finally:
+            reader.close()
+            writer.close()
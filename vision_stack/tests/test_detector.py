@@ -0,0 +1,69 @@
+"""
+Tests for detector postprocessing.
+
+Run with: pytest tests/test_detector.py -v
+"""
+
+import numpy as np
+import pytest
+from src.perception.detector import build_label_lut, detections_from_array
+
+
+@pytest.fixture
+def label_lut():
+    """Lookup with model names overriding the fallback."""
+    return build_label_lut({0: "human", 2: "drone"}, {0: "person", 1: "bicycle", 2: "car"})
+
+
+class TestLabelLut:
+    """Test class-name lookup table."""
+
+    def test_model_names_take_precedence(self, label_lut):
+        assert label_lut[0] == "human"
+        assert label_lut[2] == "drone"
+
+    def test_fallback_names_used(self, label_lut):
+        assert label_lut[1] == "bicycle"
+
+    def test_empty_names(self):
+        assert len(build_label_lut({}, {})) == 0
+
+
+class TestDetectionsFromArray:
+    """Test batched detection conversion."""
+
+    def test_converts_rows(self, label_lut):
+        data = np.array([
+            [10, 20, 30, 40, 0.9, 0],
+            [50, 60, 70, 80, 0.6, 2],
+        ], dtype=np.float32)
+        dets = detections_from_array(data, label_lut, timestamp=1.0)
+        
+        assert len(dets) == 2
+        assert dets[0].bbox.x1 == 10.0 and dets[0].bbox.y2 == 40.0
+        assert dets[0].label == "human"
+        assert dets[1].class_id == 2 and dets[1].label == "drone"
+        assert dets[1].confidence == pytest.approx(0.6)
+        assert all(d.timestamp == 1.0 for d in dets)
+
+    def test_native_python_types(self, label_lut):
+        data = np.array([[1, 2, 3, 4, 0.5, 1]], dtype=np.float32)
+        det = detections_from_array(data, label_lut)[0]
+        
+        assert type(det.class_id) is int
+        assert type(det.confidence) is float
+        assert type(det.bbox.x1) is float
+
+    def test_unknown_class(self, label_lut):
+        data = np.array([[1, 2, 3, 4, 0.5, 7]], dtype=np.float32)
+        assert detections_from_array(data, label_lut)[0].label == "class_7"
+
+    def test_track_id_column_ignored(self, label_lut):
+        """Rows with a track ID column use the last two columns for conf/cls."""
+        data = np.array([[1, 2, 3, 4, 99, 0.8, 1]], dtype=np.float32)
+        det = detections_from_array(data, label_lut)[0]
+        assert det.class_id == 1
+        assert det.confidence == pytest.approx(0.8)
+
+    def test_empty(self, label_lut):
+        assert detections_from_array(np.zeros((0, 6)), label_lut) == []
@@ -0,0 +1,88 @@
+"""
+Tests for camera ego-motion estimation and compensation.
+
+Run with: pytest tests/test_ego_motion.py -v
+"""
+
+import cv2
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, Detection
+from src.perception.ego_motion import EgoMotionEstimator, warp_points, warp_scale
+from src.perception.tracker import ByteTrackTracker, SimpleIOUTracker, TrackerConfig
+
+
+def _scene(seed=0, size=(720, 1280)):
+    """Textured background so optical flow has corners to track."""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, (size[0] // 16, size[1] // 16), dtype=np.uint8)
+    gray = cv2.resize(small, (size[1], size[0]), interpolation=cv2.INTER_NEAREST)
+    return cv2.cvtColor(cv2.GaussianBlur(gray, (5, 5), 0), cv2.COLOR_GRAY2BGR)
+
+
+def _shift(frame, dx, dy):
+    m = np.float32([[1, 0, dx], [0, 1, dy]])
+    return cv2.warpAffine(frame, m, (frame.shape[1], frame.shape[0]), borderMode=cv2.BORDER_REFLECT)
+
+
+def _det(x1, y1, x2, y2):
+    return Detection(bbox=BoundingBox(x1, y1, x2, y2), class_id=0, label="person", confidence=0.9)
+
+
+class TestWarpHelpers:
+    """Test affine helpers."""
+
+    def test_warp_points(self):
+        warp = np.array([[0.0, -2.0, 10.0], [2.0, 0.0, 5.0]])
+        np.testing.assert_allclose(warp_points(warp, np.array([[1.0, 0.0]])), [[10.0, 7.0]])
+        assert warp_scale(warp) == pytest.approx(2.0)
+
+
+class TestEgoMotionEstimator:
+    """Test flow-based global motion."""
+
+    def test_first_frame_none(self):
+        assert EgoMotionEstimator().estimate(_scene()) is None
+
+    def test_recovers_translation(self):
+        estimator = EgoMotionEstimator()
+        frame = _scene()
+        estimator.estimate(frame)
+        warp = estimator.estimate(_shift(frame, 40, -24))
+        assert warp is not None
+        assert warp[0, 2] == pytest.approx(40, abs=4)
+        assert warp[1, 2] == pytest.approx(-24, abs=4)
+        assert warp_scale(warp) == pytest.approx(1.0, abs=0.02)
+
+    def test_featureless_frame_none(self):
+        estimator = EgoMotionEstimator()
+        flat = np.full((720, 1280, 3), 128, dtype=np.uint8)
+        estimator.estimate(flat)
+        assert estimator.estimate(flat) is None
+
+
+class TestTrackerCompensation:
+    """Test that camera motion keeps IDs through large global shifts."""
+
+    @pytest.mark.parametrize("tracker_cls", [SimpleIOUTracker, ByteTrackTracker])
+    def test_ids_survive_camera_pan(self, tracker_cls):
+        frame = _scene()
+        box = np.array([600.0, 300.0, 640.0, 380.0])
+        tracker = tracker_cls(TrackerConfig(min_hits=1, ego_motion=True))
+        tracks = tracker.update([_det(*box)], frame)
+        first_id = tracks[0].track_id
+
+        # Camera pans: whole image (and the target) shifts 60 px per frame,
+        # far more than the 40 px box width
+        for step in range(1, 4):
+            shifted = _shift(frame, 60 * step, 0)
+            tracks = tracker.update([_det(*(box + [60 * step, 0, 60 * step, 0]))], shifted)
+        assert [t.track_id for t in tracks] == [first_id]
+
+    def test_without_compensation_ids_churn(self):
+        frame = _scene()
+        box = np.array([600.0, 300.0, 640.0, 380.0])
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1, ego_motion=False))
+        tracker.update([_det(*box)], frame)
+        tracks = tracker.update([_det(*(box + [60, 0, 60, 0]))], _shift(frame, 60, 0))
+        assert 1 not in [t.track_id for t in tracks if t.bbox.x1 > 650]
@@ -0,0 +1,111 @@
+"""
+Tests for targeting error computation.
+
+Run with: pytest tests/test_errors.py -v
+"""
+
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, CameraIntrinsics, Track, TrackArrays
+from src.targeting.errors import ErrorComputer, ErrorConfig
+
+
+@pytest.fixture
+def intrinsics():
+    return CameraIntrinsics(fx=1000, fy=1000, cx=960, cy=540, width=1920, height=1080)
+
+
+def _track(cx, cy, velocity=None, timestamp=100.0):
+    return Track(track_id=1, bbox=BoundingBox(cx - 20, cy - 40, cx + 20, cy + 40),
+                 class_id=0, label="person", confidence=0.9,
+                 timestamp=timestamp, velocity=velocity)
+
+
+class TestErrorComputer:
+    """Test angular/range errors and latency compensation."""
+
+    def test_centered_target(self, intrinsics):
+        errors = ErrorComputer(intrinsics, ErrorConfig()).compute(_track(960, 540), 10.0, True)
+        assert errors.yaw_error == pytest.approx(0.0)
+        assert errors.pitch_error == pytest.approx(0.0)
+        assert errors.all_valid
+        assert errors.lead_time_s == 0.0
+
+    def test_invalid_lock(self, intrinsics):
+        errors = ErrorComputer(intrinsics, ErrorConfig()).compute(_track(1200, 540), 10.0, False)
+        assert not errors.track_valid
+        assert errors.yaw_error == 0.0
+
+    def test_predictive_off_ignores_velocity(self, intrinsics):
+        computer = ErrorComputer(intrinsics, ErrorConfig())
+        plain = computer.compute(_track(1000, 540), None, True, now=100.1)
+        moving = computer.compute(_track(1000, 540, velocity=(500.0, 0.0)), None, True, now=100.1)
+        assert moving.yaw_error == plain.yaw_error
+
+    def test_predictive_leads_target(self, intrinsics):
+        computer = ErrorComputer(intrinsics, ErrorConfig(predictive=True, actuation_latency_s=0.05))
+        track = _track(960, 540, velocity=(400.0, -200.0), timestamp=100.0)
+        errors = computer.compute(track, None, True, now=100.05)
+        # Lead = frame age 0.05 + actuation 0.05 -> center (1000, 520)
+        assert errors.lead_time_s == pytest.approx(0.1)
+        expected = ErrorComputer(intrinsics, ErrorConfig()).compute(
+            _track(1000, 520), None, True)
+        assert errors.yaw_error == pytest.approx(expected.yaw_error)
+        assert errors.pitch_error == pytest.approx(expected.pitch_error)
+
+    def test_lead_is_capped(self, intrinsics):
+        computer = ErrorComputer(intrinsics, ErrorConfig(predictive=True, max_lead_s=0.2))
+        track = _track(960, 540, velocity=(100.0, 0.0), timestamp=100.0)
+        assert computer.compute(track, None, True, now=105.0).lead_time_s == pytest.approx(0.2)
+
+    def test_no_velocity_no_lead(self, intrinsics):
+        computer = ErrorComputer(intrinsics, ErrorConfig(predictive=True))
+        errors = computer.compute(_track(960, 540), None, True, now=100.1)
+        assert errors.lead_time_s == 0.0
+
+
+class TestComputeAll:
+    """Test the batch kernel."""
+
+    @pytest.fixture
+    def tracks(self):
+        return [
+            _track(960, 540),
+            _track(1200, 300, velocity=(100.0, 50.0)),
+            _track(100, 1000, velocity=(-30.0, 0.0)),
+        ]
+
+    def test_matches_single_target_path(self, intrinsics, tracks):
+        computer = ErrorComputer(intrinsics, ErrorConfig(predictive=True))
+        depths = [10.0, None, 80.0]
+        batch = computer.compute_all(
+            TrackArrays.from_tracks(tracks),
+            np.array([np.nan if d is None else d for d in depths]),
+            now=100.05
+        )
+        for i, (track, depth) in enumerate(zip(tracks, depths)):
+            single = computer.compute(track, depth, True, now=100.05)
+            assert batch.yaw_error[i] == pytest.approx(single.yaw_error)
+            assert batch.pitch_error[i] == pytest.approx(single.pitch_error)
+            assert batch.lead_time_s[i] == pytest.approx(single.lead_time_s)
+            assert bool(batch.depth_valid[i]) == single.depth_valid
+
+    def test_validity_masks(self, intrinsics, tracks):
+        computer = ErrorComputer(intrinsics, ErrorConfig(min_range_m=3.0, max_range_m=50.0))
+        batch = computer.compute_all(TrackArrays.from_tracks(tracks), np.array([10.0, np.nan, 80.0]))
+        assert batch.depth_valid.tolist() == [True, False, False]
+        assert batch.range_error[0] == pytest.approx(0.0)
+        assert np.isnan(batch.range_error[1])
+        assert batch.range_error[2] == pytest.approx(70.0)
+
+    def test_signs(self, intrinsics, tracks):
+        batch = ErrorComputer(intrinsics, ErrorConfig()).compute_all(TrackArrays.from_tracks(tracks))
+        # Track 1 is right of and above center, track 2 left of and below
+        assert batch.yaw_error[1] > 0 and batch.pitch_error[1] > 0
+        assert batch.yaw_error[2] < 0 and batch.pitch_error[2] < 0
+        assert not batch.depth_valid.any()
+
+    def test_empty(self, intrinsics):
+        batch = ErrorComputer(intrinsics, ErrorConfig(predictive=True)).compute_all(
+            TrackArrays.from_tracks([]))
+        assert len(batch) == 0
@@ -0,0 +1,136 @@
+"""
+Tests for target lock management and reacquisition.
+
+Run with: pytest tests/test_lock_manager.py -v
+"""
+
+import cv2
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, LockStatus, Track
+from src.perception.appearance import AppearanceConfig, attach_appearance, color_histogram
+from src.targeting.lock_manager import LockConfig, LockManager, box_ious, histogram_similarity
+
+RED = [1.0] + [0.0] * 31
+BLUE = [0.0] * 20 + [1.0] + [0.0] * 11
+
+
+def _track(track_id, x, y, appearance=None, velocity=None, size=(40, 80)):
+    return Track(
+        track_id=track_id, bbox=BoundingBox(x, y, x + size[0], y + size[1]),
+        class_id=0, label="person", confidence=0.9,
+        velocity=velocity, appearance=appearance
+    )
+
+
+@pytest.fixture
+def manager():
+    return LockManager(LockConfig(iou_threshold=0.3))
+
+
+class TestScoringHelpers:
+    """Test vectorized IOU and histogram similarity."""
+
+    def test_box_ious(self):
+        boxes = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=float)
+        np.testing.assert_allclose(box_ious(boxes[0], boxes), [1.0, 1 / 3, 0.0])
+
+    def test_histogram_similarity(self):
+        sims = histogram_similarity(np.array(RED), np.array([RED, BLUE]))
+        np.testing.assert_allclose(sims, [1.0, 0.0])
+
+
+class TestLockManager:
+    """Test lock keeping and reacquisition."""
+
+    def test_keeps_lock_by_id(self, manager):
+        tracks = [_track(1, 100, 100), _track(2, 400, 100)]
+        assert manager.select_by_id(1, tracks)
+        state = manager.update([_track(1, 104, 100), _track(2, 400, 100)])
+        assert state.status == LockStatus.LOCKED
+        assert state.locked_track_id == 1
+
+    def test_rebinds_after_id_switch_by_iou(self, manager):
+        manager.select_by_id(1, [_track(1, 100, 100)])
+        state = manager.update([_track(9, 105, 102), _track(2, 400, 100)])
+        assert state.status == LockStatus.LOCKED
+        assert state.locked_track_id == 9
+        assert manager.get_locked_track([_track(9, 105, 102)]).track_id == 9
+
+    def test_rebind_uses_motion_prediction(self, manager, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("src.targeting.lock_manager.time.time", lambda: clock[0])
+        manager.select_by_id(1, [_track(1, 100, 100, velocity=(200.0, 0.0))])
+        # 0.3 s later the target reappears 60 px to the right under a new ID;
+        # the stale bbox would not overlap enough, the predicted one does
+        clock[0] += 0.3
+        state = manager.update([_track(5, 160, 100)])
+        assert state.locked_track_id == 5
+
+    def test_appearance_picks_the_right_candidate(self, manager):
+        manager.select_by_id(1, [_track(1, 100, 100, appearance=RED)])
+        # Two overlapping candidates; the blue one overlaps slightly more
+        state = manager.update([
+            _track(7, 108, 100, appearance=RED),
+            _track(8, 104, 100, appearance=BLUE),
+        ])
+        assert state.locked_track_id == 7
+
+    def test_appearance_rebinds_without_overlap(self, manager):
+        manager.select_by_id(1, [_track(1, 100, 100, appearance=RED)])
+        state = manager.update([_track(4, 200, 100, appearance=RED)])
+        assert state.locked_track_id == 4
+
+    def test_no_rebind_to_dissimilar_distant_track(self, manager):
+        manager.select_by_id(1, [_track(1, 100, 100, appearance=RED)])
+        state = manager.update([_track(4, 200, 100, appearance=BLUE),
+                                _track(5, 900, 100, appearance=RED)])
+        assert state.status == LockStatus.LOCKING
+        assert state.locked_track_id == 1
+
+    def test_no_rebind_to_crossing_track(self, manager):
+        # Track 2 crosses the target while both are visible
+        manager.select_by_id(1, [_track(1, 100, 100), _track(2, 160, 100)])
+        manager.update([_track(1, 100, 100), _track(2, 120, 100)])
+        # Target occluded by the crossing track: track 2 overlaps the last box
+        state = manager.update([_track(2, 102, 100)])
+        assert state.status == LockStatus.LOCKING
+        assert state.locked_track_id == 1
+        # A genuinely new ID at the target's position is still accepted
+        state = manager.update([_track(2, 90, 100), _track(6, 104, 100)])
+        assert state.locked_track_id == 6
+
+    def test_times_out_without_candidates(self, manager, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("src.targeting.lock_manager.time.time", lambda: clock[0])
+        manager.select_by_id(1, [_track(1, 100, 100)])
+        clock[0] += 1.0
+        assert manager.update([]).status == LockStatus.LOST
+        clock[0] += 2.0
+        assert manager.update([]).status == LockStatus.UNLOCKED
+
+
+class TestAppearance:
+    """Test perception-side color signatures."""
+
+    def test_histogram_normalized(self):
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        frame[:, :] = (0, 0, 255)
+        hist = color_histogram(frame, BoundingBox(10, 10, 60, 90))
+        assert len(hist) == 32
+        assert sum(hist) == pytest.approx(1.0, abs=1e-3)
+
+    def test_empty_crop(self):
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        assert color_histogram(frame, BoundingBox(150, 150, 200, 200)) == []
+
+    def test_same_colors_similar(self):
+        frame = np.zeros((200, 400, 3), dtype=np.uint8)
+        cv2.rectangle(frame, (0, 0), (199, 199), (0, 0, 255), -1)
+        cv2.rectangle(frame, (200, 0), (399, 199), (255, 0, 0), -1)
+        tracks = [_track(1, 10, 10), _track(2, 100, 10), _track(3, 250, 10)]
+        attach_appearance(tracks, frame, AppearanceConfig(enabled=True))
+        sims = histogram_similarity(np.array(tracks[0].appearance),
+                                    np.array([t.appearance for t in tracks]))
+        assert sims[1] > 0.99
+        assert sims[2] < 0.1
@@ -0,0 +1,195 @@
+"""
+Tests for the ONNX Runtime detector backend.
+
+Run with: pytest tests/test_onnx_detector.py -v
+"""
+
+import os
+
+import numpy as np
+import pytest
+from src.perception.detector import DetectorConfig
+from src.perception.onnx_detector import (
+    OnnxDetector,
+    decode_yolo_output,
+    device_index,
+    letterbox_geometry,
+    nms,
+    select_providers,
+)
+
+
+class TestLetterbox:
+    """Test letterbox geometry."""
+
+    def test_landscape_frame(self):
+        scale, new_w, new_h, pad_x, pad_y = letterbox_geometry(720, 1280, 640)
+        assert scale == pytest.approx(0.5)
+        assert (new_w, new_h) == (640, 360)
+        assert (pad_x, pad_y) == (0, 140)
+
+    def test_square_frame(self):
+        assert letterbox_geometry(640, 640, 640) == (1.0, 640, 640, 0, 0)
+
+
+class TestNms:
+    """Test vectorized NMS."""
+
+    def test_suppresses_overlap(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [50, 50, 60, 60]], dtype=np.float32)
+        scores = np.array([0.9, 0.8, 0.7])
+        keep = nms(boxes, scores, iou_threshold=0.5, max_det=10)
+        assert keep.tolist() == [0, 2]
+
+    def test_max_det(self):
+        boxes = np.array([[0, 0, 10, 10], [50, 50, 60, 60]], dtype=np.float32)
+        keep = nms(boxes, np.array([0.5, 0.9]), iou_threshold=0.5, max_det=1)
+        assert keep.tolist() == [1]
+
+
+class TestDecode:
+    """Test YOLOv8 output decoding."""
+
+    @staticmethod
+    def _pred(rows):
+        """Build a (4 + nc, A) head output from [cx, cy, w, h, s0, s1] rows."""
+        return np.array(rows, dtype=np.float32).T
+
+    def test_decodes_and_filters(self):
+        pred = self._pred([
+            [100, 100, 20, 20, 0.9, 0.1],
+            [102, 101, 20, 20, 0.8, 0.1],  # Duplicate of the first
+            [300, 300, 40, 40, 0.2, 0.7],
+            [500, 500, 40, 40, 0.1, 0.2],  # Below threshold
+        ])
+        out = decode_yolo_output(pred, conf_threshold=0.5, iou_threshold=0.5, max_det=10)
+        
+        assert out.shape == (2, 6)
+        np.testing.assert_allclose(out[0], [90, 90, 110, 110, 0.9, 0], atol=1e-5)
+        assert out[1, 5] == 1
+
+    def test_class_aware_nms(self):
+        """Overlapping boxes of different classes are both kept."""
+        pred = self._pred([
+            [100, 100, 20, 20, 0.9, 0.0],
+            [100, 100, 20, 20, 0.0, 0.8],
+        ])
+        out = decode_yolo_output(pred, conf_threshold=0.5, iou_threshold=0.5, max_det=10)
+        assert len(out) == 2
+
+    def test_class_filter(self):
+        pred = self._pred([
+            [100, 100, 20, 20, 0.9, 0.0],
+            [300, 300, 20, 20, 0.0, 0.8],
+        ])
+        out = decode_yolo_output(
+            pred, conf_threshold=0.5, iou_threshold=0.5, max_det=10, class_filter=[1]
+        )
+        assert out[:, 5].tolist() == [1]
+
+    def test_empty(self):
+        pred = self._pred([[100, 100, 20, 20, 0.1, 0.1]])
+        out = decode_yolo_output(pred, conf_threshold=0.5, iou_threshold=0.5, max_det=10)
+        assert out.shape == (0, 6)
+
+
+class TestProviders:
+    """Test execution provider selection."""
+
+    def test_cpu_device(self):
+        available = ["TensorrtExecutionProvider", "CPUExecutionProvider"]
+        assert select_providers("cpu", available) == ["CPUExecutionProvider"]
+
+    def test_gpu_preference(self):
+        available = ["CUDAExecutionProvider", "TensorrtExecutionProvider", "CPUExecutionProvider"]
+        assert select_providers("0", available) == [
+            "TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider"
+        ]
+
+    def test_gpu_unavailable(self):
+        assert select_providers("0", ["CPUExecutionProvider"]) == ["CPUExecutionProvider"]
+
+    def test_device_index(self):
+        assert device_index("0") == 0
+        assert device_index("cuda:0") == 0
+        assert device_index("cuda:1") == 1
+        assert device_index("cuda") == 0
+        assert device_index("cpu") == 0
+        assert device_index(1) == 1
+        available = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        assert select_providers("cuda:0", available) == available
+
+
+@pytest.fixture
+def constant_model(tmp_path):
+    """Tiny ONNX model that ignores its input and emits a fixed YOLO head output."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx import TensorProto, helper, numpy_helper
+
+    # One person box centered in a 64x64 network input, 2 classes
+    head = np.zeros((1, 6, 4), dtype=np.float32)
+    head[0, :, 0] = [32, 32, 16, 8, 0.9, 0.05]
+
+    nodes = [
+        helper.make_node("ReduceMean", ["images"], ["mean"], keepdims=0),
+        helper.make_node("Mul", ["mean", "zero"], ["zeroed"]),
+        helper.make_node("Add", ["zeroed", "head"], ["output0"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "constant_head",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, 64, 64])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, 6, 4])],
+        initializer=[
+            numpy_helper.from_array(np.zeros((), dtype=np.float32), "zero"),
+            numpy_helper.from_array(head, "head"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    helper.set_model_props(model, {"names": "{0: 'person', 1: 'drone'}"})
+
+    path = tmp_path / "model.onnx"
+    onnx.save(model, str(path))
+    return str(path)
+
+
+class TestOnnxDetector:
+    """End-to-end tests on CPU."""
+
+    def _config(self, model_path, cache_dir):
+        return DetectorConfig(
+            model_path=model_path, device="cpu", input_size=64, cache_dir=str(cache_dir)
+        )
+
+    def test_detect_maps_to_frame(self, constant_model, tmp_path):
+        detector = OnnxDetector(self._config(constant_model, tmp_path / "cache"))
+        # 128x64 frame -> scale 0.5, 16 px padding in y
+        frame = np.zeros((64, 128, 3), dtype=np.uint8)
+        dets = detector.detect(frame)
+        
+        # Network box (24, 28)-(40, 36) maps back to (48, 24)-(80, 40)
+        assert len(dets) == 1
+        bbox = dets[0].bbox
+        assert (bbox.x1, bbox.y1, bbox.x2, bbox.y2) == pytest.approx((48, 24, 80, 40))
+        assert dets[0].label == "person"
+        assert dets[0].confidence == pytest.approx(0.9)
+
+    def test_torch_style_device(self, constant_model, tmp_path):
+        config = self._config(constant_model, tmp_path / "cache")
+        config.device = "cuda:0"
+        detector = OnnxDetector(config)
+        assert detector._provider_options(["CUDAExecutionProvider"], "") == [{"device_id": 0}]
+        assert len(detector.detect(np.zeros((64, 64, 3), dtype=np.uint8))) == 1
+
+    def test_session_cached(self, constant_model, tmp_path):
+        cache_dir = tmp_path / "cache"
+        OnnxDetector(self._config(constant_model, cache_dir))
+        
+        cached = [f for _, _, files in os.walk(cache_dir) for f in files]
+        assert "model.opt.onnx" in cached
+        
+        # Second start loads from cache and still detects
+        detector = OnnxDetector(self._config(constant_model, cache_dir))
+        assert len(detector.detect(np.zeros((64, 64, 3), dtype=np.uint8))) == 1
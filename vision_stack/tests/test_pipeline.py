@@ -0,0 +1,116 @@
+"""
+Tests for the threaded perception stage pipeline.
+
+Run with: pytest tests/test_pipeline.py -v
+"""
+
+import threading
+import time
+
+import pytest
+from src.perception.pipeline import LatestSlot, StagePipeline, StageStats
+
+
+class TestLatestSlot:
+    """Test single-slot drop-oldest queue."""
+
+    def test_put_get(self):
+        slot = LatestSlot()
+        slot.put(1)
+        assert slot.get(timeout=0.1) == 1
+        assert slot.get(timeout=0.01) is None
+
+    def test_drops_oldest(self):
+        slot = LatestSlot()
+        slot.put(1)
+        slot.put(2)
+        slot.put(3)
+        assert slot.get(timeout=0.1) == 3
+        assert slot.dropped == 2
+
+    def test_keep_protects_pending_item(self):
+        slot = LatestSlot(keep=lambda item: item.startswith("detect"))
+        slot.put("detect-1")
+        slot.put("predict-2")  # Dropped: would overwrite a kept item
+        assert slot.get(timeout=0.1) == "detect-1"
+        slot.put("detect-3")
+        slot.put("detect-4")  # Kept items still replace each other
+        assert slot.get(timeout=0.1) == "detect-4"
+        assert slot.dropped == 2
+
+    def test_get_waits_for_producer(self):
+        slot = LatestSlot()
+        threading.Timer(0.02, slot.put, args=("late",)).start()
+        assert slot.get(timeout=1.0) == "late"
+
+    def test_close_wakes_consumer(self):
+        slot = LatestSlot()
+        threading.Timer(0.02, slot.close).start()
+        start = time.monotonic()
+        assert slot.get(timeout=1.0) is None
+        assert time.monotonic() - start < 0.5
+
+
+class TestStageStats:
+    """Test per-stage counters."""
+
+    def test_snapshot_resets_window(self):
+        stats = StageStats("infer")
+        stats.record(0.010)
+        stats.record(0.030)
+        snap = stats.snapshot(dropped_total=3)
+        assert snap["mean_ms"] == pytest.approx(20.0)
+        assert snap["max_ms"] == pytest.approx(30.0)
+        assert snap["dropped"] == 3
+        assert stats.snapshot(dropped_total=4)["dropped"] == 1
+
+
+class TestStagePipeline:
+    """Test stage chaining."""
+
+    def test_items_flow_through_stages(self):
+        counter = iter(range(1000))
+        results = []
+
+        def source(_):
+            time.sleep(0.002)
+            return next(counter)
+
+        pipeline = StagePipeline([
+            ("source", source),
+            ("double", lambda x: x * 2),
+            ("sink", results.append),
+        ])
+        pipeline.start()
+        time.sleep(0.1)
+        pipeline.stop()
+
+        assert len(results) > 5
+        assert all(r % 2 == 0 for r in results)
+        assert results == sorted(results)
+
+    def test_slow_stage_drops_instead_of_queueing(self):
+        latencies = []
+
+        def source(_):
+            time.sleep(0.002)
+            return time.monotonic()
+
+        def slow(t):
+            time.sleep(0.02)
+            return t
+
+        pipeline = StagePipeline([
+            ("source", source),
+            ("slow", slow),
+            ("sink", lambda t: latencies.append(time.monotonic() - t)),
+        ])
+        pipeline.start()
+        time.sleep(0.3)
+        stats = pipeline.stats()
+        pipeline.stop()
+
+        assert stats["slow"]["dropped"] > 0
+        assert stats["slow"]["occupancy"] > 0.5
+        # Latency stays near one slow-stage period instead of growing
+        assert max(latencies[len(latencies) // 2:]) < 0.1
@@ -0,0 +1,154 @@
+"""
+Tests for automatic target prioritization.
+
+Run with: pytest tests/test_prioritizer.py -v
+"""
+
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, CameraIntrinsics, LockStatus, Track, TrackArrays
+from src.targeting.errors import ErrorComputer, ErrorConfig
+from src.targeting.prioritizer import PriorityConfig, TargetPrioritizer
+
+INTRINSICS = CameraIntrinsics(fx=1000, fy=1000, cx=960, cy=540, width=1920, height=1080)
+
+
+def _track(track_id, cx, cy, label="person", confidence=0.9, velocity=None):
+    return Track(track_id=track_id, bbox=BoundingBox(cx - 20, cy - 40, cx + 20, cy + 40),
+                 class_id=0, label=label, confidence=confidence, velocity=velocity)
+
+
+def _update(prioritizer, tracks, now, depths=None):
+    array = TrackArrays.from_tracks(tracks)
+    errors = ErrorComputer(INTRINSICS, ErrorConfig()).compute_all(array, depths)
+    return prioritizer.update(array, errors, now)
+
+
+@pytest.fixture
+def config():
+    return PriorityConfig(enabled=True, class_priority={"person": 1.0, "car": 0.5},
+                          default_class_priority=0.2, min_score=0.3, min_age_s=0.0,
+                          handoff_frames=3)
+
+
+class TestScoring:
+    """Test the individual score terms."""
+
+    def test_center_beats_edge(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        scores = _update(prioritizer, [_track(1, 1800, 100), _track(2, 960, 540)], 0.0)
+        assert scores[1] > scores[0]
+        assert prioritizer.best()[0] == 2
+
+    def test_class_priority(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        scores = _update(prioritizer, [_track(1, 960, 540, label="car"),
+                                       _track(2, 960, 540, label="person"),
+                                       _track(3, 960, 540, label="dog")], 0.0)
+        assert scores[1] > scores[0] > scores[2]
+
+    def test_time_to_lose(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        array = TrackArrays.from_tracks([
+            _track(1, 1800, 540, velocity=(240.0, 0.0)),
+            _track(2, 960, 540, velocity=(0.0, -270.0)),
+            _track(3, 960, 540),
+        ])
+        ttl = prioritizer.time_to_lose(array)
+        assert ttl[0] == pytest.approx(0.5)
+        assert ttl[1] == pytest.approx(2.0)
+        assert np.isinf(ttl[2])
+
+    def test_track_age(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(1, 960, 540)], 0.0)
+        scores = _update(prioritizer, [_track(1, 960, 540), _track(2, 960, 540)], 2.0)
+        assert scores[0] > scores[1]
+
+    def test_range_term(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        scores = _update(prioritizer, [_track(1, 960, 540), _track(2, 960, 540), _track(3, 960, 540)],
+                         0.0, depths=np.array([10.0, 30.0, np.nan]))
+        assert scores[0] > scores[2] > scores[1]
+
+
+class TestPriorityHeap:
+    """Test the lazily invalidated priority structure."""
+
+    def test_best_follows_rescoring(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(1, 960, 540), _track(2, 1700, 900)], 0.0)
+        assert prioritizer.best()[0] == 1
+        _update(prioritizer, [_track(1, 1700, 900), _track(2, 960, 540)], 0.1)
+        assert prioritizer.best()[0] == 2
+
+    def test_vanished_tracks_dropped(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(1, 960, 540), _track(2, 1700, 900)], 0.0)
+        _update(prioritizer, [_track(2, 1700, 900)], 0.1)
+        assert prioritizer.best()[0] == 2
+        assert prioritizer.score_of(1) is None
+        _update(prioritizer, [], 0.2)
+        assert prioritizer.best() is None
+
+    def test_heap_stays_bounded(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        for i in range(200):
+            _update(prioritizer, [_track(1, 200 + 7 * i, 540), _track(2, 960, 540)], i * 0.03)
+        assert len(prioritizer._heap) <= 4 * 8
+        assert prioritizer.ranked()[0][0] == prioritizer.best()[0]
+
+
+class TestPolicies:
+    """Test auto-lock and auto-handoff decisions."""
+
+    def test_auto_lock_when_unlocked(self, config):
+        config.auto_lock = True
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(1, 1700, 900), _track(2, 960, 540)], 0.0)
+        assert prioritizer.choose(LockStatus.UNLOCKED, None) == 2
+
+    def test_no_auto_lock_by_default(self, config):
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(1, 960, 540)], 0.0)
+        assert prioritizer.choose(LockStatus.UNLOCKED, None) is None
+
+    def test_min_age(self, config):
+        config.auto_lock = True
+        config.min_age_s = 0.5
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(1, 960, 540)], 0.0)
+        assert prioritizer.choose(LockStatus.UNLOCKED, None) is None
+        _update(prioritizer, [_track(1, 960, 540)], 0.6)
+        assert prioritizer.choose(LockStatus.UNLOCKED, None) == 1
+
+    def test_handoff_needs_sustained_margin(self, config):
+        config.auto_handoff = True
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        tracks = [_track(1, 1800, 100, label="car"), _track(2, 960, 540)]
+        decisions = []
+        for i in range(3):
+            _update(prioritizer, tracks, i * 0.03)
+            decisions.append(prioritizer.choose(LockStatus.LOCKED, 1))
+        assert decisions == [None, None, 2]
+
+    def test_no_handoff_within_margin(self, config):
+        config.auto_handoff = True
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        for i in range(5):
+            _update(prioritizer, [_track(1, 1000, 540), _track(2, 960, 540)], i * 0.03)
+            assert prioritizer.choose(LockStatus.LOCKED, 1) is None
+
+    def test_operator_lock_kept(self, config):
+        config.auto_handoff = True
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        for i in range(5):
+            _update(prioritizer, [_track(1, 1800, 100, label="car"), _track(2, 960, 540)], i * 0.03)
+            assert prioritizer.choose(LockStatus.LOCKED, 1, operator_selected=True) is None
+
+    def test_handoff_when_lost(self, config):
+        config.auto_handoff = True
+        prioritizer = TargetPrioritizer(config, (1920, 1080))
+        _update(prioritizer, [_track(2, 960, 540)], 0.0)
+        assert prioritizer.choose(LockStatus.LOCKING, 1) is None
+        assert prioritizer.choose(LockStatus.LOST, 1) == 2
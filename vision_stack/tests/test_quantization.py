@@ -0,0 +1,157 @@
+"""
+Tests for the INT8 quantization workflow.
+
+Run with: pytest tests/test_quantization.py -v
+"""
+
+import cv2
+import numpy as np
+import pytest
+from src.perception.detector import DetectorConfig
+from src.perception.quantization import (
+    FrameCalibrationReader,
+    QuantizedOnnxDetector,
+    evaluate_quantized,
+    iter_recording_frames,
+    mean_average_precision,
+    quantize_model,
+)
+
+
+def _dets(*rows):
+    return np.array(rows, dtype=np.float32).reshape(-1, 6)
+
+
+class TestMeanAveragePrecision:
+    """Test mAP against reference detections."""
+
+    def test_identical(self):
+        ref = [_dets([0, 0, 10, 10, 0.9, 0]), _dets([5, 5, 20, 20, 0.8, 1])]
+        assert mean_average_precision(ref, ref) == pytest.approx(1.0)
+
+    def test_missed_detection(self):
+        ref = [_dets([0, 0, 10, 10, 0.9, 0], [50, 50, 60, 60, 0.9, 0])]
+        pred = [_dets([0, 0, 10, 10, 0.9, 0])]
+        assert mean_average_precision(pred, ref) == pytest.approx(0.5)
+
+    def test_wrong_class(self):
+        ref = [_dets([0, 0, 10, 10, 0.9, 0])]
+        pred = [_dets([0, 0, 10, 10, 0.9, 1])]
+        assert mean_average_precision(pred, ref) == 0.0
+
+    def test_low_confidence_false_positive_ranked_last(self):
+        ref = [_dets([0, 0, 10, 10, 0.9, 0])]
+        pred = [_dets([0, 0, 10, 10, 0.9, 0], [50, 50, 60, 60, 0.1, 0])]
+        assert mean_average_precision(pred, ref) == pytest.approx(1.0)
+
+    def test_empty_reference(self):
+        assert mean_average_precision([_dets()], [_dets()]) == 1.0
+
+
+class TestRecordingFrames:
+    """Test calibration frame sampling."""
+
+    def test_image_directory(self, tmp_path):
+        for i in range(3):
+            cv2.imwrite(str(tmp_path / f"{i}.png"), np.full((8, 8, 3), i, dtype=np.uint8))
+        frames = list(iter_recording_frames([str(tmp_path)]))
+        assert len(frames) == 3
+        assert frames[2][0, 0, 0] == 2
+
+    def test_max_frames(self, tmp_path):
+        for i in range(3):
+            cv2.imwrite(str(tmp_path / f"{i}.png"), np.zeros((8, 8, 3), dtype=np.uint8))
+        assert len(list(iter_recording_frames([str(tmp_path)], max_frames=2))) == 2
+
+
+class TestCalibrationReader:
+    """Test that calibration frames are streamed."""
+
+    def test_reads_lazily_and_reopens_on_rewind(self):
+        opened = []
+        read = []
+
+        def frames():
+            opened.append(True)
+            for i in range(3):
+                read.append(i)
+                yield np.full((32, 32, 3), i, dtype=np.uint8)
+
+        reader = FrameCalibrationReader(frames, "images", 64)
+        assert read == [0]  # Only the first frame is peeked
+        batch = reader.get_next()
+        assert batch["images"].shape == (1, 3, 64, 64)
+        assert read == [0, 1]
+        while reader.get_next() is not None:
+            pass
+        assert reader.count == 3
+        reader.rewind()
+        assert len(opened) == 2
+        assert reader.get_next() is not None
+
+    def test_empty_source(self):
+        assert FrameCalibrationReader(lambda: iter([]), "images", 64).empty
+
+
+@pytest.fixture
+def conv_model(tmp_path):
+    """Tiny conv 'detector' producing a (1, 6, 64) YOLO-style head output."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime.quantization")
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+    weight = rng.normal(0, 0.1, size=(6, 3, 8, 8)).astype(np.float32)
+    bias = np.array([0, 0, 0, 0, 0, 0], dtype=np.float32)
+    shape = np.array([1, 6, 64], dtype=np.int64)
+
+    nodes = [
+        helper.make_node("Conv", ["images", "W", "B"], ["conv"], kernel_shape=[8, 8],
+                         strides=[8, 8]),
+        helper.make_node("Reshape", ["conv", "shape"], ["output0"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "tiny_head",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, 64, 64])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, 6, 64])],
+        initializer=[
+            numpy_helper.from_array(weight, "W"),
+            numpy_helper.from_array(bias, "B"),
+            numpy_helper.from_array(shape, "shape"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    helper.set_model_props(model, {"names": "{0: 'person', 1: 'drone'}"})
+
+    path = tmp_path / "fp32.onnx"
+    onnx.save(model, str(path))
+    return str(path)
+
+
+class TestQuantizeModel:
+    """End-to-end calibration, INT8 backend and report."""
+
+    def test_quantize_and_report(self, conv_model, tmp_path):
+        rng = np.random.default_rng(1)
+        frames = [rng.integers(0, 255, size=(64, 64, 3), dtype=np.uint8) for _ in range(4)]
+        int8_path = str(tmp_path / "int8.onnx")
+        
+        quantize_model(conv_model, int8_path, lambda: iter(frames), input_size=64)
+        
+        config = DetectorConfig(
+            model_path=conv_model, device="0", input_size=64,
+            confidence_threshold=0.0, cache_dir=str(tmp_path / "cache"),
+        )
+        detector = QuantizedOnnxDetector(DetectorConfig(
+            model_path=int8_path, device="0", input_size=64, cache_dir=str(tmp_path / "cache")
+        ))
+        assert detector.provider == "CPUExecutionProvider"
+        assert detector._label_lut[1] == "drone"  # Metadata carried over
+        
+        report = evaluate_quantized(config, int8_path, iter(frames))
+        assert report.frames == 4
+        assert 0.0 <= report.map50 <= 1.0
+        assert report.int8_latency.mean_ms > 0
+        assert "mAP@0.5" in report.summary()
@@ -0,0 +1,174 @@
+"""
+Tests for lock-focused ROI inference.
+
+Run with: pytest tests/test_roi.py -v
+"""
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+from src.common.bus.zmq_bus import ZmqSerializer
+from src.common.types import BoundingBox, Detection, LockState, LockStatus
+from src.perception.roi import (
+    RoiConfig,
+    RoiScheduler,
+    compute_roi,
+    merge_detections,
+    offset_detections,
+)
+
+
+def _det(x1, y1, x2, y2):
+    return Detection(bbox=BoundingBox(x1, y1, x2, y2), class_id=0, label="person", confidence=0.9)
+
+
+class TestComputeRoi:
+    """Test crop placement."""
+
+    def test_min_size_centered(self):
+        rect = compute_roi(BoundingBox(630, 350, 650, 370), 1280, 720, padding=3.0, min_size=640)
+        assert rect == (320, 40, 960, 680)
+
+    def test_clamped_to_frame(self):
+        rect = compute_roi(BoundingBox(0, 0, 10, 10), 1280, 720, padding=3.0, min_size=640)
+        assert rect == (0, 0, 640, 640)
+
+    def test_large_target_grows_crop(self):
+        x1, y1, x2, y2 = compute_roi(
+            BoundingBox(500, 300, 800, 400), 1280, 720, padding=3.0, min_size=640
+        )
+        assert x2 - x1 == 900
+        assert y2 - y1 == 720  # Limited by frame height
+
+
+class TestMerge:
+    """Test mapping crop detections back to the frame."""
+
+    def test_offset(self):
+        dets = offset_detections([_det(10, 20, 30, 40)], 100, 200)
+        assert (dets[0].bbox.x1, dets[0].bbox.y1, dets[0].bbox.x2, dets[0].bbox.y2) == (
+            110, 220, 130, 240
+        )
+
+    def test_roi_replaces_full_frame_inside_crop(self):
+        full = [_det(110, 110, 120, 120), _det(500, 500, 510, 510)]
+        roi = [_det(111, 111, 121, 121)]
+        merged = merge_detections(full, roi, (100, 100, 200, 200))
+        assert len(merged) == 2
+        assert merged[0].bbox.x1 == 500
+        assert merged[1].bbox.x1 == 111
+
+
+class TestRoiScheduler:
+    """Test ROI / full-frame cadence."""
+
+    @pytest.fixture
+    def scheduler(self):
+        return RoiScheduler(RoiConfig(enabled=True, full_frame_interval=3))
+
+    def test_full_frame_without_lock(self, scheduler):
+        assert scheduler.plan(1280, 720) == (None, True)
+
+    def test_cadence_while_locked(self, scheduler):
+        scheduler.update_lock(LockStatus.LOCKED, BoundingBox(600, 300, 640, 340))
+        plans = [scheduler.plan(1280, 720) for _ in range(6)]
+        
+        assert all(rect is not None for rect, _ in plans)
+        assert [full for _, full in plans] == [False, False, True, False, False, True]
+
+    def test_unlock_clears_roi(self, scheduler):
+        scheduler.update_lock(LockStatus.LOCKED, BoundingBox(600, 300, 640, 340))
+        scheduler.update_lock(LockStatus.UNLOCKED, None)
+        assert scheduler.plan(1280, 720) == (None, True)
+
+    def test_stale_lock_ignored(self, scheduler):
+        scheduler.update_lock(LockStatus.LOCKED, BoundingBox(600, 300, 640, 340), timestamp=0.0)
+        assert scheduler.plan(1280, 720) == (None, True)
+
+    def test_disabled(self):
+        scheduler = RoiScheduler(RoiConfig(enabled=False))
+        scheduler.update_lock(LockStatus.LOCKED, BoundingBox(600, 300, 640, 340))
+        assert scheduler.plan(1280, 720) == (None, True)
+
+
+class TestRoiFrames:
+    """Tracks outside the crop must survive ROI-only frames."""
+
+    @pytest.fixture
+    def node(self, monkeypatch):
+        from src.oak import OakConfig
+        from src.perception import perception_node
+        from src.perception.detector import DetectorConfig
+        from src.perception.tracker import TrackerConfig
+
+        class FakeDetector:
+            """Detects the bright blobs of whatever image (frame or crop) it is given."""
+
+            def detect(self, frame):
+                count, _, stats, _ = cv2.connectedComponentsWithStats(
+                    (frame[..., 0] > 0).astype(np.uint8))
+                return [_det(x, y, x + w, y + h) for x, y, w, h, _ in stats[1:count].tolist()]
+
+        class FakePublisher:
+            def __init__(self, endpoint):
+                self.sent = []
+
+            def publish(self, topic, message):
+                self.sent.append((topic, message))
+
+        class FakeSubscriber:
+            def __init__(self, endpoint):
+                pass
+
+            def subscribe(self, topic):
+                pass
+
+            def receive(self, timeout_ms=0):
+                return None
+
+        monkeypatch.setattr(perception_node, "OakBridge", lambda config: None)
+        monkeypatch.setattr(perception_node, "load_backend", lambda backend: None)
+        monkeypatch.setattr(perception_node, "create_detector", lambda config: FakeDetector())
+        monkeypatch.setattr(perception_node, "ZmqPublisher", FakePublisher)
+        monkeypatch.setattr(perception_node, "ZmqSubscriber", FakeSubscriber)
+        return perception_node.PerceptionNode(perception_node.PerceptionConfig(
+            camera=OakConfig(), detector=DetectorConfig(), tracker=TrackerConfig(min_hits=1),
+            roi=RoiConfig(enabled=True, min_size=200, full_frame_interval=5)))
+
+    def _published_ids(self, node):
+        topic, tracks = node._publisher.sent[-1]
+        assert topic == "tracks"
+        return sorted(t.track_id for t in tracks.tracks)
+
+    def _step(self, node, frame_id):
+        from src.perception.perception_node import FramePacket
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        frame[300:380, 600:640] = 255  # Locked target
+        frame[300:380, 100:140] = 255  # Second target, outside the crop
+        packet = FramePacket(frame_id=frame_id, frame=frame, capture_time=frame_id / 30.0)
+        node._track_stage(node._infer_stage(packet))
+        return packet
+
+    def test_target_outside_crop_kept_on_roi_frames(self, node):
+        assert self._step(node, 0).run_full
+        assert self._published_ids(node) == [1, 2]
+        node._roi.update_lock(LockStatus.LOCKED, BoundingBox(600, 300, 640, 380))
+        for frame_id in range(1, 4):
+            packet = self._step(node, frame_id)
+            assert not packet.run_full
+            assert len(packet.detections) == 1  # Only the locked target was looked for
+            assert self._published_ids(node) == [1, 2]
+
+
+class TestLockStateSerialization:
+    """lock_state must survive the bus for perception to consume it."""
+
+    def test_enum_and_bbox(self):
+        state = LockState(
+            status=LockStatus.LOCKED, locked_track_id=3, bbox=BoundingBox(1, 2, 3, 4)
+        )
+        data = json.loads(ZmqSerializer.serialize(state))
+        assert data["status"] == "LOCKED"
+        assert data["bbox"] == {"x1": 1, "y1": 2, "x2": 3, "y2": 4}
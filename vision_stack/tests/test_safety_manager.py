@@ -71,6 +71,14 @@ class TestGating:
         
         assert safety_manager.is_failsafe_active
 
+    def test_neutral_on_stale_telemetry(self, safety_manager):
+        """Should gate on the first tick with stale FC telemetry."""
+        setpoint = Setpoint(roll_deg=15.0, pitch_deg=5.0, thrust=0.0)
+        safety_manager.apply(setpoint, lock_valid=True, track_fresh=True, telemetry_fresh=True)
+        assert not safety_manager.is_failsafe_active
+        safety_manager.apply(setpoint, lock_valid=True, track_fresh=True, telemetry_fresh=False)
+        assert safety_manager.is_failsafe_active
+
 
 class TestBenchMode:
     """Test bench mode behavior."""
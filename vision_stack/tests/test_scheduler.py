@@ -0,0 +1,143 @@
+"""
+Tests for the drift-free rate scheduler.
+
+Run with: pytest tests/test_scheduler.py -v
+"""
+
+import time
+
+import pytest
+from src.common.scheduler import (
+    CATCH_UP_BURST,
+    JITTER_BINS_US,
+    RateScheduler,
+    scheduler_stats,
+)
+
+
+class FakeClock:
+    """Clock/sleep pair: sleeps advance time exactly plus overshoot, sleep(0) by 1 us."""
+
+    def __init__(self, overshoot_ns=0):
+        self.now = 0
+        self.overshoot_ns = overshoot_ns
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += int(seconds * 1e9) + self.overshoot_ns
+        else:
+            self.now += 1000
+
+    def advance(self, seconds):
+        self.now += int(seconds * 1e9)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _scheduler(clock, rate_hz, **kwargs):
+    return RateScheduler(rate_hz, clock=clock.clock, sleep=clock.sleep, **kwargs)
+
+
+class TestRateScheduler:
+    """Test deadlines, overrun handling and statistics."""
+
+    def test_ticks_stay_on_grid(self, clock):
+        clock.overshoot_ns = 300_000  # Every sleep wakes 0.3 ms late
+        scheduler = _scheduler(clock, 100.0, name="grid")
+        starts = []
+        for _ in range(50):
+            scheduler.wait()
+            starts.append(clock.now)
+            clock.advance(0.002)  # Work
+        # Overshoot is not carried into the next deadline: no drift
+        assert starts[-1] == pytest.approx(49 * 10_000_000 + 300_000, abs=1)
+        stats = scheduler.stats()
+        assert stats.ticks == 50
+        assert stats.overruns == 0
+        assert stats.max_us == pytest.approx(300.0)
+
+    def test_spin_removes_sleep_overshoot(self, clock):
+        clock.overshoot_ns = 300_000  # Less than the spin window
+        scheduler = _scheduler(clock, 50.0, name="spin", spin_us=500.0)
+        scheduler.wait()
+        scheduler.wait()
+        assert clock.now == 20_000_000
+
+    def test_skip_overrun(self, clock):
+        scheduler = _scheduler(clock, 100.0, name="skip")
+        scheduler.wait()
+        clock.advance(0.035)  # Deadlines at 10, 20 and 30 ms have passed
+        # This tick stands in for the 30 ms one; 10 and 20 ms are dropped
+        assert scheduler.wait() == 2
+        # Back on the grid
+        scheduler.wait()
+        assert clock.now == 40_000_000
+        stats = scheduler.stats()
+        assert stats.overruns == 1
+        assert stats.skipped == 2
+
+    def test_burst_overrun(self, clock):
+        scheduler = _scheduler(clock, 100.0, name="burst", catch_up=CATCH_UP_BURST, max_burst=2)
+        scheduler.wait()
+        clock.advance(0.045)  # Deadlines at 10-40 ms have passed
+        # The 10 and 20 ms ticks run back-to-back, 30 ms is dropped, 40 ms runs late
+        assert scheduler.wait() == 0
+        assert scheduler.wait() == 0
+        assert scheduler.wait() == 1
+        assert clock.now == 45_000_000
+        scheduler.wait()
+        assert clock.now == 50_000_000
+
+    def test_set_rate_and_reset(self, clock):
+        scheduler = _scheduler(clock, 10.0, name="rate")
+        assert scheduler.period == pytest.approx(0.1)
+        scheduler.set_rate(20.0)
+        assert scheduler.rate_hz == pytest.approx(20.0)
+        scheduler.wait()
+        scheduler.wait()
+        assert clock.now == 50_000_000
+        scheduler.reset()
+        assert scheduler.stats().ticks == 0
+        with pytest.raises(ValueError):
+            scheduler.set_rate(0.0)
+
+    def test_rejects_unknown_policy(self):
+        with pytest.raises(ValueError):
+            RateScheduler(10.0, catch_up="drop")
+
+    def test_histogram(self, clock):
+        clock.overshoot_ns = 150_000
+        scheduler = _scheduler(clock, 100.0, name="hist")
+        for _ in range(10):
+            scheduler.wait()
+        histogram = scheduler.stats().histogram
+        assert len(histogram) == len(JITTER_BINS_US)
+        assert histogram[0] == 1  # First tick anchors the grid on time
+        assert histogram[1] == 9  # 100-250 us
+        assert "hist @100Hz" in scheduler.stats().format()
+
+    def test_registry(self, clock):
+        scheduler = _scheduler(clock, 10.0, name="registered")
+        scheduler.wait()
+        assert scheduler_stats()["registered"].ticks == 1
+
+
+class TestRealTime:
+    """Test timing against the real clock."""
+
+    def test_30hz_setpoint_stream(self):
+        scheduler = RateScheduler(30.0, name="setpoints", spin_us=500.0)
+        start = time.perf_counter()
+        for _ in range(30):
+            scheduler.wait()
+        elapsed = time.perf_counter() - start
+        # 30 ticks = 29 periods after the anchoring tick
+        assert elapsed == pytest.approx(29 / 30, abs=0.02)
+        stats = scheduler.stats()
+        assert stats.p50_us < 1000.0
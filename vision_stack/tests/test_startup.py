@@ -0,0 +1,110 @@
+"""
+Tests for perception cold start: lazy imports, warm-up and startup timeline.
+
+Run with: pytest tests/test_startup.py -v
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from src.common.timeline import StartupTimeline
+from src.perception.detector import load_backend, warmup_detector
+
+
+class RecordingDetector:
+    """Detector stand-in that records the frame shapes it sees."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def detect(self, frame):
+        self.shapes.append(frame.shape)
+        return []
+
+
+class TestStartupTimeline:
+    """Test milestone recording."""
+
+    def test_marks_in_order(self):
+        timeline = StartupTimeline("TEST")
+        timeline.mark("a")
+        time.sleep(0.01)
+        timeline.mark("b")
+        marks = timeline.as_dict()
+        assert list(marks) == ["a", "b"]
+        assert marks["b"] >= marks["a"] + 0.009
+
+    def test_repeated_mark_ignored(self):
+        timeline = StartupTimeline("TEST")
+        first = timeline.mark("first_frame")
+        time.sleep(0.01)
+        assert timeline.mark("first_frame") == first
+        assert len(timeline.as_dict()) == 1
+
+    def test_elapsed_and_has(self):
+        timeline = StartupTimeline("TEST", start=time.monotonic() - 1.0)
+        assert not timeline.has("ready")
+        assert timeline.elapsed("ready") is None
+        timeline.mark("ready")
+        assert timeline.has("ready")
+        assert timeline.elapsed("ready") == pytest.approx(1.0, abs=0.1)
+
+    def test_summary(self):
+        timeline = StartupTimeline("TEST")
+        timeline.mark("import")
+        timeline.mark("model_load")
+        summary = timeline.summary()
+        assert "import +" in summary and "model_load +" in summary
+        assert summary.endswith("ms")
+
+
+class TestWarmup:
+    """Test detector warm-up."""
+
+    def test_runs_each_shape(self):
+        detector = RecordingDetector()
+        latencies = warmup_detector(detector, [(720, 1280), (640, 640)], iterations=2)
+        assert len(latencies) == 4
+        assert detector.shapes == [(720, 1280, 3)] * 2 + [(640, 640, 3)] * 2
+
+    def test_zero_iterations(self):
+        detector = RecordingDetector()
+        assert warmup_detector(detector, [(640, 640)], iterations=0) == []
+        assert detector.shapes == []
+
+
+class TestLazyImports:
+    """Test that heavy backends are imported on demand."""
+
+    def test_package_import_skips_backends(self):
+        code = (
+            "import sys, src.perception; "
+            "print('ultralytics' in sys.modules, 'onnxruntime' in sys.modules)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parents[1]
+        ).stdout.split()
+        assert out == ["False", "False"]
+
+    def test_lazy_export_resolves(self):
+        import src.perception as perception
+        from src.perception.onnx_detector import OnnxDetector
+        assert perception.OnnxDetector is OnnxDetector
+
+    def test_load_backend_onnx(self):
+        from src.perception.onnx_detector import ONNXRUNTIME_AVAILABLE
+        assert load_backend("onnx") == ONNXRUNTIME_AVAILABLE
+
+    def test_ultralytics_warning_only_when_selected(self, monkeypatch, caplog):
+        from src.perception import detector
+        monkeypatch.setattr(detector, "ULTRALYTICS_AVAILABLE", False)
+        with caplog.at_level("WARNING", logger=detector.__name__):
+            load_backend("onnx")
+            assert "Ultralytics" not in caplog.text
+            assert load_backend("ultralytics") is False
+            assert "Ultralytics not available" in caplog.text
@@ -0,0 +1,130 @@
+"""
+Tests for the 3D target state estimator.
+
+Run with: pytest tests/test_target_estimator.py -v
+"""
+
+import math
+
+import numpy as np
+import pytest
+from src.common.types import CameraIntrinsics
+from src.targeting.errors import ErrorComputer, ErrorConfig
+from src.targeting.target_estimator import EstimatorConfig, TargetEstimator
+
+
+def _unit(v):
+    v = np.asarray(v, dtype=np.float64)
+    return v / np.linalg.norm(v)
+
+
+def _run(estimator, positions, times, depths, rng=None, angle_noise=0.0, track_id=1):
+    for p, t, d in zip(positions, times, depths):
+        los = np.asarray(p, dtype=np.float64)
+        if rng is not None:
+            los = los + rng.normal(0, angle_noise * np.linalg.norm(los), 3)
+        estimator.update(track_id, _unit(los), d, "ned", t)
+    return estimator.state()
+
+
+class TestTargetEstimator:
+    """Test EKF initialization, convergence and outputs."""
+
+    def test_initializes_on_line_of_sight(self):
+        estimator = TargetEstimator(EstimatorConfig(initial_range_m=15.0))
+        estimator.update(1, _unit([1, 1, 0]), None, "body", 0.0)
+        state = estimator.state()
+        assert state.range_m == pytest.approx(15.0)
+        assert state.position[0] == pytest.approx(state.position[1])
+        assert not state.range_observed
+        assert state.frame == "body"
+
+    def test_converges_to_moving_target(self):
+        rng = np.random.default_rng(0)
+        times = np.arange(0, 4, 1 / 30)
+        start, velocity = np.array([20.0, -5.0, -2.0]), np.array([1.0, 2.0, 0.0])
+        positions = [start + velocity * t for t in times]
+        depths = [np.linalg.norm(p) + rng.normal(0, 0.3) for p in positions]
+        # Non-maneuvering target: low process noise
+        state = _run(TargetEstimator(EstimatorConfig(accel_noise=0.5)), positions, times, depths,
+                     rng=rng, angle_noise=0.003)
+        np.testing.assert_allclose(state.position, positions[-1], atol=0.5)
+        np.testing.assert_allclose(state.velocity, velocity, atol=0.5)
+        assert state.range_observed
+        assert max(state.position_std) < 1.0
+
+    def test_depth_converted_to_slant_range(self):
+        # Target 30 deg off the optical axis, 10 m deep (camera Z)
+        angle = math.radians(30.0)
+        los = np.array([math.cos(angle), math.sin(angle), 0.0])
+        estimator = TargetEstimator(EstimatorConfig())
+        estimator.update(1, los, 10.0, "body", 0.0, optical_cos=los[0])
+        state = estimator.state()
+        assert state.range_m == pytest.approx(10.0 / math.cos(angle))
+        assert state.position[0] == pytest.approx(10.0)
+        # Fused updates agree with the initialization
+        for i in range(1, 10):
+            estimator.update(1, los, 10.0, "body", i / 30, optical_cos=los[0])
+        assert estimator.state().range_m == pytest.approx(10.0 / math.cos(angle), rel=1e-3)
+
+    def test_line_of_sight_rates(self):
+        times = np.arange(0, 3, 1 / 30)
+        # Target 20 m ahead crossing to the right at 2 m/s
+        positions = [np.array([20.0, 2.0 * t, 0.0]) for t in times]
+        depths = [float(np.linalg.norm(p)) for p in positions]
+        state = _run(TargetEstimator(EstimatorConfig()), positions, times, depths)
+        p = positions[-1]
+        expected_rate = 20.0 * 2.0 / (p[0] ** 2 + p[1] ** 2)
+        assert state.los_rate_yaw == pytest.approx(expected_rate, rel=0.05)
+        assert state.los_rate_pitch == pytest.approx(0.0, abs=1e-3)
+        assert state.range_rate == pytest.approx(2.0 * p[1] / np.linalg.norm(p), abs=0.05)
+
+    def test_azimuth_wrap(self):
+        estimator = TargetEstimator(EstimatorConfig())
+        # Target behind the aircraft, crossing azimuth +/-pi
+        for i, y in enumerate([0.5, 0.2, -0.2, -0.5]):
+            estimator.update(1, _unit([-10.0, y, 0.0]), 10.0, "ned", i / 30)
+        state = estimator.state()
+        assert state.position[0] == pytest.approx(-10.0, abs=0.5)
+        assert abs(state.velocity[1]) < 30.0
+
+    def test_restarts_on_new_track_or_frame(self):
+        estimator = TargetEstimator(EstimatorConfig())
+        estimator.update(1, _unit([1, 0, 0]), 10.0, "ned", 0.0)
+        estimator.update(1, _unit([1, 0, 0]), 10.0, "ned", 0.1)
+        estimator.update(2, _unit([0, 1, 0]), 5.0, "ned", 0.2)
+        state = estimator.state()
+        assert state.track_id == 2
+        assert state.position == pytest.approx([0.0, 5.0, 0.0], abs=1e-9)
+        estimator.update(2, _unit([0, 1, 0]), 5.0, "body", 0.3)
+        assert estimator.state().frame == "body"
+
+    def test_drops_older_observation(self):
+        estimator = TargetEstimator(EstimatorConfig())
+        estimator.update(1, _unit([1, 0, 0]), 10.0, "ned", 1.0)
+        assert not estimator.update(1, _unit([1, 0.1, 0]), 10.0, "ned", 0.9)
+
+    def test_state_predicts_ahead(self):
+        times = np.arange(0, 2, 1 / 30)
+        positions = [np.array([10.0 + 3.0 * t, 0.0, 0.0]) for t in times]
+        estimator = TargetEstimator(EstimatorConfig())
+        _run(estimator, positions, times, [p[0] for p in positions])
+        ahead = estimator.state(times[-1] + 0.5)
+        assert ahead.position[0] == pytest.approx(positions[-1][0] + 1.5, abs=0.3)
+
+
+class TestLineOfSight:
+    """Test pixel line-of-sight vectors from ErrorComputer."""
+
+    def test_center_pixel_is_forward(self):
+        computer = ErrorComputer(CameraIntrinsics(1000, 1000, 960, 540, 1920, 1080), ErrorConfig())
+        np.testing.assert_allclose(computer.line_of_sight(np.array(960.0), np.array(540.0)),
+                                   [1.0, 0.0, 0.0])
+        # Pixel right of and below center: right (+y) and down (+z) in FRD
+        los = computer.line_of_sight(np.array(1960.0), np.array(1540.0))
+        np.testing.assert_allclose(los, _unit([1, 1, 1]))
+
+    def test_attitude_rotates_to_ned(self):
+        computer = ErrorComputer(CameraIntrinsics(1000, 1000, 960, 540, 1920, 1080), ErrorConfig())
+        los = computer.line_of_sight(np.array(960.0), np.array(540.0), (0.0, 0.0, math.pi / 2))
+        np.testing.assert_allclose(los, [0.0, 1.0, 0.0], atol=1e-12)  # Heading east
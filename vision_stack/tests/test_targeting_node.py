@@ -0,0 +1,301 @@
+"""
+Tests for the targeting node's event-triggered computation.
+
+Run with: pytest tests/test_targeting_node.py -v
+"""
+
+import math
+
+import numpy as np
+import pytest
+from src.common.types import CameraIntrinsics, LockStatus
+from src.targeting import targeting_node
+from src.targeting.errors import ErrorConfig
+from src.targeting.lock_manager import LockConfig
+from src.targeting.prioritizer import PriorityConfig
+from src.targeting.target_estimator import EstimatorConfig
+from src.targeting.targeting_node import TargetingConfig, TargetingNode
+
+
+class FakePublisher:
+    def __init__(self, endpoint):
+        self.sent = []
+
+    def publish(self, topic, message):
+        self.sent.append((topic, message))
+
+    def close(self):
+        pass
+
+
+class FakeSubscriber:
+    def __init__(self, endpoint):
+        self.queue = []
+
+    def subscribe(self, topic):
+        pass
+
+    def receive(self, timeout_ms=0):
+        return self.queue.pop(0) if self.queue else None
+
+    def close(self):
+        pass
+
+
+def _tracks_msg(frame_id, x=900.0):
+    return ("tracks", {
+        "frame_id": frame_id,
+        "timestamp": 100.0 + frame_id,
+        "tracks": [{
+            "track_id": 1,
+            "bbox": {"x1": x, "y1": 500.0, "x2": x + 40, "y2": 580.0},
+            "class_id": 0, "label": "person", "confidence": 0.9,
+            "timestamp": 100.0 + frame_id,
+        }],
+    })
+
+
+@pytest.fixture
+def node(monkeypatch):
+    monkeypatch.setattr(targeting_node, "ZmqPublisher", FakePublisher)
+    monkeypatch.setattr(targeting_node, "ZmqSubscriber", FakeSubscriber)
+    config = TargetingConfig(lock=LockConfig(), error=ErrorConfig(),
+                             intrinsics=CameraIntrinsics(1000, 1000, 960, 540, 1920, 1080))
+    node = TargetingNode(config)
+    node._tracking_enabled = True
+    node._track_sub.queue.append(_tracks_msg(0))
+    node._process_tracks()
+    node._lock_manager.select_by_id(1, node._current_tracks.tracks)
+    return node
+
+
+class FakeDepth:
+    """Depth source recording batch queries."""
+
+    def __init__(self):
+        self.batches = []
+
+    def query_depth_roi(self, x1, y1, x2, y2, percentile=50.0):
+        return 8.0
+
+    def query_depth_rois(self, bboxes, percentile=50.0):
+        self.batches.append(np.asarray(bboxes))
+        return np.full(len(bboxes), 8.0)
+
+
+def _errors(node):
+    return [m for topic, m in node._publisher.sent if topic == "errors"]
+
+
+class TestEventTriggeredTargeting:
+    """Test once-per-frame computation and keepalive."""
+
+    def test_new_frame_detected_once(self, node):
+        node._track_sub.queue.append(_tracks_msg(1))
+        assert node._process_tracks() == (True, False)
+        assert node._process_tracks() == (False, False)
+        # Same frame_id re-received is not new
+        node._track_sub.queue.append(_tracks_msg(1))
+        assert node._process_tracks() == (False, False)
+
+    def test_frames_since_lock_counts_distinct_frames(self, node):
+        for frame_id in (1, 2):
+            node._track_sub.queue.append(_tracks_msg(frame_id))
+            new_frame, _ = node._process_tracks()
+            if new_frame:
+                node._compute_and_publish()
+            # Idle iterations do not advance the lock
+            for _ in range(3):
+                assert node._process_tracks() == (False, False)
+        assert node._lock_manager.get_lock_state().frames_since_lock == 2
+        assert len(_errors(node)) == 2
+
+    def test_keepalive_republishes_cached_result(self, node):
+        node._track_sub.queue.append(_tracks_msg(1))
+        node._process_tracks()
+        node._compute_and_publish()
+        node._publish_keepalive()
+        errors = _errors(node)
+        assert len(errors) == 2
+        assert errors[0] is errors[1]
+        assert node._lock_manager.get_lock_state().frames_since_lock == 1
+
+    def test_locked_target_refreshes_errors_without_lock_update(self, node):
+        node._track_sub.queue.append(_tracks_msg(1))
+        node._process_tracks()
+        node._compute_and_publish()
+        node._track_sub.queue.append(("locked_target", {
+            "track_id": 1, "bbox": {"x1": 1000.0, "y1": 500.0, "x2": 1040.0, "y2": 580.0},
+            "score": 20.0, "timestamp": 101.5,
+        }))
+        assert node._process_tracks() == (False, True)
+        node._compute_and_publish(update_lock=False)
+        first, second = _errors(node)
+        assert second.yaw_error > first.yaw_error
+        state = node._lock_manager.get_lock_state()
+        assert state.status == LockStatus.LOCKED
+        assert state.frames_since_lock == 1
+
+    def test_track_errors_published_per_frame(self, node):
+        node.config.track_errors = True
+        node._track_sub.queue.append(_tracks_msg(1))
+        node._process_tracks()
+        node._compute_and_publish()
+        node._compute_and_publish(update_lock=False)
+        batches = [m for topic, m in node._publisher.sent if topic == "track_errors"]
+        assert len(batches) == 1
+        assert batches[0].frame_id == 1
+        assert batches[0].track_ids == [1]
+        assert batches[0].yaw_error[0] == pytest.approx(_errors(node)[0].yaw_error)
+        assert batches[0].range_error == [None]
+
+    def test_track_errors_off_skips_batch(self, node):
+        node._depth = FakeDepth()
+        node._track_sub.queue.append(_tracks_msg(1))
+        node._process_tracks()
+        node._compute_and_publish()
+        assert not [m for topic, m in node._publisher.sent if topic == "track_errors"]
+        assert node._depth.batches == []
+        assert _errors(node)[0].depth_valid
+
+    def test_track_depths_from_one_batch_query(self, node):
+        node.config.track_errors = True
+        node._depth = FakeDepth()
+        node._track_sub.queue.append(_tracks_msg(1))
+        node._process_tracks()
+        node._compute_and_publish()
+        assert len(node._depth.batches) == 1
+        assert node._depth.batches[0].shape == (1, 4)
+        batch = [m for topic, m in node._publisher.sent if topic == "track_errors"][0]
+        assert batch.range_error[0] == pytest.approx(8.0 - 10.0)
+
+
+class TestAutoSelection:
+    """Test prioritizer-driven locking in the node."""
+
+    @pytest.fixture
+    def auto_node(self, monkeypatch):
+        monkeypatch.setattr(targeting_node, "ZmqPublisher", FakePublisher)
+        monkeypatch.setattr(targeting_node, "ZmqSubscriber", FakeSubscriber)
+        config = TargetingConfig(
+            lock=LockConfig(), error=ErrorConfig(),
+            intrinsics=CameraIntrinsics(1000, 1000, 960, 540, 1920, 1080),
+            priority=PriorityConfig(enabled=True, auto_lock=True, min_score=0.3, min_age_s=0.0)
+        )
+        node = TargetingNode(config)
+        node._tracking_enabled = True
+        return node
+
+    def test_auto_lock_and_priority_published(self, auto_node):
+        auto_node._track_sub.queue.append(_tracks_msg(1))
+        auto_node._process_tracks()
+        auto_node._compute_and_publish()
+        state = auto_node._lock_manager.get_lock_state()
+        assert state.status == LockStatus.LOCKED
+        assert state.locked_track_id == 1
+        lock_states = [m for topic, m in auto_node._publisher.sent if topic == "lock_state"]
+        assert lock_states[-1].locked_track_id == 1
+        batch = [m for topic, m in auto_node._publisher.sent if topic == "track_errors"][0]
+        assert 0.3 < batch.priority[0] <= 1.0
+
+    def test_operator_clear_relocks_on_next_frame(self, auto_node):
+        auto_node._track_sub.queue.append(_tracks_msg(1))
+        auto_node._process_tracks()
+        auto_node._compute_and_publish()
+        auto_node._handle_command({"cmd_type": "CLEAR_LOCK"})
+        assert auto_node._lock_manager.locked_track_id is None
+        auto_node._track_sub.queue.append(_tracks_msg(2))
+        auto_node._process_tracks()
+        auto_node._compute_and_publish()
+        assert auto_node._lock_manager.locked_track_id == 1
+
+
+class TestAttitudeDerotation:
+    """Test attitude intake from the MAVLink bridge."""
+
+    @pytest.fixture
+    def derotating_node(self, monkeypatch):
+        monkeypatch.setattr(targeting_node, "ZmqPublisher", FakePublisher)
+        monkeypatch.setattr(targeting_node, "ZmqSubscriber", FakeSubscriber)
+        config = TargetingConfig(lock=LockConfig(), error=ErrorConfig(derotation="level"),
+                                 intrinsics=CameraIntrinsics(1000, 1000, 960, 540, 1920, 1080))
+        node = TargetingNode(config)
+        node._tracking_enabled = True
+        return node
+
+    def test_errors_use_attitude_at_capture_time(self, derotating_node, node):
+        for t in (100.98, 101.0, 101.02):
+            derotating_node._cmd_sub.queue.append(("attitude", {
+                "roll": 0.4, "pitch": 0.0, "yaw": 0.0, "timestamp": t,
+            }))
+        derotating_node._process_commands()
+        assert len(derotating_node._attitude) == 3
+
+        for n in (node, derotating_node):
+            n._track_sub.queue.append(_tracks_msg(1, x=1500.0))
+            n._process_tracks()
+            n._lock_manager.select_by_id(1, n._current_tracks.tracks)
+            n._compute_and_publish()
+        plain, derotated = _errors(node)[-1], _errors(derotating_node)[-1]
+        assert derotated.yaw_error != pytest.approx(plain.yaw_error)
+        assert derotated.pitch_error != pytest.approx(plain.pitch_error)
+
+    def test_no_attitude_leaves_camera_frame(self, derotating_node, node):
+        for n in (node, derotating_node):
+            n._track_sub.queue.append(_tracks_msg(1, x=1500.0))
+            n._process_tracks()
+            n._lock_manager.select_by_id(1, n._current_tracks.tracks)
+            n._compute_and_publish()
+        assert _errors(derotating_node)[-1].yaw_error == pytest.approx(_errors(node)[-1].yaw_error)
+
+
+class TestTargetStatePublishing:
+    """Test target_state output of the locked-target estimator."""
+
+    @pytest.fixture
+    def estimating_node(self, monkeypatch):
+        monkeypatch.setattr(targeting_node, "ZmqPublisher", FakePublisher)
+        monkeypatch.setattr(targeting_node, "ZmqSubscriber", FakeSubscriber)
+        config = TargetingConfig(lock=LockConfig(), error=ErrorConfig(),
+                                 intrinsics=CameraIntrinsics(1000, 1000, 960, 540, 1920, 1080),
+                                 estimator=EstimatorConfig(enabled=True))
+        node = TargetingNode(config)
+        node._tracking_enabled = True
+        node._track_sub.queue.append(_tracks_msg(0))
+        node._process_tracks()
+        node._lock_manager.select_by_id(1, node._current_tracks.tracks)
+        return node
+
+    def test_published_per_locked_observation(self, estimating_node):
+        for frame_id in (1, 2, 3):
+            estimating_node._track_sub.queue.append(_tracks_msg(frame_id, x=900.0 + 10 * frame_id))
+            estimating_node._process_tracks()
+            estimating_node._compute_and_publish()
+        states = [m for topic, m in estimating_node._publisher.sent if topic == "target_state"]
+        assert len(states) == 3
+        assert states[-1].track_id == 1
+        assert states[-1].frame == "body"  # No attitude received
+        assert states[-1].timestamp == 103.0
+        assert not states[-1].range_observed
+
+    def test_depth_fused_as_camera_z(self, estimating_node):
+        estimating_node._depth = FakeDepth()  # 8 m along the optical axis
+        estimating_node._track_sub.queue.append(_tracks_msg(1, x=1480.0))
+        estimating_node._process_tracks()
+        estimating_node._compute_and_publish()
+        state = [m for topic, m in estimating_node._publisher.sent if topic == "target_state"][-1]
+        assert state.range_observed
+        # Center u=1500: tan(off-axis) = 0.54, slant range = 8 * sqrt(1 + 0.54^2)
+        assert state.range_m == pytest.approx(8.0 * math.hypot(1.0, 0.54))
+        assert state.position[0] == pytest.approx(8.0)
+        assert state.position[1] == pytest.approx(8.0 * 0.54)
+
+    def test_reset_on_unlock(self, estimating_node):
+        estimating_node._track_sub.queue.append(_tracks_msg(1))
+        estimating_node._process_tracks()
+        estimating_node._compute_and_publish()
+        estimating_node._handle_command({"cmd_type": "CLEAR_LOCK"})
+        estimating_node._track_sub.queue.append(_tracks_msg(2))
+        estimating_node._process_tracks()
+        estimating_node._compute_and_publish()
+        assert not estimating_node._estimator.initialized
@@ -0,0 +1,107 @@
+"""
+Tests for the per-track history ring buffer.
+
+Run with: pytest tests/test_track_history.py -v
+"""
+
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, Detection
+from src.perception.track_history import TrackHistory
+from src.perception.tracker import ByteTrackTracker, SimpleIOUTracker, TrackerConfig
+
+
+def _push(history, track_id, t, x, y=0.0, size=10.0):
+    history.append([track_id], np.array([t]), np.array([[x, y, x + size, y + size]]))
+
+
+class TestTrackHistory:
+    """Test ring buffer storage and views."""
+
+    def test_chronological_before_wrap(self):
+        history = TrackHistory(length=4)
+        for i in range(3):
+            _push(history, 7, float(i), float(i))
+        traj = history.trajectory(7)
+        assert traj[:, 0].tolist() == [0.0, 1.0, 2.0]
+
+    def test_wraps_to_newest(self):
+        history = TrackHistory(length=4)
+        for i in range(10):
+            _push(history, 7, float(i), float(i))
+        traj = history.trajectory(7)
+        assert traj[:, 0].tolist() == [6.0, 7.0, 8.0, 9.0]
+        assert history.trajectory(7, n=2)[:, 0].tolist() == [8.0, 9.0]
+
+    def test_returns_view(self):
+        history = TrackHistory(length=4)
+        for i in range(6):
+            _push(history, 1, float(i), float(i))
+        traj = history.trajectory(1)
+        assert np.shares_memory(traj, history._data)
+
+    def test_unknown_track_empty(self):
+        history = TrackHistory(length=4)
+        assert history.trajectory(99).shape == (0, 5)
+        assert history.velocity(99) is None
+
+    def test_remove_reuses_slot(self):
+        history = TrackHistory(length=4, max_tracks=1)
+        _push(history, 1, 0.0, 0.0)
+        history.remove([1])
+        assert 1 not in history
+        _push(history, 2, 1.0, 5.0)
+        assert history.max_tracks == 1
+        assert history.trajectory(2)[:, 0].tolist() == [1.0]
+
+    def test_grows(self):
+        history = TrackHistory(length=4, max_tracks=2)
+        for tid in range(5):
+            _push(history, tid, 0.0, float(tid))
+        assert history.max_tracks == 8
+        assert history.trajectory(0)[0, 1] == 0.0
+        assert history.trajectory(4)[0, 1] == 4.0
+
+    def test_batch_append(self):
+        history = TrackHistory(length=4)
+        history.append([1, 2], np.array([0.5, 0.5]), np.array([[0, 0, 2, 2], [10, 10, 12, 12]]))
+        assert history.centers(1)[0].tolist() == [0.5, 1.0, 1.0]
+        assert history.centers(2)[0].tolist() == [0.5, 11.0, 11.0]
+
+    def test_velocity_and_acceleration(self):
+        history = TrackHistory(length=10)
+        # x = 2 t^2 -> v = 4 t, a = 4
+        for i in range(8):
+            t = i * 0.5
+            _push(history, 1, t, 2 * t * t, y=3.0 * t)
+        v = history.velocity(1, span=2)
+        assert v[1] == pytest.approx(3.0)
+        a = history.acceleration(1, span=7)
+        assert a[0] == pytest.approx(4.0)
+        assert a[1] == pytest.approx(0.0, abs=1e-9)
+
+
+class TestTrackerHistory:
+    """Test tracker integration."""
+
+    @pytest.mark.parametrize("tracker_cls", [SimpleIOUTracker, ByteTrackTracker])
+    def test_trajectory_follows_track(self, tracker_cls):
+        tracker = tracker_cls(TrackerConfig(min_hits=2, track_buffer=5))
+        for step in range(8):
+            det = Detection(bbox=BoundingBox(100 + step, 100, 150 + step, 200),
+                            class_id=0, label="person", confidence=0.9, timestamp=float(step))
+            tracks = tracker.update([det], None)
+        traj = tracker.trajectory(tracks[0].track_id)
+        assert traj.shape == (5, 5)
+        assert traj[:, 0].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+    @pytest.mark.parametrize("tracker_cls", [SimpleIOUTracker, ByteTrackTracker])
+    def test_history_dropped_with_track(self, tracker_cls):
+        tracker = tracker_cls(TrackerConfig(min_hits=1, max_age=1, new_track_thresh=0.5))
+        det = Detection(bbox=BoundingBox(0, 0, 10, 10), class_id=0, label="person",
+                        confidence=0.9, timestamp=0.0)
+        tracker.update([det], None)
+        assert 1 in tracker.history
+        for _ in range(4):
+            tracker.update([], None)
+        assert 1 not in tracker.history
@@ -0,0 +1,312 @@
+"""
+Tests for multi-object tracking.
+
+Run with: pytest tests/test_tracker.py -v
+"""
+
+import numpy as np
+import pytest
+from src.common.types import BoundingBox, Detection, Track
+from src.perception.tracker import (
+    BatchKalmanFilter,
+    ByteTrackTracker,
+    SimpleIOUTracker,
+    TrackerConfig,
+    associate,
+    iou_matrix,
+    xyah_to_xyxy,
+    xyxy_to_xyah,
+)
+
+
+def _det(x1, y1, x2, y2, class_id=0, label="person", confidence=0.9):
+    return Detection(
+        bbox=BoundingBox(x1, y1, x2, y2), class_id=class_id, label=label, confidence=confidence
+    )
+
+
+class TestIouMatrix:
+    """Test vectorized IOU."""
+
+    def test_known_values(self):
+        a = np.array([[0, 0, 10, 10], [0, 0, 10, 10]])
+        b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]])
+        expected = np.array([[1.0, 50 / 150, 0.0], [1.0, 50 / 150, 0.0]])
+        np.testing.assert_allclose(iou_matrix(a, b), expected)
+
+    def test_empty(self):
+        assert iou_matrix(np.empty((0, 4)), np.zeros((3, 4))).shape == (0, 3)
+
+    def test_degenerate_boxes(self):
+        assert iou_matrix([[5, 5, 5, 5]], [[5, 5, 5, 5]])[0, 0] == 0.0
+
+
+class TestAssociate:
+    """Test gated assignment."""
+
+    def test_gating(self):
+        scores = np.array([[0.9, 0.1], [0.2, 0.25]])
+        matches, rows, cols = associate(scores, 0.3)
+        assert matches.tolist() == [[0, 0]]
+        assert rows.tolist() == [1]
+        assert cols.tolist() == [1]
+
+    def test_hungarian_beats_greedy(self):
+        # Greedy takes (0,0)=0.9 and strands row 1; optimal matches both
+        scores = np.array([[0.9, 0.8], [0.85, 0.0]])
+        greedy, _, _ = associate(scores, 0.3, "greedy")
+        optimal, _, _ = associate(scores, 0.3, "hungarian")
+        assert greedy.tolist() == [[0, 0]]
+        assert sorted(optimal.tolist()) == [[0, 1], [1, 0]]
+
+    def test_rectangular(self):
+        scores = np.array([[0.1, 0.7, 0.0], [0.0, 0.0, 0.5]])
+        for method in ("greedy", "hungarian"):
+            matches, rows, cols = associate(scores, 0.3, method)
+            assert sorted(matches.tolist()) == [[0, 1], [1, 2]]
+            assert rows.size == 0
+            assert cols.tolist() == [0]
+
+    def test_no_feasible(self):
+        matches, rows, cols = associate(np.zeros((2, 3)), 0.3)
+        assert matches.shape == (0, 2)
+        assert rows.tolist() == [0, 1]
+        assert cols.tolist() == [0, 1, 2]
+
+
+class TestSimpleIOUTracker:
+    """Test track lifecycle."""
+
+    @pytest.mark.parametrize("matching", ["greedy", "hungarian"])
+    def test_ids_stable(self, matching):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=2, matching=matching))
+        for step in range(4):
+            tracks = tracker.update(
+                [_det(100 + step * 2, 100, 150 + step * 2, 200),
+                 _det(400, 100, 450, 200, label="car", class_id=2)], None
+            )
+        assert sorted(t.track_id for t in tracks) == [1, 2]
+        assert {t.track_id: t.label for t in tracks} == {1: "person", 2: "car"}
+
+    def test_track_removed_after_max_age(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1, max_age=2))
+        tracker.update([_det(0, 0, 10, 10)], None)
+        for _ in range(3):
+            tracks = tracker.update([], None)
+        assert tracks == []
+
+
+class TestBatchKalmanFilter:
+    """Test batched constant-velocity Kalman filter."""
+
+    def test_roundtrip_xyah(self):
+        boxes = np.array([[10.0, 20.0, 50.0, 100.0], [0.0, 0.0, 4.0, 2.0]])
+        np.testing.assert_allclose(xyah_to_xyxy(xyxy_to_xyah(boxes)), boxes)
+
+    def test_learns_constant_velocity(self):
+        kf = BatchKalmanFilter()
+        start = np.array([[100.0, 100.0, 0.5, 80.0], [300.0, 200.0, 1.0, 40.0]])
+        step = np.array([[4.0, -2.0, 0.0, 0.0], [-1.0, 3.0, 0.0, 0.0]])
+        mean, cov = kf.initiate(start)
+        for k in range(1, 30):
+            mean, cov = kf.predict(mean, cov)
+            mean, cov = kf.update(mean, cov, start + k * step)
+        np.testing.assert_allclose(mean[:, 4:6], step[:, :2], atol=0.05)
+
+    def test_covariance_grows_when_predicting(self):
+        kf = BatchKalmanFilter()
+        mean, cov = kf.initiate(np.array([[100.0, 100.0, 0.5, 80.0]]))
+        _, predicted = kf.predict(mean, cov)
+        assert predicted[0, 0, 0] > cov[0, 0, 0]
+
+    def test_empty_batch(self):
+        kf = BatchKalmanFilter()
+        mean, cov = kf.predict(np.zeros((0, 8)), np.zeros((0, 8, 8)))
+        assert mean.shape == (0, 8)
+        mean, cov = kf.update(mean, cov, np.zeros((0, 4)))
+        assert cov.shape == (0, 8, 8)
+
+
+class TestByteTrackTracker:
+    """Test native ByteTrack association and lifecycle."""
+
+    @pytest.fixture
+    def tracker(self):
+        return ByteTrackTracker(TrackerConfig(min_hits=2, max_age=5))
+
+    def test_confirms_after_min_hits(self, tracker):
+        assert tracker.update([_det(100, 100, 150, 200)], None) == []
+        tracks = tracker.update([_det(102, 100, 152, 200)], None)
+        assert [t.track_id for t in tracks] == [1]
+
+    def test_labels_retained_per_track(self, tracker):
+        for step in range(3):
+            tracks = tracker.update(
+                [_det(100 + step, 100, 150 + step, 200, class_id=0, label="person"),
+                 _det(400, 100, 500, 160, class_id=2, label="car")], None
+            )
+        by_id = {t.track_id: (t.class_id, t.label) for t in tracks}
+        assert sorted(by_id.values()) == [(0, "person"), (2, "car")]
+
+    def test_low_score_detection_keeps_track(self, tracker):
+        for step in range(3):
+            tracker.update([_det(100 + step * 2, 100, 150 + step * 2, 200)], None)
+        # Occluded: detector only reports low confidence
+        tracks = tracker.update([_det(106, 100, 156, 200, confidence=0.2)], None)
+        assert [t.track_id for t in tracks] == [1]
+        # Low-score detections never start new tracks
+        tracks = tracker.update([_det(108, 100, 158, 200, confidence=0.2),
+                                 _det(500, 500, 550, 600, confidence=0.2)], None)
+        assert [t.track_id for t in tracks] == [1]
+        assert tracker._next_id == 2
+
+    def test_lost_track_recovered_with_same_id(self, tracker):
+        for step in range(3):
+            tracker.update([_det(100, 100, 150, 200)], None)
+        for _ in range(3):
+            assert tracker.update([], None) == []
+        tracks = tracker.update([_det(100, 100, 150, 200)], None)
+        assert [t.track_id for t in tracks] == [1]
+
+    def test_lost_track_expires(self, tracker):
+        for _ in range(3):
+            tracker.update([_det(100, 100, 150, 200)], None)
+        for _ in range(7):
+            tracker.update([], None)
+        tracks = tracker.update([_det(100, 100, 150, 200)], None)
+        assert tracks == []
+        assert tracker._next_id == 3
+
+    def test_unconfirmed_dropped_on_miss(self, tracker):
+        tracker.update([_det(100, 100, 150, 200)], None)
+        tracker.update([], None)
+        tracker.update([_det(100, 100, 150, 200)], None)
+        assert tracker._next_id == 3
+
+    def test_tracks_outside_region_not_lost(self, tracker):
+        for step in range(3):
+            tracks = tracker.update([_det(100 + step * 2, 100, 150 + step * 2, 200),
+                                     _det(600, 100, 650, 200)], None)
+        # Detector only covered the second target's area
+        for _ in range(8):
+            tracks = tracker.update([_det(600, 100, 650, 200)], None, region=(500, 0, 800, 400))
+        by_id = {t.track_id: t for t in tracks}
+        assert sorted(by_id) == [1, 2]
+        assert by_id[1].bbox.x1 > 106  # Carried forward by its velocity
+        assert not tracker._lost.any()
+
+    def test_unconfirmed_outside_region_kept(self, tracker):
+        tracker.update([_det(100, 100, 150, 200)], None)
+        tracker.update([], None, region=(500, 0, 800, 400))
+        tracker.update([_det(100, 100, 150, 200)], None)
+        assert tracker._next_id == 2
+
+    def test_predict_moves_tracks(self, tracker):
+        for step in range(6):
+            tracks = tracker.update([_det(100 + step * 5, 100, 150 + step * 5, 200)], None)
+        x_before = tracks[0].bbox.x1
+        predicted = tracker.predict(None)
+        assert predicted[0].bbox.x1 > x_before + 2
+        assert tracker.uncertainty > 0.0
+
+    def test_error_keeps_last_tracks(self, tracker, monkeypatch):
+        for _ in range(3):
+            tracks = tracker.update([_det(100, 100, 150, 200)], None)
+
+        def boom(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(tracker, "_update", boom)
+        assert tracker.update([_det(100, 100, 150, 200)], None) == tracks
+
+
+class TestTrackMotion:
+    """Test published velocity/covariance and look-ahead prediction."""
+
+    def _run(self, tracker, steps=10, speed=5.0, fps=20.0):
+        tracks = []
+        for step in range(steps):
+            x = 100 + step * speed
+            det = _det(x, 100, x + 50, 200)
+            det.timestamp = 1000.0 + step / fps
+            tracks = tracker.update([det], None)
+        return tracks
+
+    def test_bytetrack_velocity_px_per_s(self):
+        tracker = ByteTrackTracker(TrackerConfig(min_hits=2, frame_rate=30.0))
+        tracks = self._run(tracker, steps=40, speed=5.0, fps=20.0)
+        vx, vy = tracks[0].velocity
+        assert vx == pytest.approx(100.0, rel=0.1)
+        assert vy == pytest.approx(0.0, abs=2.0)
+
+    def test_bytetrack_covariance_published(self):
+        tracker = ByteTrackTracker(TrackerConfig(min_hits=2))
+        tracks = self._run(tracker)
+        cov = np.array(tracks[0].covariance).reshape(4, 4)
+        np.testing.assert_allclose(cov, cov.T, atol=1e-9)
+        assert np.all(np.diag(cov) > 0)
+
+    def test_bytetrack_predict_ahead(self):
+        tracker = ByteTrackTracker(TrackerConfig(min_hits=2))
+        tracks = self._run(tracker, steps=40, speed=5.0, fps=20.0)
+        ahead = tracker.predict_ahead(0.5)
+        assert ahead[0].bbox.x1 == pytest.approx(tracks[0].bbox.x1 + 50.0, abs=5.0)
+        assert ahead[0].timestamp == pytest.approx(tracks[0].timestamp + 0.5)
+        assert ahead[0].covariance[0] > tracks[0].covariance[0]
+        # State is unchanged
+        assert tracker.predict_ahead(0.0)[0].bbox.x1 == pytest.approx(tracks[0].bbox.x1)
+
+    def test_simple_tracker_velocity(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=2, velocity_alpha=1.0))
+        tracks = self._run(tracker, steps=30, speed=5.0, fps=20.0)
+        assert tracks[0].velocity[0] == pytest.approx(100.0, rel=0.1)
+        ahead = tracker.predict_ahead(0.1)
+        assert ahead[0].bbox.x1 == pytest.approx(tracks[0].bbox.x1 + 10.0, rel=0.1)
+
+    def test_track_predicted_bbox(self):
+        track = Track(track_id=1, bbox=BoundingBox(0, 0, 10, 10), class_id=0,
+                      label="person", confidence=0.9, velocity=(20.0, -10.0))
+        box = track.predicted_bbox(0.5)
+        assert (box.x1, box.y1, box.x2, box.y2) == (10.0, -5.0, 20.0, 5.0)
+        track.velocity = None
+        assert track.predicted_bbox(0.5) == track.bbox
+
+
+class TestSimpleTrackerStore:
+    """Test the array-backed SimpleIOUTracker store."""
+
+    def test_grows_past_capacity(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1), capacity=2)
+        dets = [_det(i * 100, 0, i * 100 + 50, 50) for i in range(5)]
+        tracks = tracker.update(dets, None)
+        assert [t.track_id for t in tracks] == [1, 2, 3, 4, 5]
+        assert tracker._capacity == 8
+
+    def test_expired_slots_reused(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1, max_age=1), capacity=4)
+        tracker.update([_det(0, 0, 10, 10), _det(100, 0, 110, 10)], None)
+        tracker.update([_det(100, 0, 110, 10)], None)
+        tracker.update([_det(100, 0, 110, 10)], None)  # track 1 expires
+        tracks = tracker.update([_det(100, 0, 110, 10), _det(300, 0, 310, 10)], None)
+        assert [t.track_id for t in tracks] == [2, 3]
+        assert tracker._capacity == 4
+        assert tracker._ids[0] == 3  # slot of track 1 reused
+
+    def test_track_arrays(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=2))
+        for step in range(3):
+            tracker.update([_det(10 + step, 0, 60 + step, 50),
+                            _det(200, 0, 250, 80, class_id=2, label="car", confidence=0.7)], None)
+        arrays = tracker.track_arrays()
+        assert len(arrays) == 2
+        assert arrays.ids.tolist() == [1, 2]
+        assert arrays.bboxes.shape == (2, 4)
+        assert arrays.labels.tolist() == ["person", "car"]
+        assert arrays.confidences.tolist() == pytest.approx([0.9, 0.7])
+        assert [t.track_id for t in arrays.to_tracks()] == [1, 2]
+
+    def test_reset(self):
+        tracker = SimpleIOUTracker(TrackerConfig(min_hits=1))
+        tracker.update([_det(0, 0, 10, 10)], None)
+        tracker.reset()
+        assert tracker.update([_det(0, 0, 10, 10)], None)[0].track_id == 1